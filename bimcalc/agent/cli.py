@@ -7,10 +7,6 @@ from pathlib import Path
 
 import typer
 from rich.console import Console
-from rich.markdown import Markdown
-
-from bimcalc.agent.rag import RAGService
-from bimcalc.db.connection import get_session
 
 agent_cli = typer.Typer(help="BIMCalc RAG Agent")
 console = Console()
@@ -27,6 +23,9 @@ def ingest_cmd(
     ),
 ):
     """Ingest a document into the knowledge base."""
+    from bimcalc.agent.rag import RAGService
+    from bimcalc.db.connection import get_session
+
     if not file_path.exists():
         console.print(f"[red]File not found: {file_path}[/red]")
         raise typer.Exit(1)
@@ -55,6 +54,8 @@ def search_cmd(
     limit: int = typer.Option(5, help="Number of results"),
 ):
     """Search the knowledge base."""
+    from bimcalc.agent.rag import RAGService
+    from bimcalc.db.connection import get_session
 
     async def _search():
         async with get_session() as session:
@@ -79,6 +80,11 @@ def search_cmd(
 @agent_cli.command("chat")
 def chat_cmd():
     """Interactive chat with the agent."""
+    from rich.markdown import Markdown
+
+    from bimcalc.agent.rag import RAGService
+    from bimcalc.db.connection import get_session
+
     console.print("[bold green]BIMCalc Agent[/bold green] (type 'exit' to quit)")
 
     async def _chat_loop():
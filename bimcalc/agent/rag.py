@@ -1,6 +1,7 @@
 """RAG Service for BIMCalc Agent.
 
-Handles document ingestion (embedding generation) and semantic search using pgvector.
+Handles document ingestion (embedding generation) and semantic search using
+pgvector on Postgres and the local vector index elsewhere.
 """
 
 from __future__ import annotations
@@ -8,10 +9,10 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bimcalc.config import get_config
+from bimcalc.core.vector_index import get_vector_index, index_embedding
 from bimcalc.db.models import DocumentModel
 
 # Optional dependency for OpenAI
@@ -66,68 +67,23 @@ class RAGService:
             content=content,
             embedding=embedding,
             doc_type=doc_type,
-            metadata=metadata or {},
+            doc_metadata=metadata or {},
             source_file=source_file,
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow(),
         )
         self.session.add(doc)
         await self.session.commit()
+        index_embedding(self.session, "documents", doc.id, embedding)
         return doc
 
     async def search(self, query: str, limit: int = 5) -> list[DocumentModel]:
         """Perform semantic search for documents."""
         query_embedding = await self.get_embedding(query)
 
-        # Check dialect
-        dialect = self.session.bind.dialect.name if self.session.bind else "sqlite"
-
-        if dialect == "postgresql":
-            # pgvector cosine distance operator: <=>
-            stmt = (
-                select(DocumentModel)
-                .order_by(DocumentModel.embedding.cosine_distance(query_embedding))
-                .limit(limit)
-            )
-            result = await self.session.execute(stmt)
-            return result.scalars().all()
-        else:
-            # SQLite fallback: Fetch all and sort in Python
-            # Note: This is inefficient for large datasets but fine for MVP/testing
-            stmt = select(DocumentModel)
-            result = await self.session.execute(stmt)
-            docs = result.scalars().all()
-
-            if not docs:
-                return []
-
-            def cosine_similarity(v1, v2):
-                if v1 is None or v2 is None or len(v1) == 0 or len(v2) == 0:
-                    return 0.0
-                dot_product = sum(a * b for a, b in zip(v1, v2, strict=False))
-                norm_a = sum(a * a for a in v1) ** 0.5
-                norm_b = sum(b * b for b in v2) ** 0.5
-                return dot_product / (norm_a * norm_b) if norm_a and norm_b else 0.0
-
-            # Calculate similarity and sort
-            scored_docs = []
-            for doc in docs:
-                # Handle string embedding from SQLite if stored as JSON/string
-                embedding = doc.embedding
-                if isinstance(embedding, str):
-                    import json
-
-                    try:
-                        embedding = json.loads(embedding)
-                    except Exception:
-                        embedding = []
-
-                score = cosine_similarity(query_embedding, embedding)
-                scored_docs.append((score, doc))
-
-            # Sort by score descending
-            scored_docs.sort(key=lambda x: x[0], reverse=True)
-            return [doc for _, doc in scored_docs[:limit]]
+        index = get_vector_index(self.session, "documents")
+        hits = await index.search(self.session, query_embedding, limit)
+        return [doc for doc, _ in hits]
 
     async def chat(self, query: str) -> str:
         """Simple RAG chat: Search + Generate (Mock generation for MVP)."""
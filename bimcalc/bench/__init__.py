@@ -0,0 +1,29 @@
+"""Benchmark suite behind ``bimcalc bench``.
+
+Generates deterministic synthetic catalogs and schedules, times every
+pipeline stage on a local SQLite database and gates runs against a stored
+baseline.
+"""
+
+from bimcalc.bench.compare import DEFAULT_THRESHOLD, Regression, compare_results
+from bimcalc.bench.data import SCALES, parse_scale
+from bimcalc.bench.runner import (
+    STAGES,
+    BenchConfig,
+    StageResult,
+    default_item_count,
+    run_benchmarks,
+)
+
+__all__ = [
+    "DEFAULT_THRESHOLD",
+    "SCALES",
+    "STAGES",
+    "BenchConfig",
+    "Regression",
+    "StageResult",
+    "compare_results",
+    "default_item_count",
+    "parse_scale",
+    "run_benchmarks",
+]
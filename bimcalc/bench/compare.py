@@ -0,0 +1,86 @@
+"""Regression gate: compare a benchmark run against a stored baseline."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+# Default allowed slowdown before a stage counts as regressed (20%)
+DEFAULT_THRESHOLD = 0.2
+
+# Latencies below this are timer noise and never fail the gate
+MIN_LATENCY_MS = 0.05
+
+
+@dataclass(frozen=True)
+class Regression:
+    """One metric of one stage that got worse than the baseline allows."""
+
+    stage: str
+    metric: str
+    baseline: float | None
+    current: float | None
+
+    @property
+    def change(self) -> float | None:
+        """Relative change, e.g. 0.35 for 35% slower (None if not numeric)."""
+        if not self.baseline or self.current is None:
+            return None
+        return (self.current - self.baseline) / self.baseline
+
+    def describe(self) -> str:
+        if self.metric == "error":
+            return f"{self.stage}: failed ({self.current})"
+        return (
+            f"{self.stage}: {self.metric} {self.baseline:g} -> {self.current:g} "
+            f"({self.change:+.0%})"
+        )
+
+
+def compare_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Regression]:
+    """Stage metrics in ``current`` that regressed beyond ``threshold``.
+
+    Latency percentiles may rise and throughput may fall by at most
+    ``threshold`` (a fraction). A stage that passed in the baseline but
+    errored now is always a regression. Stages missing from either run are
+    not compared.
+
+    Raises:
+        ValueError: If the runs used different scales or seeds
+    """
+    for key in ("scale", "seed"):
+        if current.get(key) != baseline.get(key):
+            raise ValueError(
+                f"Cannot compare runs with different {key}: "
+                f"{current.get(key)!r} vs baseline {baseline.get(key)!r}"
+            )
+
+    regressions = []
+    for stage, base in baseline.get("stages", {}).items():
+        now = current.get("stages", {}).get(stage)
+        if now is None:
+            continue
+        if now.get("error"):
+            if not base.get("error"):
+                regressions.append(Regression(stage, "error", None, now["error"]))
+            continue
+        if base.get("error"):
+            continue
+
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            before, after = base.get(metric), now.get(metric)
+            if before is None or after is None:
+                continue
+            if max(before, after) < MIN_LATENCY_MS:
+                continue
+            if after > before * (1 + threshold):
+                regressions.append(Regression(stage, metric, before, after))
+
+        before, after = base.get("throughput_per_s"), now.get("throughput_per_s")
+        if before and after is not None and after < before * (1 - threshold):
+            regressions.append(Regression(stage, "throughput_per_s", before, after))
+    return regressions
@@ -0,0 +1,197 @@
+"""Deterministic synthetic catalogs and schedules for benchmarking.
+
+Every value is drawn from a ``random.Random`` seeded by the caller, so the
+same scale and seed always produce the same rows (ids included) and
+benchmark runs are comparable. Products use Revit categories the trust
+hierarchy classifies, so schedule items block onto the generated prices.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+import pandas as pd
+
+# Named catalog sizes accepted by ``bimcalc bench run --scale``
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+REGION = "IE"
+VALID_FROM = datetime(2025, 1, 1)
+MATERIALS = ("Galvanised Steel", "Stainless Steel", "Aluminium", "PVC", "Copper")
+VENDORS = ("vendor-a", "vendor-b", "vendor-c", "vendor-d", "vendor-e")
+WIDTHS = (50, 75, 100, 150, 200, 300, 400, 600)
+HEIGHTS = (25, 50, 75, 100, 150)
+DN_SIZES = (15, 20, 25, 32, 40, 50, 65, 80, 100, 150, 200)
+
+
+@dataclass(frozen=True)
+class Product:
+    """A product line: Revit category, its classification and sizing."""
+
+    category: str
+    system_type: str | None
+    classification_code: str
+    families: tuple[str, ...]
+    unit: str
+    sizing: str  # "wh" (width x height), "dn" (diameter) or "none"
+
+
+PRODUCTS = (
+    Product("Cable Tray", None, "2650", ("Ladder", "Trough", "Basket"), "m", "wh"),
+    Product(
+        "Cable Tray Fittings", None, "2650", ("Elbow", "Tee", "Reducer"), "ea", "wh"
+    ),
+    Product("Ducts", None, "2302", ("Rectangular Duct", "Flat Oval Duct"), "m", "wh"),
+    Product("Pipes", "Domestic Cold Water", "2211", ("Pipe", "Press Pipe"), "m", "dn"),
+    Product("Pipe Fittings", None, "2215", ("Elbow", "Tee", "Coupling"), "ea", "dn"),
+    Product(
+        "Lighting Fixtures", None, "2603", ("LED Panel", "Downlight"), "ea", "none"
+    ),
+)
+
+
+def parse_scale(value: str) -> int:
+    """Catalog size for a named scale ("10k", "100k", "1m") or a row count."""
+    named = SCALES.get(value.strip().lower())
+    if named is not None:
+        return named
+    try:
+        count = int(value)
+    except ValueError:
+        raise ValueError(
+            f"Unknown scale {value!r}; use one of {', '.join(SCALES)} or a row count"
+        ) from None
+    if count <= 0:
+        raise ValueError("Scale must be a positive row count")
+    return count
+
+
+def _uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _sizes(rng: random.Random, product: Product) -> dict[str, float | None]:
+    if product.sizing == "wh":
+        return {"width_mm": rng.choice(WIDTHS), "height_mm": rng.choice(HEIGHTS)}
+    if product.sizing == "dn":
+        return {"dn_mm": rng.choice(DN_SIZES)}
+    return {}
+
+
+def _size_label(sizes: dict[str, float | None]) -> str:
+    if "dn_mm" in sizes:
+        return f"DN{sizes['dn_mm']}"
+    if sizes:
+        return f"{sizes['width_mm']}x{sizes['height_mm']}"
+    return ""
+
+
+def iter_price_rows(
+    count: int,
+    org_id: str,
+    seed: int = 0,
+    batch_size: int = 10_000,
+    prefix: str = "BENCH",
+) -> Iterator[list[dict[str, Any]]]:
+    """Current price item rows in batches, ready for a bulk ``INSERT``.
+
+    Batches keep a million-row catalog out of memory.
+    """
+    rng = random.Random(seed)
+    batch: list[dict[str, Any]] = []
+    for n in range(count):
+        product = rng.choice(PRODUCTS)
+        family = rng.choice(product.families)
+        material = rng.choice(MATERIALS)
+        sizes = _sizes(rng, product)
+        sku = f"{prefix}-{n:07d}"
+        batch.append(
+            {
+                "id": _uuid(rng),
+                "org_id": org_id,
+                "item_code": sku,
+                "region": REGION,
+                "vendor_id": rng.choice(VENDORS),
+                "sku": sku,
+                "classification_code": product.classification_code,
+                "description": " ".join(
+                    filter(None, (family, _size_label(sizes), material))
+                ),
+                "unit": product.unit,
+                "unit_price": Decimal(rng.randint(100, 50_000)) / 100,
+                "currency": "EUR",
+                "vat_rate": Decimal("0.23"),
+                "material": material,
+                "source_name": "bench",
+                "source_currency": "EUR",
+                "valid_from": VALID_FROM,
+                "last_updated": VALID_FROM,
+                "is_current": True,
+                "attributes": {},
+                **sizes,
+            }
+        )
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def price_book_frame(count: int, seed: int = 0, prefix: str = "BOOK") -> pd.DataFrame:
+    """A vendor price book in the column layout ``ingest_pricebook`` reads."""
+    rows = [
+        row
+        for batch in iter_price_rows(count, "", seed, prefix=prefix)
+        for row in batch
+    ]
+    return pd.DataFrame(
+        {
+            "SKU": [r["sku"] for r in rows],
+            "Description": [r["description"] for r in rows],
+            "Classification Code": [r["classification_code"] for r in rows],
+            "Unit Price": [str(r["unit_price"]) for r in rows],
+            "Unit": [r["unit"] for r in rows],
+            "Currency": "EUR",
+            "VAT Rate": "0.23",
+            "Width": [r.get("width_mm") for r in rows],
+            "Height": [r.get("height_mm") for r in rows],
+            "DN": [r.get("dn_mm") for r in rows],
+            "Material": [r["material"] for r in rows],
+        }
+    )
+
+
+def schedule_frame(count: int, seed: int = 0) -> pd.DataFrame:
+    """A Revit schedule in the column layout ``ingest_schedule`` reads.
+
+    Every (Family, Type) pair is unique so no row is skipped as a duplicate.
+    """
+    rng = random.Random(seed + 1)
+    rows = []
+    for n in range(count):
+        product = rng.choice(PRODUCTS)
+        material = rng.choice(MATERIALS)
+        sizes = _sizes(rng, product)
+        rows.append(
+            {
+                "Family": rng.choice(product.families),
+                "Type": " ".join(filter(None, (_size_label(sizes), f"T{n:05d}"))),
+                "Category": product.category,
+                "System Type": product.system_type,
+                "Count": rng.randint(1, 50),
+                "Unit": product.unit,
+                "Width": sizes.get("width_mm"),
+                "Height": sizes.get("height_mm"),
+                "DN": sizes.get("dn_mm"),
+                "Material": material,
+                "Element Id": str(100_000 + n),
+            }
+        )
+    return pd.DataFrame(rows)
@@ -0,0 +1,533 @@
+"""Benchmark runner: time each pipeline stage against a synthetic catalog.
+
+A run builds a throwaway SQLite database, bulk-loads a catalog of the
+requested scale (untimed) and then times the stages in ``STAGES`` order.
+Each stage records one latency sample per call; ``ops`` counts the rows or
+items those calls handled, so ``throughput_per_s`` is comparable across
+stages that batch (ingestion, SCD2 merge) and those that don't.
+
+Stages that need earlier results (ranked candidates, stored matches) build
+them untimed when run on their own, so ``--stage`` can pick any subset.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from bimcalc.bench.data import (
+    REGION,
+    iter_price_rows,
+    price_book_frame,
+    schedule_frame,
+)
+from bimcalc.canonical.key_generator import canonical_key
+from bimcalc.classification.trust_hierarchy import classify_item
+from bimcalc.config import get_config
+from bimcalc.db.models import (
+    Base,
+    ItemMappingModel,
+    ItemModel,
+    MatchResultModel,
+    PriceItemModel,
+)
+from bimcalc.flags.engine import compute_flags
+from bimcalc.ingestion.pricebooks import ingest_pricebook
+from bimcalc.ingestion.schedules import ingest_schedule
+from bimcalc.matching.candidate_generator import CandidateGenerator
+from bimcalc.matching.fuzzy_ranker import FuzzyRanker
+from bimcalc.models import CandidateMatch, Item, PriceItem
+from bimcalc.pipeline.scd2_updater import SCD2PriceUpdater
+from bimcalc.pipeline.types import PriceRecord
+from bimcalc.reporting.builder import generate_report
+from bimcalc.reporting.dashboard_metrics import compute_dashboard_metrics
+
+logger = logging.getLogger(__name__)
+
+RESULTS_VERSION = 1
+
+STAGES = (
+    "ingest_prices",
+    "ingest_schedule",
+    "classification",
+    "canonical_keys",
+    "candidates",
+    "fuzzy_ranking",
+    "flags",
+    "scd2_merge",
+    "report",
+    "dashboard",
+)
+
+PROJECT_ID = "bench"
+INGEST_PROJECT_ID = "bench-ingest"
+INGEST_BATCH_ROWS = 1_000
+
+
+def default_item_count(prices: int) -> int:
+    """Schedule size for a catalog: 1 item per 20 prices, within 200-5,000."""
+    return min(max(prices // 20, 200), 5_000)
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process so far (None if unknown)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+@dataclass
+class BenchConfig:
+    """Parameters of one benchmark run."""
+
+    prices: int
+    items: int
+    scale: str = ""
+    queries: int = 200
+    repeat: int = 5
+    seed: int = 0
+    stages: tuple[str, ...] = STAGES
+    workdir: Path | None = None
+
+    def __post_init__(self) -> None:
+        unknown = set(self.stages) - set(STAGES)
+        if unknown:
+            raise ValueError(
+                f"Unknown stage(s) {', '.join(sorted(unknown))}; "
+                f"choose from {', '.join(STAGES)}"
+            )
+        self.scale = self.scale or str(self.prices)
+
+
+@dataclass
+class StageResult:
+    """Latency and throughput of one stage."""
+
+    calls: int = 0
+    ops: int = 0
+    seconds: float = 0.0
+    p50_ms: float | None = None
+    p95_ms: float | None = None
+    p99_ms: float | None = None
+    throughput_per_s: float | None = None
+    peak_rss_mb: float | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class _Timer:
+    """Collects per-call durations for one stage."""
+
+    def __init__(self) -> None:
+        self.durations: list[float] = []
+        self.ops = 0
+
+    @contextmanager
+    def measure(self, ops: int = 1) -> Iterator[None]:
+        start = time.perf_counter()
+        yield
+        self.durations.append(time.perf_counter() - start)
+        self.ops += ops
+
+    def result(self) -> StageResult:
+        seconds = float(sum(self.durations))
+        stats = StageResult(
+            calls=len(self.durations),
+            ops=self.ops,
+            seconds=round(seconds, 6),
+            peak_rss_mb=peak_rss_mb(),
+        )
+        if self.durations:
+            p50, p95, p99 = np.percentile(self.durations, [50, 95, 99]) * 1000
+            stats.p50_ms = round(float(p50), 3)
+            stats.p95_ms = round(float(p95), 3)
+            stats.p99_ms = round(float(p99), 3)
+        if seconds > 0:
+            stats.throughput_per_s = round(self.ops / seconds, 1)
+        return stats
+
+
+@dataclass
+class _Context:
+    """State shared by the stages of one run."""
+
+    config: BenchConfig
+    sessions: async_sessionmaker[AsyncSession]
+    org_id: str
+    workdir: Path
+    items: list[Item] = field(default_factory=list)
+    candidates: list[list[PriceItem]] | None = None
+    ranked: list[list[CandidateMatch]] | None = None
+    matched: bool = False
+
+    @property
+    def queried(self) -> list[Item]:
+        """Items the per-query stages run against."""
+        return self.items[: self.config.queries]
+
+    async def ensure_candidates(self) -> list[list[PriceItem]]:
+        if self.candidates is None:
+            async with self.sessions() as session:
+                generator = CandidateGenerator(session)
+                self.candidates = [
+                    await generator.generate(item, region=REGION)
+                    for item in self.queried
+                ]
+        return self.candidates
+
+    async def ensure_ranked(self) -> list[list[CandidateMatch]]:
+        if self.ranked is None:
+            ranker = FuzzyRanker()
+            self.ranked = [
+                ranker.rank(item, candidates)
+                for item, candidates in zip(
+                    self.queried, await self.ensure_candidates(), strict=True
+                )
+            ]
+        return self.ranked
+
+    async def ensure_matches(self) -> None:
+        """Store mappings and match results for the top-ranked candidates."""
+        if self.matched:
+            return
+        mappings, results, seen = [], [], set()
+        now = datetime.now(timezone.utc)
+        for item, ranked in zip(self.queried, await self.ensure_ranked(), strict=True):
+            best = ranked[0] if ranked else None
+            results.append(
+                {
+                    "id": uuid4(),
+                    "item_id": item.id,
+                    "price_item_id": best.price_item.id if best else None,
+                    "confidence_score": round(best.score, 2) if best else 0.0,
+                    "source": "fuzzy_match",
+                    "decision": "auto-accepted" if best else "manual-review",
+                    "reason": "bench",
+                    "created_by": "bench",
+                    "timestamp": now,
+                }
+            )
+            if best and item.canonical_key not in seen:
+                seen.add(item.canonical_key)
+                mappings.append(
+                    {
+                        "id": uuid4(),
+                        "org_id": self.org_id,
+                        "canonical_key": item.canonical_key,
+                        "price_item_id": best.price_item.id,
+                        "start_ts": now,
+                        "created_by": "bench",
+                        "reason": "bench",
+                    }
+                )
+        async with self.sessions() as session:
+            if mappings:
+                await session.execute(insert(ItemMappingModel), mappings)
+            if results:
+                await session.execute(insert(MatchResultModel), results)
+            await session.commit()
+        self.matched = True
+
+
+def _schedule_item(row: dict[str, Any], org_id: str) -> Item:
+    """A classified, keyed ``Item`` for a schedule frame row."""
+    item = Item(
+        id=uuid4(),
+        org_id=org_id,
+        project_id=PROJECT_ID,
+        family=row["Family"],
+        type_name=row["Type"],
+        category=row["Category"],
+        system_type=row["System Type"],
+        quantity=Decimal(row["Count"]),
+        unit=row["Unit"],
+        width_mm=row["Width"],
+        height_mm=row["Height"],
+        dn_mm=row["DN"],
+        material=row["Material"],
+    )
+    item.classification_code = int(classify_item(item))
+    item.canonical_key = canonical_key(item)
+    return item
+
+
+def _frame_rows(frame) -> list[dict[str, Any]]:
+    """Frame rows as dicts with missing values as ``None``."""
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict("records")
+
+
+async def _setup(ctx: _Context) -> None:
+    """Load the catalog and the benchmark project's schedule (untimed)."""
+    config = ctx.config
+    async with ctx.sessions() as session:
+        for batch in iter_price_rows(config.prices, ctx.org_id, config.seed):
+            for row in batch:
+                row["org_id"] = ctx.org_id
+            await session.execute(insert(PriceItemModel), batch)
+        await session.commit()
+
+    rows = _frame_rows(schedule_frame(config.items, config.seed))
+    ctx.items = [_schedule_item(row, ctx.org_id) for row in rows]
+    async with ctx.sessions() as session:
+        await session.execute(
+            insert(ItemModel),
+            [
+                {
+                    **item.model_dump(
+                        include={
+                            "id",
+                            "org_id",
+                            "project_id",
+                            "family",
+                            "type_name",
+                            "category",
+                            "system_type",
+                            "quantity",
+                            "unit",
+                            "width_mm",
+                            "height_mm",
+                            "dn_mm",
+                            "material",
+                            "canonical_key",
+                        }
+                    ),
+                    "classification_code": str(item.classification_code),
+                }
+                for item in ctx.items
+            ],
+        )
+        await session.commit()
+
+
+# ----------------------------------------------------------------------------
+# Stages
+# ----------------------------------------------------------------------------
+
+
+async def _ingest_prices(ctx: _Context, timer: _Timer) -> None:
+    rows = min(ctx.config.prices, 5 * INGEST_BATCH_ROWS)
+    book = price_book_frame(rows, ctx.config.seed)
+    for n, start in enumerate(range(0, rows, INGEST_BATCH_ROWS)):
+        path = ctx.workdir / f"pricebook-{n}.csv"
+        book.iloc[start : start + INGEST_BATCH_ROWS].to_csv(path, index=False)
+        async with ctx.sessions() as session:
+            with timer.measure(ops=0):
+                count, _errors = await ingest_pricebook(
+                    session,
+                    path,
+                    vendor_id=f"bench-ingest-{n}",
+                    org_id=ctx.org_id,
+                    region=REGION,
+                    use_cmm=False,
+                )
+            timer.ops += count
+
+
+async def _ingest_schedule(ctx: _Context, timer: _Timer) -> None:
+    frame = schedule_frame(ctx.config.items, ctx.config.seed)
+    for n, start in enumerate(range(0, len(frame), INGEST_BATCH_ROWS)):
+        path = ctx.workdir / f"schedule-{n}.csv"
+        frame.iloc[start : start + INGEST_BATCH_ROWS].to_csv(path, index=False)
+        async with ctx.sessions() as session:
+            with timer.measure(ops=0):
+                count, _errors = await ingest_schedule(
+                    session, path, ctx.org_id, INGEST_PROJECT_ID
+                )
+            timer.ops += count
+
+
+async def _classification(ctx: _Context, timer: _Timer) -> None:
+    for item in ctx.items:
+        with timer.measure():
+            classify_item(item)
+
+
+async def _canonical_keys(ctx: _Context, timer: _Timer) -> None:
+    for item in ctx.items:
+        with timer.measure():
+            canonical_key(item)
+
+
+async def _candidates(ctx: _Context, timer: _Timer) -> None:
+    candidates = []
+    async with ctx.sessions() as session:
+        generator = CandidateGenerator(session)
+        for item in ctx.queried:
+            with timer.measure():
+                candidates.append(await generator.generate(item, region=REGION))
+    ctx.candidates = candidates
+
+
+async def _fuzzy_ranking(ctx: _Context, timer: _Timer) -> None:
+    ranker = FuzzyRanker()
+    ranked = []
+    for item, candidates in zip(
+        ctx.queried, await ctx.ensure_candidates(), strict=True
+    ):
+        with timer.measure():
+            ranked.append(ranker.rank(item, candidates))
+    ctx.ranked = ranked
+
+
+async def _flags(ctx: _Context, timer: _Timer) -> None:
+    for item, candidates in zip(
+        ctx.queried, await ctx.ensure_candidates(), strict=True
+    ):
+        item_attrs = item.model_dump()
+        for price in candidates[:5]:
+            with timer.measure():
+                compute_flags(item_attrs, price.model_dump())
+
+
+async def _scd2_merge(ctx: _Context, timer: _Timer) -> None:
+    # Replay part of the catalog with every other price changed
+    count = min(ctx.config.prices, 2_000)
+    batch = next(iter_price_rows(count, ctx.org_id, ctx.config.seed, count))
+    records = [
+        PriceRecord(
+            item_code=row["item_code"],
+            region=row["region"],
+            classification_code=int(row["classification_code"]),
+            description=row["description"],
+            unit=row["unit"],
+            unit_price=row["unit_price"] * (Decimal("1.05") if n % 2 else 1),
+            currency=row["currency"],
+            vat_rate=row["vat_rate"],
+            width_mm=row.get("width_mm"),
+            height_mm=row.get("height_mm"),
+            dn_mm=row.get("dn_mm"),
+            material=row["material"],
+            source_name="bench-merge",
+            vendor_id=row["vendor_id"],
+        )
+        for n, row in enumerate(batch)
+    ]
+    async with ctx.sessions() as session:
+        updater = SCD2PriceUpdater(session)
+        for start in range(0, len(records), 500):
+            chunk = records[start : start + 500]
+            with timer.measure(ops=len(chunk)):
+                for record in chunk:
+                    await updater.process_price(record)
+                await session.commit()
+        if updater.stats["failed"]:
+            raise RuntimeError(f"{updater.stats['failed']} price records failed")
+
+
+async def _report(ctx: _Context, timer: _Timer) -> None:
+    await ctx.ensure_matches()
+    async with ctx.sessions() as session:
+        for _ in range(ctx.config.repeat):
+            with timer.measure(ops=0):
+                report = await generate_report(session, ctx.org_id, PROJECT_ID)
+            timer.ops += len(report)
+
+
+async def _dashboard(ctx: _Context, timer: _Timer) -> None:
+    await ctx.ensure_matches()
+    async with ctx.sessions() as session:
+        for _ in range(ctx.config.repeat):
+            with timer.measure():
+                await compute_dashboard_metrics(session, ctx.org_id, PROJECT_ID)
+
+
+_STAGE_FUNCS: dict[str, Callable[[_Context, _Timer], Awaitable[None]]] = {
+    "ingest_prices": _ingest_prices,
+    "ingest_schedule": _ingest_schedule,
+    "classification": _classification,
+    "canonical_keys": _canonical_keys,
+    "candidates": _candidates,
+    "fuzzy_ranking": _fuzzy_ranking,
+    "flags": _flags,
+    "scd2_merge": _scd2_merge,
+    "report": _report,
+    "dashboard": _dashboard,
+}
+
+
+async def run_benchmarks(
+    config: BenchConfig, progress: Callable[[str], None] | None = None
+) -> dict[str, Any]:
+    """Run the selected stages and return the results document.
+
+    A failing stage is recorded with its ``error`` and the run carries on.
+    """
+    with tempfile.TemporaryDirectory(prefix="bimcalc-bench-") as tmp:
+        workdir = Path(config.workdir or tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        db_path = workdir / "bench.db"
+        db_path.unlink(missing_ok=True)
+        url = f"sqlite+aiosqlite:///{db_path}"
+
+        # Config is only read for org/matching settings; the bench never
+        # touches the configured database.
+        os.environ.setdefault("DATABASE_URL", url)
+        engine = create_async_engine(url)
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            ctx = _Context(
+                config=config,
+                sessions=async_sessionmaker(engine, expire_on_commit=False),
+                org_id=get_config().org_id,
+                workdir=workdir,
+            )
+
+            if progress:
+                progress(f"Loading {config.prices:,} prices, {config.items:,} items")
+            await _setup(ctx)
+
+            stages: dict[str, dict[str, Any]] = {}
+            for name in STAGES:
+                if name not in config.stages:
+                    continue
+                if progress:
+                    progress(f"Running {name}")
+                timer = _Timer()
+                try:
+                    await _STAGE_FUNCS[name](ctx, timer)
+                    result = timer.result()
+                except Exception as e:
+                    logger.exception("Benchmark stage %s failed", name)
+                    result = timer.result()
+                    result.error = f"{type(e).__name__}: {e}"
+                stages[name] = result.to_dict()
+        finally:
+            await engine.dispose()
+
+    return {
+        "version": RESULTS_VERSION,
+        "scale": config.scale,
+        "prices": config.prices,
+        "items": config.items,
+        "queries": len(ctx.queried),
+        "seed": config.seed,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": "sqlite",
+        "stages": stages,
+    }
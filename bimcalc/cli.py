@@ -10,6 +10,9 @@ Commands:
 - report: Generate cost report with as-of query
 - stats: Show project statistics
 - pipeline-status: Check last pipeline run status
+- bench run/compare: Benchmark pipeline stages and gate regressions
+
+Pass --profile-sql before any command to profile its SQL queries.
 """
 
 from __future__ import annotations
@@ -17,26 +20,20 @@ from __future__ import annotations
 import asyncio
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
 from rich.console import Console
 from rich.table import Table
-from sqlalchemy import func, select
-
-from bimcalc.config import get_config
-from bimcalc.db.connection import get_engine, get_session
-from bimcalc.db.match_results import record_match_result
-from bimcalc.db.models import (
-    Base,
-    ItemMappingModel,
-    ItemModel,
-    MatchResultModel,
-    PriceItemModel,
-)
-from bimcalc.ingestion.pricebooks import ingest_pricebook
-from bimcalc.ingestion.schedules import ingest_schedule
-from bimcalc.matching.orchestrator import MatchOrchestrator
-from bimcalc.reporting.builder import generate_report
+
+# Commands import the database, pipeline and reporting stacks (SQLAlchemy
+# models, pandas, FastAPI via ingestion) inside their bodies, so `--help`
+# and light commands run from cron start fast. Keep module-level imports to
+# the standard library, typer and rich; tests/unit/test_cli_startup.py
+# enforces this.
+if TYPE_CHECKING:
+    from bimcalc.db.profiler import QueryProfile
+    from bimcalc.utils.spans import SpanRecorder
 
 app = typer.Typer(
     name="bimcalc",
@@ -49,6 +46,9 @@ app.add_typer(review_cli, name="review")
 web_cli = typer.Typer(help="Web UI / API")
 app.add_typer(web_cli, name="web")
 
+bench_cli = typer.Typer(help="Benchmarks and regression gates")
+app.add_typer(bench_cli, name="bench")
+
 # Register Agent CLI
 from bimcalc.agent.cli import agent_cli
 
@@ -62,11 +62,58 @@ app.add_typer(project_cli, name="project")
 console = Console()
 
 
+def _print_query_profile(profile: QueryProfile) -> None:
+    """Print the hottest SQL fingerprints of a command and likely N+1 loops."""
+    table = Table(
+        title=f"SQL Profile: {profile.total_queries} queries, "
+        f"{profile.query_ms:,.1f} ms of {profile.duration_ms:,.1f} ms"
+    )
+    table.add_column("Count", justify="right")
+    table.add_column("Total ms", justify="right")
+    table.add_column("Max ms", justify="right")
+    table.add_column("Statement", style="cyan", overflow="fold")
+    for key, stats in profile.hot_queries(10):
+        table.add_row(
+            str(stats.count),
+            f"{stats.total_ms:,.1f}",
+            f"{stats.max_ms:,.2f}",
+            key[:160],
+        )
+    console.print(table)
+
+    for key, stats in profile.suspected_n_plus_one():
+        console.print(f"[yellow]⚠ Probable N+1: {stats.count}× {key[:120]}[/yellow]")
+
+
+@app.callback()
+def cli_options(
+    ctx: typer.Context,
+    profile_sql: bool = typer.Option(
+        False,
+        "--profile-sql",
+        help="Profile SQL queries; report hot and repeated (N+1) queries at exit",
+    ),
+):
+    """BIMCalc - Classification-first cost matching for BIM."""
+    if profile_sql:
+        from bimcalc.db.profiler import profile_queries
+
+        # Close callbacks run last-in first-out: finish the profile, then print
+        ctx.call_on_close(lambda: _print_query_profile(profile))
+        profile = ctx.with_resource(
+            profile_queries(f"cli {ctx.invoked_subcommand or ''}".strip())
+        )
+
+
 @app.command()
 def init(
     drop: bool = typer.Option(False, "--drop", help="Drop existing tables"),
 ):
     """Initialize database schema."""
+    from bimcalc.config import get_config
+    from bimcalc.db.connection import get_engine
+    from bimcalc.db.models import Base
+
     config = get_config()
     console.print(f"[bold]Initializing database:[/bold] {config.db.url}")
 
@@ -89,8 +136,17 @@ def ingest_schedules_cmd(
     files: list[Path] = typer.Argument(..., help="Schedule files (CSV/XLSX)"),
     org_id: str | None = typer.Option(None, "--org", help="Organization ID"),
     project_id: str | None = typer.Option(None, "--project", help="Project ID"),
+    reingest: bool = typer.Option(
+        False,
+        "--reingest",
+        help="Diff against existing items and record revisions instead of skipping them",
+    ),
 ):
     """Import Revit schedules from CSV or XLSX files."""
+    from bimcalc.config import get_config
+    from bimcalc.db.connection import get_session
+    from bimcalc.ingestion.schedules import ingest_schedule, reingest_schedule
+
     config = get_config()
     org_id = org_id or config.org_id
     project_id = project_id or "default"
@@ -107,14 +163,25 @@ def ingest_schedules_cmd(
             for file_path in files:
                 console.print(f"  Processing: {file_path}")
                 try:
-                    success_count, errors = await ingest_schedule(
-                        session, file_path, org_id, project_id
-                    )
+                    if reingest:
+                        diff = await reingest_schedule(
+                            session, file_path, org_id, project_id
+                        )
+                        console.print(
+                            f"    [green]✓[/green] {diff.added} added, "
+                            f"{diff.modified} modified, {diff.deleted} deleted, "
+                            f"{diff.unchanged} unchanged"
+                        )
+                        success_count, errors = diff.added + diff.modified, diff.errors
+                    else:
+                        success_count, errors = await ingest_schedule(
+                            session, file_path, org_id, project_id
+                        )
+                        console.print(
+                            f"    [green]✓[/green] {success_count} items imported"
+                        )
                     total_success += success_count
                     total_errors.extend(errors)
-                    console.print(
-                        f"    [green]✓[/green] {success_count} items imported"
-                    )
                     if errors:
                         console.print(f"    [yellow]⚠[/yellow] {len(errors)} errors")
                         for err in errors[:5]:  # Show first 5 errors
@@ -138,6 +205,9 @@ def ingest_prices_cmd(
     vendor_id: str = typer.Option("default", "--vendor", help="Vendor ID"),
 ):
     """Import vendor price books from CSV or XLSX files."""
+    from bimcalc.db.connection import get_session
+    from bimcalc.ingestion.pricebooks import ingest_pricebook
+
     console.print(f"[bold]Ingesting price books:[/bold] vendor={vendor_id}")
 
     async def _ingest():
@@ -179,8 +249,23 @@ def match(
     project_id: str | None = typer.Option(None, "--project", help="Project ID"),
     created_by: str = typer.Option("cli", "--by", help="Created by user/system"),
     limit: int | None = typer.Option(None, "--limit", help="Limit items to match"),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Only re-match items affected by price, mapping or schedule changes",
+    ),
 ):
     """Run matching pipeline on project items."""
+    from sqlalchemy import func, select
+
+    from bimcalc.config import get_config
+    from bimcalc.db.connection import get_session
+    from bimcalc.db.match_results import record_match_result
+    from bimcalc.db.models import ItemModel, MatchResultModel
+    from bimcalc.matching.dirty import find_dirty_items, load_dirty_items
+    from bimcalc.matching.orchestrator import MatchOrchestrator
+    from bimcalc.utils.spans import collect_spans, span
+
     config = get_config()
     org_id = org_id or config.org_id
     project_id = project_id or "default"
@@ -206,18 +291,35 @@ def match(
             orchestrator = MatchOrchestrator(session)
 
             # Query items for project
-            stmt = select(ItemModel).where(
-                ItemModel.org_id == org_id,
-                ItemModel.project_id == project_id,
-            )
-            if limit:
-                stmt = stmt.limit(limit)
-
-            result = await session.execute(stmt)
-            items = result.scalars().all()
+            if incremental:
+                dirty = await find_dirty_items(session, org_id, project_id)
+                items = await load_dirty_items(session, dirty, limit)
+            else:
+                stmt = select(ItemModel).where(
+                    ItemModel.org_id == org_id,
+                    ItemModel.project_id == project_id,
+                )
+                if limit:
+                    stmt = stmt.limit(limit)
+                result = await session.execute(stmt)
+                items = result.scalars().all()
+
+            if incremental:
+                reasons = ", ".join(
+                    f"{reason}={count}"
+                    for reason, count in sorted(dirty.reasons.items())
+                )
+                console.print(
+                    f"Dirty items: {len(dirty.item_ids)}"
+                    + (f" ({reasons})" if reasons else "")
+                )
+                console.print(f"Skipped as clean: {dirty.clean}")
 
             if not items:
-                console.print("[yellow]No items found for project[/yellow]")
+                if incremental and dirty.total_items:
+                    console.print("[green]Nothing to re-match[/green]")
+                else:
+                    console.print("[yellow]No items found for project[/yellow]")
                 return
 
             console.print(f"Found {len(items)} items to match\n")
@@ -262,7 +364,8 @@ def match(
                 item_model.canonical_key = item.canonical_key
                 item_model.classification_code = item.classification_code
 
-                await record_match_result(session, item_model.id, match_result)
+                with span("persist_result"):
+                    await record_match_result(session, item_model.id, match_result)
                 processed_item_ids.append(item_model.id)
 
                 item_desc = f"{item.family} / {item.type_name}"
@@ -308,7 +411,36 @@ def match(
                 )
                 console.print(f"  Match results persisted: {persisted.scalar_one()}")
 
-    asyncio.run(_match())
+    with collect_spans() as spans:
+        asyncio.run(_match())
+    if spans.stages:
+        _print_stage_breakdown(spans)
+
+
+def _print_stage_breakdown(spans: SpanRecorder) -> None:
+    """Print where a matching run spent its time, slowest stage first."""
+    total = spans.total_seconds or 1.0
+    table = Table(title="Pipeline Stages")
+    table.add_column("Stage", style="cyan", no_wrap=True)
+    table.add_column("Calls", justify="right")
+    table.add_column("Items", justify="right")
+    table.add_column("Total ms", justify="right")
+    table.add_column("Mean ms", justify="right")
+    table.add_column("Max ms", justify="right")
+    table.add_column("Share", justify="right")
+
+    stages = sorted(spans.stages.items(), key=lambda kv: kv[1].seconds, reverse=True)
+    for name, timing in stages:
+        table.add_row(
+            name,
+            str(timing.calls),
+            str(timing.items),
+            f"{timing.seconds * 1000:,.1f}",
+            f"{timing.mean_ms:,.2f}",
+            f"{timing.max_seconds * 1000:,.2f}",
+            f"{timing.seconds / total:.0%}",
+        )
+    console.print(table)
 
 
 @review_cli.command("ui")
@@ -320,6 +452,8 @@ def review_ui_cmd(
     ),
 ):
     """Launch interactive review UI."""
+    from bimcalc.config import get_config
+
     config = get_config()
     org_val = org_id or config.org_id
     project_val = project_id or "default"
@@ -352,6 +486,143 @@ def web_serve(
     )
 
 
+def _print_bench_results(results: dict) -> None:
+    table = Table(
+        title=f"Benchmark ({results['scale']} prices, {results['items']} items)"
+    )
+    table.add_column("Stage", style="cyan", no_wrap=True)
+    table.add_column("Calls", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("p99 ms", justify="right")
+    table.add_column("Ops/s", justify="right")
+    table.add_column("Peak RSS MB", justify="right")
+
+    def fmt(value) -> str:
+        return "-" if value is None else f"{value:,.2f}"
+
+    for name, stage in results["stages"].items():
+        if stage["error"]:
+            table.add_row(name, str(stage["calls"]), f"[red]{stage['error']}[/red]")
+            continue
+        table.add_row(
+            name,
+            str(stage["calls"]),
+            fmt(stage["p50_ms"]),
+            fmt(stage["p95_ms"]),
+            fmt(stage["p99_ms"]),
+            fmt(stage["throughput_per_s"]),
+            fmt(stage["peak_rss_mb"]),
+        )
+    console.print(table)
+
+
+def _gate_bench(results: dict, baseline_path: Path, threshold: float) -> None:
+    """Exit non-zero if ``results`` regressed against the baseline file."""
+    import json
+
+    from bimcalc.bench import compare_results
+
+    baseline = json.loads(baseline_path.read_text())
+    try:
+        regressions = compare_results(results, baseline, threshold)
+    except ValueError as exc:
+        console.print(f"[red]✗ {exc}[/red]")
+        raise typer.Exit(2) from exc
+
+    if not regressions:
+        console.print(f"[green]✓ No regressions beyond {threshold:.0%}[/green]")
+        return
+    console.print(
+        f"[red]✗ {len(regressions)} regression(s) beyond {threshold:.0%}:[/red]"
+    )
+    for regression in regressions:
+        console.print(f"  • {regression.describe()}")
+    raise typer.Exit(1)
+
+
+@bench_cli.command("run")
+def bench_run(
+    scale: str = typer.Option(
+        "10k", "--scale", help="Catalog size: 10k, 100k, 1m or a row count"
+    ),
+    output: Path = typer.Option(
+        Path("bench-results.json"), "--out", "-o", help="Results JSON file"
+    ),
+    items: int | None = typer.Option(
+        None, "--items", help="Schedule items (default: 1 per 20 prices, 200-5000)"
+    ),
+    queries: int = typer.Option(
+        200, "--queries", help="Items matched by the per-query stages"
+    ),
+    repeat: int = typer.Option(5, "--repeat", help="Report/dashboard repetitions"),
+    seed: int = typer.Option(0, "--seed", help="Synthetic data seed"),
+    stage: list[str] | None = typer.Option(
+        None, "--stage", help="Only run this stage (repeatable)"
+    ),
+    workdir: Path | None = typer.Option(
+        None, "--workdir", help="Keep the SQLite database and files here"
+    ),
+    baseline: Path | None = typer.Option(
+        None, "--baseline", help="Fail if results regress against this file"
+    ),
+    threshold: float = typer.Option(
+        0.2, "--threshold", help="Allowed regression as a fraction (0.2 = 20%)"
+    ),
+):
+    """Benchmark every pipeline stage on a synthetic catalog (SQLite, no services)."""
+    import json
+
+    from bimcalc.bench import (
+        STAGES,
+        BenchConfig,
+        default_item_count,
+        parse_scale,
+        run_benchmarks,
+    )
+
+    try:
+        prices = parse_scale(scale)
+        config = BenchConfig(
+            prices=prices,
+            items=items or default_item_count(prices),
+            scale=scale,
+            queries=queries,
+            repeat=repeat,
+            seed=seed,
+            stages=tuple(stage) if stage else STAGES,
+            workdir=workdir,
+        )
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+    results = asyncio.run(
+        run_benchmarks(config, progress=lambda msg: console.print(f"[dim]{msg}[/dim]"))
+    )
+    output.write_text(json.dumps(results, indent=2))
+    _print_bench_results(results)
+    console.print(f"[green]✓ Results written to {output}[/green]")
+
+    if baseline:
+        _gate_bench(results, baseline, threshold)
+
+
+@bench_cli.command("compare")
+def bench_compare(
+    results: Path = typer.Argument(..., help="Results JSON from 'bench run'"),
+    baseline: Path = typer.Argument(..., help="Baseline results JSON"),
+    threshold: float = typer.Option(
+        0.2, "--threshold", help="Allowed regression as a fraction (0.2 = 20%)"
+    ),
+):
+    """Compare benchmark results with a baseline; exit 1 on regression."""
+    import json
+
+    current = json.loads(results.read_text())
+    _print_bench_results(current)
+    _gate_bench(current, baseline, threshold)
+
+
 @app.command()
 def report(
     org_id: str | None = typer.Option(None, "--org", help="Organization ID"),
@@ -362,6 +633,10 @@ def report(
     output: Path | None = typer.Option(None, "--out", "-o", help="Output CSV file"),
 ):
     """Generate cost report with as-of temporal query."""
+    from bimcalc.config import get_config
+    from bimcalc.db.connection import get_session
+    from bimcalc.reporting.builder import generate_report
+
     config = get_config()
     org_id = org_id or config.org_id
     project_id = project_id or "default"
@@ -413,6 +688,12 @@ def stats(
     project_id: str | None = typer.Option(None, "--project", help="Project ID"),
 ):
     """Show project statistics."""
+    from sqlalchemy import select
+
+    from bimcalc.config import get_config
+    from bimcalc.db.connection import get_session
+    from bimcalc.db.models import ItemMappingModel, ItemModel, PriceItemModel
+
     config = get_config()
     org_id = org_id or config.org_id
     project_id = project_id or "default"
@@ -589,6 +870,18 @@ def sync_prices_cmd(
     dry_run: bool = typer.Option(
         False, "--dry-run", help="Simulate run without writing to database"
     ),
+    max_parallel: int = typer.Option(
+        1,
+        "--max-parallel",
+        "-j",
+        min=1,
+        help="Number of sources to process concurrently",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Continue sources from their last committed checkpoint",
+    ),
 ):
     """Run automated price synchronization pipeline.
 
@@ -603,6 +896,8 @@ def sync_prices_cmd(
 
     if dry_run:
         console.print("[yellow]DRY RUN MODE - No changes will be made[/yellow]\n")
+    if resume:
+        console.print("[cyan]Resuming from last committed checkpoints[/cyan]")
 
     async def _sync():
         try:
@@ -618,7 +913,9 @@ def sync_prices_cmd(
             console.print(f"Loaded {len(importers)} data sources\n")
 
             # Run pipeline
-            summary = await run_pipeline(importers)
+            summary = await run_pipeline(
+                importers, max_parallel=max_parallel, resume=resume
+            )
 
             # Display results
             console.print("\n[bold]Pipeline Run Summary[/bold]")
@@ -634,6 +931,8 @@ def sync_prices_cmd(
             table.add_column("Inserted", justify="right")
             table.add_column("Updated", justify="right")
             table.add_column("Failed", justify="right")
+            table.add_column("Skipped", justify="right")
+            table.add_column("Back-dated", justify="right")
             table.add_column("Duration", justify="right")
 
             for result in summary["results"]:
@@ -646,6 +945,8 @@ def sync_prices_cmd(
                     str(result.records_inserted),
                     str(result.records_updated),
                     str(result.records_failed),
+                    str(result.records_skipped),
+                    str(result.records_stale),
                     f"{result.duration_seconds:.1f}s",
                 )
 
@@ -675,6 +976,9 @@ def pipeline_status_cmd(
     last_n: int = typer.Option(5, "--last", "-n", help="Show last N pipeline runs"),
 ):
     """Check status of recent pipeline runs."""
+    from sqlalchemy import select
+
+    from bimcalc.db.connection import get_session
     from bimcalc.db.models import DataSyncLogModel
 
     console.print(f"[bold]Last {last_n} Pipeline Runs[/bold]\n")
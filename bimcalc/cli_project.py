@@ -7,10 +7,6 @@ from uuid import UUID
 import typer
 from rich.console import Console
 from rich.table import Table
-from sqlalchemy import select
-
-from bimcalc.db.connection import get_session
-from bimcalc.db.models import ProjectModel, LaborRateOverride
 
 project_cli = typer.Typer(help="Manage projects and settings")
 console = Console()
@@ -19,6 +15,10 @@ console = Console()
 @project_cli.command("list")
 def list_projects():
     """List all projects."""
+    from sqlalchemy import select
+
+    from bimcalc.db.connection import get_session
+    from bimcalc.db.models import ProjectModel
 
     async def _list():
         async with get_session() as session:
@@ -47,6 +47,10 @@ def list_projects():
 @project_cli.command("settings")
 def get_settings(project_id: str):
     """Get settings for a project."""
+    from sqlalchemy import select
+
+    from bimcalc.db.connection import get_session
+    from bimcalc.db.models import ProjectModel
 
     async def _get():
         try:
@@ -79,6 +83,10 @@ def update_settings(
     is_json: bool = typer.Option(False, help="Parse value as JSON"),
 ):
     """Update a specific project setting."""
+    from sqlalchemy import select
+
+    from bimcalc.db.connection import get_session
+    from bimcalc.db.models import ProjectModel
 
     async def _update():
         try:
@@ -132,6 +140,10 @@ def update_settings(
 @project_cli.command("list-rates")
 def list_labor_rates(project_id: str):
     """List labor rate overrides."""
+    from sqlalchemy import select
+
+    from bimcalc.db.connection import get_session
+    from bimcalc.db.models import LaborRateOverride
 
     async def _list():
         try:
@@ -169,6 +181,10 @@ def set_labor_rate(
     rate: float = typer.Option(..., help="Labor rate"),
 ):
     """Set labor rate override for a category."""
+    from sqlalchemy import select
+
+    from bimcalc.db.connection import get_session
+    from bimcalc.db.models import LaborRateOverride
 
     async def _set():
         try:
@@ -77,6 +77,8 @@ class VectorConfig:
     lists: int = 100  # ivfflat parameter (tune for dataset size)
     similarity_threshold: float = 0.7
     max_results: int = 10
+    backend: str = "auto"  # auto (pgvector on Postgres, else local), pgvector, local
+    local_index_dir: str | None = None  # Persist the local index here
 
 
 @dataclass
@@ -231,6 +233,8 @@ class AppConfig:
             vector=VectorConfig(
                 index_type=os.getenv("VECTOR_INDEX_TYPE", "ivfflat"),
                 lists=int(os.getenv("VECTOR_LISTS", "100")),
+                backend=os.getenv("VECTOR_BACKEND", "auto"),
+                local_index_dir=os.getenv("VECTOR_INDEX_DIR"),
             ),
             graph=GraphConfig(
                 enabled=os.getenv("NEO4J_URI") is not None,
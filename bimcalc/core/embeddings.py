@@ -1,29 +1,42 @@
+import asyncio
+import hashlib
 import logging
 import os
 from typing import List
 
-import openai
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from bimcalc.core.vector_index import index_embedding
 from bimcalc.db.connection import get_session
 from bimcalc.db.models import ItemModel, PriceItemModel
 from bimcalc.utils.redis_cache import get_cached, set_cached
 
 logger = logging.getLogger(__name__)
 
+# Texts sent per embeddings API request (the API accepts up to 2048)
+EMBEDDING_BATCH_SIZE = 256
+
+
+def _embedding_cache_key(text: str) -> str:
+    # Stable digest: built-in hash() is salted per process
+    return f"embedding:{hashlib.sha1(text.encode('utf-8')).hexdigest()}"
+
+
 async def generate_embedding(text: str) -> List[float] | None:
     """Generate embedding for text using OpenAI."""
     if not text or not text.strip():
         return None
 
     # Check cache
-    cache_key = f"embedding:{hash(text)}"
+    cache_key = _embedding_cache_key(text)
     cached = await get_cached(cache_key)
     if cached:
         return cached
 
     try:
+        import openai
+
         client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         response = await client.embeddings.create(
             model="text-embedding-3-small", input=text
@@ -31,12 +44,51 @@ async def generate_embedding(text: str) -> List[float] | None:
         embedding = response.data[0].embedding
         
         # Cache
-        await set_cached(cache_key, embedding, ttl_seconds=86400 * 7) # 1 week
+        # Keyed by content digest, so entries never go stale
+        await set_cached(cache_key, embedding, ttl_seconds=86400 * 30)
         return embedding
     except Exception as e:
         logger.error(f"Failed to generate embedding: {e}")
         return None
 
+
+async def generate_embeddings(
+    texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE
+) -> List[List[float] | None]:
+    """Generate embeddings for many texts, one API call per batch.
+
+    Duplicate texts are embedded once and cached vectors are reused, so the
+    result lines up with ``texts`` but only unseen texts reach OpenAI.
+    """
+    unique = list(dict.fromkeys(t for t in texts if t and t.strip()))
+    cached = await asyncio.gather(
+        *(get_cached(_embedding_cache_key(t)) for t in unique)
+    )
+    found = {t: vector for t, vector in zip(unique, cached, strict=False) if vector}
+
+    missing = [t for t in unique if t not in found]
+    if missing:
+        import openai
+
+        client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start : start + batch_size]
+            try:
+                response = await client.embeddings.create(
+                    model="text-embedding-3-small", input=batch
+                )
+            except Exception as e:
+                logger.error(f"Failed to generate {len(batch)} embeddings: {e}")
+                continue
+            for data in response.data:
+                text = batch[data.index]
+                found[text] = data.embedding
+                await set_cached(
+                    _embedding_cache_key(text), data.embedding, ttl_seconds=86400 * 30
+                )
+
+    return [found.get(t) for t in texts]
+
 async def update_item_embedding(item_id: str):
     """Generate and save embedding for an item."""
     async with get_session() as session:
@@ -64,6 +116,7 @@ async def update_item_embedding(item_id: str):
         if embedding:
             item.embedding = embedding
             await session.commit()
+            index_embedding(session, "items", item.id, embedding)
 
 async def update_price_item_embedding(price_item_id: str):
     """Generate and save embedding for a price item."""
@@ -89,3 +142,4 @@ async def update_price_item_embedding(price_item_id: str):
         if embedding:
             item.embedding = embedding
             await session.commit()
+            index_embedding(session, "price_items", item.id, embedding)
@@ -0,0 +1,516 @@
+"""Vector similarity index with pluggable backends.
+
+Embeddings are searched by cosine similarity through one of two backends:
+
+- ``PgVectorIndex`` orders by ``embedding <=> :query`` so Postgres serves
+  top-k from the HNSW indexes declared on the models.
+- ``LocalVectorIndex`` is used on every other engine (SQLite in dev and
+  tests). It holds the L2-normalised embeddings in one float32 matrix,
+  persisted with its ids to one ``.npz`` file under ``VECTOR_INDEX_DIR``
+  when that is set, and answers top-k with a single matrix-vector product
+  and ``argpartition``. Newly added vectors are scored as a small separate
+  block and folded into the matrix (one rewrite, done while syncing, never
+  inside a search) only once enough of them accumulate.
+
+The local index loads once per process and is then kept current
+incrementally: write paths call ``index_embedding`` after committing,
+and a periodic id-only reconcile picks up rows written by other
+processes. Results are always re-read through the table's
+filters (e.g. ``is_current`` for prices), so expired rows never surface
+and are dropped from the index when encountered.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import Integer, cast, column, select, true, values
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from bimcalc.config import get_config
+from bimcalc.db.models import DocumentModel, ItemModel, PriceItemModel
+
+logger = logging.getLogger(__name__)
+
+# Re-check the table for rows embedded by other processes this often
+RECONCILE_SECONDS = 300
+
+# Rows fetched per round trip when loading embeddings
+_LOAD_BATCH = 2000
+
+# Queries scored per matrix product in batched searches
+_QUERY_BLOCK = 256
+
+# Rewrite the matrix once this share of its rows are removed or replaced
+_COMPACT_DEAD_RATIO = 0.25
+
+# Fold added vectors into the matrix once this many are pending
+_FOLD_PENDING_ROWS = 1024
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """A table with an ``embedding`` column and the filters results must pass."""
+
+    model: Any
+    where: tuple = ()
+
+
+SPECS: dict[str, IndexSpec] = {
+    "price_items": IndexSpec(PriceItemModel, (PriceItemModel.is_current.is_(True),)),
+    "items": IndexSpec(ItemModel),
+    "documents": IndexSpec(DocumentModel),
+}
+
+
+def to_vector(value: Any) -> np.ndarray | None:
+    """Coerce a stored embedding (array, list or JSON text) to float32."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    vector = np.asarray(value, dtype=np.float32).ravel()
+    return vector if vector.size else None
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+class PgVectorIndex:
+    """Top-k through pgvector's ``<=>`` operator and the table's HNSW index."""
+
+    def __init__(self, table: str):
+        self.table = table
+        self.spec = SPECS[table]
+
+    async def search(
+        self, session: AsyncSession, query: list[float], limit: int = 5
+    ) -> list[tuple[Any, float]]:
+        model = self.spec.model
+        distance = model.embedding.cosine_distance(list(query))
+        stmt = (
+            select(model, (1 - distance).label("similarity"))
+            .where(model.embedding.isnot(None), *self.spec.where)
+            .order_by(distance)
+            .limit(limit)
+        )
+        result = await session.execute(stmt)
+        return [(row, float(similarity)) for row, similarity in result.all()]
+
+    async def search_many(
+        self, session: AsyncSession, queries: list[list[float]], limit: int = 5
+    ) -> list[list[tuple[Any, float]]]:
+        """Top-k for every query in one round trip (VALUES + LATERAL)."""
+        if not queries:
+            return []
+        model = self.spec.model
+        vector_type = model.embedding.type
+        batch = values(
+            column("qi", Integer), column("qv", vector_type), name="queries"
+        ).data([(i, list(query)) for i, query in enumerate(queries)])
+
+        distance = model.embedding.cosine_distance(cast(batch.c.qv, vector_type))
+        nearest = (
+            select(model, (1 - distance).label("similarity"))
+            .where(model.embedding.isnot(None), *self.spec.where)
+            .order_by(distance)
+            .limit(limit)
+            .lateral("nearest")
+        )
+        row = aliased(model, nearest)
+        stmt = (
+            select(batch.c.qi, row, nearest.c.similarity)
+            .select_from(batch)
+            .join(nearest, true())
+            .order_by(batch.c.qi, nearest.c.similarity.desc())
+        )
+
+        hits: list[list[tuple[Any, float]]] = [[] for _ in queries]
+        for qi, match, similarity in (await session.execute(stmt)).all():
+            hits[qi].append((match, float(similarity)))
+        return hits
+
+    def add(self, ids: Iterable[UUID], vectors: Iterable[Sequence[float]]) -> None:
+        """Postgres maintains its own index."""
+
+    def remove(self, ids: Iterable[UUID]) -> None:
+        """Postgres maintains its own index."""
+
+
+class LocalVectorIndex:
+    """In-process cosine index over a float32 matrix of unit vectors."""
+
+    def __init__(self, table: str, path: Path | None = None):
+        self.table = table
+        self.spec = SPECS[table]
+        self.path = path
+
+        self._matrix: np.ndarray | None = None  # (n, dim)
+        self._ids: list[UUID] = []
+        self._live: np.ndarray = np.zeros(0, dtype=bool)
+        self._positions: dict[UUID, int] = {}
+        # Added since the last fold; never also live in the matrix
+        self._pending: dict[UUID, np.ndarray] = {}
+        self._pending_block: tuple[list[UUID], np.ndarray] | None = None
+
+        self._synced_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._positions) + len(self._pending)
+
+    @property
+    def dim(self) -> int | None:
+        if self._matrix is not None and self._matrix.size:
+            return self._matrix.shape[1]
+        for vector in self._pending.values():
+            return vector.shape[0]
+        return None
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+
+    def add(self, ids: Iterable[UUID], vectors: Iterable[Sequence[float]]) -> None:
+        """Insert or replace embeddings; searchable immediately."""
+        for id_, value in zip(ids, vectors, strict=False):
+            vector = to_vector(value)
+            if vector is None:
+                self.remove([id_])
+                continue
+            dim = self.dim
+            if dim is not None and vector.shape[0] != dim:
+                logger.warning(
+                    "Skipping %s embedding %s: dimension %d != index %d",
+                    self.table,
+                    id_,
+                    vector.shape[0],
+                    dim,
+                )
+                continue
+            self._kill(id_)
+            self._pending[id_] = vector
+            self._pending_block = None
+
+    def remove(self, ids: Iterable[UUID]) -> None:
+        for id_ in ids:
+            if self._pending.pop(id_, None) is not None:
+                self._pending_block = None
+            self._kill(id_)
+
+    def _kill(self, id_: UUID) -> None:
+        position = self._positions.pop(id_, None)
+        if position is not None:
+            self._live[position] = False
+
+    def _pending_vectors(self) -> tuple[list[UUID], np.ndarray] | None:
+        """Ids and unit vectors of the pending rows, built once per change."""
+        if self._pending and self._pending_block is None:
+            self._pending_block = (
+                list(self._pending),
+                _normalize(np.vstack(list(self._pending.values()))),
+            )
+        return self._pending_block if self._pending else None
+
+    def _fold_due(self, force: bool = False) -> bool:
+        dead = len(self._ids) - len(self._positions)
+        return bool(
+            (force and (self._pending or dead))
+            or len(self._pending) >= _FOLD_PENDING_ROWS
+            or dead > _COMPACT_DEAD_RATIO * max(len(self._ids), 1)
+        )
+
+    async def _consolidate(self, force: bool = False) -> None:
+        """Fold pending rows into the matrix and drop dead rows, if worth it.
+
+        Rewriting the matrix (and its file) costs a full copy, so it waits
+        until ``_FOLD_PENDING_ROWS`` rows are pending or the dead share
+        passes ``_COMPACT_DEAD_RATIO``; until then pending rows are scored
+        as their own block. The file is written in a worker thread.
+        """
+        if not self._fold_due(force):
+            return
+
+        keep = np.flatnonzero(self._live)
+        parts = []
+        if self._matrix is not None and keep.size:
+            parts.append(np.asarray(self._matrix[keep], dtype=np.float32))
+        if self._pending:
+            parts.append(_normalize(np.vstack(list(self._pending.values()))))
+
+        ids = [self._ids[i] for i in keep] + list(self._pending)
+        self._set(np.vstack(parts) if parts else None, ids)
+        self._pending.clear()
+        self._pending_block = None
+        # The saved matrix and ids are replaced, never modified in place
+        await asyncio.to_thread(self._save, self._matrix, self._ids)
+
+    def _set(self, matrix: np.ndarray | None, ids: list[UUID]) -> None:
+        self._matrix = matrix
+        self._ids = ids
+        self._live = np.ones(len(ids), dtype=bool)
+        self._positions = {id_: i for i, id_ in enumerate(ids)}
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _file(self) -> Path | None:
+        return self.path.with_suffix(".npz") if self.path is not None else None
+
+    def _save(self, matrix: np.ndarray | None, ids: list[UUID]) -> None:
+        """Write matrix and ids as one file, published by a single rename.
+
+        Every process on the same database shares the file, so each writes
+        to its own temporary name first; readers see either the old or the
+        new pair, never one process's matrix with another's ids.
+        """
+        file = self._file()
+        if file is None:
+            return
+        file.parent.mkdir(parents=True, exist_ok=True)
+        if matrix is None:
+            file.unlink(missing_ok=True)
+            return
+
+        fd, tmp = tempfile.mkstemp(
+            prefix=f".{file.stem}-", suffix=".tmp.npz", dir=file.parent
+        )
+        try:
+            with os.fdopen(fd, "wb") as out:
+                np.savez(
+                    out,
+                    matrix=np.ascontiguousarray(matrix, dtype=np.float32),
+                    ids=np.frombuffer(
+                        b"".join(id_.bytes for id_ in ids), dtype=np.uint8
+                    ).reshape(-1, 16),
+                )
+            os.replace(tmp, file)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _load(self) -> None:
+        file = self._file()
+        if file is None or not file.exists():
+            return
+        try:
+            with np.load(file) as data:
+                matrix = data["matrix"]
+                raw_ids = data["ids"]
+            ids = [UUID(bytes=raw.tobytes()) for raw in raw_ids.reshape(-1, 16)]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable vector index %s: %s", file, e)
+            return
+        if (
+            matrix.ndim != 2
+            or matrix.dtype != np.float32
+            or matrix.shape[0] != len(ids)
+            or len(set(ids)) != len(ids)
+        ):
+            logger.warning("Ignoring inconsistent vector index %s", file)
+            return
+        self._set(matrix, ids)
+
+    # ------------------------------------------------------------------
+    # Sync with the database
+    # ------------------------------------------------------------------
+
+    async def sync(self, session: AsyncSession, force: bool = False) -> None:
+        """Load on first use, then reconcile ids with the table periodically."""
+        if not force and time.monotonic() - self._synced_at < RECONCILE_SECONDS:
+            return
+        async with self._lock:
+            if not force and time.monotonic() - self._synced_at < RECONCILE_SECONDS:
+                return
+            first_load = self._matrix is None and not self._ids
+            if first_load:
+                self._load()
+
+            model = self.spec.model
+            result = await session.execute(
+                select(model.id).where(model.embedding.isnot(None), *self.spec.where)
+            )
+            db_ids = set(result.scalars())
+            known = set(self._positions) | set(self._pending)
+
+            self.remove(known - db_ids)
+            missing = list(db_ids - known)
+            for start in range(0, len(missing), _LOAD_BATCH):
+                batch = missing[start : start + _LOAD_BATCH]
+                rows = (
+                    await session.execute(
+                        select(model.id, model.embedding).where(model.id.in_(batch))
+                    )
+                ).all()
+                self.add([row.id for row in rows], [row.embedding for row in rows])
+
+            # The first load is persisted at once; later adds wait to fold
+            await self._consolidate(force=first_load)
+            self._synced_at = time.monotonic()
+            logger.debug("Vector index %s synced: %d vectors", self.table, len(self))
+
+    async def fold(self) -> None:
+        """Fold pending and dead rows into the matrix once enough accumulate."""
+        if self._fold_due():
+            async with self._lock:
+                await self._consolidate()
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def top_k(
+        self, query: Sequence[float] | np.ndarray, k: int
+    ) -> list[tuple[UUID, float]]:
+        """Ids and cosine similarities of the ``k`` nearest vectors."""
+        return self.top_k_many([query], k)[0]
+
+    def top_k_many(
+        self, queries: Sequence[Sequence[float] | np.ndarray], k: int
+    ) -> list[list[tuple[UUID, float]]]:
+        """``top_k`` for a batch of queries via one matrix product per block."""
+        hits: list[list[tuple[UUID, float]]] = [[] for _ in queries]
+        if not len(self) or k <= 0:
+            return hits
+
+        dim = self.dim
+        valid = []
+        for i, query in enumerate(queries):
+            vector = to_vector(query)
+            if vector is not None and vector.shape[0] == dim:
+                valid.append((i, vector))
+
+        # Score rows are the matrix rows followed by the pending block
+        pending = self._pending_vectors()
+        ids = self._ids + pending[0] if pending else self._ids
+        k = min(k, len(self))
+        has_dead = len(self._positions) < len(self._ids)
+        for start in range(0, len(valid), _QUERY_BLOCK):
+            block = valid[start : start + _QUERY_BLOCK]
+            unit = _normalize(np.vstack([v for _, v in block])).T
+            parts = []
+            if self._matrix is not None and len(self._ids):
+                scores = self._matrix @ unit
+                if has_dead:
+                    scores[~self._live] = -np.inf
+                parts.append(scores)
+            if pending:
+                parts.append(pending[1] @ unit)
+            scores = parts[0] if len(parts) == 1 else np.vstack(parts)
+            top = np.argpartition(-scores, k - 1, axis=0)[:k]
+            for j, (i, _) in enumerate(block):
+                rows = top[:, j]
+                column_scores = scores[rows, j]
+                order = np.argsort(-column_scores, kind="stable")
+                hits[i] = [(ids[rows[n]], float(column_scores[n])) for n in order]
+        return hits
+
+    async def search(
+        self, session: AsyncSession, query: list[float], limit: int = 5
+    ) -> list[tuple[Any, float]]:
+        return (await self.search_many(session, [query], limit))[0]
+
+    async def search_many(
+        self, session: AsyncSession, queries: list[list[float]], limit: int = 5
+    ) -> list[list[tuple[Any, float]]]:
+        """Rows and similarities of the nearest vectors for each query."""
+        await self.sync(session)
+        await self.fold()
+        model = self.spec.model
+
+        while True:
+            hits = self.top_k_many(queries, limit)
+            ids = {id_ for query_hits in hits for id_, _ in query_hits}
+            if not ids:
+                return hits
+            rows: dict[UUID, Any] = {}
+            for chunk in _chunks(list(ids), _LOAD_BATCH):
+                result = await session.execute(
+                    select(model).where(model.id.in_(chunk), *self.spec.where)
+                )
+                rows.update((row.id, row) for row in result.scalars())
+            stale = ids - rows.keys()
+            if not stale:
+                return [
+                    [(rows[id_], score) for id_, score in query_hits]
+                    for query_hits in hits
+                ]
+            # Expired or deleted since indexing: drop them and look again
+            self.remove(stale)
+
+
+def _chunks(items: list[UUID], size: int) -> Iterator[list[UUID]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+_local_indexes: dict[tuple[str, str], LocalVectorIndex] = {}
+
+
+def _bind_key(session: AsyncSession) -> str:
+    bind = session.bind
+    if bind is None:
+        return "default"
+    # An AsyncConnection exposes its URL through its engine
+    return str(bind.engine.url)
+
+
+def _index_path(table: str, bind_key: str) -> Path | None:
+    directory = get_config().vector.local_index_dir
+    if not directory:
+        return None
+    digest = hashlib.sha1(bind_key.encode()).hexdigest()[:12]
+    return Path(directory) / f"{table}-{digest}"
+
+
+def get_vector_index(
+    session: AsyncSession, table: str
+) -> PgVectorIndex | LocalVectorIndex:
+    """Vector index backend for ``table`` on the session's database."""
+    if table not in SPECS:
+        raise ValueError(f"No vector index for table {table!r}")
+
+    backend = get_config().vector.backend
+    dialect = session.bind.dialect.name if session.bind else "sqlite"
+    if backend == "pgvector" or (backend == "auto" and dialect == "postgresql"):
+        return PgVectorIndex(table)
+
+    key = (_bind_key(session), table)
+    index = _local_indexes.get(key)
+    if index is None:
+        index = LocalVectorIndex(table, _index_path(table, key[0]))
+        _local_indexes[key] = index
+    return index
+
+
+def index_embedding(
+    session: AsyncSession, table: str, id_: UUID, embedding: Any
+) -> None:
+    """Apply a committed embedding to this process's local index, if loaded."""
+    index = _local_indexes.get((_bind_key(session), table))
+    if index is not None:
+        index.add([id_], [embedding])
+
+
+def clear_vector_indexes() -> None:
+    """Forget every loaded local index (tests)."""
+    _local_indexes.clear()
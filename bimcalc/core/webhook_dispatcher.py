@@ -1,98 +1,397 @@
-import hmac
+"""Webhook dispatch for BIMCalc.
+
+Events are published in-process, coalesced per webhook and enqueued to the
+arq worker in batches; the worker delivers them over a shared keep-alive
+HTTP client.
+
+- Subscriptions: active webhooks are loaded once and indexed by event type
+  (``*`` subscribers included), refreshed after ``subscription_ttl_seconds``
+  or when ``invalidate_subscriptions()`` is called on create/delete
+- Queue: one long-lived arq pool per process instead of one per event
+- Batching: events published within ``linger_seconds`` of each other become
+  a single job per webhook; webhooks with ``batch_max_events > 1`` receive
+  up to that many events per POST
+- Delivery: retries on connection errors, 429 and 5xx with exponential
+  backoff and jitter; once a webhook exhausts its retries the rest of the
+  job's deliveries to it are dropped
+"""
+
+from __future__ import annotations
+
+import asyncio
 import hashlib
+import hmac
 import json
-import httpx
+import logging
 import os
+import random
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+import httpx
 from sqlalchemy import select
-from arq import create_pool
-from arq.connections import RedisSettings
+
 from bimcalc.db.connection import get_session
 from bimcalc.db.models import WebhookModel
 
+logger = logging.getLogger(__name__)
+
+DELIVERY_TIMEOUT_SECONDS = 10.0
+MAX_DELIVERY_ATTEMPTS = 4
+RETRY_BASE_DELAY_SECONDS = 0.5
+RETRY_MAX_DELAY_SECONDS = 8.0
+
+# Events per arq job; bounds job payload size during bulk runs
+MAX_EVENTS_PER_JOB = 500
+
+# Outcomes of one POST (after retries)
+DELIVERED = "delivered"
+REJECTED = "rejected"
+UNREACHABLE = "unreachable"
+
+
+@dataclass(frozen=True, slots=True)
+class WebhookTarget:
+    """Cached, session-independent view of an active webhook."""
+
+    id: UUID
+    url: str
+    secret: str
+    batch_max_events: int = 1
+
+
+# ============================================================================
+# Subscription index
+# ============================================================================
+
+
+class SubscriptionIndex:
+    """Active webhooks indexed by event type, refreshed on a TTL."""
+
+    def __init__(self, ttl_seconds: float = 30.0):
+        self.ttl_seconds = ttl_seconds
+        self._by_event: dict[str, list[WebhookTarget]] = {}
+        self._wildcard: list[WebhookTarget] = []
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def _fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.ttl_seconds
+        )
+
+    async def targets_for(self, event_type: str) -> list[WebhookTarget]:
+        if not self._fresh():
+            async with self._lock:
+                if not self._fresh():
+                    await self._load()
+        return self._by_event.get(event_type, []) + self._wildcard
+
+    async def _load(self) -> None:
+        async with get_session() as session:
+            result = await session.execute(
+                select(
+                    WebhookModel.id,
+                    WebhookModel.url,
+                    WebhookModel.secret,
+                    WebhookModel.events,
+                    WebhookModel.batch_max_events,
+                ).where(WebhookModel.is_active.is_(True))
+            )
+            rows = result.all()
+
+        by_event: dict[str, list[WebhookTarget]] = defaultdict(list)
+        wildcard: list[WebhookTarget] = []
+        for webhook_id, url, secret, events, batch_max_events in rows:
+            target = WebhookTarget(webhook_id, url, secret, batch_max_events or 1)
+            if "*" in events:
+                wildcard.append(target)
+                continue
+            for event in set(events):
+                by_event[event].append(target)
+
+        self._by_event = dict(by_event)
+        self._wildcard = wildcard
+        self._loaded_at = time.monotonic()
+
+
+# ============================================================================
+# Publisher
+# ============================================================================
+
+
+async def _create_queue_pool() -> Any:
+    from arq import create_pool
+    from arq.connections import RedisSettings
+
+    redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379")
+    return await create_pool(RedisSettings.from_dsn(redis_url))
+
+
+class WebhookDispatcher:
+    """Buffers published events and enqueues one job per webhook per flush."""
+
+    def __init__(
+        self,
+        pool_factory: Callable[[], Awaitable[Any]] = _create_queue_pool,
+        subscriptions: SubscriptionIndex | None = None,
+        linger_seconds: float = 0.05,
+        max_buffered_events: int = 1000,
+    ):
+        self._pool_factory = pool_factory
+        self._pool: Any | None = None
+        self.subscriptions = subscriptions or SubscriptionIndex()
+        self.linger_seconds = linger_seconds
+        self.max_buffered_events = max_buffered_events
+        self._buffer: dict[WebhookTarget, list[dict[str, Any]]] = defaultdict(list)
+        self._buffered = 0
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+    async def publish(self, event_type: str, payload: dict) -> None:
+        await self.publish_many(event_type, [payload])
+
+    async def publish_many(self, event_type: str, payloads: Iterable[dict]) -> None:
+        """Buffer events for every webhook subscribed to ``event_type``."""
+        targets = await self.subscriptions.targets_for(event_type)
+        if not targets:
+            return
+
+        timestamp = datetime.utcnow().isoformat()
+        events = [
+            {"event": event_type, "timestamp": timestamp, "data": payload}
+            for payload in payloads
+        ]
+        for target in targets:
+            self._buffer[target].extend(events)
+        self._buffered += len(events)
+
+        if self._buffered >= self.max_buffered_events:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_linger())
+
+    async def _flush_after_linger(self) -> None:
+        await asyncio.sleep(self.linger_seconds)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Enqueue everything buffered so far."""
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            buffer, self._buffer = self._buffer, defaultdict(list)
+            self._buffered = 0
+
+            try:
+                pool = await self._get_pool()
+                for target, events in buffer.items():
+                    for start in range(0, len(events), MAX_EVENTS_PER_JOB):
+                        await pool.enqueue_job(
+                            "deliver_webhook_batch",
+                            webhook_id=str(target.id),
+                            events=events[start : start + MAX_EVENTS_PER_JOB],
+                        )
+            except Exception as e:
+                # Drop the pool so the next flush reconnects
+                self._pool = None
+                logger.error("Failed to enqueue webhook jobs: %s", e)
+
+    async def _get_pool(self) -> Any:
+        if self._pool is None:
+            self._pool = await self._pool_factory()
+        return self._pool
+
+    async def close(self) -> None:
+        """Flush pending events and release the queue pool."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush()
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+_dispatcher: WebhookDispatcher | None = None
+
+
+def get_dispatcher() -> WebhookDispatcher:
+    """Get the process-wide webhook dispatcher (singleton)."""
+    global _dispatcher
+
+    if _dispatcher is None:
+        _dispatcher = WebhookDispatcher()
+    return _dispatcher
+
+
+def invalidate_subscriptions() -> None:
+    """Reload subscriptions on the next publish (call after webhook edits)."""
+    get_dispatcher().subscriptions.invalidate()
+
+
+async def close_dispatcher() -> None:
+    global _dispatcher
+
+    if _dispatcher is not None:
+        await _dispatcher.close()
+        _dispatcher = None
+
+
 async def trigger_webhook(event_type: str, payload: dict):
     """Trigger webhooks for a given event.
-    
+
     Args:
         event_type: Event name (e.g. "item.matched")
         payload: Data to send
     """
-    
-    # Find active webhooks
-    async with get_session() as session:
-        stmt = select(WebhookModel).where(WebhookModel.is_active == True)
-        result = await session.execute(stmt)
-        webhooks = result.scalars().all()
-        
-        matching_webhooks = [
-            w for w in webhooks 
-            if event_type in w.events or "*" in w.events
-        ]
-        
-        if not matching_webhooks:
-            return
+    await get_dispatcher().publish(event_type, payload)
+
+
+# ============================================================================
+# Delivery (arq worker)
+# ============================================================================
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for webhook delivery."""
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=DELIVERY_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            headers={"User-Agent": "BIMCalc-Webhook/1.0"},
+        )
+    return _http_client
+
+
+def _sign(secret: str, body: str) -> str:
+    return hmac.new(secret.encode(), body.encode(), hashlib.sha256).hexdigest()
 
-        # Enqueue jobs
-        redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379")
+
+def _retry_delay(attempt: int) -> float:
+    delay = min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2**attempt)
+    return delay * random.uniform(0.5, 1.0)
+
+
+async def _post_with_retry(
+    client: httpx.AsyncClient, url: str, body: str, headers: dict[str, str]
+) -> str:
+    """POST with retries; returns ``delivered``, ``rejected`` or ``unreachable``.
+
+    ``rejected`` is a 4xx other than 429 (this payload is refused, retrying
+    will not help); ``unreachable`` means every attempt failed.
+    """
+    for attempt in range(MAX_DELIVERY_ATTEMPTS):
         try:
-            redis = await create_pool(RedisSettings.from_dsn(redis_url))
-            
-            for webhook in matching_webhooks:
-                await redis.enqueue_job(
-                    "send_webhook_request",
-                    webhook_id=str(webhook.id),
-                    event_type=event_type,
-                    payload=payload,
-                    timestamp=datetime.utcnow().isoformat()
+            response = await client.post(url, content=body, headers=headers)
+        except httpx.RequestError as e:
+            logger.warning("Webhook delivery to %s failed: %s", url, e)
+        else:
+            if response.status_code < 400:
+                return DELIVERED
+            if response.status_code != 429 and response.status_code < 500:
+                logger.warning(
+                    "Webhook %s rejected delivery: HTTP %s", url, response.status_code
                 )
-            
-            await redis.close()
-        except Exception as e:
-            print(f"Failed to enqueue webhook jobs: {e}")
-
-async def send_webhook_request(ctx, webhook_id: str, event_type: str, payload: dict, timestamp: str):
-    """Worker job to send webhook request."""
-    
-    session_maker = ctx.get("session_maker")
-    if not session_maker:
-        # Fallback if not running in worker context
-        from bimcalc.db.connection import get_session
-        session_cm = get_session()
+                return REJECTED
+            logger.warning("Webhook %s returned HTTP %s", url, response.status_code)
+
+        if attempt + 1 < MAX_DELIVERY_ATTEMPTS:
+            await asyncio.sleep(_retry_delay(attempt))
+
+    logger.error("Giving up on webhook delivery to %s", url)
+    return UNREACHABLE
+
+
+def _requests_for(
+    target: WebhookTarget, events: list[dict[str, Any]]
+) -> list[tuple[str, dict[str, str]]]:
+    """Build (body, headers) per POST: one event each unless batching."""
+    if target.batch_max_events <= 1:
+        groups = [(event["event"], json.dumps(event)) for event in events]
     else:
-        session_cm = session_maker()
+        groups = []
+        for start in range(0, len(events), target.batch_max_events):
+            chunk = events[start : start + target.batch_max_events]
+            body = json.dumps({"event": "batch", "count": len(chunk), "events": chunk})
+            groups.append(("batch", body))
+
+    return [
+        (
+            body,
+            {
+                "Content-Type": "application/json",
+                "X-BIMCalc-Signature": _sign(target.secret, body),
+                "X-BIMCalc-Event": event_type,
+            },
+        )
+        for event_type, body in groups
+    ]
+
+
+async def _load_target(ctx, webhook_id: str) -> WebhookTarget | None:
+    session_maker = ctx.get("session_maker")
+    session_cm = session_maker() if session_maker else get_session()
 
     async with session_cm as session:
-        from uuid import UUID
         try:
             webhook = await session.get(WebhookModel, UUID(webhook_id))
         except Exception:
-            return
-
+            return None
         if not webhook or not webhook.is_active:
-            return
+            return None
+        return WebhookTarget(
+            webhook.id, webhook.url, webhook.secret, webhook.batch_max_events or 1
+        )
 
-        full_payload = {
-            "event": event_type,
-            "timestamp": timestamp,
-            "data": payload
-        }
-        body = json.dumps(full_payload)
-        
-        signature = hmac.new(
-            webhook.secret.encode(),
-            body.encode(),
-            hashlib.sha256
-        ).hexdigest()
-        
-        headers = {
-            "Content-Type": "application/json",
-            "X-BIMCalc-Signature": signature,
-            "X-BIMCalc-Event": event_type,
-            "User-Agent": "BIMCalc-Webhook/1.0"
-        }
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                await client.post(webhook.url, content=body, headers=headers, timeout=10.0)
-            except httpx.RequestError as e:
-                print(f"Webhook delivery failed to {webhook.url}: {e}")
+
+async def deliver_webhook_batch(ctx, webhook_id: str, events: list[dict]) -> dict:
+    """Worker job: deliver coalesced events to one webhook."""
+    target = await _load_target(ctx, webhook_id)
+    if target is None:
+        return {"delivered": 0, "failed": 0, "skipped": len(events)}
+
+    client = ctx.get("http_client") or get_http_client()
+    requests = _requests_for(target, events)
+    delivered = failed = 0
+    for index, (body, headers) in enumerate(requests):
+        outcome = await _post_with_retry(client, target.url, body, headers)
+        if outcome == DELIVERED:
+            delivered += 1
+            continue
+        failed += 1
+        if outcome == UNREACHABLE:
+            # Circuit breaker: retrying every remaining POST against a dead
+            # endpoint would hold the job for attempts x timeout each
+            skipped = len(requests) - index - 1
+            if skipped:
+                logger.error(
+                    "Webhook %s unreachable, dropping %d remaining deliveries",
+                    target.url,
+                    skipped,
+                )
+            return {"delivered": delivered, "failed": failed, "skipped": skipped}
+    return {"delivered": delivered, "failed": failed, "skipped": 0}
+
+
+async def send_webhook_request(
+    ctx, webhook_id: str, event_type: str, payload: dict, timestamp: str
+):
+    """Worker job to send a single webhook request (jobs queued before batching)."""
+    await deliver_webhook_batch(
+        ctx,
+        webhook_id,
+        [{"event": event_type, "timestamp": timestamp, "data": payload}],
+    )
@@ -13,6 +13,7 @@ from sqlalchemy.orm import sessionmaker
 
 from bimcalc.config import get_config
 from bimcalc.db.models import Base
+from bimcalc.utils.cache_tags import flush_invalidations
 
 # Global engine instance
 _engine: AsyncEngine | None = None
@@ -97,6 +98,8 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             result = await session.execute(query)
             await session.commit()
 
+    Cache invalidations published during the session are awaited on exit.
+
     Yields:
         AsyncSession: SQLAlchemy async session
 
@@ -114,6 +117,7 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         raise
     finally:
         await session.close()
+        await flush_invalidations()
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -0,0 +1,106 @@
+"""Facet counts for the list view filter dropdowns.
+
+Each view's facets come from one ``GROUP BY`` over all of its filter
+dimensions at once (a small "cube" of value combinations and row counts).
+Per-dimension counts and the total for any combination of dropdown filters
+are then sums over the cube, so paging and changing filters never re-count
+the table.
+
+Cubes are cached briefly and tagged with the data they summarise: schedule
+ingestion invalidates a project's item facets (``project:{org}:{project}``)
+and price imports an organisation's price facets (``prices:{org}``).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bimcalc.db.models import ItemModel, PriceItemModel
+from bimcalc.utils.cache import get_cache, register_cache_type
+from bimcalc.utils.cache_tags import prices_tag, project_tag
+
+# Facets may lag writes that don't publish a cache tag by at most this long
+FACET_TTL_SECONDS = 60
+
+ITEM_DIMENSIONS = ("category",)
+PRICE_DIMENSIONS = ("is_current", "vendor_id", "classification_code", "region")
+
+
+@register_cache_type
+@dataclass
+class FacetCube:
+    """Row counts per combination of dimension values."""
+
+    dimensions: tuple[str, ...]
+    cells: list[tuple[Any, ...]] = field(default_factory=list)
+
+    def _matches(self, cell: tuple[Any, ...], filters: dict[str, Any]) -> bool:
+        return all(
+            cell[self.dimensions.index(name)] == value
+            for name, value in filters.items()
+            if value is not None
+        )
+
+    def total(self, **filters: Any) -> int:
+        """Rows matching ``filters`` (``None`` values are ignored)."""
+        return sum(cell[-1] for cell in self.cells if self._matches(cell, filters))
+
+    def counts(self, dimension: str, **filters: Any) -> list[tuple[Any, int]]:
+        """``(value, rows)`` for every non-null value of ``dimension``.
+
+        Counts apply the other dimensions' filters, so they show how many rows
+        picking each value would list. Values that drop to zero are kept so a
+        selected option never disappears from its dropdown.
+        """
+        position = self.dimensions.index(dimension)
+        others = {k: v for k, v in filters.items() if k != dimension}
+        counts: dict[Any, int] = {}
+        for cell in self.cells:
+            value = cell[position]
+            if value is None:
+                continue
+            hits = cell[-1] if self._matches(cell, others) else 0
+            counts[value] = counts.get(value, 0) + hits
+        return sorted(counts.items())
+
+
+async def _load_cube(
+    session: AsyncSession, model: type, dimensions: tuple[str, ...], *where: Any
+) -> FacetCube:
+    columns = [getattr(model, name) for name in dimensions]
+    result = await session.execute(
+        select(*columns, func.count()).where(*where).group_by(*columns)
+    )
+    return FacetCube(dimensions, [tuple(row) for row in result])
+
+
+async def item_facets(session: AsyncSession, org_id: str, project_id: str) -> FacetCube:
+    """Item counts by category for a project (cached)."""
+    return await get_cache().get_or_compute(
+        f"facets:items:{org_id}:{project_id}",
+        lambda: _load_cube(
+            session,
+            ItemModel,
+            ITEM_DIMENSIONS,
+            ItemModel.org_id == org_id,
+            ItemModel.project_id == project_id,
+        ),
+        ttl_seconds=FACET_TTL_SECONDS,
+        tags=[project_tag(org_id, project_id)],
+    )
+
+
+async def price_facets(session: AsyncSession, org_id: str) -> FacetCube:
+    """Price counts by current flag, vendor, classification and region (cached)."""
+    return await get_cache().get_or_compute(
+        f"facets:prices:{org_id}",
+        lambda: _load_cube(
+            session, PriceItemModel, PRICE_DIMENSIONS, PriceItemModel.org_id == org_id
+        ),
+        ttl_seconds=FACET_TTL_SECONDS,
+        tags=[prices_tag(org_id)],
+    )
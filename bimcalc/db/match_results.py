@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from bimcalc.db.models import MatchFlagModel, MatchResultModel
 from bimcalc.models import Flag, MatchResult
+from bimcalc.utils.cache_tags import item_tag, publish_invalidation
 
 
 def _enum_value(value):
@@ -37,6 +38,7 @@ async def record_match_result(
     await session.flush()
 
     await _record_flags(session, db_result, item_id, match_result.flags)
+    publish_invalidation(session, item_tag(item_id))
     return db_result
 
 
@@ -0,0 +1,32 @@
+"""add_ingest_log_progress
+
+Revision ID: a4c8e2f6b1d3
+Revises: c9e5a1f3d4b6
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c8e2f6b1d3"
+down_revision: Union[str, None] = "c9e5a1f3d4b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows parsed so far by a running background ingest job
+    op.add_column(
+        "ingest_logs",
+        sa.Column(
+            "items_processed", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("ingest_logs", "items_processed")
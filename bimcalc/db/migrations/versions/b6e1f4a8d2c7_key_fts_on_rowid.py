@@ -0,0 +1,97 @@
+"""key_fts_on_rowid
+
+Revision ID: b6e1f4a8d2c7
+Revises: f3b7d2a9c1e4
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e1f4a8d2c7"
+down_revision: Union[str, None] = "f3b7d2a9c1e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns matched by the items / prices list search
+SEARCH_COLUMNS = {
+    "items": ("family", "type_name", "category"),
+    "price_items": ("description", "sku", "item_code"),
+}
+
+
+def _drop(fts: str) -> None:
+    for suffix in ("ai", "ad", "au"):
+        op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+    op.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+def upgrade() -> None:
+    if op.get_bind().engine.name != "sqlite":
+        return
+
+    # External-content FTS5 tables keyed on the base table's rowid: the
+    # update/delete triggers no longer scan the index for an UNINDEXED id
+    for table, columns in SEARCH_COLUMNS.items():
+        fts = f"{table}_fts"
+        names = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+        delete_old = (
+            f"INSERT INTO {fts}({fts}, rowid, {names}) "
+            f"VALUES ('delete', old.rowid, {old_values});"
+        )
+        insert_new = (
+            f"INSERT INTO {fts}(rowid, {names}) VALUES (new.rowid, {new_values});"
+        )
+
+        _drop(fts)
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, "
+            f"content='{table}', content_rowid='rowid', tokenize='trigram')"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} "
+            f"BEGIN {delete_old} {insert_new} END"
+        )
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().engine.name != "sqlite":
+        return
+
+    for table, columns in SEARCH_COLUMNS.items():
+        fts = f"{table}_fts"
+        names = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        assignments = ", ".join(f"{column} = new.{column}" for column in columns)
+
+        _drop(fts)
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} "
+            f"USING fts5(id UNINDEXED, {names}, tokenize='trigram')"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(id, {names}) VALUES (new.id, {new_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"DELETE FROM {fts} WHERE id = old.id; END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} "
+            f"ON {table} BEGIN UPDATE {fts} SET {assignments} "
+            f"WHERE id = old.id; END"
+        )
+        op.execute(f"INSERT INTO {fts}(id, {names}) SELECT id, {names} FROM {table}")
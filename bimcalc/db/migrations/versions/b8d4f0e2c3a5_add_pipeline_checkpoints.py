@@ -0,0 +1,40 @@
+"""add_pipeline_checkpoints
+
+Revision ID: b8d4f0e2c3a5
+Revises: a7c3e9d1b2f4
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d4f0e2c3a5"
+down_revision: Union[str, None] = "a7c3e9d1b2f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pipeline_checkpoints",
+        sa.Column("source_name", sa.Text(), nullable=False),
+        sa.Column("run_timestamp", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("position", sa.BigInteger(), nullable=False),
+        sa.Column("records_committed", sa.Integer(), nullable=False),
+        sa.Column("batch_hash", sa.Text(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("source_name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("pipeline_checkpoints")
@@ -0,0 +1,47 @@
+"""add_source_fingerprints
+
+Revision ID: c9e5a1f3d4b6
+Revises: b8d4f0e2c3a5
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c9e5a1f3d4b6"
+down_revision: Union[str, None] = "b8d4f0e2c3a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "source_fingerprints",
+        sa.Column("source_name", sa.Text(), nullable=False),
+        sa.Column("file_digest", sa.Text(), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("source_name"),
+    )
+    op.create_table(
+        "source_row_hashes",
+        sa.Column("source_name", sa.Text(), nullable=False),
+        sa.Column("item_code", sa.Text(), nullable=False),
+        sa.Column("region", sa.Text(), nullable=False),
+        sa.Column("row_hash", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("source_name", "item_code", "region"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("source_row_hashes")
+    op.drop_table("source_fingerprints")
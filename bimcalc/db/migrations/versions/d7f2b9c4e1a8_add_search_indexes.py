@@ -0,0 +1,83 @@
+"""add_search_indexes
+
+Revision ID: d7f2b9c4e1a8
+Revises: a4c8e2f6b1d3
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d7f2b9c4e1a8"
+down_revision: Union[str, None] = "a4c8e2f6b1d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns matched by the items / prices list search
+SEARCH_COLUMNS = {
+    "items": ("family", "type_name", "category"),
+    "price_items": ("description", "sku", "item_code"),
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.engine.name == "postgresql":
+        # Trigram GIN indexes let ILIKE '%term%' use an index
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table, columns in SEARCH_COLUMNS.items():
+            for column in columns:
+                op.create_index(
+                    f"idx_{table}_{column}_trgm",
+                    table,
+                    [column],
+                    unique=False,
+                    postgresql_using="gin",
+                    postgresql_ops={column: "gin_trgm_ops"},
+                )
+
+    elif bind.engine.name == "sqlite":
+        # FTS5 trigram mirror tables, kept in sync by triggers
+        for table, columns in SEARCH_COLUMNS.items():
+            fts = f"{table}_fts"
+            names = ", ".join(columns)
+            new_values = ", ".join(f"new.{column}" for column in columns)
+            assignments = ", ".join(f"{column} = new.{column}" for column in columns)
+            op.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} "
+                f"USING fts5(id UNINDEXED, {names}, tokenize='trigram')"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(id, {names}) VALUES (new.id, {new_values}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"DELETE FROM {fts} WHERE id = old.id; END"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} "
+                f"ON {table} BEGIN UPDATE {fts} SET {assignments} "
+                f"WHERE id = old.id; END"
+            )
+            op.execute(
+                f"INSERT INTO {fts}(id, {names}) SELECT id, {names} FROM {table}"
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.engine.name == "postgresql":
+        for table, columns in SEARCH_COLUMNS.items():
+            for column in columns:
+                op.drop_index(f"idx_{table}_{column}_trgm", table_name=table)
+
+    elif bind.engine.name == "sqlite":
+        for table in SEARCH_COLUMNS:
+            fts = f"{table}_fts"
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {fts}")
@@ -0,0 +1,42 @@
+"""add_list_keyset_indexes
+
+Revision ID: e5a1c7d3f9b2
+Revises: d7f2b9c4e1a8
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a1c7d3f9b2"
+down_revision: Union[str, None] = "d7f2b9c4e1a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Items list: (created_at, id) descending within a project. Supersedes
+    # the (org, project, created_at) index that only create_all ever built.
+    op.execute("DROP INDEX IF EXISTS idx_items_org_project_created")
+    op.create_index(
+        "idx_items_list_keyset",
+        "items",
+        ["org_id", "project_id", "created_at", "id"],
+        unique=False,
+    )
+    # Prices list: item_code, newest version first, id
+    op.create_index(
+        "idx_price_list_keyset",
+        "price_items",
+        ["org_id", "item_code", sa.text("valid_from DESC"), "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_price_list_keyset", table_name="price_items")
+    op.drop_index("idx_items_list_keyset", table_name="items")
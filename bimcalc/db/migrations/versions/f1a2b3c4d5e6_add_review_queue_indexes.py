@@ -0,0 +1,39 @@
+"""add_review_queue_indexes
+
+Revision ID: f1a2b3c4d5e6
+Revises: 77c8bf6e2811
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f1a2b3c4d5e6"
+down_revision: Union[str, None] = "77c8bf6e2811"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination of the review queue on (timestamp, id)
+    op.create_index(
+        "idx_match_results_decision_ts",
+        "match_results",
+        ["decision", "timestamp", "id"],
+        unique=False,
+    )
+    # NOT EXISTS (newer result for same item) probe
+    op.create_index(
+        "idx_match_results_item_ts",
+        "match_results",
+        ["item_id", "timestamp"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_match_results_item_ts", table_name="match_results")
+    op.drop_index("idx_match_results_decision_ts", table_name="match_results")
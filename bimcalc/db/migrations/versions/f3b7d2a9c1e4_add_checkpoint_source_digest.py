@@ -0,0 +1,29 @@
+"""add_checkpoint_source_digest
+
+Revision ID: f3b7d2a9c1e4
+Revises: e5a1c7d3f9b2
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b7d2a9c1e4"
+down_revision: Union[str, None] = "e5a1c7d3f9b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "pipeline_checkpoints",
+        sa.Column("source_digest", sa.Text(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("pipeline_checkpoints", "source_digest")
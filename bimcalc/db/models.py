@@ -10,8 +10,10 @@ from decimal import Decimal
 from uuid import UUID, uuid4
 
 from sqlalchemy import (
+    DDL,
     JSON,
     TIMESTAMP,
+    BigInteger,
     CheckConstraint,
     DateTime,
     Float,
@@ -23,6 +25,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     Uuid,
+    event,
     text,
 )
 from pgvector.sqlalchemy import Vector
@@ -37,6 +40,23 @@ class Base(DeclarativeBase):
     pass
 
 
+# Columns matched by list-view search, per table (see bimcalc.db.search)
+SEARCH_COLUMNS: dict[str, tuple[str, ...]] = {
+    "items": ("family", "type_name", "category"),
+    "price_items": ("description", "sku", "item_code"),
+}
+
+
+def _trigram_index(table: str, column: str) -> Index:
+    """pg_trgm GIN index so ILIKE '%term%' can use an index (Postgres only)."""
+    return Index(
+        f"idx_{table}_{column}_trgm",
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
+
+
 class UserModel(Base):
     """User account for authentication and RBAC."""
 
@@ -96,6 +116,10 @@ class WebhookModel(Base):
     secret: Mapped[str] = mapped_column(Text, nullable=False)
     events: Mapped[list[str]] = mapped_column(JSON, nullable=False)  # List of event types
     is_active: Mapped[bool] = mapped_column(default=True, nullable=False)
+    # Max events per POST; 1 = one request per event (no batching)
+    batch_max_events: Mapped[int] = mapped_column(
+        Integer, default=1, server_default="1", nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -151,14 +175,15 @@ class ItemModel(Base):
     attributes: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
 
     # Vector embedding for semantic search
-    embedding: Mapped[Vector] = mapped_column(Vector(1536))
+    embedding: Mapped[Vector | None] = mapped_column(Vector(1536))
 
     __table_args__ = (
         Index("idx_items_class", "classification_code"),  # CRITICAL for blocking
         Index("idx_items_canonical", "canonical_key"),  # CRITICAL for O(1) lookup
+        # Items list keyset pagination (bimcalc.db.pagination.ITEMS_SORT)
         Index(
-            "idx_items_org_project_created", "org_id", "project_id", "created_at"
-        ),  # Items list performance
+            "idx_items_list_keyset", "org_id", "project_id", "created_at", "id"
+        ),
         Index(
             "idx_items_embedding",
             "embedding",
@@ -166,6 +191,8 @@ class ItemModel(Base):
             postgresql_with={"m": 16, "ef_construction": 64},
             postgresql_ops={"embedding": "vector_cosine_ops"},
         ),
+        # List search (bimcalc.db.search); SQLite uses the items_fts table
+        *(_trigram_index("items", column) for column in SEARCH_COLUMNS["items"]),
     )
 
 
@@ -239,7 +266,7 @@ class PriceItemModel(Base):
     attributes: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
 
     # Vector embedding for semantic search
-    embedding: Mapped[Vector] = mapped_column(Vector(1536))
+    embedding: Mapped[Vector | None] = mapped_column(Vector(1536))
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -276,6 +303,14 @@ class PriceItemModel(Base):
         ),
         # Current price lookups (most common query)
         Index("idx_price_current", "org_id", "item_code", "region", "is_current"),
+        # Prices list keyset pagination (bimcalc.db.pagination.PRICES_SORT)
+        Index(
+            "idx_price_list_keyset",
+            "org_id",
+            "item_code",
+            text("valid_from DESC"),
+            "id",
+        ),
         # Source tracking for operational monitoring
         Index("idx_price_source", "source_name", "last_updated"),
         Index(
@@ -285,6 +320,8 @@ class PriceItemModel(Base):
             postgresql_with={"m": 16, "ef_construction": 64},
             postgresql_ops={"embedding": "vector_cosine_ops"},
         ),
+        # List search (bimcalc.db.search); SQLite uses the price_items_fts table
+        *(_trigram_index("price_items", c) for c in SEARCH_COLUMNS["price_items"]),
     )
 
 
@@ -523,6 +560,10 @@ class MatchResultModel(Base):
             "decision IN ('auto-accepted', 'manual-review', 'rejected')",
             name="check_decision_valid",
         ),
+        # Review queue keyset pagination on (timestamp, id)
+        Index("idx_match_results_decision_ts", "decision", "timestamp", "id"),
+        # Latest-result-per-item lookups
+        Index("idx_match_results_item_ts", "item_id", "timestamp"),
     )
 
 
@@ -631,6 +672,76 @@ class DataSyncLogModel(Base):
     )
 
 
+class PipelineCheckpointModel(Base):
+    """Resume point for a pipeline source.
+
+    Written in the same transaction as the SCD2 batch it covers, so the
+    checkpoint never runs ahead of (or behind) committed price data.
+    Deleted when the source completes.
+    """
+
+    __tablename__ = "pipeline_checkpoints"
+
+    source_name: Mapped[str] = mapped_column(Text, primary_key=True)
+    run_timestamp: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False
+    )
+
+    # Importer-defined position (API offset, file row) to resume from
+    position: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    records_committed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # sha256 of the last committed batch (item_code, region, price, currency)
+    batch_hash: Mapped[str] = mapped_column(Text, nullable=False)
+    # Digest of the input file the position refers to (None for API sources);
+    # a checkpoint is discarded when the file has changed since
+    source_digest: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class SourceFingerprintModel(Base):
+    """Digest of the last file fully imported from a file-drop source.
+
+    A new drop with the same digest is skipped without being parsed.
+    """
+
+    __tablename__ = "source_fingerprints"
+
+    source_name: Mapped[str] = mapped_column(Text, primary_key=True)
+    # sha256 of the raw file bytes
+    file_digest: Mapped[str] = mapped_column(Text, nullable=False)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class SourceRowHashModel(Base):
+    """Content hash of the last imported row per (source, item_code, region).
+
+    Hash covers (item_code, region, unit_price, currency); rows whose hash
+    is unchanged are not sent to the SCD2 merge. Written in the same
+    transaction as the price rows it describes.
+    """
+
+    __tablename__ = "source_row_hashes"
+
+    source_name: Mapped[str] = mapped_column(Text, primary_key=True)
+    item_code: Mapped[str] = mapped_column(Text, primary_key=True)
+    region: Mapped[str] = mapped_column(Text, primary_key=True)
+    row_hash: Mapped[str] = mapped_column(Text, nullable=False)
+
+
 class DocumentModel(Base):
     """RAG knowledge base document with pgvector embeddings."""
 
@@ -978,6 +1089,11 @@ class IngestLogModel(Base):
     items_unchanged: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     items_deleted: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
+    # Progress of a running background import (rows parsed so far)
+    items_processed: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
     # Error tracking
     errors: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     warnings: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1104,3 +1220,58 @@ class PriceImportItemModel(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+
+
+# ============================================================================
+# Search support
+# ============================================================================
+
+
+def sqlite_fts_ddl(table: str, columns: tuple[str, ...]) -> list[str]:
+    """FTS5 index over ``table``'s search columns, kept in sync by triggers.
+
+    The trigram tokenizer gives substring (``%term%``) semantics. The FTS
+    table is external-content, keyed on the base table's rowid, so the
+    triggers touch one row by rowid instead of scanning the index and
+    column values are read from ``table`` itself. VACUUM may renumber the
+    rowids of a table without an INTEGER PRIMARY KEY; run
+    ``INSERT INTO <table>_fts(<table>_fts) VALUES('rebuild')`` after one.
+    """
+    fts = f"{table}_fts"
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.rowid, {old_values});"
+    )
+    insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.rowid, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, "
+        f"content='{table}', content_rowid='rowid', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"{insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"{delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+for _table, _columns in SEARCH_COLUMNS.items():
+    event.listen(
+        Base.metadata.tables[_table],
+        "before_create",
+        DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+    )
+    for _statement in sqlite_fts_ddl(_table, _columns):
+        event.listen(
+            Base.metadata.tables[_table],
+            "after_create",
+            DDL(_statement).execute_if(dialect="sqlite"),
+        )
+    event.listen(
+        Base.metadata.tables[_table],
+        "after_drop",
+        DDL(f"DROP TABLE IF EXISTS {_table}_fts").execute_if(dialect="sqlite"),
+    )
@@ -0,0 +1,171 @@
+"""Keyset (cursor) pagination for the list views.
+
+A page is fetched by seeking past the last row of the previous page on the
+view's sort key instead of skipping ``OFFSET`` rows, so page 500 costs the
+same index range scan as page 1. The sort key always ends with the primary
+key so every row has a unique position; all key columns must be NOT NULL.
+
+Cursors are opaque URL-safe strings holding the key values of a boundary
+row. ``after`` continues forwards from a row, ``before`` goes back from it.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, and_, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import Select
+
+from bimcalc.db.models import ItemModel, PriceItemModel
+
+
+class InvalidCursorError(ValueError):
+    """Cursor could not be decoded for this sort key."""
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """Ordered key columns, each ascending or descending."""
+
+    columns: tuple[InstrumentedAttribute, ...]
+    descending: tuple[bool, ...]
+
+    def order_by(self, reverse: bool = False) -> list[ColumnElement]:
+        return [
+            col.asc() if desc == reverse else col.desc()
+            for col, desc in zip(self.columns, self.descending, strict=True)
+        ]
+
+    def seek(self, values: list[Any], reverse: bool = False) -> ColumnElement[bool]:
+        """Rows strictly after ``values`` in this order (before, if ``reverse``)."""
+        if len(set(self.descending)) == 1:
+            # One direction: a row-value comparison the index can range-scan
+            row, bound = tuple_(*self.columns), tuple_(*values)
+            return row < bound if self.descending[0] != reverse else row > bound
+
+        terms = []
+        for i, (col, desc) in enumerate(
+            zip(self.columns, self.descending, strict=True)
+        ):
+            ties = [c == v for c, v in zip(self.columns[:i], values[:i], strict=True)]
+            past = col < values[i] if desc != reverse else col > values[i]
+            terms.append(and_(*ties, past))
+
+        # The OR alone is not sargable; bounding the leading column (implied
+        # by every term) lets the index range-scan from the cursor onwards
+        lead, lead_value = self.columns[0], values[0]
+        bound = (
+            lead <= lead_value if self.descending[0] != reverse else lead >= lead_value
+        )
+        return and_(bound, or_(*terms))
+
+    def values(self, row: Any) -> list[Any]:
+        return [getattr(row, col.key) for col in self.columns]
+
+    def encode(self, row: Any) -> str:
+        """Cursor pointing at ``row``."""
+        raw = json.dumps([_plain(v) for v in self.values(row)], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def decode(self, cursor: str) -> list[Any]:
+        """Key values held by ``cursor``.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or for another key
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            raw = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            if not isinstance(raw, list) or len(raw) != len(self.columns):
+                raise ValueError("wrong number of key values")
+            return [_revive(col, v) for col, v in zip(self.columns, raw, strict=True)]
+        except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+            raise InvalidCursorError(f"Invalid page cursor: {e}") from e
+
+
+# Newest items first
+ITEMS_SORT = SortKey((ItemModel.created_at, ItemModel.id), (True, True))
+
+# By code, newest version of each code first
+PRICES_SORT = SortKey(
+    (PriceItemModel.item_code, PriceItemModel.valid_from, PriceItemModel.id),
+    (False, True, False),
+)
+
+
+@dataclass
+class KeysetPage:
+    """One page of rows plus cursors to its neighbours (None at either end)."""
+
+    rows: list[Any] = field(default_factory=list)
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _revive(column: InstrumentedAttribute, value: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    if not isinstance(value, python_type):
+        raise ValueError(f"bad value for {column.key}")
+    return value
+
+
+async def fetch_page(
+    session: AsyncSession,
+    stmt: Select,
+    key: SortKey,
+    per_page: int,
+    after: str | None = None,
+    before: str | None = None,
+    offset: int = 0,
+) -> KeysetPage:
+    """Fetch the page of ``stmt`` after (or before) a cursor.
+
+    ``stmt`` must not be ordered yet. One extra row is read to tell whether
+    another page follows. ``offset`` is only honoured without a cursor, for
+    old page-number links.
+
+    Raises:
+        InvalidCursorError: If a cursor is malformed
+    """
+    backwards = before is not None
+    cursor = before if backwards else after
+    if cursor is not None:
+        stmt = stmt.where(key.seek(key.decode(cursor), reverse=backwards))
+    elif offset:
+        stmt = stmt.offset(offset)
+
+    stmt = stmt.order_by(*key.order_by(reverse=backwards)).limit(per_page + 1)
+    result = await session.execute(stmt)
+    rows = list(result.scalars().all())
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    page = KeysetPage(rows=rows)
+    if rows:
+        has_prev = more if backwards else cursor is not None or offset > 0
+        has_next = True if backwards else more
+        page.prev_cursor = key.encode(rows[0]) if has_prev else None
+        page.next_cursor = key.encode(rows[-1]) if has_next else None
+    return page
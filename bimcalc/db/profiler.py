@@ -0,0 +1,191 @@
+"""Opt-in SQL query profiler with N+1 detection.
+
+``profile_queries(label)`` records every statement executed in the current
+context (request, CLI command, background job) by hooking the engine's
+``before/after_cursor_execute`` events. Statements are grouped by
+fingerprint, the SQL with literals, bind parameters and ``IN`` lists
+collapsed to ``?``, so a loop issuing the same query per row shows up as a
+single fingerprint with a high count: a probable N+1 pattern.
+
+Finished profiles are logged as one structured ``query_profile`` line and
+kept in a small in-process buffer served by ``/admin/profiling``. The event
+hooks are installed on first use; outside a profile they cost one context
+variable lookup per statement.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = structlog.get_logger(__name__)
+
+# A fingerprint executed this many times in one profile is reported as N+1
+N_PLUS_ONE_THRESHOLD = 10
+
+# Finished profiles kept for /admin/profiling
+RECENT_PROFILES = 100
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<![:\w]):\w+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """Statement with values replaced by ``?`` so repeats group together."""
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _PARAM.sub("?", sql)
+    sql = _LITERAL.sub("?", sql)
+    return _IN_LIST.sub("(?, ...)", sql)
+
+
+@dataclass
+class QueryStats:
+    """Executions of one fingerprint."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def record(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+
+@dataclass
+class QueryProfile:
+    """Statements executed inside one ``profile_queries`` block."""
+
+    label: str
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    duration_ms: float = 0.0
+    queries: dict[str, QueryStats] = field(default_factory=dict)
+
+    def record(self, statement: str, seconds: float) -> None:
+        key = fingerprint(statement)
+        stats = self.queries.get(key)
+        if stats is None:
+            stats = self.queries[key] = QueryStats()
+        stats.record(seconds * 1000)
+
+    @property
+    def total_queries(self) -> int:
+        return sum(stats.count for stats in self.queries.values())
+
+    @property
+    def query_ms(self) -> float:
+        return sum(stats.total_ms for stats in self.queries.values())
+
+    def hot_queries(self, top: int = 10) -> list[tuple[str, QueryStats]]:
+        """Fingerprints that took the most total time."""
+        ranked = sorted(self.queries.items(), key=lambda kv: -kv[1].total_ms)
+        return ranked[:top]
+
+    def suspected_n_plus_one(
+        self, threshold: int = N_PLUS_ONE_THRESHOLD
+    ) -> list[tuple[str, QueryStats]]:
+        """Fingerprints repeated at least ``threshold`` times, most first."""
+        repeated = [kv for kv in self.queries.items() if kv[1].count >= threshold]
+        return sorted(repeated, key=lambda kv: -kv[1].count)
+
+    def summary(self, top: int = 10) -> dict[str, Any]:
+        """JSON-friendly digest for logs and the admin endpoint."""
+
+        def rows(pairs: list[tuple[str, QueryStats]]) -> list[dict[str, Any]]:
+            return [
+                {
+                    "fingerprint": key,
+                    "count": stats.count,
+                    "total_ms": round(stats.total_ms, 2),
+                    "max_ms": round(stats.max_ms, 2),
+                }
+                for key, stats in pairs
+            ]
+
+        return {
+            "label": self.label,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 2),
+            "queries": self.total_queries,
+            "query_ms": round(self.query_ms, 2),
+            "distinct": len(self.queries),
+            "hot": rows(self.hot_queries(top)),
+            "n_plus_one": rows(self.suspected_n_plus_one()),
+        }
+
+
+_active: ContextVar[QueryProfile | None] = ContextVar(
+    "bimcalc_query_profile", default=None
+)
+_recent: deque[QueryProfile] = deque(maxlen=RECENT_PROFILES)
+_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    if _active.get() is not None and context is not None:
+        context._bimcalc_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    profile = _active.get()
+    start = getattr(context, "_bimcalc_query_start", None)
+    if profile is not None and start is not None:
+        profile.record(statement, time.perf_counter() - start)
+
+
+def install_profiler() -> None:
+    """Hook cursor execution on every engine (idempotent)."""
+    global _installed
+    if not _installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _installed = True
+
+
+@contextmanager
+def profile_queries(label: str, log: bool = True) -> Iterator[QueryProfile]:
+    """Record the queries executed in this context until the block exits.
+
+    The profile is kept for ``/admin/profiling`` and, with ``log``, written
+    as a ``query_profile`` log line (a warning when N+1 patterns were seen).
+    """
+    install_profiler()
+    profile = QueryProfile(label=label)
+    token = _active.set(profile)
+    start = time.perf_counter()
+    try:
+        yield profile
+    finally:
+        _active.reset(token)
+        profile.duration_ms = (time.perf_counter() - start) * 1000
+        _recent.append(profile)
+        if log and profile.queries:
+            summary = profile.summary(top=5)
+            if summary["n_plus_one"]:
+                logger.warning("query_profile", **summary)
+            else:
+                logger.info("query_profile", **summary)
+
+
+def recent_profiles() -> list[QueryProfile]:
+    """Finished profiles, newest first."""
+    return list(reversed(_recent))
+
+
+def clear_profiles() -> None:
+    _recent.clear()
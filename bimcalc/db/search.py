@@ -0,0 +1,200 @@
+"""Ranked text search for the items and prices list views.
+
+One search predicate is shared by the list pages, their Excel exports and
+the project CSV export. It is compiled per backend:
+
+- PostgreSQL: ``ILIKE '%term%'`` across the search columns, served by the
+  ``pg_trgm`` GIN indexes and ranked by trigram word similarity
+- SQLite: ``MATCH`` against the FTS5 trigram mirror table (see
+  ``bimcalc.db.models.sqlite_fts_ddl``), ranked by bm25
+- Anything else, or terms shorter than one trigram: plain ``LIKE``
+
+Counting a large result set asks the Postgres planner for an estimate
+instead of scanning the matches a second time.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import func, literal_column, or_, select, text
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select, column, table
+
+from bimcalc.db.models import SEARCH_COLUMNS, ItemModel, PriceItemModel
+
+# Above this many planner-estimated rows, report the estimate instead of COUNT(*)
+ESTIMATE_THRESHOLD = 10_000
+
+# The FTS5 trigram tokenizer cannot match terms shorter than this
+MIN_FTS_TERM = 3
+
+LIKE_ESCAPE = "\\"
+
+
+@dataclass(frozen=True)
+class SearchTarget:
+    """A searchable table and the columns the search term is matched against."""
+
+    model: type
+    columns: tuple[str, ...]
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+    @property
+    def fts_table(self) -> str:
+        return f"{self.table}_fts"
+
+
+ITEMS = SearchTarget(ItemModel, SEARCH_COLUMNS["items"])
+PRICES = SearchTarget(PriceItemModel, SEARCH_COLUMNS["price_items"])
+
+
+@dataclass(frozen=True)
+class ResultCount:
+    """Number of rows a filtered query returns."""
+
+    total: int
+    estimated: bool = False
+
+
+def dialect_name(session: AsyncSession) -> str:
+    """Database backend behind a session ("postgresql", "sqlite", ...)."""
+    name = getattr(getattr(session.bind, "dialect", None), "name", None)
+    return name if isinstance(name, str) else "default"
+
+
+def _backend(dialect: str, term: str) -> str:
+    if dialect == "postgresql":
+        return "trigram"
+    if dialect == "sqlite" and len(term) >= MIN_FTS_TERM:
+        return "fts5"
+    return "like"
+
+
+def _like_pattern(term: str) -> str:
+    for char in (LIKE_ESCAPE, "%", "_"):
+        term = term.replace(char, LIKE_ESCAPE + char)
+    return f"%{term}%"
+
+
+def _fts_phrase(term: str) -> str:
+    """Quote a term as one FTS5 phrase (a substring under the trigram tokenizer)."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def apply_search(
+    stmt: Select,
+    target: SearchTarget,
+    term: str | None,
+    dialect: str,
+    ranked: bool = True,
+) -> Select:
+    """Restrict ``stmt`` to rows matching ``term`` in any search column.
+
+    With ``ranked`` the best matches are ordered first; any ``order_by``
+    added afterwards breaks ties. A blank term returns ``stmt`` unchanged.
+    """
+    term = (term or "").strip()
+    if not term:
+        return stmt
+
+    backend = _backend(dialect, term)
+    if backend == "fts5":
+        fts = table(target.fts_table, column("rowid"), column("rank"))
+        matches = (
+            select(fts.c.rowid.label("fts_rowid"), fts.c.rank)
+            .where(literal_column(target.fts_table).op("MATCH")(_fts_phrase(term)))
+            .subquery()
+        )
+        # The FTS table is keyed on the base table's rowid
+        rowid = literal_column(f"{target.table}.rowid")
+        stmt = stmt.join(matches, matches.c.fts_rowid == rowid)
+        return stmt.order_by(matches.c.rank) if ranked else stmt
+
+    attrs = [getattr(target.model, name) for name in target.columns]
+    pattern = _like_pattern(term)
+    stmt = stmt.where(or_(*(attr.ilike(pattern, escape=LIKE_ESCAPE) for attr in attrs)))
+    if ranked and backend == "trigram":
+        similarity = func.greatest(
+            *(func.word_similarity(term, attr) for attr in attrs)
+        )
+        stmt = stmt.order_by(similarity.desc())
+    return stmt
+
+
+def search_sql(
+    target: SearchTarget, term: str | None, dialect: str, alias: str
+) -> tuple[str, dict[str, Any]]:
+    """The same search predicate as SQL text, for hand-written queries.
+
+    Returns:
+        Tuple of (condition to AND into the WHERE clause, bind parameters);
+        an empty condition when there is no term
+    """
+    term = (term or "").strip()
+    if not term:
+        return "", {}
+
+    if _backend(dialect, term) == "fts5":
+        fts = target.fts_table
+        return (
+            f"{alias}.rowid IN "
+            f"(SELECT rowid FROM {fts} WHERE {fts} MATCH :search_phrase)",
+            {"search_phrase": _fts_phrase(term)},
+        )
+
+    like = "ILIKE" if dialect == "postgresql" else "LIKE"
+    condition = " OR ".join(
+        f"{alias}.{name} {like} :search_pattern ESCAPE '{LIKE_ESCAPE}'"
+        for name in target.columns
+    )
+    return f"({condition})", {"search_pattern": _like_pattern(term)}
+
+
+async def count_results(
+    session: AsyncSession, stmt: Select, dialect: str, estimate: bool = True
+) -> ResultCount:
+    """Count the rows ``stmt`` returns, estimating when there are many.
+
+    On Postgres the planner's row estimate is used once it exceeds
+    ``ESTIMATE_THRESHOLD``; smaller results, and other backends, get an
+    exact ``COUNT(*)``.
+    """
+    stmt = stmt.order_by(None).limit(None).offset(None)
+    if estimate and dialect == "postgresql":
+        rows = await _planner_rows(session, stmt)
+        if rows is not None and rows > ESTIMATE_THRESHOLD:
+            return ResultCount(total=rows, estimated=True)
+
+    result = await session.execute(select(func.count()).select_from(stmt.subquery()))
+    return ResultCount(total=result.scalar_one())
+
+
+async def _planner_rows(session: AsyncSession, stmt: Select) -> int | None:
+    """Row estimate from ``EXPLAIN`` (no execution), or None if unavailable."""
+    try:
+        sql = str(
+            stmt.compile(
+                dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}
+            )
+        )
+    except CompileError:
+        return None
+
+    # Literal values may contain colons, which text() would read as binds
+    result = await session.execute(
+        text("EXPLAIN (FORMAT JSON) " + sql.replace(":", "\\:"))
+    )
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (LookupError, TypeError, ValueError):
+        return None
@@ -0,0 +1,156 @@
+"""Background schedule and price book import jobs.
+
+A job parses a spooled upload and records its outcome on the job's
+``ingest_logs`` row. By default the web worker that accepted the upload
+runs it as a FastAPI background task. With ``BIMCALC_INGEST_ON_WORKER=true``
+the job is enqueued on the arq worker instead, so parsing never holds a
+DataFrame in web-worker memory; ``BIMCALC_SPOOL_DIR`` must then point at
+storage shared by the web and arq workers.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from bimcalc.core.queue import get_queue
+from bimcalc.db.connection import get_session
+from bimcalc.ingestion.pricebooks import ingest_pricebook
+from bimcalc.ingestion.schedules import ingest_schedule, reingest_schedule
+from bimcalc.ingestion.uploads import (
+    SpooledUpload,
+    finish_ingest_job,
+    ingest_progress,
+)
+from bimcalc.intelligence.notifications import get_email_notifier, get_slack_notifier
+
+logger = logging.getLogger(__name__)
+
+
+def ingest_on_worker() -> bool:
+    """Whether uploads are parsed on the arq worker (``BIMCALC_INGEST_ON_WORKER``)."""
+    return os.environ.get("BIMCALC_INGEST_ON_WORKER", "false").lower() == "true"
+
+
+async def enqueue_ingest_job(function: str, **kwargs: Any) -> bool:
+    """Enqueue an import on the arq worker.
+
+    Returns:
+        False when worker ingestion is disabled or the queue is unreachable;
+        the caller then runs the job in-process.
+    """
+    if not ingest_on_worker():
+        return False
+    try:
+        redis = await get_queue()
+        try:
+            await redis.enqueue_job(function, **kwargs)
+        finally:
+            await redis.close()
+    except Exception as e:
+        logger.warning(f"Could not enqueue {function}, importing in-process: {e}")
+        return False
+    return True
+
+
+async def run_schedule_job(
+    job_id: UUID,
+    upload: SpooledUpload,
+    org: str,
+    project: str,
+    reingest: bool = False,
+) -> None:
+    """Import (or with ``reingest`` diff) a spooled schedule."""
+    started = datetime.utcnow()
+    progress = ingest_progress(job_id)
+    try:
+        async with get_session() as session:
+            if reingest:
+                diff = await reingest_schedule(
+                    session,
+                    upload.path,
+                    org,
+                    project,
+                    progress=progress,
+                    source_name=upload.filename,
+                )
+            else:
+                success_count, errors = await ingest_schedule(
+                    session,
+                    upload.path,
+                    org,
+                    project,
+                    progress=progress,
+                    source_name=upload.filename,
+                )
+    except Exception as e:
+        await finish_ingest_job(job_id, "failed", errors=[str(e)], started=started)
+        await _send_failure_alerts(upload.filename, str(e), org)
+    else:
+        if reingest:
+            await finish_ingest_job(
+                job_id,
+                "completed",
+                diff.added,
+                diff.errors,
+                started=started,
+                modified=diff.modified,
+                unchanged=diff.unchanged,
+                deleted=diff.deleted,
+            )
+        else:
+            await finish_ingest_job(
+                job_id, "completed", success_count, errors, started=started
+            )
+    finally:
+        upload.path.unlink(missing_ok=True)
+
+
+async def run_pricebook_job(
+    job_id: UUID, upload: SpooledUpload, vendor: str, use_cmm: bool
+) -> None:
+    """Import a spooled price book."""
+    started = datetime.utcnow()
+    try:
+        async with get_session() as session:
+            success_count, errors = await ingest_pricebook(
+                session,
+                upload.path,
+                vendor,
+                use_cmm=use_cmm,
+                digest=upload.sha256,
+                progress=ingest_progress(job_id),
+            )
+    except (ValueError, FileNotFoundError) as e:
+        # Invalid file: reported on the job, no alert
+        await finish_ingest_job(job_id, "failed", errors=[str(e)], started=started)
+    except Exception as e:
+        await finish_ingest_job(job_id, "failed", errors=[str(e)], started=started)
+        await _send_failure_alerts(upload.filename, str(e), f"Vendor: {vendor}")
+    else:
+        await finish_ingest_job(
+            job_id, "completed", success_count, errors, started=started
+        )
+    finally:
+        upload.path.unlink(missing_ok=True)
+
+
+async def _send_failure_alerts(filename: str, error_msg: str, org_id: str) -> None:
+    """Email and Slack alerts for a failed import (never raises)."""
+    email_notifier = get_email_notifier()
+    slack_notifier = get_slack_notifier()
+    try:
+        await email_notifier.send_ingestion_failure_alert(
+            recipients=["admin@bimcalc.com"],  # TODO: Configure recipients
+            filename=filename,
+            error_message=error_msg,
+            org_id=org_id,
+        )
+        await slack_notifier.post_ingestion_failure_alert(
+            filename=filename, error_message=error_msg, org_id=org_id
+        )
+    except Exception as alert_err:
+        print(f"Failed to send alerts: {alert_err}")
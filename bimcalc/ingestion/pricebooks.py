@@ -8,18 +8,28 @@ codes and descriptors into BIMCalc canonical classification codes.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
 
 import pandas as pd
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bimcalc.classification.translator import VendorTranslator
 from bimcalc.db.models import PriceItemModel
+from bimcalc.ingestion.uploads import PROGRESS_EVERY, ProgressCallback
+from bimcalc.pipeline.fingerprints import SourceFingerprints, file_digest, row_hash
+from bimcalc.reporting.price_history import stage_price_version
+from bimcalc.utils.cache_tags import prices_tag, publish_invalidation
 
 logger = logging.getLogger(__name__)
 
+# Item codes per UPDATE ... IN (...) when touching unchanged prices
+_TOUCH_BATCH = 1000
+
 
 async def ingest_pricebook(
     session: AsyncSession,
@@ -29,6 +39,8 @@ async def ingest_pricebook(
     region: str = "IE",
     use_cmm: bool = True,
     config_dir: Path = Path("config/vendors"),
+    digest: str | None = None,
+    progress: ProgressCallback | None = None,
 ) -> tuple[int, list[str]]:
     """Ingest vendor price book from CSV or XLSX file.
 
@@ -43,6 +55,11 @@ async def ingest_pricebook(
     - Width / Height / DN / Angle (optional, numeric attributes)
     - Material (optional)
 
+    Skip-unchanged:
+    - A file byte-identical to the vendor's last import is not parsed
+    - Rows whose (SKU, region, price, currency) hash is unchanged are skipped;
+      changed rows expire the vendor's current price before inserting
+
     CMM Support (Classification Mapping Module):
     - If use_cmm=True, attempts to load vendor mapping file
     - Translates vendor-specific codes/descriptors to canonical codes
@@ -57,6 +74,10 @@ async def ingest_pricebook(
         region: Region code (e.g., 'IE', 'UK', 'EU') for price localization
         use_cmm: Enable Classification Mapping Module translation
         config_dir: Directory containing vendor mapping YAML files
+        digest: sha256 of the file if already known (e.g. hashed while
+            streaming the upload); computed from the file otherwise
+        progress: Optional ``(rows_processed, rows_total)`` coroutine, awaited
+            every ``PROGRESS_EVERY`` rows and once at the end
 
     Returns:
         Tuple of (success_count, error_messages)
@@ -76,11 +97,31 @@ async def ingest_pricebook(
             f"File too large ({file_size_mb:.1f}MB). Maximum allowed: {MAX_FILE_SIZE_MB}MB"
         )
 
-    # Read file
+    fingerprints = await SourceFingerprints.load(
+        session, _fingerprint_source(org_id, vendor_id, region)
+    )
+    if digest is None:
+        digest = await asyncio.to_thread(file_digest, file_path)
+    if fingerprints.file_unchanged(digest):
+        stored_codes = [
+            code for code, key_region in fingerprints.hashes if key_region == region
+        ]
+        if await _touch_current_prices(
+            session, org_id, vendor_id, region, stored_codes
+        ):
+            await session.commit()
+            return 0, [
+                f"ℹ️  File unchanged since last import: "
+                f"{fingerprints.row_count} rows skipped by hash"
+            ]
+        # Prices were deleted since the last import: import in full
+        await fingerprints.discard(session)
+
+    # Read file off the event loop
     if file_path.suffix.lower() == ".csv":
-        df = pd.read_csv(file_path)
+        df = await asyncio.to_thread(pd.read_csv, file_path)
     elif file_path.suffix.lower() in (".xlsx", ".xls"):
-        df = pd.read_excel(file_path)
+        df = await asyncio.to_thread(pd.read_excel, file_path)
     else:
         raise ValueError(f"Unsupported file format: {file_path.suffix}")
 
@@ -119,8 +160,12 @@ async def ingest_pricebook(
     errors = []
     cmm_mapped_count = 0
     cmm_unmapped_count = 0
+    unchanged_codes: list[str] = []
+    now = datetime.utcnow()
 
-    for idx, row in df.iterrows():
+    for position, (idx, row) in enumerate(df.iterrows()):
+        if progress and position and position % PROGRESS_EVERY == 0:
+            await progress(position, len(df))
         try:
             # Apply CMM translation if enabled
             row_dict = row.to_dict()
@@ -188,6 +233,10 @@ async def ingest_pricebook(
 
             # Optional fields
             currency = str(row_dict.get("Currency", "EUR")).strip().upper()
+            content_hash = row_hash(sku, region, unit_price, currency)
+            if fingerprints.unchanged(sku, region, content_hash):
+                unchanged_codes.append(sku)
+                continue
             vat_rate = None
             if "VAT Rate" in row_dict and pd.notna(row_dict["VAT Rate"]):
                 vat_rate = Decimal(str(row_dict["VAT Rate"]))
@@ -240,17 +289,49 @@ async def ingest_pricebook(
                 source_name=f"{vendor_id}_{file_path.stem}",  # Traceable source
                 source_currency=currency,
                 vendor_note=vendor_note,
+                valid_from=now,
             )
 
+            if (sku, region) in fingerprints.hashes:
+                # Changed price: close the version from the previous import
+                await session.execute(
+                    update(PriceItemModel)
+                    .where(
+                        PriceItemModel.org_id == org_id,
+                        PriceItemModel.item_code == sku,
+                        PriceItemModel.region == region,
+                        PriceItemModel.is_current.is_(True),
+                    )
+                    .values(is_current=False, valid_to=now)
+                    .execution_options(synchronize_session=False)
+                )
             session.add(price_model)
+            stage_price_version(
+                session, org_id, sku, region, now, unit_price, vendor_id
+            )
+            fingerprints.stage(sku, region, content_hash)
             success_count += 1
 
         except Exception as e:
             errors.append(f"Row {idx}: {str(e)}")
             continue
 
-    # Commit all items
+    # Commit all items together with their fingerprints. A file with failed
+    # rows keeps no digest so that it is parsed again once fixed.
+    skipped_count = len(unchanged_codes)
+    if unchanged_codes:
+        await _touch_current_prices(session, org_id, vendor_id, region, unchanged_codes)
+    if errors:
+        await fingerprints.forget_file(session)
+    else:
+        await fingerprints.save_file(session, digest, len(df))
+    publish_invalidation(session, prices_tag(org_id))
     await session.commit()
+    if progress:
+        await progress(len(df), len(df))
+
+    if skipped_count:
+        errors.append(f"ℹ️  {skipped_count} unchanged rows skipped by hash")
 
     # Add CMM statistics to errors (informational)
     if translator and translator.loader:
@@ -266,6 +347,46 @@ async def ingest_pricebook(
     return success_count, errors
 
 
+def _fingerprint_source(org_id: str, vendor_id: str, region: str) -> str:
+    """Fingerprint key: one price book per vendor and region, whatever the file name."""
+    return f"pricebook:{org_id}:{vendor_id}:{region}"
+
+
+async def _touch_current_prices(
+    session: AsyncSession,
+    org_id: str,
+    vendor_id: str,
+    region: str,
+    item_codes: list[str],
+) -> int:
+    """Mark current prices of rows skipped by hash as confirmed by this import.
+
+    Only ``item_codes`` (rows with a stored hash matching this file) are
+    touched, so prices dropped from the book or left by a failed row do not
+    look freshly confirmed.
+
+    Returns:
+        Number of current price rows touched
+    """
+    now = datetime.utcnow()
+    touched = 0
+    for start in range(0, len(item_codes), _TOUCH_BATCH):
+        result = await session.execute(
+            update(PriceItemModel)
+            .where(
+                PriceItemModel.org_id == org_id,
+                PriceItemModel.vendor_id == vendor_id,
+                PriceItemModel.region == region,
+                PriceItemModel.item_code.in_(item_codes[start : start + _TOUCH_BATCH]),
+                PriceItemModel.is_current.is_(True),
+            )
+            .values(last_updated=now)
+            .execution_options(synchronize_session=False)
+        )
+        touched += result.rowcount
+    return touched
+
+
 def _get_str(row: pd.Series, col_name: str | list[str]) -> str | None:
     """Get string value from row."""
     if isinstance(col_name, str):
@@ -6,16 +6,19 @@ Handles file upload and ingestion for schedules and price books.
 Routes:
 - GET  /ingest/history     - Ingest history dashboard
 - GET  /ingest             - File upload page
-- POST /ingest/schedules   - Upload and ingest Revit schedules (CSV/XLSX)
-- POST /ingest/prices      - Upload and ingest price books (CSV/XLSX)
+- POST /ingest/schedules   - Upload Revit schedules (CSV/XLSX), import in background
+- POST /ingest/prices      - Upload price books (CSV/XLSX), import in background
+- GET  /api/ingest/jobs/{job_id} - Background import status and progress
 """
 
 from __future__ import annotations
 
 from pathlib import Path
+from uuid import UUID
 
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Depends,
     File,
     Form,
@@ -27,9 +30,18 @@ from fastapi import (
 from fastapi.responses import HTMLResponse, JSONResponse
 
 from bimcalc.db.connection import get_session
-from bimcalc.ingestion.pricebooks import ingest_pricebook
-from bimcalc.ingestion.schedules import ingest_schedule
-from bimcalc.intelligence.notifications import get_email_notifier, get_slack_notifier
+from bimcalc.ingestion.jobs import (
+    enqueue_ingest_job,
+    run_pricebook_job,
+    run_schedule_job,
+)
+from bimcalc.ingestion.uploads import (
+    SpooledUpload,
+    UploadTooLargeError,
+    fail_stale_ingest_jobs,
+    spool_upload,
+    start_ingest_job,
+)
 from bimcalc.web.dependencies import get_org_project, get_templates
 
 # Create router with ingestion tag
@@ -95,78 +107,59 @@ async def ingest_page(
 # ============================================================================
 
 
-@router.post("/ingest/schedules")
+@router.post("/ingest/schedules", status_code=202)
 async def ingest_schedules(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     org: str = Form(...),
     project: str = Form(...),
+    reingest: bool = Form(default=False),
 ):
-    """Upload and ingest Revit schedules (CSV/XLSX).
+    """Upload a Revit schedule (CSV/XLSX) and import it in the background.
+
+    The upload is streamed to a spool file and hashed; parsing runs as a
+    background job tracked on an ingest log row. Poll ``status_url`` for
+    progress. Sends alerts on failure via email and Slack.
 
-    Processes uploaded schedule file and imports items into database.
-    Sends alerts on failure via email and Slack.
+    With ``reingest`` the schedule is diffed against the project's items
+    instead: changed items are updated and their field changes recorded as
+    item revisions.
 
     Extracted from: app_enhanced.py:863
     """
-    # Save uploaded file temporarily
-    temp_path = Path(f"/tmp/{file.filename}")
-    with open(temp_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-
-    # Ingest
-    try:
-        async with get_session() as session:
-            success_count, errors = await ingest_schedule(
-                session, temp_path, org, project
-            )
-
-        # Clean up
-        temp_path.unlink()
-
-        return {
-            "success": True,
-            "message": f"Imported {success_count} items",
-            "errors": errors[:5] if errors else [],  # Show first 5 errors
-        }
-    except Exception as e:
-        if temp_path.exists():
-            temp_path.unlink()
-
-        # Send alerts
-        error_msg = str(e)
-        email_notifier = get_email_notifier()
-        slack_notifier = get_slack_notifier()
-
-        # Background tasks for alerts to not block response too long (or use BackgroundTasks)
-        # For now, await them as they are async and shouldn't take too long
-        try:
-            await email_notifier.send_ingestion_failure_alert(
-                recipients=["admin@bimcalc.com"],  # TODO: Configure recipients
-                filename=file.filename,
-                error_message=error_msg,
-                org_id=org,
-            )
-            await slack_notifier.post_ingestion_failure_alert(
-                filename=file.filename, error_message=error_msg, org_id=org
-            )
-        except Exception as alert_err:
-            print(f"Failed to send alerts: {alert_err}")
-
-        raise HTTPException(status_code=500, detail=error_msg)
+    upload = await _spool(file)
+    if isinstance(upload, JSONResponse):
+        return upload
+
+    job_id = await start_ingest_job(org, project, upload)
+    queued = await enqueue_ingest_job(
+        "ingest_schedule_job",
+        job_id=job_id,
+        upload=upload,
+        org=org,
+        project=project,
+        reingest=reingest,
+    )
+    if not queued:
+        background_tasks.add_task(
+            run_schedule_job, job_id, upload, org, project, reingest
+        )
+    return _accepted(job_id, upload)
 
 
-@router.post("/ingest/prices")
+@router.post("/ingest/prices", status_code=202)
 async def ingest_prices(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     vendor: str = Form(default="default"),
     use_cmm: bool = Form(default=True),
 ):
-    """Upload and ingest price books (CSV/XLSX) with optional CMM translation.
+    """Upload a price book (CSV/XLSX) and import it in the background.
 
-    Processes uploaded pricebook file and imports price items into database.
     Supports CMM (Classification Mapping Memory) for automatic classification.
-    Sends alerts on failure via email and Slack.
+    The digest computed while streaming feeds the price book's skip-unchanged
+    check, so an identical file is never re-read. Sends alerts on failure via
+    email and Slack.
 
     Args:
         file: Uploaded CSV/XLSX file
@@ -175,59 +168,105 @@ async def ingest_prices(
 
     Extracted from: app_enhanced.py:918
     """
-    # Save uploaded file temporarily
-    temp_path = Path(f"/tmp/{file.filename}")
-    with open(temp_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
+    upload = await _spool(file)
+    if isinstance(upload, JSONResponse):
+        return upload
+
+    job_id = await start_ingest_job(PRICEBOOK_ORG, f"vendor:{vendor}", upload)
+    queued = await enqueue_ingest_job(
+        "ingest_pricebook_job",
+        job_id=job_id,
+        upload=upload,
+        vendor=vendor,
+        use_cmm=use_cmm,
+    )
+    if not queued:
+        background_tasks.add_task(run_pricebook_job, job_id, upload, vendor, use_cmm)
+    return _accepted(job_id, upload)
 
-    # Ingest
-    try:
-        async with get_session() as session:
-            success_count, errors = await ingest_pricebook(
-                session, temp_path, vendor, use_cmm=use_cmm
-            )
-    except (ValueError, FileNotFoundError) as e:
-        if temp_path.exists():
-            temp_path.unlink()
+
+@router.get("/api/ingest/jobs/{job_id}")
+async def get_ingest_job(job_id: UUID):
+    """Status and progress of a background schedule or price book import."""
+    from bimcalc.db.models import IngestLogModel
+
+    await fail_stale_ingest_jobs(IngestLogModel.id == job_id)
+    async with get_session() as session:
+        log = await session.get(IngestLogModel, job_id)
+    if log is None:
+        raise HTTPException(status_code=404, detail="Ingest job not found")
+
+    messages = (log.error_details or {}).get("messages", [])
+    if log.status == "completed" and (log.items_modified or log.items_unchanged):
+        message = (
+            f"Added {log.items_added}, modified {log.items_modified}, "
+            f"deleted {log.items_deleted}, unchanged {log.items_unchanged} items"
+        )
+    elif log.status == "completed":
+        message = f"Imported {log.items_added} items"
+    elif log.status == "failed":
+        message = messages[0] if messages else "Import failed"
+    else:
+        message = f"Processed {log.items_processed} of {log.items_total or '?'} rows"
+
+    return {
+        "job_id": str(log.id),
+        "status": log.status,
+        "success": log.status == "completed",
+        "message": message,
+        "filename": log.filename,
+        "file_hash": log.file_hash,
+        "progress": {
+            "processed": log.items_processed,
+            "total": log.items_total,
+            "percent": round(100 * log.items_processed / log.items_total, 1)
+            if log.items_total
+            else 0.0,
+        },
+        "imported": log.items_added,
+        "modified": log.items_modified,
+        "deleted": log.items_deleted,
+        "errors": messages[:5],  # Show first 5 errors
+        "processing_time_ms": log.processing_time_ms,
+    }
+
+
+# ============================================================================
+# Background ingest jobs
+# ============================================================================
+
+# Price books are not project-scoped; their jobs are logged under this org
+PRICEBOOK_ORG = "default"
+
+SUPPORTED_SUFFIXES = (".csv", ".xlsx", ".xls")
+
+
+async def _spool(file: UploadFile) -> SpooledUpload | JSONResponse:
+    """Stream the upload to disk, or a 4xx response if it is unacceptable."""
+    if Path(file.filename or "").suffix.lower() not in SUPPORTED_SUFFIXES:
         return JSONResponse(
             status_code=400,
-            content={"success": False, "message": str(e)},
+            content={
+                "success": False,
+                "message": f"Unsupported file format: {file.filename}. Use CSV or XLSX.",
+            },
+        )
+    try:
+        return await spool_upload(file)
+    except UploadTooLargeError as e:
+        return JSONResponse(
+            status_code=413, content={"success": False, "message": str(e)}
         )
-    except Exception as e:
-        if temp_path.exists():
-            temp_path.unlink()
-
-        # Send alerts
-        error_msg = str(e)
-        email_notifier = get_email_notifier()
-        slack_notifier = get_slack_notifier()
-
-        try:
-            await email_notifier.send_ingestion_failure_alert(
-                recipients=["admin@bimcalc.com"],
-                filename=file.filename,
-                error_message=error_msg,
-                org_id=f"Vendor: {vendor}",
-            )
-            await slack_notifier.post_ingestion_failure_alert(
-                filename=file.filename,
-                error_message=error_msg,
-                org_id=f"Vendor: {vendor}",
-            )
-        except Exception as alert_err:
-            print(f"Failed to send alerts: {alert_err}")
-
-        raise HTTPException(status_code=500, detail=error_msg)
 
-    # Clean up
-    temp_path.unlink()
 
-    cmm_status = "with CMM enabled" if use_cmm else "without CMM"
+def _accepted(job_id: UUID, upload: SpooledUpload) -> dict:
     return {
         "success": True,
-        "message": f"Imported {success_count} price items ({cmm_status})",
-        "errors": errors[:5] if errors else [],
+        "job_id": str(job_id),
+        "status": "running",
+        "message": f"Uploaded {upload.filename}; importing in the background",
+        "file_hash": upload.sha256,
+        "status_url": f"/api/ingest/jobs/{job_id}",
     }
 
 
@@ -251,6 +290,9 @@ async def get_ingest_history(
     from bimcalc.db.models import IngestLogModel
     from sqlalchemy import select
 
+    await fail_stale_ingest_jobs(
+        IngestLogModel.org_id == org, IngestLogModel.project_id == project
+    )
     async with get_session() as session:
         query = (
             select(IngestLogModel)
@@ -1,16 +1,27 @@
 """Revit schedule ingestion for BIMCalc.
 
-Parses CSV/XLSX schedule exports and creates Item records.
+Parses CSV/XLSX schedule exports and creates Item records, or diffs a new
+export against the project's items and records field-level revisions.
 """
 
 from __future__ import annotations
 
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
 from pathlib import Path
+from uuid import UUID, uuid4
 
+import numpy as np
 import pandas as pd
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bimcalc.db.models import ItemModel
+from bimcalc.core.vector_index import index_embedding
+from bimcalc.db.models import ItemModel, ItemRevisionModel
+from bimcalc.ingestion.uploads import PROGRESS_EVERY, ProgressCallback
+from bimcalc.utils.cache_tags import item_tag, project_tag, publish_invalidation
 
 
 async def ingest_schedule(
@@ -18,9 +29,14 @@ async def ingest_schedule(
     file_path: Path,
     org_id: str,
     project_id: str,
+    progress: ProgressCallback | None = None,
+    source_name: str | None = None,
 ) -> tuple[int, list[str]]:
     """Ingest Revit schedule from CSV or XLSX file.
 
+    Rows whose (family, type_name) already exist in the project are skipped;
+    use ``reingest_schedule`` to apply a model update to existing items.
+
     Expected columns:
     - Family (required)
     - Type (required)
@@ -36,6 +52,9 @@ async def ingest_schedule(
         file_path: Path to CSV or XLSX file
         org_id: Organization identifier
         project_id: Project identifier
+        progress: Optional ``(rows_processed, rows_total)`` coroutine, awaited
+            every ``PROGRESS_EVERY`` rows and once at the end
+        source_name: File name recorded on items (defaults to ``file_path``)
 
     Returns:
         Tuple of (success_count, error_messages)
@@ -44,42 +63,15 @@ async def ingest_schedule(
         FileNotFoundError: If file doesn't exist
         ValueError: If file format is invalid
     """
-    if not file_path.exists():
-        raise FileNotFoundError(f"Schedule file not found: {file_path}")
-
-    # Check file size limit (50MB max)
-    MAX_FILE_SIZE_MB = 50
-    file_size_mb = file_path.stat().st_size / (1024 * 1024)
-    if file_size_mb > MAX_FILE_SIZE_MB:
-        raise ValueError(
-            f"File too large ({file_size_mb:.1f}MB). Maximum allowed: {MAX_FILE_SIZE_MB}MB"
-        )
-
-    # Read file (CSV or XLSX)
-    if file_path.suffix.lower() == ".csv":
-        df = pd.read_csv(file_path)
-    elif file_path.suffix.lower() in (".xlsx", ".xls"):
-        df = pd.read_excel(file_path)
-    else:
-        raise ValueError(
-            f"Unsupported file format: {file_path.suffix}. Use CSV or XLSX."
-        )
-
-    # Check row count limit
-    MAX_ROWS = 50000
-    if len(df) > MAX_ROWS:
-        raise ValueError(f"Too many rows ({len(df):,}). Maximum allowed: {MAX_ROWS:,}")
-
-    # Validate required columns
-    required_cols = {"Family", "Type"}
-    missing = required_cols - set(df.columns)
-    if missing:
-        raise ValueError(f"Missing required columns: {missing}")
+    df = await _read_schedule(file_path)
+    source_file = source_name or str(file_path)
 
     success_count = 0
     errors = []
 
-    for idx, row in df.iterrows():
+    for position, (idx, row) in enumerate(df.iterrows()):
+        if progress and position and position % PROGRESS_EVERY == 0:
+            await progress(position, len(df))
         try:
             # Required fields
             family = str(row.get("Family", "")).strip()
@@ -120,12 +112,10 @@ async def ingest_schedule(
                 dn_mm=dn_mm,
                 angle_deg=angle_deg,
                 material=material,
-                source_file=str(file_path),
+                source_file=source_file,
             )
 
             # Check for duplicate before inserting
-            from sqlalchemy import select
-
             existing_item = await session.execute(
                 select(ItemModel).where(
                     ItemModel.org_id == org_id,
@@ -150,11 +140,424 @@ async def ingest_schedule(
             continue
 
     # Commit all items
+    publish_invalidation(session, project_tag(org_id, project_id))
     await session.commit()
+    if progress:
+        await progress(len(df), len(df))
 
     return success_count, errors
 
 
+# ============================================================================
+# Re-ingest: diff a schedule against the project's current items
+# ============================================================================
+
+# Item fields compared between imports, in revision order
+DIFF_FIELDS = (
+    "family",
+    "type_name",
+    "category",
+    "system_type",
+    "element_id",
+    "quantity",
+    "unit",
+    "width_mm",
+    "height_mm",
+    "dn_mm",
+    "angle_deg",
+    "material",
+)
+NUMERIC_FIELDS = frozenset({"quantity", "width_mm", "height_mm", "dn_mm", "angle_deg"})
+
+# Changing one of these invalidates the item's classification
+CLASSIFYING_FIELDS = frozenset({"family", "type_name", "category", "system_type"})
+
+# Item fields the stored embedding text is built from (with the
+# classification code, which a classifying change clears)
+EMBEDDED_FIELDS = CLASSIFYING_FIELDS | {"material"}
+
+# Schedule column names accepted for each item field (first match wins)
+SCHEDULE_COLUMNS: dict[str, list[str]] = {
+    "family": ["Family"],
+    "type_name": ["Type"],
+    "category": ["Category"],
+    "system_type": ["System Type"],
+    "element_id": ["Element Id", "ElementId", "Id", "Element ID"],
+    "quantity": ["Count", "Quantity"],
+    "unit": ["Unit"],
+    "width_mm": ["Width", "Width (mm)", "W"],
+    "height_mm": ["Height", "Height (mm)", "H"],
+    "dn_mm": ["DN", "Diameter", "D"],
+    "angle_deg": ["Angle", "Angle (deg)", "Degrees"],
+    "material": ["Material"],
+}
+
+# Relative tolerance for numeric fields (spreadsheet round-trips)
+NUMERIC_RTOL = 1e-9
+
+
+@dataclass
+class ScheduleDiff:
+    """Outcome of re-ingesting a schedule."""
+
+    added: int = 0
+    modified: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    revisions: int = 0
+    changed_item_ids: list[UUID] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+
+async def reingest_schedule(
+    session: AsyncSession,
+    file_path: Path,
+    org_id: str,
+    project_id: str,
+    progress: ProgressCallback | None = None,
+    source_name: str | None = None,
+) -> ScheduleDiff:
+    """Apply an updated Revit schedule to a project's existing items.
+
+    Rows are matched to items by ``element_id``, falling back to
+    (family, type_name) when either side has no element id. Matched items
+    are compared column-wise; changed items are updated in bulk and get one
+    ``item_revisions`` row per changed field, new rows are inserted with an
+    ``added`` revision, and items previously imported from the same source
+    file that are missing from it get a ``deleted`` revision (the item rows
+    themselves are kept so their history stays queryable).
+
+    Updated items lose their canonical key, and their classification if a
+    classifying field changed, so only added or modified items are picked up
+    again by matching. Their embedding is cleared (and dropped from the
+    vector index) when a field it was built from changed, and each updated
+    item's ``item_tag`` is invalidated on commit.
+
+    Args:
+        session: Database session
+        file_path: Path to CSV or XLSX file
+        org_id: Organization identifier
+        project_id: Project identifier
+        progress: Optional ``(rows_processed, rows_total)`` coroutine
+        source_name: File name recorded on items and revisions (defaults to
+            ``file_path``); also scopes deletion detection
+
+    Returns:
+        ScheduleDiff with per-outcome counts and the ids of changed items
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file format is invalid
+    """
+    df = await _read_schedule(file_path)
+    source_file = source_name or str(file_path)
+    if progress:
+        await progress(0, len(df))
+
+    diff = ScheduleDiff()
+    new, diff.errors = _schedule_frame(df)
+    old = await _current_items(session, org_id, project_id)
+    pairs = _pair_rows(new, old)
+
+    # Column-wise comparison of every matched pair
+    before = old.loc[pairs["id"], list(DIFF_FIELDS)].reset_index(drop=True)
+    after = new.loc[pairs["row"], list(DIFF_FIELDS)].reset_index(drop=True)
+    changed = pd.DataFrame(
+        {name: _differs(before[name], after[name], name) for name in DIFF_FIELDS},
+        index=before.index,
+    )
+    modified = changed.any(axis=1)
+    diff.modified = int(modified.sum())
+    diff.unchanged = len(pairs) - diff.modified
+
+    now = datetime.utcnow()
+    revision_base = {
+        "org_id": org_id,
+        "project_id": project_id,
+        "ingest_timestamp": now,
+        "source_filename": source_file,
+    }
+    revisions: list[dict] = []
+    # Bulk UPDATE groups by the set of columns cleared: (reclassify, reembed)
+    updates: dict[tuple[bool, bool], list[dict]] = {}
+    stale_embeddings: list[UUID] = []
+
+    for pos in np.flatnonzero(modified.to_numpy()):
+        item_id = pairs["id"].iat[pos]
+        fields = [name for name in DIFF_FIELDS if changed.at[pos, name]]
+        values = {name: _db_value(after.at[pos, name], name) for name in DIFF_FIELDS}
+        reclassify = not CLASSIFYING_FIELDS.isdisjoint(fields)
+        reembed = not EMBEDDED_FIELDS.isdisjoint(fields)
+        updates.setdefault((reclassify, reembed), []).append(
+            {"id": item_id, **values, "source_file": source_file, "canonical_key": None}
+            | ({"classification_code": None} if reclassify else {})
+            | ({"embedding": None} if reembed else {})
+        )
+        if reembed:
+            stale_embeddings.append(item_id)
+        revisions.extend(
+            {
+                **revision_base,
+                "item_id": item_id,
+                "field_name": name,
+                "old_value": _revision_value(before.at[pos, name], name),
+                "new_value": _revision_value(after.at[pos, name], name),
+                "change_type": "modified",
+            }
+            for name in fields
+        )
+        diff.changed_item_ids.append(item_id)
+
+    for rows in updates.values():
+        await session.execute(update(ItemModel), rows)
+
+    # Rows with no current item
+    added = new.drop(index=pairs["row"])
+    inserts = []
+    for row in added.itertuples(index=False):
+        item_id = uuid4()
+        inserts.append(
+            {
+                "id": item_id,
+                "org_id": org_id,
+                "project_id": project_id,
+                **{name: _db_value(getattr(row, name), name) for name in DIFF_FIELDS},
+                "source_file": source_file,
+            }
+        )
+        revisions.append(
+            {
+                **revision_base,
+                "item_id": item_id,
+                "field_name": "item",
+                "old_value": None,
+                "new_value": f"{row.family} / {row.type_name}",
+                "change_type": "added",
+            }
+        )
+        diff.changed_item_ids.append(item_id)
+    if inserts:
+        await session.execute(insert(ItemModel), inserts)
+    diff.added = len(inserts)
+
+    # Items from this source file that the new export no longer contains
+    gone = old.drop(index=pairs["id"])
+    gone = gone[gone["source_file"] == source_file]
+    revisions.extend(
+        {
+            **revision_base,
+            "item_id": item_id,
+            "field_name": "item",
+            "old_value": f"{row.family} / {row.type_name}",
+            "new_value": None,
+            "change_type": "deleted",
+        }
+        for item_id, row in zip(gone.index, gone.itertuples(index=False), strict=True)
+    )
+    diff.deleted = len(gone)
+
+    if revisions:
+        await session.execute(insert(ItemRevisionModel), revisions)
+    diff.revisions = len(revisions)
+
+    publish_invalidation(
+        session,
+        project_tag(org_id, project_id),
+        *(item_tag(row["id"]) for rows in updates.values() for row in rows),
+    )
+    await session.commit()
+    for item_id in stale_embeddings:
+        index_embedding(session, "items", item_id, None)
+    if progress:
+        await progress(len(df), len(df))
+
+    return diff
+
+
+def _schedule_frame(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
+    """Normalise schedule columns to item fields, dropping invalid rows.
+
+    Returns:
+        Tuple of (frame indexed like ``df`` with one column per item field and
+        None for missing values, error messages)
+    """
+    frame = pd.DataFrame(index=df.index)
+    for name, aliases in SCHEDULE_COLUMNS.items():
+        present = [column for column in aliases if column in df.columns]
+        if not present:
+            frame[name] = None
+            continue
+        if name in NUMERIC_FIELDS:
+            values = df[present].apply(pd.to_numeric, errors="coerce")
+        else:
+            values = df[present].apply(_text_column)
+        frame[name] = values.bfill(axis=1).iloc[:, 0]
+    frame = frame.astype(object).where(frame.notna(), None)
+
+    errors = [
+        f"Row {idx}: Missing family or type"
+        for idx in frame.index[frame["family"].isna() | frame["type_name"].isna()]
+    ]
+    frame = frame.dropna(subset=["family", "type_name"])
+
+    duplicated = _row_keys(frame).duplicated()
+    errors.extend(
+        f"Row {idx}: Duplicate item (Family='{row.family}', "
+        f"Type='{row.type_name}', Element Id='{row.element_id}') - skipped"
+        for idx, row in zip(
+            frame.index[duplicated], frame[duplicated].itertuples(), strict=True
+        )
+    )
+    return frame[~duplicated], errors
+
+
+def _text_column(column: pd.Series) -> pd.Series:
+    """Stripped strings with blanks as missing; whole floats lose their ``.0``."""
+    if pd.api.types.is_float_dtype(column):
+        whole = column.dropna()
+        if (whole == whole.round()).all():
+            column = column.astype("Int64")
+    text = column.astype("string").str.strip()
+    return text.mask(text == "")
+
+
+def _row_keys(frame: pd.DataFrame) -> pd.Series:
+    """Identity of each row: element id, else family and type."""
+    by_type = (
+        "type:" + frame["family"].astype(str) + "\x1f" + frame["type_name"].astype(str)
+    )
+    return ("id:" + frame["element_id"].astype(str)).where(
+        frame["element_id"].notna(), by_type
+    )
+
+
+async def _current_items(
+    session: AsyncSession, org_id: str, project_id: str
+) -> pd.DataFrame:
+    """Project items as a frame indexed by item id (first per row key)."""
+    result = await session.execute(
+        select(
+            ItemModel.id,
+            ItemModel.source_file,
+            *(getattr(ItemModel, name) for name in DIFF_FIELDS),
+        )
+        .where(ItemModel.org_id == org_id, ItemModel.project_id == project_id)
+        .order_by(ItemModel.created_at, ItemModel.id)
+    )
+    old = pd.DataFrame(
+        result.all(), columns=["id", "source_file", *DIFF_FIELDS], dtype=object
+    ).set_index("id")
+    for name in NUMERIC_FIELDS:
+        old[name] = pd.to_numeric(old[name], errors="coerce")
+    old = old.astype(object).where(old.notna(), None)
+    return old[~_row_keys(old).duplicated()]
+
+
+def _pair_rows(new: pd.DataFrame, old: pd.DataFrame) -> pd.DataFrame:
+    """Match schedule rows to current items.
+
+    Element ids are matched first. Remaining rows then match on
+    (family, type_name) provided at least one side has no element id; two
+    different element ids are two different elements even if they share a
+    type.
+
+    Returns:
+        Frame with ``row`` (schedule index) and ``id`` (item id) columns
+    """
+    new_rows = new.rename_axis("row").reset_index()
+    old_rows = old.rename_axis("id").reset_index()
+
+    by_id = new_rows.dropna(subset=["element_id"]).merge(
+        old_rows.dropna(subset=["element_id"]), on="element_id"
+    )[["row", "id"]]
+
+    new_rest = new_rows[~new_rows["row"].isin(by_id["row"])]
+    old_rest = old_rows[~old_rows["id"].isin(by_id["id"])]
+    by_type = new_rest.merge(
+        old_rest, on=["family", "type_name"], suffixes=("_new", "_old")
+    )
+    by_type = by_type[
+        by_type["element_id_new"].isna() | by_type["element_id_old"].isna()
+    ]
+    by_type = by_type.drop_duplicates("row").drop_duplicates("id")[["row", "id"]]
+
+    return pd.concat([by_id, by_type], ignore_index=True)
+
+
+def _differs(before: pd.Series, after: pd.Series, name: str) -> pd.Series:
+    """Element-wise inequality where two missing values are equal."""
+    before_missing, after_missing = before.isna(), after.isna()
+    both = ~before_missing & ~after_missing
+    if name in NUMERIC_FIELDS:
+        unequal = pd.Series(
+            ~np.isclose(
+                before.where(both, 0).astype(float),
+                after.where(both, 0).astype(float),
+                rtol=NUMERIC_RTOL,
+                atol=0,
+            ),
+            index=before.index,
+        )
+    else:
+        unequal = before.astype(str) != after.astype(str)
+    return (before_missing != after_missing) | (both & unequal)
+
+
+def _db_value(value, name: str):
+    if value is None:
+        return None
+    if name == "quantity":
+        return Decimal(str(value))
+    if name in NUMERIC_FIELDS:
+        return float(value)
+    return str(value)
+
+
+def _revision_value(value, name: str) -> str | None:
+    if value is None:
+        return None
+    if name in NUMERIC_FIELDS:
+        return f"{float(value):g}"
+    return str(value)
+
+
+async def _read_schedule(file_path: Path) -> pd.DataFrame:
+    """Read and validate a schedule export (CSV or XLSX)."""
+    if not file_path.exists():
+        raise FileNotFoundError(f"Schedule file not found: {file_path}")
+
+    # Check file size limit (50MB max)
+    MAX_FILE_SIZE_MB = 50
+    file_size_mb = file_path.stat().st_size / (1024 * 1024)
+    if file_size_mb > MAX_FILE_SIZE_MB:
+        raise ValueError(
+            f"File too large ({file_size_mb:.1f}MB). Maximum allowed: {MAX_FILE_SIZE_MB}MB"
+        )
+
+    # Read file (CSV or XLSX) off the event loop
+    if file_path.suffix.lower() == ".csv":
+        df = await asyncio.to_thread(pd.read_csv, file_path)
+    elif file_path.suffix.lower() in (".xlsx", ".xls"):
+        df = await asyncio.to_thread(pd.read_excel, file_path)
+    else:
+        raise ValueError(
+            f"Unsupported file format: {file_path.suffix}. Use CSV or XLSX."
+        )
+
+    # Check row count limit
+    MAX_ROWS = 50000
+    if len(df) > MAX_ROWS:
+        raise ValueError(f"Too many rows ({len(df):,}). Maximum allowed: {MAX_ROWS:,}")
+
+    # Validate required columns
+    required_cols = {"Family", "Type"}
+    missing = required_cols - set(df.columns)
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+    return df
+
+
 def _get_str(row: pd.Series, col_name: str | list[str]) -> str | None:
     """Get string value from row, trying multiple column names."""
     if isinstance(col_name, str):
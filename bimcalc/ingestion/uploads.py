@@ -0,0 +1,229 @@
+"""Streaming upload spooling and background ingest job tracking.
+
+Uploads are copied to a uniquely named spool file in fixed-size chunks and
+hashed on the way, so a large schedule or price book never sits in a web
+worker's memory and concurrent uploads of the same file name never
+collide. Parsing then runs as a background job whose state and progress
+live on an ``ingest_logs`` row, polled via ``GET /api/ingest/jobs/{id}``.
+A job whose worker died never finishes its row; polling fails it once it
+has been running for ``STALE_JOB_AFTER``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+import aiofiles
+from sqlalchemy import update
+
+from bimcalc.db.connection import get_session
+from bimcalc.db.models import IngestLogModel
+
+if TYPE_CHECKING:
+    from fastapi import UploadFile
+
+# Bytes read from the request and written to disk per step
+CHUNK_SIZE = 1024 * 1024
+
+# Same limit the schedule and price book ingesters enforce after parsing
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+
+# Rows between progress writes to the ingest log
+PROGRESS_EVERY = 500
+
+# Error messages kept on the ingest log
+MAX_ERROR_DETAILS = 50
+
+# A job still running after this long lost its worker (restart, crash or
+# the arq job timeout) and is reported failed when polled
+STALE_JOB_AFTER = timedelta(hours=1)
+
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+class UploadTooLargeError(ValueError):
+    """Upload exceeded ``MAX_UPLOAD_BYTES`` while streaming."""
+
+
+@dataclass(frozen=True)
+class SpooledUpload:
+    """An upload copied to local disk."""
+
+    path: Path
+    filename: str
+    size: int
+    sha256: str
+
+
+def spool_dir() -> Path:
+    """Directory for spooled uploads (``BIMCALC_SPOOL_DIR`` or the temp dir)."""
+    return Path(os.getenv("BIMCALC_SPOOL_DIR") or tempfile.gettempdir())
+
+
+async def stream_to_file(
+    file: UploadFile, path: Path, max_bytes: int | None = None
+) -> tuple[int, str]:
+    """Copy an upload to ``path`` chunk by chunk.
+
+    Returns:
+        Tuple of (size in bytes, sha256 hex digest)
+
+    Raises:
+        UploadTooLargeError: If the upload exceeds ``max_bytes``
+    """
+    digest = hashlib.sha256()
+    size = 0
+    async with aiofiles.open(path, "wb") as out:
+        while chunk := await file.read(CHUNK_SIZE):
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise UploadTooLargeError(
+                    f"File too large. Maximum allowed: {max_bytes // (1024 * 1024)}MB"
+                )
+            digest.update(chunk)
+            await out.write(chunk)
+    return size, digest.hexdigest()
+
+
+async def spool_upload(
+    file: UploadFile,
+    directory: Path | None = None,
+    max_bytes: int | None = None,
+) -> SpooledUpload:
+    """Stream an upload to a uniquely named spool file.
+
+    The client's file name is only used for its extension (which picks the
+    parser) and for display; it never becomes part of the path. ``max_bytes``
+    defaults to ``MAX_UPLOAD_BYTES``.
+    """
+    filename = Path(file.filename or "upload").name
+    directory = directory or spool_dir()
+    if max_bytes is None:
+        max_bytes = MAX_UPLOAD_BYTES
+    directory.mkdir(parents=True, exist_ok=True)
+
+    fd, name = tempfile.mkstemp(
+        prefix="bimcalc-upload-", suffix=Path(filename).suffix.lower(), dir=directory
+    )
+    os.close(fd)
+    path = Path(name)
+    try:
+        size, sha256 = await stream_to_file(file, path, max_bytes)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return SpooledUpload(path=path, filename=filename, size=size, sha256=sha256)
+
+
+# ============================================================================
+# Background job tracking (ingest_logs)
+# ============================================================================
+
+
+async def start_ingest_job(
+    org_id: str, project_id: str, upload: SpooledUpload, created_by: str = "web"
+) -> UUID:
+    """Record a running ingest job and return its id."""
+    async with get_session() as session:
+        log = IngestLogModel(
+            org_id=org_id,
+            project_id=project_id,
+            filename=upload.filename,
+            file_hash=upload.sha256,
+            status="running",
+            created_by=created_by,
+        )
+        session.add(log)
+        await session.commit()
+        return log.id
+
+
+def ingest_progress(job_id: UUID) -> ProgressCallback:
+    """Progress callback that records rows parsed on the job's log row."""
+
+    async def report(processed: int, total: int) -> None:
+        async with get_session() as session:
+            await session.execute(
+                update(IngestLogModel)
+                .where(IngestLogModel.id == job_id)
+                .values(items_processed=processed, items_total=total)
+            )
+            await session.commit()
+
+    return report
+
+
+async def finish_ingest_job(
+    job_id: UUID,
+    status: str,
+    imported: int = 0,
+    errors: list[str] | None = None,
+    started: datetime | None = None,
+    modified: int = 0,
+    unchanged: int = 0,
+    deleted: int = 0,
+) -> None:
+    """Mark a job completed or failed with its final statistics.
+
+    ``modified``, ``unchanged`` and ``deleted`` are only reported by schedule
+    re-ingests; plain imports only add items.
+    """
+    errors = errors or []
+    now = datetime.utcnow()
+    values = {
+        "status": status,
+        "items_added": imported,
+        "items_modified": modified,
+        "items_unchanged": unchanged,
+        "items_deleted": deleted,
+        "errors": len(errors),
+        "error_details": {"messages": errors[:MAX_ERROR_DETAILS]},
+        "completed_at": now,
+    }
+    if started is not None:
+        values["processing_time_ms"] = int((now - started).total_seconds() * 1000)
+
+    async with get_session() as session:
+        await session.execute(
+            update(IngestLogModel).where(IngestLogModel.id == job_id).values(**values)
+        )
+        await session.commit()
+
+
+async def fail_stale_ingest_jobs(*criteria: Any) -> int:
+    """Fail running jobs matching ``criteria`` started before ``STALE_JOB_AFTER``.
+
+    Returns:
+        Number of jobs marked failed
+    """
+    now = datetime.utcnow()
+    minutes = int(STALE_JOB_AFTER.total_seconds() // 60)
+    async with get_session() as session:
+        result = await session.execute(
+            update(IngestLogModel)
+            .where(
+                IngestLogModel.status == "running",
+                IngestLogModel.started_at < now - STALE_JOB_AFTER,
+                *criteria,
+            )
+            .values(
+                status="failed",
+                errors=1,
+                error_details={
+                    "messages": [
+                        f"Import interrupted: still running after {minutes} minutes"
+                    ]
+                },
+                completed_at=now,
+            )
+        )
+        await session.commit()
+    return result.rowcount
@@ -14,6 +14,7 @@ import pandas as pd
 
 from bimcalc.db import get_session
 from bimcalc.db.models import PriceImportRunModel, PriceItemModel
+from bimcalc.utils.cache_tags import prices_tag, publish_invalidation
 
 logger = logging.getLogger(__name__)
 
@@ -166,6 +167,7 @@ class CSVPriceImporter:
             import_run.items_rejected = items_rejected
             import_run.rejection_breakdown = rejection_reasons
 
+            publish_invalidation(session, prices_tag(self.org_id))
             await session.commit()
 
         result = {
@@ -1,125 +1,211 @@
 """Bulk operations for batch processing Intelligence features."""
 
+import asyncio
+import copy
 import zipfile
+from collections import defaultdict
 from io import BytesIO
 from uuid import UUID
 import logging
 
+from sqlalchemy import select
+
+from bimcalc.intelligence.checklist_generator import (
+    DEFAULT_LLM_CONCURRENCY,
+    QAChecklistGenerator,
+)
 from bimcalc.intelligence.exports import ChecklistPDFExporter
-from bimcalc.db.models import ItemModel, QAChecklistModel
+from bimcalc.intelligence.recommendations import get_document_recommendations
+from bimcalc.db.models import DocumentModel, ItemModel, QAChecklistModel
 
 logger = logging.getLogger(__name__)
 
+# IDs per IN (...) query when prefetching items, checklists and documents
+_ID_BATCH = 1000
+
 
 async def batch_generate_checklists(
-    session, item_ids: list[str], progress_callback=None
+    session,
+    item_ids: list[str],
+    progress_callback=None,
+    generator=None,
+    max_concurrency: int = DEFAULT_LLM_CONCURRENCY,
 ) -> dict:
     """Generate checklists for multiple items in batch.
 
+    Items, existing checklists and recommended documents are loaded with
+    grouped queries. Items whose prompt context is identical (same item
+    details and documents) share one LLM call; distinct contexts are sent
+    concurrently, at most ``max_concurrency`` at a time, and responses are
+    cached by context hash. New checklists are inserted in one flush.
+
     Args:
         session: Database session
         item_ids: List of item IDs to process
         progress_callback: Optional function to report progress
+        generator: QAChecklistGenerator to use (e.g. with a stub LLM client)
+        max_concurrency: LLM calls in flight when ``generator`` is not given
 
     Returns:
         Dict with results and stats
     """
-    from bimcalc.intelligence.checklist_generator import QAChecklistGenerator
-    from bimcalc.intelligence.recommendations import get_document_recommendations
-    from sqlalchemy import select
+    if generator is None:
+        generator = QAChecklistGenerator(max_concurrency=max_concurrency)
 
-    generator = QAChecklistGenerator()
+    total = len(item_ids)
     results = {
-        "total": len(item_ids),
+        "total": total,
         "successful": 0,
         "failed": 0,
         "skipped": 0,
+        "unique_contexts": 0,
         "checklists": [],
     }
+    done = 0
 
-    for idx, item_id in enumerate(item_ids):
-        try:
-            # Report progress
-            if progress_callback:
-                progress_callback(idx + 1, len(item_ids))
+    def report(count: int) -> None:
+        nonlocal done
+        done += count
+        if progress_callback:
+            progress_callback(done, total)
 
-            # Check if checklist already exists
-            existing_query = select(QAChecklistModel).where(
-                QAChecklistModel.item_id == UUID(item_id)
-            )
-            existing_result = await session.execute(existing_query)
-            if existing_result.scalar_one_or_none():
-                results["skipped"] += 1
-                logger.info(f"Skipped {item_id} - checklist already exists")
-                continue
-
-            # Get item
-            item = await session.get(ItemModel, UUID(item_id))
-            if not item:
-                results["failed"] += 1
-                logger.warning(f"Item {item_id} not found")
-                continue
-
-            # Get recommendations
+    # 1. Items and existing checklists, one query per chunk of IDs
+    uuids: dict[UUID, str] = {}
+    for item_id in item_ids:
+        try:
+            uuids[UUID(item_id)] = item_id
+        except ValueError:
+            results["failed"] += 1
+            logger.warning(f"Invalid item ID {item_id!r}")
+
+    items: dict[UUID, ItemModel] = {}
+    existing: set[UUID] = set()
+    for chunk in _chunks(list(uuids), _ID_BATCH):
+        rows = await session.execute(select(ItemModel).where(ItemModel.id.in_(chunk)))
+        items.update((item.id, item) for item in rows.scalars())
+        rows = await session.execute(
+            select(QAChecklistModel.item_id).where(QAChecklistModel.item_id.in_(chunk))
+        )
+        existing.update(rows.scalars())
+
+    pending: list[ItemModel] = []
+    for item_uuid, item_id in uuids.items():
+        if item_uuid in existing:
+            results["skipped"] += 1
+            logger.info(f"Skipped {item_id} - checklist already exists")
+        elif item_uuid not in items:
+            results["failed"] += 1
+            logger.warning(f"Item {item_id} not found")
+        else:
+            pending.append(items[item_uuid])
+    report(total - len(pending))
+
+    # 2. Recommendations once per distinct item description: the embedding
+    # (and so the vector search) depends only on these fields
+    by_description: dict[tuple, list[ItemModel]] = defaultdict(list)
+    for item in pending:
+        key = (item.org_id, item.family, item.type_name, item.classification_code)
+        by_description[key].append(item)
+
+    recommended: dict[UUID, list[UUID]] = {}
+    for group in by_description.values():
+        try:
             recommendations = await get_document_recommendations(
-                session, item_id, limit=5, min_score=0.6
+                session, group[0], limit=5, min_score=0.6
             )
+        except Exception as e:
+            logger.error(f"Error recommending documents for {group[0].id}: {e}")
+            recommendations = []
+        doc_ids = [UUID(rec["id"]) for rec in recommendations]
+        for item in group:
+            recommended[item.id] = doc_ids
+
+    docs: dict[UUID, DocumentModel] = {}
+    all_doc_ids = list({doc_id for ids in recommended.values() for doc_id in ids})
+    for chunk in _chunks(all_doc_ids, _ID_BATCH):
+        rows = await session.execute(
+            select(DocumentModel).where(DocumentModel.id.in_(chunk))
+        )
+        docs.update((doc.id, doc) for doc in rows.scalars())
+
+    # 3. Group items by the exact prompt context they would send
+    contexts: dict[str, tuple[str, list[DocumentModel], list[ItemModel]]] = {}
+    no_docs = 0
+    for item in pending:
+        quality_docs = [docs[i] for i in recommended[item.id] if i in docs]
+        if not quality_docs:
+            no_docs += 1
+            logger.warning(f"No documents found for {item.id}")
+            continue
+        context = generator.build_context(item, quality_docs)
+        key = generator.context_hash(context)
+        contexts.setdefault(key, (context, quality_docs, []))[2].append(item)
+    results["failed"] += no_docs
+    results["unique_contexts"] = len(contexts)
+    report(no_docs)
+
+    # 4. One LLM call per distinct context, bounded by the generator
+    async def generate(context: str, group: list[ItemModel]) -> list[dict]:
+        try:
+            return await generator.generate_items(context)
+        except Exception as e:
+            logger.error(f"Error generating checklist for {len(group)} item(s): {e}")
+            return []
+        finally:
+            report(len(group))
 
-            if not recommendations:
-                results["failed"] += 1
-                logger.warning(f"No documents found for {item_id}")
-                continue
-
-            # Get document objects
-            from bimcalc.db.models import DocumentModel
-
-            doc_ids = [rec["document_id"] for rec in recommendations]
-            docs_query = select(DocumentModel).where(DocumentModel.id.in_(doc_ids))
-            docs_result = await session.execute(docs_query)
-            quality_docs = list(docs_result.scalars())
-
-            # Generate checklist
-            checklist_data = await generator.generate_checklist(item, quality_docs)
+    generated = await asyncio.gather(
+        *(generate(context, group) for context, _, group in contexts.values())
+    )
 
-            if not checklist_data.get("items"):
+    # 5. Bulk insert
+    checklists = []
+    for (_, quality_docs, group), checklist_items in zip(
+        contexts.values(), generated, strict=True
+    ):
+        for item in group:
+            if not checklist_items:
                 results["failed"] += 1
-                logger.warning(f"Failed to generate checklist for {item_id}")
+                logger.warning(f"Failed to generate checklist for {item.id}")
                 continue
-
-            # Save to database
-            checklist = QAChecklistModel(
-                item_id=UUID(item_id),
-                org_id=item.org_id,
-                project_id=item.project_id,
-                checklist_items={"items": checklist_data["items"]},
-                source_documents={"docs": checklist_data["source_docs"]},
-                auto_generated=True,
-                completion_percent=0.0,
-                created_by="batch_system",
+            checklists.append(
+                QAChecklistModel(
+                    item_id=item.id,
+                    org_id=item.org_id,
+                    project_id=item.project_id,
+                    # Copied per item: checklists are completed independently
+                    checklist_items={"items": copy.deepcopy(checklist_items)},
+                    source_documents={"docs": generator.source_docs(quality_docs)},
+                    auto_generated=True,
+                    completion_percent=0.0,
+                    created_by="batch_system",
+                )
             )
 
-            session.add(checklist)
-            await session.flush()
-
-            results["successful"] += 1
-            results["checklists"].append(
-                {
-                    "item_id": item_id,
-                    "checklist_id": str(checklist.id),
-                    "items_count": len(checklist_data["items"]),
-                }
-            )
+    session.add_all(checklists)
+    await session.flush()
+    await session.commit()
 
-            logger.info(f"Generated checklist for {item_id}")
+    results["successful"] = len(checklists)
+    results["checklists"] = [
+        {
+            "item_id": str(checklist.item_id),
+            "checklist_id": str(checklist.id),
+            "items_count": len(checklist.checklist_items["items"]),
+        }
+        for checklist in checklists
+    ]
+    logger.info(
+        f"Generated {len(checklists)} checklists from "
+        f"{len(contexts)} unique contexts ({total} items requested)"
+    )
 
-        except Exception as e:
-            results["failed"] += 1
-            logger.error(f"Error generating checklist for {item_id}: {e}")
+    return results
 
-    # Commit all changes
-    await session.commit()
 
-    return results
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
 
 
 async def bulk_assess_risks(session, org_id: str, project_id: str) -> dict:
@@ -134,7 +220,6 @@ async def bulk_assess_risks(session, org_id: str, project_id: str) -> dict:
         Dict with risk assessment results
     """
     from bimcalc.intelligence.risk_scoring import get_risk_score_cached
-    from sqlalchemy import select
 
     # Get all items
     query = select(ItemModel).where(
@@ -198,8 +283,6 @@ async def export_all_checklists_zip(session, org_id: str, project_id: str) -> by
     Returns:
         ZIP file as bytes
     """
-    from sqlalchemy import select
-
     # Get all checklists for project
     query = select(QAChecklistModel).where(
         QAChecklistModel.org_id == org_id, QAChecklistModel.project_id == project_id
@@ -1,21 +1,33 @@
 """Auto-generate QA testing checklists using LLMs."""
 
+import asyncio
+import hashlib
 import json
 import logging
 from typing import Any
 
-import openai
-
 from bimcalc.db.models import DocumentModel, ItemModel
+from bimcalc.utils.cache import get_cache
 
 logger = logging.getLogger(__name__)
 
-# Cache TTL for generated checklists (stored in DB, not Redis)
+# Cache TTL for LLM checklist responses, keyed by prompt context
 CHECKLIST_CACHE_TTL = 86400  # 24 hours
 
+# LLM requests in flight at once per generator
+DEFAULT_LLM_CONCURRENCY = 8
+
 
 class QAChecklistGenerator:
-    """Generate QA testing checklists using LLM analysis of quality documents."""
+    """Generate QA testing checklists using LLM analysis of quality documents.
+
+    Responses are cached by context hash, so items with identical details
+    and documents cost one LLM call, and at most ``max_concurrency`` calls
+    run at once. Pass ``client`` (anything with the OpenAI
+    ``chat.completions.create`` interface) to stub the LLM in tests.
+    """
+
+    MODEL = "gpt-4o-mini"
 
     SYSTEM_PROMPT = """You are a construction QA expert specializing in generating comprehensive testing checklists.
 
@@ -40,6 +52,20 @@ Each requirement must be:
 - Relevant to the item type
 - Based on the provided documents"""
 
+    def __init__(
+        self, client: Any | None = None, max_concurrency: int = DEFAULT_LLM_CONCURRENCY
+    ):
+        self._client = client
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            import openai
+
+            self._client = openai.AsyncOpenAI()
+        return self._client
+
     async def generate_checklist(
         self, item: ItemModel, quality_docs: list[DocumentModel]
     ) -> dict[str, Any]:
@@ -54,31 +80,47 @@ Each requirement must be:
         """
         try:
             # 1. Build context from item and documents
-            context = self._build_context(item, quality_docs)
-
-            # 2. Call LLM to generate checklist
-            checklist_data = await self._call_llm(context)
+            context = self.build_context(item, quality_docs)
 
-            # 3. Parse and validate response
-            checklist_items = self._parse_checklist(checklist_data)
+            # 2. Call LLM (or cache) and validate the response
+            checklist_items = await self.generate_items(context)
 
             return {
                 "items": checklist_items,
-                "source_docs": [
-                    {
-                        "id": str(doc.id),
-                        "title": doc.title,
-                        "type": doc.doc_type or "unknown",
-                    }
-                    for doc in quality_docs
-                ],
+                "source_docs": self.source_docs(quality_docs),
             }
         except Exception as e:
             logger.error(f"Failed to generate checklist for item {item.id}: {e}")
             # Return empty checklist on error
             return {"items": [], "source_docs": []}
 
-    def _build_context(self, item: ItemModel, docs: list[DocumentModel]) -> str:
+    async def generate_items(self, context: str) -> list[dict]:
+        """Validated checklist items for a prompt context.
+
+        Args:
+            context: Output of ``build_context``
+
+        Returns:
+            Checklist items (empty if the LLM returned nothing usable)
+
+        Raises:
+            Exception: LLM client errors are propagated
+        """
+
+        async def compute() -> list[dict] | None:
+            async with self._semaphore:
+                response = await self._call_llm(context)
+            # Empty results are not cached so the next run retries them
+            return self._parse_checklist(response) or None
+
+        items = await get_cache().get_or_compute(
+            f"qa_checklist:{self.context_hash(context)}",
+            compute,
+            ttl_seconds=CHECKLIST_CACHE_TTL,
+        )
+        return items or []
+
+    def build_context(self, item: ItemModel, docs: list[DocumentModel]) -> str:
         """Build prompt context from item and documents.
 
         Args:
@@ -110,6 +152,24 @@ QUALITY DOCUMENTS:
 
         return context
 
+    def context_hash(self, context: str) -> str:
+        """Stable digest of the LLM request built from ``context``."""
+        request = f"{self.MODEL}\n{self.SYSTEM_PROMPT}\n{context}"
+        digest = hashlib.sha1(request.encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def source_docs(docs: list[DocumentModel]) -> list[dict[str, str]]:
+        """Document references stored alongside a checklist."""
+        return [
+            {
+                "id": str(doc.id),
+                "title": doc.title,
+                "type": doc.doc_type or "unknown",
+            }
+            for doc in docs
+        ]
+
     async def _call_llm(self, context: str) -> str:
         """Call OpenAI to generate checklist.
 
@@ -119,10 +179,8 @@ QUALITY DOCUMENTS:
         Returns:
             JSON string from LLM
         """
-        client = openai.AsyncOpenAI()
-
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
+        response = await self.client.chat.completions.create(
+            model=self.MODEL,
             messages=[
                 {"role": "system", "content": self.SYSTEM_PROMPT},
                 {
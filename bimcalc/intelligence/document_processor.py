@@ -1,7 +1,7 @@
 import os
 from datetime import datetime
 from uuid import uuid4
-import aiofiles
+from pathlib import Path
 
 try:
     import pdfplumber
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import UploadFile
 
 from bimcalc.db.models_documents import ProjectDocumentModel, ExtractedItemModel
+from bimcalc.ingestion.uploads import stream_to_file
 
 UPLOAD_DIR = "uploads"
 
@@ -32,11 +33,8 @@ class DocumentProcessor:
 
         file_path = os.path.join(UPLOAD_DIR, f"{file_id}{file_ext}")
 
-        # Save file to disk
-        async with aiofiles.open(file_path, "wb") as out_file:
-            content = await file.read()
-            await out_file.write(content)
-            file_size = len(content)
+        # Stream file to disk in chunks
+        file_size, _ = await stream_to_file(file, Path(file_path))
 
         # Create DB record
         document = ProjectDocumentModel(
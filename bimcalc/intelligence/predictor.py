@@ -1,10 +1,19 @@
-from datetime import datetime, timedelta
-from statistics import linear_regression
+from datetime import datetime
 from typing import List, Optional
 
+import numpy as np
 from pydantic import BaseModel
 
 from bimcalc.db.models import PriceItemModel
+from bimcalc.reporting.price_history import (
+    SECONDS_PER_YEAR,
+    epoch_seconds,
+    fit_linear_trends,
+    to_datetimes,
+)
+
+FORECAST_MONTHS = 12
+SECONDS_PER_FORECAST_STEP = 30 * 24 * 3600
 
 
 class TrendPoint(BaseModel):
@@ -25,80 +34,69 @@ class PriceTrend(BaseModel):
 def predict_price_trend(history: List[PriceItemModel]) -> Optional[PriceTrend]:
     """
     Calculate linear trend from price history and forecast future prices.
-    
+
     Args:
-        history: List of PriceItemModel objects (should be sorted by date ideally, but we'll sort here)
-        
+        history: List of PriceItemModel objects (any order)
+
     Returns:
         PriceTrend object or None if insufficient data
     """
     if len(history) < 2:
         return None
-    
-    # Sort by date ascending
-    sorted_hist = sorted(history, key=lambda x: x.valid_from)
-    
-    # Prepare data
-    # Use valid_from as the x-axis
-    dates = [x.valid_from for x in sorted_hist]
-    prices = [float(x.unit_price) for x in sorted_hist]
-    
-    # Convert dates to timestamps for regression (X axis)
-    timestamps = []
-    for d in dates:
-        if isinstance(d, str):
-            try:
-                # Try ISO format first
-                dt = datetime.fromisoformat(d)
-            except ValueError:
-                try:
-                    # Try SQLite default format
-                    dt = datetime.strptime(d, "%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    # Fallback or skip
-                    continue
-            timestamps.append(dt.timestamp())
-        else:
-            timestamps.append(d.timestamp())
-    
-    if len(timestamps) != len(prices):
-        return None
-    
+
     try:
-        slope, intercept = linear_regression(timestamps, prices)
-    except Exception:
-        # Fallback for constant prices or errors
-        if len(set(prices)) == 1:
-            slope = 0.0
-            intercept = prices[0]
+        timestamps = epoch_seconds([x.valid_from for x in history])
+    except (ValueError, TypeError):
+        return None
+    prices = np.fromiter((float(x.unit_price) for x in history), dtype=np.float64)
+
+    return trend_from_arrays(timestamps, prices)
+
+
+def trend_from_arrays(
+    timestamps: np.ndarray, prices: np.ndarray
+) -> Optional[PriceTrend]:
+    """Trend and 12-month forecast for one series given as epoch seconds/prices."""
+    if len(timestamps) < 2:
+        return None
+
+    order = np.argsort(timestamps, kind="stable")
+    timestamps, prices = timestamps[order], prices[order]
+
+    slope_arr, intercept_arr, _ = fit_linear_trends(
+        np.zeros(len(timestamps), dtype=np.int64), timestamps, prices, 1
+    )
+    slope, intercept = float(slope_arr[0]), float(intercept_arr[0])
+    if not np.isfinite(slope):
+        # All versions share one timestamp: only a constant price has a trend
+        if np.all(prices == prices[0]):
+            slope, intercept = 0.0, float(prices[0])
         else:
             return None
-        
-    # Generate trend points for existing dates (The "Line of Best Fit")
-    trend_points = []
-    for d, ts in zip(dates, timestamps):
-        trend_price = slope * ts + intercept
-        trend_points.append(TrendPoint(date=d, price=trend_price))
-        
-    # Forecast next 12 months (monthly intervals)
-    last_date = dates[-1]
-    forecast_points = []
-    for i in range(1, 13):
-        future_date = last_date + timedelta(days=30 * i)
-        future_ts = future_date.timestamp()
-        future_price = slope * future_ts + intercept
-        forecast_points.append(TrendPoint(date=future_date, price=future_price, is_forecast=True))
-        
+
+    # Line of best fit at the existing dates, then monthly forecast
+    fitted = slope * timestamps + intercept
+    future_ts = timestamps[-1] + SECONDS_PER_FORECAST_STEP * np.arange(
+        1, FORECAST_MONTHS + 1
+    )
+    forecast = slope * future_ts + intercept
+
+    trend_points = [
+        TrendPoint(date=d, price=p)
+        for d, p in zip(to_datetimes(timestamps), fitted.tolist(), strict=False)
+    ]
+    forecast_points = [
+        TrendPoint(date=d, price=p, is_forecast=True)
+        for d, p in zip(to_datetimes(future_ts), forecast.tolist(), strict=False)
+    ]
+
     # Calculate annual change
-    seconds_per_year = 365.25 * 24 * 3600
-    annual_change = slope * seconds_per_year
-    current_price = prices[-1]
-    
+    current_price = float(prices[-1])
     if current_price != 0:
-        annual_change_percent = (annual_change / current_price) * 100
+        annual_change_percent = slope * SECONDS_PER_YEAR / current_price * 100
     else:
         annual_change_percent = 0.0
-        
+
     # Description
     if abs(annual_change_percent) < 0.5:
         desc = "Stable"
@@ -106,12 +104,12 @@ def predict_price_trend(history: List[PriceItemModel]) -> Optional[PriceTrend]:
         desc = f"Increasing (+{annual_change_percent:.1f}% / year)"
     else:
         desc = f"Decreasing ({annual_change_percent:.1f}% / year)"
-        
+
     return PriceTrend(
         slope=slope,
         intercept=intercept,
         points=trend_points,
         forecast=forecast_points,
         trend_description=desc,
-        annual_change_percent=annual_change_percent
+        annual_change_percent=annual_change_percent,
     )
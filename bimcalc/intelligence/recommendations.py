@@ -7,6 +7,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bimcalc.db.models import ItemModel
+from bimcalc.utils.cache_tags import item_tag
 from bimcalc.utils.redis_cache import get_cached, set_cached
 
 logger = logging.getLogger(__name__)
@@ -56,7 +57,8 @@ async def get_item_embedding(item: ItemModel) -> list[float] | None:
     """
     # Check cache first
     cache_key = f"item_embedding:{item.id}"
-    cached_embedding = await get_cached(cache_key)
+    tags = [item_tag(item.id)]
+    cached_embedding = await get_cached(cache_key, tags=tags)
 
     if cached_embedding:
         return cached_embedding
@@ -65,8 +67,9 @@ async def get_item_embedding(item: ItemModel) -> list[float] | None:
     embedding = await _generate_item_embedding(item)
 
     if embedding:
-        # Cache for 24 hours (items don't change often)
-        await set_cached(cache_key, embedding, ttl_seconds=86400)
+        # Invalidated through item_tag when the item's family, type or
+        # classification change; TTL only evicts idle entries
+        await set_cached(cache_key, embedding, ttl_seconds=86400 * 30, tags=tags)
 
     return embedding
 
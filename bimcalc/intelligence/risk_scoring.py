@@ -5,12 +5,15 @@ from datetime import datetime, timezone
 from typing import Any
 
 from bimcalc.db.models import DocumentModel, ItemModel, MatchResultModel
-from bimcalc.utils.redis_cache import get_cached, set_cached
+from bimcalc.utils.cache import get_cache, register_cache_type
+from bimcalc.utils.cache_tags import item_tag, project_tag
 
-# Cache TTL for risk scores (1 hour)
-RISK_CACHE_TTL = 3600
+# Cache TTL for risk scores (1 day). Writes to the item or its project
+# invalidate earlier; the TTL keeps age-based factors from drifting.
+RISK_CACHE_TTL = 86400
 
 
+@register_cache_type
 @dataclass
 class RiskScore:
     """Risk assessment for an item."""
@@ -207,16 +210,14 @@ async def get_risk_score_cached(
     """
     cache_key = f"risk:{item.id}"
 
-    # Check cache
-    cached = await get_cached(cache_key)
-    if cached:
-        return cached
-
-    # Calculate fresh
-    scorer = ComplianceRiskScorer()
-    risk = await scorer.calculate_risk(item, documents, match)
-
-    # Cache for 1 hour
-    await set_cached(cache_key, risk, ttl_seconds=RISK_CACHE_TTL)
-
-    return risk
+    async def _calculate() -> RiskScore:
+        scorer = ComplianceRiskScorer()
+        return await scorer.calculate_risk(item, documents, match)
+
+    # Concurrent misses share one calculation
+    return await get_cache().get_or_compute(
+        cache_key,
+        _calculate,
+        ttl_seconds=RISK_CACHE_TTL,
+        tags=[item_tag(item.id), project_tag(item.org_id, item.project_id)],
+    )
@@ -6,6 +6,7 @@ Enforces invariant: at most one active row per (org_id, canonical_key).
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from datetime import datetime
 from uuid import UUID
 
@@ -14,6 +15,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from bimcalc.db.models import ItemMappingModel
 from bimcalc.models import MappingEntry
+from bimcalc.utils.cache_tags import mappings_tag, publish_invalidation
+
+# Canonical keys per IN (...) clause in batch lookups
+LOOKUP_BATCH_SIZE = 500
 
 
 class MappingMemory:
@@ -54,6 +59,42 @@ class MappingMemory:
 
         return row if row else None
 
+    async def lookup_many(
+        self, org_id: str, canonical_keys: Iterable[str]
+    ) -> dict[str, UUID]:
+        """Batch lookup of active mappings.
+
+        Args:
+            org_id: Organization identifier
+            canonical_keys: Canonical keys to resolve (duplicates are fine)
+
+        Returns:
+            Mapping of canonical_key -> price_item_id for keys with an active row
+
+        Raises:
+            SQLAlchemyError: If database query fails
+        """
+        keys = list(dict.fromkeys(canonical_keys))
+        found: dict[str, UUID] = {}
+
+        for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+            stmt = select(
+                ItemMappingModel.canonical_key, ItemMappingModel.price_item_id
+            ).where(
+                and_(
+                    ItemMappingModel.org_id == org_id,
+                    ItemMappingModel.canonical_key.in_(
+                        keys[start : start + LOOKUP_BATCH_SIZE]
+                    ),
+                    ItemMappingModel.end_ts.is_(None),
+                )
+            )
+            result = await self.session.execute(stmt)
+            for canonical_key, price_item_id in result:
+                found[canonical_key] = price_item_id
+
+        return found
+
     async def write(
         self,
         org_id: str,
@@ -110,6 +151,7 @@ class MappingMemory:
 
         self.session.add(new_mapping)
         await self.session.flush()  # Get ID without committing
+        publish_invalidation(self.session, mappings_tag(org_id))
 
         return new_mapping.id
 
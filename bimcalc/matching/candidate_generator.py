@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from bimcalc.config import get_config
 from bimcalc.db.models import PriceItemModel
 from bimcalc.models import Item, PriceItem
+from bimcalc.utils.spans import span
 
 logger = logging.getLogger(__name__)
 
@@ -130,32 +131,36 @@ class CandidateGenerator:
         stmt = stmt.limit(limit)
 
         # Execute query
-        result = await self.session.execute(stmt)
-        rows = result.scalars().all()
+        with span("candidate_sql") as s:
+            result = await self.session.execute(stmt)
+            rows = result.scalars().all()
+            s.count = len(rows)
 
         # Convert to Pydantic models
-        return [
-            PriceItem(
-                id=row.id,
-                classification_code=row.classification_code,
-                vendor_id=row.vendor_id,
-                sku=row.sku,
-                description=row.description,
-                unit=row.unit,
-                unit_price=row.unit_price,
-                currency=row.currency,
-                vat_rate=row.vat_rate,
-                width_mm=row.width_mm,
-                height_mm=row.height_mm,
-                dn_mm=row.dn_mm,
-                angle_deg=row.angle_deg,
-                material=row.material,
-                last_updated=row.last_updated,
-                vendor_note=row.vendor_note,
-                attributes=row.attributes or {},
-            )
-            for row in rows
-        ]
+        with span("candidate_convert", count=len(rows)):
+            candidates = [
+                PriceItem(
+                    id=row.id,
+                    classification_code=row.classification_code,
+                    vendor_id=row.vendor_id,
+                    sku=row.sku,
+                    description=row.description,
+                    unit=row.unit,
+                    unit_price=row.unit_price,
+                    currency=row.currency,
+                    vat_rate=row.vat_rate,
+                    width_mm=row.width_mm,
+                    height_mm=row.height_mm,
+                    dn_mm=row.dn_mm,
+                    angle_deg=row.angle_deg,
+                    material=row.material,
+                    last_updated=row.last_updated,
+                    vendor_note=row.vendor_note,
+                    attributes=row.attributes or {},
+                )
+                for row in rows
+            ]
+        return candidates
 
     async def generate_with_escape_hatch(
         self, item: Item, max_escape_hatch: int = 2, region: str = "EU"
@@ -260,32 +265,35 @@ class CandidateGenerator:
         stmt = stmt.limit(max_escape_hatch)
 
         # Execute query
-        result = await self.session.execute(stmt)
-        rows = result.scalars().all()
+        with span("escape_hatch_sql") as s:
+            result = await self.session.execute(stmt)
+            rows = result.scalars().all()
+            s.count = len(rows)
 
         # Convert to Pydantic models
-        escape_candidates = [
-            PriceItem(
-                id=row.id,
-                classification_code=row.classification_code,
-                vendor_id=row.vendor_id,
-                sku=row.sku,
-                description=row.description,
-                unit=row.unit,
-                unit_price=row.unit_price,
-                currency=row.currency,
-                vat_rate=row.vat_rate,
-                width_mm=row.width_mm,
-                height_mm=row.height_mm,
-                dn_mm=row.dn_mm,
-                angle_deg=row.angle_deg,
-                material=row.material,
-                last_updated=row.last_updated,
-                vendor_note=row.vendor_note,
-                attributes=row.attributes or {},
-            )
-            for row in rows
-        ]
+        with span("candidate_convert", count=len(rows)):
+            escape_candidates = [
+                PriceItem(
+                    id=row.id,
+                    classification_code=row.classification_code,
+                    vendor_id=row.vendor_id,
+                    sku=row.sku,
+                    description=row.description,
+                    unit=row.unit,
+                    unit_price=row.unit_price,
+                    currency=row.currency,
+                    vat_rate=row.vat_rate,
+                    width_mm=row.width_mm,
+                    height_mm=row.height_mm,
+                    dn_mm=row.dn_mm,
+                    angle_deg=row.angle_deg,
+                    material=row.material,
+                    last_updated=row.last_updated,
+                    vendor_note=row.vendor_note,
+                    attributes=row.attributes or {},
+                )
+                for row in rows
+            ]
 
         if len(escape_candidates) > 0:
             logger.info(
@@ -0,0 +1,214 @@
+"""Dirty-set tracking for incremental re-matching.
+
+An item needs re-matching when something it was scored against has changed
+since its latest match result. Each reason is one set-based query keyed on
+that result's timestamp:
+
+- ``unmatched``: the item has no match result yet
+- ``price_changed``: the matched price item got a new SCD2 version or was
+  closed
+- ``mapping_changed``: the item's canonical key was mapped to a different
+  price item, or the mapping it was matched through was closed
+- ``candidates_changed``: the item's classification block gained or lost a
+  current price item
+- ``reingested``: a schedule re-ingest added or modified the item
+
+Everything else is clean and can keep its latest result.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, and_, exists, func, literal, or_, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import CompoundSelect, Select
+
+from bimcalc.db.models import (
+    ItemMappingModel,
+    ItemModel,
+    ItemRevisionModel,
+    MatchResultModel,
+    PriceItemModel,
+)
+
+# Ids per ``IN (...)`` when loading dirty items; stays under driver bind limits
+ITEM_ID_BATCH = 1000
+
+DIRTY_REASONS = (
+    "unmatched",
+    "price_changed",
+    "mapping_changed",
+    "candidates_changed",
+    "reingested",
+)
+
+
+@dataclass
+class DirtySet:
+    """Items of a project that need re-matching, with per-reason counts."""
+
+    total_items: int
+    item_ids: set[UUID] = field(default_factory=set)
+    reasons: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def clean(self) -> int:
+        """Items whose latest match result is still valid."""
+        return self.total_items - len(self.item_ids)
+
+
+def dirty_items_query(org_id: str, project_id: str) -> CompoundSelect:
+    """``(item_id, reason)`` rows for every dirty item in a project.
+
+    An item appears once per reason that applies to it.
+    """
+    latest = aliased(MatchResultModel)
+    newer = aliased(MatchResultModel)
+    matched = aliased(PriceItemModel)
+    version = aliased(PriceItemModel)
+    in_block = aliased(PriceItemModel)
+    peer = aliased(PriceItemModel)
+    matched_at = latest.timestamp
+
+    def project_items(reason: str) -> Select:
+        return select(
+            ItemModel.id.label("item_id"), literal(reason).label("reason")
+        ).where(ItemModel.org_id == org_id, ItemModel.project_id == project_id)
+
+    def latest_match(reason: str) -> Select:
+        return project_items(reason).join(
+            latest,
+            and_(
+                latest.item_id == ItemModel.id,
+                ~exists().where(
+                    newer.item_id == latest.item_id,
+                    newer.timestamp > latest.timestamp,
+                ),
+            ),
+        )
+
+    def same_price_key(a, b) -> ColumnElement[bool]:
+        return and_(
+            a.org_id == b.org_id, a.item_code == b.item_code, a.region == b.region
+        )
+
+    unmatched = project_items("unmatched").where(
+        ~exists().where(MatchResultModel.item_id == ItemModel.id)
+    )
+
+    price_changed = (
+        latest_match("price_changed")
+        .join(matched, matched.id == latest.price_item_id)
+        .where(
+            or_(
+                matched.valid_to > matched_at,
+                exists().where(
+                    same_price_key(version, matched),
+                    version.valid_from > matched_at,
+                ),
+            )
+        )
+    )
+
+    # The orchestrator writes a mapping to the price it just auto-accepted,
+    # after stamping the result; that mapping agrees with the result.
+    mapping_changed = latest_match("mapping_changed").where(
+        exists().where(
+            ItemMappingModel.org_id == org_id,
+            ItemMappingModel.canonical_key == ItemModel.canonical_key,
+            or_(
+                and_(
+                    ItemMappingModel.start_ts > matched_at,
+                    ItemMappingModel.price_item_id.is_distinct_from(
+                        latest.price_item_id
+                    ),
+                ),
+                and_(
+                    ItemMappingModel.end_ts > matched_at,
+                    ItemMappingModel.price_item_id == latest.price_item_id,
+                ),
+            ),
+        )
+    )
+
+    # A price key is in the block at a point in time if a version with the
+    # item's classification was open then. New versions of a key that stays
+    # in the block only change its price, which price_changed covers.
+    open_at_match = and_(
+        peer.classification_code == in_block.classification_code,
+        peer.valid_from <= matched_at,
+        or_(peer.valid_to.is_(None), peer.valid_to > matched_at),
+    )
+    gained = and_(
+        in_block.is_current.is_(True),
+        in_block.valid_from > matched_at,
+        # Two levels down: auto-correlation would not reach the match row
+        ~exists()
+        .where(same_price_key(peer, in_block), open_at_match)
+        .correlate_except(peer),
+    )
+    lost = and_(
+        in_block.valid_from <= matched_at,
+        in_block.valid_to > matched_at,
+        ~exists().where(
+            same_price_key(peer, in_block),
+            peer.classification_code == in_block.classification_code,
+            peer.is_current.is_(True),
+        ),
+    )
+    candidates_changed = latest_match("candidates_changed").where(
+        exists().where(
+            in_block.org_id == org_id,
+            in_block.classification_code == ItemModel.classification_code,
+            or_(gained, lost),
+        )
+    )
+
+    reingested = latest_match("reingested").where(
+        exists().where(
+            ItemRevisionModel.item_id == ItemModel.id,
+            ItemRevisionModel.change_type.in_(("added", "modified")),
+            ItemRevisionModel.ingest_timestamp > matched_at,
+        )
+    )
+
+    return union(
+        unmatched, price_changed, mapping_changed, candidates_changed, reingested
+    )
+
+
+async def find_dirty_items(
+    session: AsyncSession, org_id: str, project_id: str
+) -> DirtySet:
+    """Compute a project's dirty set and its clean/dirty counts."""
+    total = await session.scalar(
+        select(func.count())
+        .select_from(ItemModel)
+        .where(ItemModel.org_id == org_id, ItemModel.project_id == project_id)
+    )
+    dirty = DirtySet(total_items=total or 0)
+    result = await session.execute(dirty_items_query(org_id, project_id))
+    for item_id, reason in result:
+        dirty.item_ids.add(item_id)
+        dirty.reasons[reason] += 1
+    return dirty
+
+
+async def load_dirty_items(
+    session: AsyncSession, dirty: DirtySet, limit: int | None = None
+) -> list[ItemModel]:
+    """Load the items of ``dirty`` by id, without re-running the dirty query."""
+    item_ids = sorted(dirty.item_ids)
+    if limit:
+        item_ids = item_ids[:limit]
+
+    items: list[ItemModel] = []
+    for start in range(0, len(item_ids), ITEM_ID_BATCH):
+        batch = item_ids[start : start + ITEM_ID_BATCH]
+        result = await session.execute(select(ItemModel).where(ItemModel.id.in_(batch)))
+        items.extend(result.scalars())
+    return items
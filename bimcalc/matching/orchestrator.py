@@ -2,6 +2,9 @@
 
 Coordinates classification → canonical key → mapping lookup → candidate generation
 → fuzzy ranking → flag evaluation → auto-routing.
+
+Each stage runs in a ``bimcalc.utils.spans.span`` so its time shows up in
+the Prometheus stage histograms and the ``bimcalc match`` breakdown.
 """
 
 from __future__ import annotations
@@ -19,6 +22,7 @@ from bimcalc.matching.auto_router import AutoRouter
 from bimcalc.matching.candidate_generator import CandidateGenerator
 from bimcalc.matching.fuzzy_ranker import FuzzyRanker
 from bimcalc.models import CandidateMatch, Item, MatchResult, PriceItem
+from bimcalc.utils.spans import span
 
 
 class MatchOrchestrator:
@@ -67,35 +71,42 @@ class MatchOrchestrator:
         """
         # Step 1: Classification
         if item.classification_code is None:
-            item.classification_code = classify_item(item)
+            with span("classification"):
+                item.classification_code = classify_item(item)
 
         # Step 2: Canonical key
         if item.canonical_key is None:
-            item.canonical_key = canonical_key(item)
+            with span("canonical_key"):
+                item.canonical_key = canonical_key(item)
 
         # Step 3: Mapping memory lookup (instant auto-match path)
-        price_item_id = await self.mapping_memory.lookup(
-            self.config.org_id, item.canonical_key
-        )
+        with span("mapping_lookup"):
+            price_item_id = await self.mapping_memory.lookup(
+                self.config.org_id, item.canonical_key
+            )
 
         if price_item_id:
             # Mapping hit! Instant auto-match via learning curve
-            price_item = await self._get_price_item(price_item_id)
+            with span("price_fetch"):
+                price_item = await self._get_price_item(price_item_id)
 
             if price_item:
                 # Evaluate flags even for mapping memory matches
-                flags = compute_flags(item.model_dump(), price_item.model_dump())
+                with span("flags"):
+                    flags = compute_flags(item.model_dump(), price_item.model_dump())
 
                 match = CandidateMatch(price_item=price_item, score=100.0, flags=flags)
 
-                result = self.auto_router.route(
-                    match, source="mapping_memory", created_by=created_by
-                )
+                with span("routing"):
+                    result = self.auto_router.route(
+                        match, source="mapping_memory", created_by=created_by
+                    )
 
                 return result, price_item
 
         # Fetch project region
-        region = await self._get_project_region(item.org_id, item.project_id)
+        with span("region_fetch"):
+            region = await self._get_project_region(item.org_id, item.project_id)
 
         # Step 4: Mapping miss → Generate candidates with escape-hatch
         (
@@ -124,7 +135,8 @@ class MatchOrchestrator:
             return result, None
 
         # Step 5: Fuzzy rank candidates
-        ranked = self.fuzzy_ranker.rank(item, candidates)
+        with span("fuzzy_ranking", count=len(candidates)):
+            ranked = self.fuzzy_ranker.rank(item, candidates)
 
         if not ranked:
             # No candidates passed fuzzy threshold
@@ -142,9 +154,10 @@ class MatchOrchestrator:
 
         # Step 6: Evaluate flags for top candidate
         top_match = ranked[0]
-        top_match.flags = compute_flags(
-            item.model_dump(), top_match.price_item.model_dump()
-        )
+        with span("flags"):
+            top_match.flags = compute_flags(
+                item.model_dump(), top_match.price_item.model_dump()
+            )
 
         # If escape-hatch was used, add Classification Mismatch flag (CRITICAL-VETO)
         if used_escape_hatch:
@@ -161,20 +174,22 @@ class MatchOrchestrator:
             top_match.flags.append(escape_flag)
 
         # Step 7: Auto-route decision
-        result = self.auto_router.route(
-            top_match, source="fuzzy_match", created_by=created_by
-        )
+        with span("routing"):
+            result = self.auto_router.route(
+                top_match, source="fuzzy_match", created_by=created_by
+            )
         result.item_id = item.id  # Correct the item_id
 
         # Step 8: Write mapping if auto-accepted
         if result.decision == "auto-accepted":
-            await self.mapping_memory.write(
-                org_id=self.config.org_id,
-                canonical_key=item.canonical_key,
-                price_item_id=top_match.price_item.id,
-                created_by=created_by,
-                reason="auto-accept",
-            )
+            with span("mapping_write"):
+                await self.mapping_memory.write(
+                    org_id=self.config.org_id,
+                    canonical_key=item.canonical_key,
+                    price_item_id=top_match.price_item.id,
+                    created_by=created_by,
+                    reason="auto-accept",
+                )
 
         return result, top_match.price_item
 
@@ -94,6 +94,32 @@ class BaseImporter(ABC):
 
         return result
 
+    def checkpoint_position(self) -> int | None:
+        """Position to resume from so that no unprocessed record is skipped.
+
+        Read by the orchestrator after it has processed the latest yielded
+        record. Resuming may replay a few already-committed records; the
+        SCD2 merge is idempotent. ``None`` means the importer can't resume.
+        """
+        return None
+
+    def resume_from(self, position: int) -> bool:
+        """Start the next ``fetch_data()`` at ``position``.
+
+        Returns:
+            False if this importer doesn't support resuming
+        """
+        return False
+
+    def source_digest(self) -> str | None:
+        """Digest of the whole input, for sources delivered as a file.
+
+        When not ``None`` the orchestrator skips the source if the digest
+        matches the last completed import, and otherwise skips rows whose
+        content hash is unchanged. Called in a worker thread.
+        """
+        return None
+
     def _get_config_value(self, key: str, default=None, required: bool = False):
         """Get configuration value with validation.
 
@@ -0,0 +1,160 @@
+"""File and row fingerprints for skip-unchanged file imports.
+
+Manufacturer drops are often byte-identical to the previous quarter, or
+change only a small share of rows. Two levels of fingerprint avoid
+re-parsing and re-diffing them:
+
+- File digest: sha256 of the raw bytes, stored once every row of a source
+  imported cleanly. A drop with the same digest is skipped without being
+  parsed; a drop with failed rows keeps no digest, so it is retried.
+- Row hash: blake2b over (item_code, region, unit_price, currency) per
+  source. Rows whose hash matches the last import never reach the SCD2
+  merge; only changed and new rows do.
+
+Row hashes are written in the same transaction as the price rows they
+describe, so a failed run never records a row as imported.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bimcalc.db.models import SourceFingerprintModel, SourceRowHashModel
+from bimcalc.pipeline.types import PriceRecord
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: Path | str) -> str:
+    """sha256 hex digest of a file, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def row_hash(
+    item_code: str, region: str, unit_price: Decimal | float | str, currency: str
+) -> str:
+    """Content hash of the fields that decide whether a price changed."""
+    price = format(Decimal(str(unit_price)).normalize(), "f")
+    payload = f"{item_code}\x1f{region}\x1f{price}\x1f{currency.upper()}"
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def record_hash(record: PriceRecord) -> str:
+    return row_hash(record.item_code, record.region, record.unit_price, record.currency)
+
+
+class SourceFingerprints:
+    """Stored fingerprints of one source plus hashes staged by the current run."""
+
+    def __init__(
+        self,
+        source_name: str,
+        file_digest: str | None = None,
+        row_count: int = 0,
+        hashes: dict[tuple[str, str], str] | None = None,
+    ):
+        self.source_name = source_name
+        self.file_digest = file_digest
+        self.row_count = row_count
+        self.hashes = hashes or {}
+        self._pending: dict[tuple[str, str], str] = {}
+
+    @classmethod
+    async def load(cls, session: AsyncSession, source_name: str) -> SourceFingerprints:
+        fingerprint = await session.get(SourceFingerprintModel, source_name)
+        result = await session.execute(
+            select(
+                SourceRowHashModel.item_code,
+                SourceRowHashModel.region,
+                SourceRowHashModel.row_hash,
+            ).where(SourceRowHashModel.source_name == source_name)
+        )
+        return cls(
+            source_name,
+            file_digest=fingerprint.file_digest if fingerprint else None,
+            row_count=fingerprint.row_count if fingerprint else 0,
+            hashes={(code, region): h for code, region, h in result.all()},
+        )
+
+    def file_unchanged(self, digest: str) -> bool:
+        return self.file_digest is not None and self.file_digest == digest
+
+    def unchanged(self, item_code: str, region: str, row_hash: str) -> bool:
+        """True if this row was already imported with the same content."""
+        return self.hashes.get((item_code, region)) == row_hash
+
+    def stage(self, item_code: str, region: str, row_hash: str) -> None:
+        """Remember a processed row; written by the next ``flush``."""
+        self._pending[(item_code, region)] = row_hash
+
+    async def flush(self, session: AsyncSession) -> None:
+        """Write staged row hashes into the session's open transaction."""
+        if not self._pending:
+            return
+
+        updates, inserts = [], []
+        for (item_code, region), h in self._pending.items():
+            params = {
+                "source_name": self.source_name,
+                "item_code": item_code,
+                "region": region,
+                "row_hash": h,
+            }
+            (updates if (item_code, region) in self.hashes else inserts).append(params)
+
+        if updates:
+            await session.execute(update(SourceRowHashModel), updates)
+        if inserts:
+            await session.execute(insert(SourceRowHashModel), inserts)
+
+        self.hashes.update(self._pending)
+        self._pending.clear()
+
+    async def discard(self, session: AsyncSession) -> None:
+        """Forget every stored row hash, e.g. when the prices were removed."""
+        await session.execute(
+            delete(SourceRowHashModel).where(
+                SourceRowHashModel.source_name == self.source_name
+            )
+        )
+        self.file_digest = None
+        self.hashes.clear()
+        self._pending.clear()
+
+    async def save_file(
+        self, session: AsyncSession, digest: str, row_count: int
+    ) -> None:
+        """Record the digest of a fully imported file (caller commits)."""
+        await self.flush(session)
+        fingerprint = await session.get(SourceFingerprintModel, self.source_name)
+        if fingerprint is None:
+            fingerprint = SourceFingerprintModel(source_name=self.source_name)
+            session.add(fingerprint)
+        fingerprint.file_digest = digest
+        fingerprint.row_count = row_count
+        self.file_digest = digest
+        self.row_count = row_count
+
+    async def forget_file(self, session: AsyncSession) -> None:
+        """Write staged row hashes but drop the file digest (caller commits).
+
+        Used when some rows failed: the rows that did import keep their
+        hashes, while the same file is parsed again on the next run.
+        """
+        await self.flush(session)
+        await session.execute(
+            delete(SourceFingerprintModel).where(
+                SourceFingerprintModel.source_name == self.source_name
+            )
+        )
+        self.file_digest = None
+        self.row_count = 0
@@ -1,12 +1,11 @@
 """Template for API-based importers (RS Components, Farnell, Trimble Luckins, etc.).
 
 Demonstrates the pattern for REST API data sources with rate limiting
-and pagination support.
+and concurrent, resumable pagination support.
 """
 
 from __future__ import annotations
 
-import asyncio
 import logging
 from collections.abc import AsyncIterator
 from decimal import Decimal
@@ -14,6 +13,7 @@ from decimal import Decimal
 import aiohttp
 
 from bimcalc.pipeline.base_importer import BaseImporter
+from bimcalc.pipeline.pagination import PaginationSettings, iter_pages
 from bimcalc.pipeline.types import PriceRecord
 
 logger = logging.getLogger(__name__)
@@ -26,22 +26,54 @@ class APIImporter(BaseImporter):
     - api_base_url: Base URL for API
     - api_key: Authentication key (stored in env var recommended)
     - region: Geographic region
-    - rate_limit_delay: Seconds between requests (optional, default: 0.1)
+    - rate_limit_delay: Minimum seconds between request starts (optional, default: 0.1)
     - batch_size: Records per API call (optional, default: 100)
+    - max_in_flight: Concurrent page requests (optional, default: 4)
+    - prefetch_pages: Pages fetched ahead of the consumer (optional, default: 8)
+    - max_retries: Retries per page with jittered backoff (optional, default: 3)
+
+    Resuming is driven by the orchestrator's checkpoint (``--resume``),
+    committed together with the prices it covers.
 
     Subclasses must implement:
     - _fetch_batch(): Fetch one batch/page from API
     - _parse_api_response(): Parse API response to PriceRecords
+    - _count_page_items(): Raw item count of a page (if not under "items")
     """
 
+    def __init__(self, source_name: str, config: dict):
+        super().__init__(source_name, config)
+        # Offset after the last page fully handed to the consumer
+        self.consumed_offset = 0
+        self._resume_offset: int | None = None
+
+    def _pagination_settings(self) -> PaginationSettings:
+        return PaginationSettings(
+            page_size=self._get_config_value("batch_size", 100),
+            max_in_flight=self._get_config_value("max_in_flight", 4),
+            prefetch_pages=self._get_config_value("prefetch_pages", 8),
+            min_interval=self._get_config_value("rate_limit_delay", 0.1),
+            max_retries=self._get_config_value("max_retries", 3),
+            retry_base_delay=self._get_config_value("retry_base_delay", 0.5),
+        )
+
     async def fetch_data(self) -> AsyncIterator[PriceRecord]:
-        """Fetch data from API with pagination and rate limiting."""
+        """Fetch data from API with concurrent, ordered pagination.
+
+        Starts at the offset given to ``resume_from()``, if any. A page that
+        keeps failing raises ``PageFetchError`` so the run is reported as
+        failed rather than silently truncated.
+        """
 
         api_base_url = self._get_config_value("api_base_url", required=True)
         api_key = self._get_config_value("api_key", required=True)
         region = self._get_config_value("region", required=True)
-        rate_limit_delay = self._get_config_value("rate_limit_delay", 0.1)
-        batch_size = self._get_config_value("batch_size", 100)
+        settings = self._pagination_settings()
+
+        start_offset = self._resume_offset or 0
+        if start_offset:
+            self.logger.info(f"Resuming from checkpoint offset {start_offset}")
+        self.consumed_offset = start_offset
 
         headers = {
             "Authorization": f"Bearer {api_key}",
@@ -49,43 +81,40 @@ class APIImporter(BaseImporter):
         }
 
         async with aiohttp.ClientSession(headers=headers) as session:
-            offset = 0
-            has_more = True
-
-            while has_more:
-                try:
-                    # Fetch one batch
-                    response_data = await self._fetch_batch(
-                        session, api_base_url, offset, batch_size
-                    )
 
-                    if not response_data:
-                        break
+            async def fetch(offset: int, limit: int) -> dict:
+                return await self._fetch_batch(session, api_base_url, offset, limit)
 
-                    # Parse and yield records
-                    records = self._parse_api_response(response_data, region)
+            total = 0
+            async for page in iter_pages(
+                fetch, self._count_page_items, settings, start_offset
+            ):
+                records = self._parse_api_response(page.data, region)
 
-                    for record in records:
-                        record.source_name = self.source_name
-                        yield record
+                for record in records:
+                    record.source_name = self.source_name
+                    yield record
 
-                    # Check pagination
-                    has_more = len(records) >= batch_size
-                    offset += len(records)
+                total += len(records)
+                self.consumed_offset = page.offset + page.size
+                self.logger.debug(
+                    f"Fetched {len(records)} records at offset {page.offset} "
+                    f"(total: {total})"
+                )
 
-                    self.logger.debug(
-                        f"Fetched {len(records)} records (total: {offset})"
-                    )
+        self.logger.info(f"API import completed: {total} total records")
 
-                    # Rate limiting
-                    if has_more and rate_limit_delay > 0:
-                        await asyncio.sleep(rate_limit_delay)
+    def checkpoint_position(self) -> int | None:
+        # Page granularity: the current page is replayed on resume
+        return self.consumed_offset
 
-                except Exception as e:
-                    self.logger.error(f"Batch fetch error at offset {offset}: {e}")
-                    break
+    def resume_from(self, position: int) -> bool:
+        self._resume_offset = position
+        return True
 
-        self.logger.info(f"API import completed: {offset} total records")
+    def _count_page_items(self, data: dict) -> int:
+        """Raw number of items in a page (parse failures don't end the feed)."""
+        return len(data.get("items", []))
 
     async def _fetch_batch(
         self, session: aiohttp.ClientSession, base_url: str, offset: int, limit: int
@@ -172,6 +201,9 @@ class RSComponentsImporter(APIImporter):
             response.raise_for_status()
             return await response.json()
 
+    def _count_page_items(self, data: dict) -> int:
+        return len(data.get("products", []))
+
     def _parse_api_response(self, data: dict, region: str) -> list[PriceRecord]:
         """Parse RS Components API response."""
         records = []
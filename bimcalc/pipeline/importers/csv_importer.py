@@ -14,6 +14,7 @@ from pathlib import Path
 import pandas as pd
 
 from bimcalc.pipeline.base_importer import BaseImporter
+from bimcalc.pipeline.fingerprints import file_digest
 from bimcalc.pipeline.types import PriceRecord
 
 logger = logging.getLogger(__name__)
@@ -42,8 +43,32 @@ class CSVFileImporter(BaseImporter):
         }
     """
 
+    def __init__(self, source_name: str, config: dict):
+        super().__init__(source_name, config)
+        # Data rows (excluding header) already handed to the consumer
+        self.rows_consumed = 0
+        self._resume_row = 0
+
+    def checkpoint_position(self) -> int | None:
+        return self.rows_consumed
+
+    def resume_from(self, position: int) -> bool:
+        self._resume_row = position
+        return True
+
+    def source_digest(self) -> str | None:
+        file_path = Path(self._get_config_value("file_path", required=True))
+        if not file_path.exists():
+            # fetch_data reports the missing file
+            return None
+        return file_digest(file_path)
+
     async def fetch_data(self) -> AsyncIterator[PriceRecord]:
-        """Read file and yield normalized price records."""
+        """Read file and yield normalized price records.
+
+        When resuming, rows before the checkpoint are skipped at read time
+        (CSV) so they are never parsed.
+        """
 
         file_path = Path(self._get_config_value("file_path", required=True))
         region = self._get_config_value("region", required=True)
@@ -52,18 +77,26 @@ class CSVFileImporter(BaseImporter):
         if not file_path.exists():
             raise FileNotFoundError(f"Price file not found: {file_path}")
 
+        start_row = self._resume_row
+        skip = range(1, start_row + 1) if start_row else None
+
         # Read file based on extension
         if file_path.suffix.lower() == ".csv":
-            df = pd.read_csv(file_path)
+            df = pd.read_csv(file_path, skiprows=skip)
         elif file_path.suffix.lower() in (".xlsx", ".xls"):
-            df = pd.read_excel(file_path)
+            df = pd.read_excel(file_path, skiprows=skip)
         else:
             raise ValueError(f"Unsupported file format: {file_path.suffix}")
 
+        if start_row:
+            self.logger.info(f"Resuming at row {start_row}")
         self.logger.info(f"Read {len(df)} rows from {file_path}")
+        self.rows_consumed = start_row
 
         # Process each row
-        for idx, row in df.iterrows():
+        for offset, (idx, row) in enumerate(df.iterrows()):
+            # Set before yielding: the consumer reads it after processing
+            self.rows_consumed = start_row + offset + 1
             try:
                 record = self._parse_row(row, column_mapping, region)
                 if record:
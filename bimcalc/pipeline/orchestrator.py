@@ -7,44 +7,103 @@ Key features:
 - Modular: Each source is an isolated importer module
 - Resilient: Failures are contained and logged per-source
 - Auditable: Complete logging to data_sync_log table
-- Transactional: SCD Type-2 updates are atomic per source
+- Transactional: SCD Type-2 updates commit in batches per source (own
+  session), each batch together with the source's resume checkpoint
+- Resumable: ``resume=True`` continues a failed source from its checkpoint,
+  unless the source file changed since the checkpoint was written
+- Skip-unchanged: file sources whose digest matches the last import are
+  skipped; otherwise rows with an unchanged content hash bypass SCD2
+- Concurrent: up to ``max_parallel`` sources run at once; sources that
+  write the same (item_code, region) keys are serialized
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import time
 from datetime import datetime
 from uuid import uuid4
 
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bimcalc.db.connection import get_session
-from bimcalc.db.models import DataSyncLogModel
+from bimcalc.db.models import (
+    DataSyncLogModel,
+    PipelineCheckpointModel,
+    PriceItemModel,
+)
 from bimcalc.pipeline.base_importer import BaseImporter
+from bimcalc.pipeline.fingerprints import SourceFingerprints, record_hash
 from bimcalc.pipeline.scd2_updater import SCD2PriceUpdater
-from bimcalc.pipeline.types import ImportResult, ImportStatus
+from bimcalc.pipeline.types import ImportResult, ImportStatus, PriceRecord
 
 logger = logging.getLogger(__name__)
 
+# Records per SCD2 transaction; each commit also advances the checkpoint
+DEFAULT_COMMIT_EVERY = 1000
+
+
+def _record_fingerprint(record: PriceRecord) -> bytes:
+    return (
+        f"{record.item_code}\x1f{record.region}\x1f{record.unit_price}"
+        f"\x1f{record.currency}\x1e"
+    ).encode()
+
+
+class KeyClaims:
+    """First-writer-wins ownership of (item_code, region) keys across sources.
+
+    Concurrent importers run in separate transactions, so two of them
+    updating the same current price row would race on the SCD2 invariant.
+    A source that meets a key owned by another in-flight source defers the
+    record; deferred records are replayed serially once the parallel phase
+    is over.
+    """
+
+    def __init__(self) -> None:
+        self._owners: dict[tuple[str, str], str] = {}
+
+    def claim(self, record: PriceRecord, owner: str) -> bool:
+        key = (record.item_code, record.region)
+        return self._owners.setdefault(key, owner) == owner
+
+    def release(self, owner: str) -> None:
+        self._owners = {k: v for k, v in self._owners.items() if v != owner}
+
 
 class PipelineOrchestrator:
     """Orchestrates the entire price data synchronization pipeline.
 
     Responsibilities:
     1. Load and configure all enabled importers
-    2. Execute each importer sequentially (can be parallelized later)
-    3. Apply SCD Type-2 updates for each source's data
-    4. Log results to data_sync_log for monitoring
+    2. Execute importers, up to ``max_parallel`` at a time
+    3. Apply SCD Type-2 updates per source, each in its own session/transaction
+    4. Log results (including duration) to data_sync_log for monitoring
     5. Generate alerts on failures
     """
 
-    def __init__(self, importers: list[BaseImporter]):
+    def __init__(
+        self,
+        importers: list[BaseImporter],
+        max_parallel: int = 1,
+        resume: bool = False,
+        commit_every: int = DEFAULT_COMMIT_EVERY,
+    ):
         """Initialize orchestrator with list of importers.
 
         Args:
             importers: List of configured importer instances
+            max_parallel: Maximum number of sources processed concurrently
+            resume: Continue each source from its last committed checkpoint
+            commit_every: Records per SCD2 batch transaction
         """
         self.importers = importers
+        self.max_parallel = max(1, max_parallel)
+        self.resume = resume
+        self.commit_every = max(1, commit_every)
         self.run_timestamp = datetime.utcnow()
 
     async def run(self) -> dict:
@@ -54,31 +113,57 @@ class PipelineOrchestrator:
             Summary dict with overall status and per-source results
         """
         logger.info(f"Starting pipeline run at {self.run_timestamp}")
-        logger.info(f"Configured sources: {len(self.importers)}")
+        logger.info(
+            f"Configured sources: {len(self.importers)} "
+            f"(max parallel: {self.max_parallel})"
+        )
 
-        results = []
-        overall_success = True
+        claims = KeyClaims() if self.max_parallel > 1 else None
+        semaphore = asyncio.Semaphore(self.max_parallel)
 
-        async with get_session() as session:
-            for importer in self.importers:
-                result = await self._run_importer(importer, session)
-                results.append(result)
-
-                if not result.success:
-                    overall_success = False
-                    logger.warning(
-                        f"Source {importer.source_name} failed: {result.message}"
+        async def run_one(importer: BaseImporter):
+            async with semaphore:
+                started = time.monotonic()
+                deferred: list[PriceRecord] = []
+                async with get_session() as session:
+                    result = await self._run_importer(
+                        importer, session, claims, deferred
                     )
+                if claims is not None:
+                    claims.release(importer.source_name)
+                return result, deferred, time.monotonic() - started
 
-                # Log to data_sync_log
-                await self._log_result(result, session)
+        outcomes = await asyncio.gather(
+            *(run_one(importer) for importer in self.importers)
+        )
+
+        results = []
+        for importer, (result, deferred, elapsed) in zip(
+            self.importers, outcomes, strict=True
+        ):
+            if deferred and result.success:
+                # Overlapping keys: replay after every concurrent writer is done
+                started = time.monotonic()
+                async with get_session() as session:
+                    await self._replay_deferred(importer, session, deferred, result)
+                elapsed += time.monotonic() - started
+            result.duration_seconds = elapsed
+            results.append(result)
+
+            if not result.success:
+                logger.warning(
+                    f"Source {importer.source_name} failed: {result.message}"
+                )
 
-            # Commit all logs
+        async with get_session() as session:
+            for result in results:
+                await self._log_result(result, session)
             await session.commit()
 
         # Check for failures and potentially send alerts
         await self._check_and_alert(results)
 
+        overall_success = all(r.success for r in results)
         summary = {
             "run_timestamp": self.run_timestamp.isoformat(),
             "total_sources": len(self.importers),
@@ -95,13 +180,19 @@ class PipelineOrchestrator:
         return summary
 
     async def _run_importer(
-        self, importer: BaseImporter, session: AsyncSession
+        self,
+        importer: BaseImporter,
+        session: AsyncSession,
+        claims: KeyClaims | None = None,
+        deferred: list[PriceRecord] | None = None,
     ) -> ImportResult:
         """Run a single importer with SCD Type-2 updates.
 
         Args:
             importer: Importer instance
-            session: Database session
+            session: Database session owned by this source
+            claims: Key ownership shared by concurrently running sources
+            deferred: Receives records whose key is owned by another source
 
         Returns:
             ImportResult with statistics
@@ -117,54 +208,120 @@ class PipelineOrchestrator:
             # Initialize SCD2 updater
             updater = SCD2PriceUpdater(session)
 
-            # Fetch and process records
+            fingerprints = None
+            digest = await asyncio.to_thread(importer.source_digest)
+            if self.resume:
+                await self._resume_importer(importer, session, digest)
+
+            if digest is not None:
+                fingerprints = await SourceFingerprints.load(
+                    session, importer.source_name
+                )
+                if fingerprints.file_unchanged(digest):
+                    if await self._touch_current_prices(importer, session):
+                        return await self._skip_unchanged_source(
+                            importer, session, fingerprints, result
+                        )
+                    # Prices were deleted since the last import: run in full
+                    await fingerprints.discard(session)
+
+            # Fetch and process records, committing every `commit_every`
             record_count = 0
+            committed_count = 0
+            batch_hash = hashlib.sha256()
+            batch_size = 0
             try:
                 async for record in importer.fetch_data():
                     record.source_name = importer.source_name
-                    success = await updater.process_price(record)
                     record_count += 1
+                    if claims is not None and not claims.claim(
+                        record, importer.source_name
+                    ):
+                        deferred.append(record)
+                        continue
+
+                    row_hash = None
+                    if fingerprints is not None:
+                        row_hash = record_hash(record)
+                        if fingerprints.unchanged(
+                            record.item_code, record.region, row_hash
+                        ):
+                            result.records_skipped += 1
+                            continue
 
+                    success = await updater.process_price(record)
                     if not success:
                         result.records_failed += 1
+                    elif row_hash is not None:
+                        fingerprints.stage(record.item_code, record.region, row_hash)
+
+                    batch_hash.update(_record_fingerprint(record))
+                    batch_size += 1
+                    if batch_size >= self.commit_every:
+                        committed_count += batch_size
+                        if fingerprints is not None:
+                            await fingerprints.flush(session)
+                        await self._commit_batch(
+                            importer,
+                            session,
+                            batch_hash.hexdigest(),
+                            digest,
+                            committed_count,
+                            # Deferred records sit before the current position
+                            advance=not deferred,
+                        )
+                        batch_hash = hashlib.sha256()
+                        batch_size = 0
             except Exception as e:
-                # Error during fetch/process
+                # Error during fetch/process: only the open batch is lost
                 logger.error(
                     f"Error processing records from {importer.source_name}: {e}"
                 )
+                await updater.rollback()
+                if deferred:
+                    deferred.clear()
                 result.status = ImportStatus.FAILED
                 result.message = f"Processing error: {str(e)}"
+                if committed_count:
+                    result.message += (
+                        f" ({committed_count} records committed; "
+                        f"rerun with --resume to continue)"
+                    )
                 return result
 
-            # Commit SCD2 updates for this source
+            # Commit the final batch; a finished source needs no checkpoint
             try:
+                if not deferred:
+                    await session.execute(
+                        delete(PipelineCheckpointModel).where(
+                            PipelineCheckpointModel.source_name == importer.source_name
+                        )
+                    )
+                if fingerprints is not None:
+                    if result.records_skipped:
+                        await self._touch_current_prices(importer, session)
+                    if deferred:
+                        await fingerprints.flush(session)
+                    elif result.records_failed:
+                        # Some records failed: parse the same file again next run
+                        await fingerprints.forget_file(session)
+                    else:
+                        await fingerprints.save_file(session, digest, record_count)
                 await updater.commit()
             except Exception as e:
                 logger.error(
                     f"Error committing updates for {importer.source_name}: {e}"
                 )
                 await updater.rollback()
+                if deferred:
+                    deferred.clear()
                 result.status = ImportStatus.FAILED
                 result.message = f"Commit error: {str(e)}"
                 return result
 
-            # Get statistics
-            stats = updater.get_stats()
-            result.records_inserted = stats["inserted"]
-            result.records_updated = stats["updated"]
-            result.records_failed = stats["failed"]
-
-            result.message = (
-                f"Processed {record_count} records: "
-                f"{stats['inserted']} new, "
-                f"{stats['updated']} updated, "
-                f"{stats['unchanged']} unchanged, "
-                f"{stats['failed']} failed"
-            )
-
-            if stats["failed"] > 0:
-                result.status = ImportStatus.PARTIAL_SUCCESS
-
+            self._apply_stats(result, updater, record_count)
+            if result.records_skipped:
+                result.message += f", {result.records_skipped} skipped by hash"
             logger.info(f"✓ {importer.source_name}: {result.message}")
 
         except Exception as e:
@@ -182,6 +339,178 @@ class PipelineOrchestrator:
 
         return result
 
+    async def _skip_unchanged_source(
+        self,
+        importer: BaseImporter,
+        session: AsyncSession,
+        fingerprints: SourceFingerprints,
+        result: ImportResult,
+    ) -> ImportResult:
+        """Finish a source whose file is identical to the last import."""
+        await session.execute(
+            delete(PipelineCheckpointModel).where(
+                PipelineCheckpointModel.source_name == importer.source_name
+            )
+        )
+        await session.commit()
+
+        result.records_skipped = fingerprints.row_count
+        result.message = (
+            f"File unchanged since last import: "
+            f"{fingerprints.row_count} records skipped by hash"
+        )
+        logger.info(f"✓ {importer.source_name}: {result.message}")
+        return result
+
+    @staticmethod
+    async def _touch_current_prices(
+        importer: BaseImporter, session: AsyncSession
+    ) -> int:
+        """Refresh last_updated for rows the SCD2 merge was skipped for.
+
+        Unchanged rows would otherwise look stale; one set-based UPDATE
+        replaces the per-row touch the merge does.
+
+        Returns:
+            Number of current price rows touched
+        """
+        touched = await session.execute(
+            update(PriceItemModel)
+            .where(
+                PriceItemModel.source_name == importer.source_name,
+                PriceItemModel.is_current.is_(True),
+            )
+            .values(last_updated=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return touched.rowcount
+
+    async def _resume_importer(
+        self, importer: BaseImporter, session: AsyncSession, digest: str | None
+    ) -> None:
+        checkpoint = await session.get(PipelineCheckpointModel, importer.source_name)
+        if checkpoint is None:
+            return
+        if checkpoint.source_digest != digest:
+            # The position counts records of a different file
+            logger.warning(
+                f"{importer.source_name}: source changed since the checkpoint of "
+                f"run {checkpoint.run_timestamp}; discarding it and importing "
+                f"from the start"
+            )
+            await session.delete(checkpoint)
+            await session.commit()
+            return
+        if importer.resume_from(checkpoint.position):
+            logger.info(
+                f"{importer.source_name}: resuming at position {checkpoint.position} "
+                f"({checkpoint.records_committed} records committed by "
+                f"run {checkpoint.run_timestamp})"
+            )
+        else:
+            logger.warning(
+                f"{importer.source_name}: importer cannot resume; reprocessing "
+                f"from the start (SCD2 merge skips unchanged prices)"
+            )
+
+    async def _commit_batch(
+        self,
+        importer: BaseImporter,
+        session: AsyncSession,
+        batch_hash: str,
+        source_digest: str | None,
+        records_committed: int,
+        advance: bool = True,
+    ) -> None:
+        """Commit the open SCD2 batch together with the source checkpoint."""
+        position = importer.checkpoint_position() if advance else None
+        if position is not None:
+            checkpoint = await session.get(
+                PipelineCheckpointModel, importer.source_name
+            )
+            if checkpoint is None:
+                checkpoint = PipelineCheckpointModel(source_name=importer.source_name)
+                session.add(checkpoint)
+            checkpoint.run_timestamp = self.run_timestamp
+            checkpoint.position = position
+            checkpoint.records_committed = records_committed
+            checkpoint.batch_hash = batch_hash
+            checkpoint.source_digest = source_digest
+
+        await session.commit()
+        logger.debug(
+            f"{importer.source_name}: committed {records_committed} records "
+            f"(checkpoint position {position})"
+        )
+
+    async def _replay_deferred(
+        self,
+        importer: BaseImporter,
+        session: AsyncSession,
+        deferred: list[PriceRecord],
+        result: ImportResult,
+    ) -> None:
+        """Apply records that overlapped another source, after it committed."""
+        logger.info(
+            f"{importer.source_name}: replaying {len(deferred)} records "
+            f"with keys shared by another source"
+        )
+        updater = SCD2PriceUpdater(session)
+        for record in deferred:
+            await updater.process_price(record)
+
+        try:
+            await updater.commit()
+        except Exception as e:
+            logger.error(
+                f"Error committing deferred updates for {importer.source_name}: {e}"
+            )
+            await updater.rollback()
+            result.status = ImportStatus.PARTIAL_SUCCESS
+            result.records_failed += len(deferred)
+            result.message += f"; {len(deferred)} overlapping records failed: {e}"
+            return
+
+        await session.execute(
+            delete(PipelineCheckpointModel).where(
+                PipelineCheckpointModel.source_name == importer.source_name
+            )
+        )
+        await session.commit()
+        stats = updater.get_stats()
+        result.records_inserted += stats["inserted"]
+        result.records_updated += stats["updated"]
+        result.records_failed += stats["failed"]
+        if stats["failed"] > 0:
+            result.status = ImportStatus.PARTIAL_SUCCESS
+        result.message += f"; {len(deferred)} overlapping records serialized"
+
+    @staticmethod
+    def _apply_stats(
+        result: ImportResult, updater: SCD2PriceUpdater, record_count: int
+    ) -> None:
+        stats = updater.get_stats()
+        result.records_inserted = stats["inserted"]
+        result.records_updated = stats["updated"]
+        result.records_failed = stats["failed"]
+        result.records_stale = stats["stale"]
+
+        result.message = (
+            f"Processed {record_count} records: "
+            f"{stats['inserted']} new, "
+            f"{stats['updated']} updated, "
+            f"{stats['unchanged']} unchanged, "
+            f"{stats['failed']} failed"
+        )
+        if stats["stale"]:
+            result.message += (
+                f", {stats['stale']} back-dated corrections ignored "
+                f"(older than the current price)"
+            )
+
+        if stats["failed"] > 0:
+            result.status = ImportStatus.PARTIAL_SUCCESS
+
     async def _log_result(self, result: ImportResult, session: AsyncSession) -> None:
         """Log import result to data_sync_log table.
 
@@ -225,14 +554,20 @@ class PipelineOrchestrator:
         # For now, just log. In production, this would trigger notifications.
 
 
-async def run_pipeline(importers: list[BaseImporter]) -> dict:
+async def run_pipeline(
+    importers: list[BaseImporter], max_parallel: int = 1, resume: bool = False
+) -> dict:
     """Convenience function to run the pipeline.
 
     Args:
         importers: List of configured importers
+        max_parallel: Maximum number of sources processed concurrently
+        resume: Continue each source from its last committed checkpoint
 
     Returns:
         Pipeline run summary
     """
-    orchestrator = PipelineOrchestrator(importers)
+    orchestrator = PipelineOrchestrator(
+        importers, max_parallel=max_parallel, resume=resume
+    )
     return await orchestrator.run()
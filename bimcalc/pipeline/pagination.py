@@ -0,0 +1,163 @@
+"""Concurrent, ordered pagination helpers for API importers.
+
+Offset-paginated APIs are fetched with several pages in flight while the
+consumer still receives pages strictly in offset order:
+
+- ``max_in_flight`` bounds concurrent HTTP requests
+- ``prefetch_pages`` bounds how far ahead of the consumer pages are fetched
+  (and therefore memory held in completed-but-unconsumed pages)
+- ``min_interval`` spaces out request starts (rate limiting)
+- each page is retried with jittered exponential backoff; a page that still
+  fails raises ``PageFetchError`` instead of silently truncating the feed
+
+Resuming is left to the caller: ``iter_pages`` starts at any offset, and
+the orchestrator checkpoints the consumed offset with each committed batch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PageFetchError(RuntimeError):
+    """A page could not be fetched after all retries."""
+
+    def __init__(self, offset: int, attempts: int, cause: BaseException):
+        super().__init__(
+            f"Page at offset {offset} failed after {attempts} attempts: {cause}"
+        )
+        self.offset = offset
+        self.attempts = attempts
+
+
+@dataclass(frozen=True)
+class Page(Generic[T]):
+    """One fetched page; ``size`` is the raw item count used for end-of-feed."""
+
+    offset: int
+    data: T
+    size: int
+
+
+@dataclass
+class PaginationSettings:
+    page_size: int = 100
+    max_in_flight: int = 4
+    prefetch_pages: int = 8
+    min_interval: float = 0.0
+    max_retries: int = 3
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 30.0
+
+    def __post_init__(self) -> None:
+        self.max_in_flight = max(1, self.max_in_flight)
+        self.prefetch_pages = max(self.max_in_flight, self.prefetch_pages)
+
+
+class _RequestSpacer:
+    """Ensures request starts are at least ``interval`` seconds apart."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        async with self._lock:
+            delay = self._next_start - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start = time.monotonic() + self.interval
+
+
+def _backoff(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+async def iter_pages(
+    fetch: Callable[[int, int], Awaitable[T]],
+    count: Callable[[T], int],
+    settings: PaginationSettings,
+    start_offset: int = 0,
+) -> AsyncIterator[Page[T]]:
+    """Yield pages in offset order while fetching ahead concurrently.
+
+    Args:
+        fetch: ``fetch(offset, limit)`` returning one raw page
+        count: Number of items in a raw page; a short page ends the feed
+        settings: Concurrency, prefetch, rate limit and retry settings
+        start_offset: Offset of the first page (resume point)
+
+    Raises:
+        PageFetchError: If a page keeps failing after ``max_retries`` retries
+    """
+    semaphore = asyncio.Semaphore(settings.max_in_flight)
+    spacer = _RequestSpacer(settings.min_interval)
+    attempts = settings.max_retries + 1
+
+    async def fetch_page(offset: int) -> Page[T]:
+        for attempt in range(attempts):
+            try:
+                async with semaphore:
+                    await spacer.wait()
+                    data = await fetch(offset, settings.page_size)
+                return Page(offset=offset, data=data, size=count(data) if data else 0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt + 1 == attempts:
+                    raise PageFetchError(offset, attempts, e) from e
+                delay = _backoff(
+                    attempt, settings.retry_base_delay, settings.retry_max_delay
+                )
+                logger.warning(
+                    "Page at offset %s failed (attempt %s/%s): %s; retrying in %.2fs",
+                    offset,
+                    attempt + 1,
+                    attempts,
+                    e,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    pending: dict[int, asyncio.Task[Page[T]]] = {}
+    next_to_schedule = start_offset
+    next_to_yield = start_offset
+
+    def schedule() -> None:
+        nonlocal next_to_schedule
+        while len(pending) < settings.prefetch_pages:
+            pending[next_to_schedule] = asyncio.create_task(fetch_page(next_to_schedule))
+            next_to_schedule += settings.page_size
+
+    try:
+        schedule()
+        while True:
+            page = await pending.pop(next_to_yield)
+            next_to_yield += settings.page_size
+            if page.size == 0:
+                return
+            yield page
+            if page.size < settings.page_size:
+                return
+            schedule()
+    finally:
+        for task in pending.values():
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending.values(), return_exceptions=True)
+
@@ -20,6 +20,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from bimcalc.db.models import PriceItemModel
 from bimcalc.pipeline.types import PriceRecord
 from bimcalc.config import get_config
+from bimcalc.reporting.price_history import stage_price_version
+from bimcalc.utils.cache_tags import prices_tag, publish_invalidation
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +40,7 @@ class SCD2PriceUpdater:
             "inserted": 0,
             "updated": 0,
             "unchanged": 0,
+            "stale": 0,
             "failed": 0,
         }
         self.org_id = get_config().org_id
@@ -55,7 +58,12 @@ class SCD2PriceUpdater:
             1. Query for active record (is_current=true)
             2. If not found → INSERT new record
             3. If found and price unchanged → skip or update last_updated
-            4. If found and price changed → EXPIRE old + INSERT new
+            4. If found but record is older than the active version → skip
+            5. If found and price changed → EXPIRE old + INSERT new
+
+        Idempotent: replaying a record that is already the active version
+        (or predates it) never creates another version, so batches can be
+        re-run after a resume.
         """
         try:
             # 1. Query for current active record
@@ -86,6 +94,18 @@ class SCD2PriceUpdater:
                 self.stats["unchanged"] += 1
                 return True
 
+            if self._is_stale_replay(current_record, record):
+                # Older than the active version (a resume replay or a
+                # back-dated correction): keep history linear, but report it
+                logger.warning(
+                    f"Ignoring back-dated price for {record.item_code} "
+                    f"({record.region}): effective "
+                    f"{record.original_effective_date:%Y-%m-%d}, current version "
+                    f"effective {current_record.original_effective_date:%Y-%m-%d}"
+                )
+                self.stats["stale"] += 1
+                return True
+
             # 4. Price changed → SCD Type-2: Expire old, Insert new
             await self._expire_and_insert(current_record, record, now)
             self.stats["updated"] += 1
@@ -138,6 +158,16 @@ class SCD2PriceUpdater:
         )
 
         self.session.add(price_model)
+        publish_invalidation(self.session, prices_tag(self.org_id))
+        stage_price_version(
+            self.session,
+            self.org_id,
+            record.item_code,
+            record.region,
+            timestamp,
+            record.unit_price,
+            record.vendor_id,
+        )
 
         logger.debug(
             f"Inserted new price: {record.item_code} ({record.region}) "
@@ -175,6 +205,16 @@ class SCD2PriceUpdater:
         # Insert new record
         await self._insert_new_record(new_record, timestamp)
 
+    @staticmethod
+    def _is_stale_replay(current: PriceItemModel, new: PriceRecord) -> bool:
+        """True if ``new`` is effective before the active version it would replace."""
+        if new.original_effective_date is None:
+            return False
+        if current.original_effective_date is None:
+            return False
+        current_date = current.original_effective_date.replace(tzinfo=None)
+        return new.original_effective_date.replace(tzinfo=None) < current_date
+
     def _price_has_changed(self, current: PriceItemModel, new: PriceRecord) -> bool:
         """Compare current and new price records.
 
@@ -199,6 +239,7 @@ class SCD2PriceUpdater:
             f"{self.stats['inserted']} inserted, "
             f"{self.stats['updated']} updated, "
             f"{self.stats['unchanged']} unchanged, "
+            f"{self.stats['stale']} stale, "
             f"{self.stats['failed']} failed"
         )
 
@@ -211,6 +252,6 @@ class SCD2PriceUpdater:
         """Get processing statistics.
 
         Returns:
-            Dictionary with insert/update/unchanged/failed counts
+            Dictionary with insert/update/unchanged/stale/failed counts
         """
         return self.stats.copy()
@@ -70,6 +70,10 @@ class ImportResult:
     records_inserted: int = 0
     records_updated: int = 0
     records_failed: int = 0
+    # Rows not sent to the SCD2 merge because their content hash was unchanged
+    records_skipped: int = 0
+    # Changed prices effective before the current version, left unapplied
+    records_stale: int = 0
     message: str = ""
     error_details: dict | None = None
     duration_seconds: float = 0.0
@@ -3,6 +3,21 @@
 Generates deterministic cost reports using SCD2 as-of queries and EU formatting.
 """
 
-from bimcalc.reporting.builder import ReportBuilder
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from bimcalc.reporting.builder import ReportBuilder, generate_report
 
 __all__ = ["ReportBuilder", "generate_report"]
+
+
+def __getattr__(name: str) -> Any:
+    # The builder pulls in pandas; load it only when actually used so that
+    # importing a light submodule (csv_export, routes) stays cheap.
+    if name in __all__:
+        from bimcalc.reporting import builder
+
+        return getattr(builder, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
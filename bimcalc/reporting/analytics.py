@@ -1,12 +1,13 @@
-from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Any
 from uuid import UUID
 
+import numpy as np
 from sqlalchemy import select, func, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bimcalc.db.models import ItemModel, PriceItemModel
+from bimcalc.reporting.price_history import fit_linear_trends, get_price_history
 
 
 class AnalyticsEngine:
@@ -158,69 +159,25 @@ class AnalyticsEngine:
         self, item_code: str, org_id: str
     ) -> Dict[str, Any]:
         """Fetches historical price changes for a specific item code."""
-        query = (
-            select(
-                PriceItemModel.unit_price,
-                PriceItemModel.valid_from,
-                PriceItemModel.valid_to,
-                PriceItemModel.vendor_id,
-            )
-            .where(
-                PriceItemModel.item_code == item_code, PriceItemModel.org_id == org_id
-            )
-            .order_by(PriceItemModel.valid_from)
-        )
-
-        result = await self.session.execute(query)
-        rows = result.all()
-
-        history = []
-        for row in rows:
-            history.append(
-                {
-                    "price": float(row.unit_price),
-                    "date": row.valid_from.strftime("%Y-%m-%d"),
-                    "vendor": row.vendor_id,
-                }
-            )
-
-        return {"item_code": item_code, "history": history}
+        history = await get_price_history(self.session, org_id)
+        return {"item_code": item_code, "history": history.item_history(item_code)}
 
     async def compare_vendors(
         self, item_codes: List[str], org_id: str
     ) -> Dict[str, Any]:
         """Compares current prices for a list of items across vendors."""
-        query = (
-            select(
-                PriceItemModel.vendor_id,
-                func.sum(PriceItemModel.unit_price).label("total_cost"),
-                func.count(PriceItemModel.id).label("item_count"),
-            )
-            .where(
-                PriceItemModel.item_code.in_(item_codes),
-                PriceItemModel.org_id == org_id,
-                PriceItemModel.is_current == True,
-            )
-            .group_by(PriceItemModel.vendor_id)
-        )
-
-        result = await self.session.execute(query)
-        rows = result.all()
-
-        comparison = []
-        for row in rows:
-            comparison.append(
-                {
-                    "vendor": row.vendor_id,
-                    "total_cost": float(row.total_cost),
-                    "item_count": row.item_count,
-                    "coverage_percent": (row.item_count / len(item_codes)) * 100
-                    if item_codes
-                    else 0,
-                }
-            )
+        history = await get_price_history(self.session, org_id)
+        return {"comparison": history.vendor_basket(item_codes)}
 
-        return {"comparison": comparison}
+    async def get_price_inflation(
+        self, org_id: str, limit: int = 20, region: str | None = None
+    ) -> Dict[str, Any]:
+        """Items whose price trend rises fastest, across the whole catalog."""
+        history = await get_price_history(self.session, org_id)
+        return {
+            "items": history.steepest_inflation(limit=limit, region=region),
+            "series_count": len(history.series_item_codes),
+        }
 
     async def forecast_cost_trends(
         self, project_id: UUID, days: int = 90
@@ -241,30 +198,20 @@ class AnalyticsEngine:
         if n < 2:
             return {"forecast": [], "message": "Need at least 2 data points"}
 
-        x = list(range(n))
-        y = data
-
-        # Calculate slope (m) and intercept (c)
-        sum_x = sum(x)
-        sum_y = sum(y)
-        sum_xy = sum(i * j for i, j in zip(x, y, strict=False))
-        sum_xx = sum(i * i for i in x)
-
-        m = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x * sum_x)
-        c = (sum_y - m * sum_x) / n
-
-        # Forecast
-        last_date = datetime.strptime(labels[-1], "%Y-%m-%d")
-        forecast_data = []
-        forecast_labels = []
-
-        for i in range(1, days + 1):
-            next_x = n - 1 + i
-            next_y = m * next_x + c
-            next_date = last_date + timedelta(days=i)
-
-            forecast_data.append(max(0, next_y))  # No negative costs
-            forecast_labels.append(next_date.strftime("%Y-%m-%d"))
+        slope, intercept, _ = fit_linear_trends(
+            np.zeros(n, dtype=np.int64),
+            np.arange(n, dtype=np.float64),
+            np.asarray(data, dtype=np.float64),
+            1,
+        )
+        m = float(np.nan_to_num(slope[0]))
+        c = float(intercept[0]) if np.isfinite(slope[0]) else float(np.mean(data))
+
+        # Forecast (no negative costs)
+        steps = np.arange(1, days + 1)
+        forecast_data = np.maximum(0, m * (n - 1 + steps) + c).tolist()
+        last_date = np.datetime64(labels[-1], "D")
+        forecast_labels = np.datetime_as_string(last_date + steps, unit="D").tolist()
 
         return {
             "original_labels": labels,
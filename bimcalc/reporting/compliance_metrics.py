@@ -7,9 +7,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bimcalc.db.models import DocumentLinkModel, DocumentModel, ItemModel
+from bimcalc.utils.cache import get_cache, register_cache_type
+from bimcalc.utils.cache_tags import project_tag
 from bimcalc.utils.performance import log_slow_queries
 
 
+@register_cache_type
 @dataclass
 class ComplianceMetrics:
     """Compliance metrics for project QA tracking."""
@@ -29,7 +32,10 @@ class ComplianceMetrics:
     computed_at: datetime
 
 
-# Cache configuration
+# Cache configuration: entries are tagged with the project and invalidated
+# on import/review. Documents and document links are written outside any
+# project-scoped path (RAG ingestion, scripts), so the TTL stays short to
+# bound how long a new link takes to show up.
 _CACHE_TTL_SECONDS = 300  # 5 minutes
 
 
@@ -38,24 +44,6 @@ def _get_cache_key(org_id: str, project_id: str) -> str:
     return f"compliance:{org_id}:{project_id}"
 
 
-async def _get_cached_metrics(org_id: str, project_id: str) -> ComplianceMetrics | None:
-    """Get metrics from Redis cache if valid."""
-    from bimcalc.utils.redis_cache import get_cached
-
-    cache_key = _get_cache_key(org_id, project_id)
-    return await get_cached(cache_key)
-
-
-async def _cache_metrics(
-    org_id: str, project_id: str, metrics: ComplianceMetrics
-) -> None:
-    """Store metrics in Redis cache."""
-    from bimcalc.utils.redis_cache import set_cached
-
-    cache_key = _get_cache_key(org_id, project_id)
-    await set_cached(cache_key, metrics, ttl_seconds=_CACHE_TTL_SECONDS)
-
-
 @log_slow_queries(threshold_ms=1000)  # Log if takes > 1 second
 async def compute_compliance_metrics(
     session: AsyncSession, org_id: str, project_id: str
@@ -156,7 +144,7 @@ async def compute_compliance_metrics_cached(
     """Compute compliance metrics with Redis caching.
 
     This is the preferred entry point for compliance metrics.
-    Uses Redis cache with 5-minute TTL for distributed caching.
+    Cached per project until an import or review touches the project.
 
     Args:
         session: Database session
@@ -166,15 +154,10 @@ async def compute_compliance_metrics_cached(
     Returns:
         ComplianceMetrics (cached or freshly computed)
     """
-    # Check cache first
-    cached = await _get_cached_metrics(org_id, project_id)
-    if cached:
-        return cached
-
-    # Compute fresh
-    metrics = await compute_compliance_metrics(session, org_id, project_id)
-
-    # Cache for next time
-    await _cache_metrics(org_id, project_id, metrics)
-
-    return metrics
+    # Single-flight: concurrent misses share one computation
+    return await get_cache().get_or_compute(
+        _get_cache_key(org_id, project_id),
+        lambda: compute_compliance_metrics(session, org_id, project_id),
+        ttl_seconds=_CACHE_TTL_SECONDS,
+        tags=[project_tag(org_id, project_id)],
+    )
@@ -14,15 +14,23 @@ from typing import TYPE_CHECKING, AsyncGenerator
 
 from sqlalchemy import text
 
+from bimcalc.db.search import ITEMS, dialect_name, search_sql
+
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
 
 async def export_items_csv(
-    session: AsyncSession, org_id: str, project_id: str, category: str | None = None
+    session: AsyncSession,
+    org_id: str,
+    project_id: str,
+    category: str | None = None,
+    search: str | None = None,
 ) -> AsyncGenerator[str, None]:
     """Generate CSV stream for project items with pricing.
 
+    ``search`` filters items the same way as the items list view.
+
     Yields:
         CSV rows as strings
     """
@@ -88,6 +96,11 @@ async def export_items_csv(
         sql += " AND i.category = :category"
         params["category"] = category
 
+    condition, search_params = search_sql(ITEMS, search, dialect_name(session), "i")
+    if condition:
+        sql += f" AND {condition}"
+        params.update(search_params)
+
     sql += " ORDER BY i.category, i.family, i.type_name"
 
     result = await session.stream(text(sql), params)
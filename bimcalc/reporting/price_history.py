@@ -0,0 +1,448 @@
+"""Columnar price history for analytics and forecasting.
+
+An organisation's SCD2 price versions are held as numpy columns
+(series, valid_from, unit_price, vendor) sorted by series then time, where
+a series is one (item_code, region). Trends are fitted for every series at
+once with grouped least squares, so org-wide views such as "steepest price
+inflation" cost a few array passes instead of a regression per item.
+
+Caching:
+- One ``PriceHistory`` per org per process, loaded on first use
+- Versions inserted by this process (SCD2 merge, price book ingestion) are
+  appended when their transaction commits
+- Versions written by other processes are picked up by a delta query every
+  ``DELTA_SYNC_SECONDS``; a full reload happens every ``FULL_RELOAD_SECONDS``.
+  The delta watermark is the newest ``created_at`` seen, not ``valid_from``,
+  so back-dated versions are found; it re-reads ``SYNC_OVERLAP_SECONDS``
+  before the watermark for rows whose transaction committed after a newer
+  row's, and re-read versions replace their cached copy
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, cast, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from bimcalc.db.models import PriceItemModel
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+DELTA_SYNC_SECONDS = 30.0
+FULL_RELOAD_SECONDS = 3600.0
+
+# created_at is the insert transaction's start time, so a version committed
+# late can be older than the watermark; longer imports are caught by the
+# full reload
+SYNC_OVERLAP_SECONDS = 300.0
+
+_PENDING_KEY = "bimcalc_price_versions"
+
+# (item_code, region, valid_from, unit_price, vendor_id, is_current)
+VersionRow = tuple[str, str, Any, Any, "str | None", bool]
+
+
+def epoch_seconds(values: Sequence[Any]) -> np.ndarray:
+    """Convert datetimes (naive = UTC, aware, or ISO strings) to epoch seconds."""
+    if len(values) == 0:
+        return np.empty(0, dtype=np.float64)
+    try:
+        stamps = pd.to_datetime(pd.Series(values), utc=True)
+    except (ValueError, TypeError):
+        # Mixed datetime objects and strings (e.g. raw SQLite values)
+        stamps = pd.to_datetime(pd.Series(values), utc=True, format="mixed")
+    return ((stamps - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)).to_numpy(
+        dtype=np.float64
+    )
+
+
+def to_datetimes(seconds: np.ndarray) -> list[datetime]:
+    """Naive UTC datetimes for epoch seconds (as stored by the SCD2 merge)."""
+    return [
+        datetime.fromtimestamp(s, tz=timezone.utc).replace(tzinfo=None)
+        for s in seconds.tolist()
+    ]
+
+
+def fit_linear_trends(
+    group: np.ndarray, x: np.ndarray, y: np.ndarray, n_groups: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Least-squares line ``y = slope * x + intercept`` per group, all at once.
+
+    Args:
+        group: Group index (0..n_groups-1) of every point
+        x: Point x values (e.g. epoch seconds)
+        y: Point y values
+        n_groups: Number of groups
+
+    Returns:
+        (slope, intercept, count) arrays of length ``n_groups``. Slope is NaN
+        where a group has fewer than two distinct x values.
+    """
+    counts = np.bincount(group, minlength=n_groups)
+    safe = np.maximum(counts, 1)
+    mean_x = np.bincount(group, weights=x, minlength=n_groups) / safe
+    mean_y = np.bincount(group, weights=y, minlength=n_groups) / safe
+
+    # Centre x per group: raw epoch seconds squared lose precision
+    dx = x - mean_x[group]
+    sxx = np.bincount(group, weights=dx * dx, minlength=n_groups)
+    sxy = np.bincount(group, weights=dx * (y - mean_y[group]), minlength=n_groups)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)
+    intercept = mean_y - slope * mean_x
+    return slope, intercept, counts
+
+
+@dataclass
+class SeriesTrends:
+    """Fitted trend of every series, aligned with ``PriceHistory`` series ids."""
+
+    slope: np.ndarray  # price per second
+    intercept: np.ndarray
+    points: np.ndarray
+    last_price: np.ndarray
+    annual_change_percent: np.ndarray
+
+
+class PriceHistory:
+    """All price versions of one org as columnar arrays."""
+
+    def __init__(self, org_id: str):
+        self.org_id = org_id
+
+        # Series (item_code, region) and vendor dictionaries
+        self._series_ids: dict[tuple[str, str], int] = {}
+        self.series_item_codes: list[str] = []
+        self.series_regions: list[str] = []
+        self._series_by_item: dict[str, list[int]] = defaultdict(list)
+        self._vendor_ids: dict[str | None, int] = {}
+        self.vendor_names: list[str | None] = []
+
+        # Row columns, sorted by (series, valid_from)
+        self.series = np.empty(0, dtype=np.int64)
+        self.valid_from = np.empty(0, dtype=np.float64)
+        self.price = np.empty(0, dtype=np.float64)
+        self.vendor = np.empty(0, dtype=np.int64)
+        self.is_current = np.empty(0, dtype=bool)
+        # Row range of series i is offsets[i]:offsets[i + 1]
+        self.offsets = np.zeros(1, dtype=np.int64)
+
+        self.high_water: datetime | None = None
+        self.loaded_at = time.monotonic()
+        self.synced_at = self.loaded_at
+
+        self._pending: list[VersionRow] = []
+        self._trends: SeriesTrends | None = None
+
+    # ------------------------------------------------------------------
+    # Loading and extension
+    # ------------------------------------------------------------------
+
+    @classmethod
+    async def load(cls, session: AsyncSession, org_id: str) -> PriceHistory:
+        history = cls(org_id)
+        await history.sync(session, full=True)
+        return history
+
+    async def sync(self, session: AsyncSession, full: bool = False) -> int:
+        """Fetch versions inserted since the last sync (or all of them).
+
+        Returns:
+            Number of versions read
+        """
+        query = select(
+            PriceItemModel.item_code,
+            PriceItemModel.region,
+            PriceItemModel.valid_from,
+            cast(PriceItemModel.unit_price, Float),
+            PriceItemModel.vendor_id,
+            PriceItemModel.is_current,
+            PriceItemModel.created_at,
+        ).where(PriceItemModel.org_id == self.org_id)
+        if not full and self.high_water is not None:
+            overlap = timedelta(seconds=SYNC_OVERLAP_SECONDS)
+            query = query.where(PriceItemModel.created_at > self.high_water - overlap)
+
+        rows = (await session.execute(query)).all()
+        if rows:
+            self.extend(tuple(row[:6]) for row in rows)
+            # Only database rows move the watermark; locally committed versions
+            # may be newer than another process's uncommitted-at-the-time rows
+            newest = max(row[6] for row in rows)
+            if self.high_water is None or newest > self.high_water:
+                self.high_water = newest
+        self.synced_at = time.monotonic()
+        return len(rows)
+
+    def extend(self, rows: Iterable[VersionRow]) -> None:
+        """Buffer new versions; they're merged on the next read."""
+        self._pending.extend(rows)
+
+    def _series_id(self, item_code: str, region: str) -> int:
+        key = (item_code, region)
+        series_id = self._series_ids.get(key)
+        if series_id is None:
+            series_id = len(self.series_item_codes)
+            self._series_ids[key] = series_id
+            self.series_item_codes.append(item_code)
+            self.series_regions.append(region)
+            self._series_by_item[item_code].append(series_id)
+        return series_id
+
+    def _vendor_id(self, vendor: str | None) -> int:
+        vendor_id = self._vendor_ids.get(vendor)
+        if vendor_id is None:
+            vendor_id = len(self.vendor_names)
+            self._vendor_ids[vendor] = vendor_id
+            self.vendor_names.append(vendor)
+        return vendor_id
+
+    def _compact(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+
+        item_codes, regions, valid_from, prices, vendors, current = zip(
+            *pending, strict=False
+        )
+
+        # Factorize rows, then map only the distinct keys to stable ids
+        key_codes, keys = pd.factorize(
+            pd.Series(item_codes, dtype=object)
+            + "\x1f"
+            + pd.Series(regions, dtype=object)
+        )
+        key_ids = np.fromiter(
+            (self._series_id(*key.split("\x1f", 1)) for key in keys),
+            dtype=np.int64,
+            count=len(keys),
+        )
+        series = key_ids[key_codes]
+
+        # Missing vendors factorize to -1, which indexes the appended None id
+        vendor_codes, vendor_values = pd.factorize(np.asarray(vendors, dtype=object))
+        vendor_ids = np.fromiter(
+            (self._vendor_id(v) for v in [*vendor_values, None]),
+            dtype=np.int64,
+            count=len(vendor_values) + 1,
+        )
+        vendor = vendor_ids[vendor_codes]
+
+        all_series = np.concatenate([self.series, series])
+        all_from = np.concatenate([self.valid_from, epoch_seconds(valid_from)])
+        all_price = np.concatenate([self.price, np.asarray(prices, dtype=np.float64)])
+        all_vendor = np.concatenate([self.vendor, vendor])
+        all_current = np.concatenate([self.is_current, np.asarray(current, dtype=bool)])
+
+        order = np.lexsort((all_from, all_series))
+        all_series, all_from = all_series[order], all_from[order]
+
+        # A version seen twice (local commit, overlapping delta syncs): keep the
+        # last one read, whose is_current is the freshest
+        keep = np.ones(len(order), dtype=bool)
+        keep[:-1] = (all_series[1:] != all_series[:-1]) | (
+            all_from[1:] != all_from[:-1]
+        )
+
+        self.series = all_series[keep]
+        self.valid_from = all_from[keep]
+        self.price = all_price[order][keep]
+        self.vendor = all_vendor[order][keep]
+        self.is_current = all_current[order][keep]
+
+        counts = np.bincount(self.series, minlength=len(self.series_item_codes))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._trends = None
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _last_rows(self) -> np.ndarray:
+        """Row index of the newest version of every non-empty series."""
+        ends = self.offsets[1:]
+        return ends[ends > self.offsets[:-1]] - 1
+
+    def item_history(self, item_code: str) -> list[dict[str, Any]]:
+        """Every version of ``item_code`` (all regions), oldest first."""
+        self._compact()
+        series_ids = self._series_by_item.get(item_code)
+        if not series_ids:
+            return []
+
+        rows = np.concatenate(
+            [np.arange(self.offsets[s], self.offsets[s + 1]) for s in series_ids]
+        )
+        rows = rows[np.argsort(self.valid_from[rows], kind="stable")]
+        dates = np.datetime_as_string(
+            (self.valid_from[rows] * 1e6).astype("datetime64[us]"), unit="D"
+        )
+        return [
+            {"price": price, "date": date, "vendor": self.vendor_names[vendor]}
+            for price, date, vendor in zip(
+                self.price[rows].tolist(),
+                dates.tolist(),
+                self.vendor[rows].tolist(),
+                strict=False,
+            )
+        ]
+
+    def vendor_basket(self, item_codes: Sequence[str]) -> list[dict[str, Any]]:
+        """Current price total and coverage per vendor for a basket of items."""
+        self._compact()
+        series_ids = [
+            s for code in set(item_codes) for s in self._series_by_item.get(code, ())
+        ]
+        if not series_ids:
+            return []
+
+        ids = np.asarray(series_ids, dtype=np.int64)
+        ids = ids[self.offsets[ids + 1] > self.offsets[ids]]
+        last = self.offsets[ids + 1] - 1
+        last = last[self.is_current[last]]
+
+        n_vendors = len(self.vendor_names)
+        totals = np.bincount(
+            self.vendor[last], weights=self.price[last], minlength=n_vendors
+        )
+        counts = np.bincount(self.vendor[last], minlength=n_vendors)
+
+        return [
+            {
+                "vendor": self.vendor_names[v],
+                "total_cost": float(totals[v]),
+                "item_count": int(counts[v]),
+                "coverage_percent": (int(counts[v]) / len(item_codes)) * 100,
+            }
+            for v in np.flatnonzero(counts).tolist()
+        ]
+
+    def trends(self) -> SeriesTrends:
+        """Linear price trend of every series (cached until new versions arrive)."""
+        self._compact()
+        if self._trends is not None:
+            return self._trends
+
+        n_series = len(self.series_item_codes)
+        slope, intercept, points = fit_linear_trends(
+            self.series, self.valid_from, self.price, n_series
+        )
+        last_price = np.full(n_series, np.nan)
+        last_rows = self._last_rows()
+        last_price[self.series[last_rows]] = self.price[last_rows]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            annual = np.where(
+                last_price != 0, slope * SECONDS_PER_YEAR / last_price * 100, 0.0
+            )
+
+        self._trends = SeriesTrends(slope, intercept, points, last_price, annual)
+        return self._trends
+
+    def steepest_inflation(
+        self, limit: int = 20, min_points: int = 2, region: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Series with the highest annualised price increase."""
+        trends = self.trends()
+        eligible = (trends.points >= min_points) & np.isfinite(
+            trends.annual_change_percent
+        )
+        if region is not None:
+            eligible &= np.asarray(self.series_regions, dtype=object) == region
+
+        candidates = np.flatnonzero(eligible)
+        if len(candidates) == 0 or limit <= 0:
+            return []
+        if len(candidates) > limit:
+            top = np.argpartition(-trends.annual_change_percent[candidates], limit - 1)
+            candidates = candidates[top[:limit]]
+        candidates = candidates[np.argsort(-trends.annual_change_percent[candidates])]
+
+        return [
+            {
+                "item_code": self.series_item_codes[s],
+                "region": self.series_regions[s],
+                "annual_change_percent": float(trends.annual_change_percent[s]),
+                "current_price": float(trends.last_price[s]),
+                "versions": int(trends.points[s]),
+            }
+            for s in candidates.tolist()
+        ]
+
+
+# ============================================================================
+# Per-process cache
+# ============================================================================
+
+_histories: dict[str, PriceHistory] = {}
+
+
+async def get_price_history(session: AsyncSession, org_id: str) -> PriceHistory:
+    """Cached price history for ``org_id``, synced with the database."""
+    history = _histories.get(org_id)
+    now = time.monotonic()
+
+    if history is None or now - history.loaded_at > FULL_RELOAD_SECONDS:
+        history = await PriceHistory.load(session, org_id)
+        _histories[org_id] = history
+        logger.debug(
+            "Loaded price history for %s: %s series",
+            org_id,
+            len(history.series_item_codes),
+        )
+    elif now - history.synced_at > DELTA_SYNC_SECONDS:
+        await history.sync(session)
+    return history
+
+
+def clear_price_history_cache() -> None:
+    _histories.clear()
+
+
+def stage_price_version(
+    session: AsyncSession | Session,
+    org_id: str,
+    item_code: str,
+    region: str,
+    valid_from: datetime,
+    unit_price: Any,
+    vendor_id: str | None,
+) -> None:
+    """Append a new version to cached histories once ``session`` commits."""
+    pending: list = session.info.setdefault(_PENDING_KEY, [])
+    pending.append(
+        (org_id, (item_code, region, valid_from, float(unit_price), vendor_id, True))
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _extend_on_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    by_org: dict[str, list[VersionRow]] = defaultdict(list)
+    for org_id, row in pending:
+        if org_id in _histories:
+            by_org[org_id].append(row)
+    for org_id, rows in by_org.items():
+        _histories[org_id].extend(rows)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_on_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
@@ -6,15 +6,21 @@ financial exposure for stakeholder reporting.
 
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from decimal import Decimal
 
-from sqlalchemy import and_, func, select, text
+from sqlalchemy import and_, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bimcalc.db.models import ItemModel, PriceItemModel
+from bimcalc.utils.cache import get_cache, register_cache_type
+from bimcalc.utils.cache_tags import prices_tag
+from bimcalc.utils.performance import log_slow_queries
 
 
+@register_cache_type
 @dataclass
 class PriceMetrics:
     """Executive-level price data quality metrics."""
@@ -108,6 +114,64 @@ def _calculate_quality_score(
     return max(0, min(100, int(score)))
 
 
+# Cache configuration: entries are tagged with the org's price catalog and
+# invalidated by every price import, so the TTL only bounds how far the
+# age/staleness counts drift with the clock
+_CACHE_TTL_SECONDS = 3600
+
+
+def _get_cache_key(org_id: str) -> str:
+    """Generate cache key for metrics."""
+    return f"price_metrics:{org_id}"
+
+
+def _epoch_seconds(column, dialect: str):
+    """SQL expression for a timestamp column as Unix seconds."""
+    if dialect == "postgresql":
+        return func.extract("epoch", column)
+    # SQLite stores timestamps as ISO text; julianday() parses them
+    return (func.julianday(column) - 2440587.5) * 86400.0
+
+
+def _as_utc(value: datetime | str | None) -> datetime | None:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value is not None and value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value
+
+
+async def _median_price(
+    session: AsyncSession, org_id: str, count: int, dialect: str
+) -> float | None:
+    """Median current unit price (PERCENTILE_CONT where available)."""
+    current = and_(PriceItemModel.org_id == org_id, PriceItemModel.is_current == True)
+    if dialect == "postgresql":
+        median = (
+            await session.execute(
+                select(
+                    func.percentile_cont(0.5).within_group(PriceItemModel.unit_price)
+                ).where(current)
+            )
+        ).scalar()
+        return float(median) if median else None
+
+    # Portable fallback: the middle one or two rows of the sorted prices
+    result = await session.execute(
+        select(PriceItemModel.unit_price)
+        .where(current)
+        .order_by(PriceItemModel.unit_price)
+        .offset((count - 1) // 2)
+        .limit(2 - count % 2)
+    )
+    middle = result.scalars().all()
+    if not middle:
+        return None
+    median = sum(float(p) for p in middle) / len(middle)
+    return median if median else None
+
+
+@log_slow_queries(threshold_ms=1000)
 async def compute_price_metrics(
     session: AsyncSession, org_id: str = "default"
 ) -> PriceMetrics:
@@ -116,6 +180,12 @@ async def compute_price_metrics(
     Provides oversight on pricebook health, coverage, and staleness
     for stakeholder reporting and vendor management.
 
+    Inventory, currency, VAT, price range, staleness, classification and
+    vendor figures all come from one scan of the org's price rows grouped
+    by (is_current, classification, vendor, currency); only the median,
+    the ten most expensive items and the item classification count need
+    their own (index-backed) queries.
+
     Args:
         session: Database session
         org_id: Organization ID (prices are org-scoped, not project-scoped)
@@ -125,94 +195,111 @@ async def compute_price_metrics(
     """
 
     now = datetime.now(UTC)
+    dialect = session.bind.dialect.name if session.bind else "sqlite"
+
+    thirty_days_ago = now - timedelta(days=30)
+    ninety_days_ago = now - timedelta(days=90)
+    one_year_ago = now - timedelta(days=365)
+
+    def _count_where(condition):
+        return func.sum(case((condition, 1), else_=0))
 
     # ========================================================================
-    # 1. Overall Inventory
+    # 1. Grouped Scan
     # ========================================================================
 
-    total_query = select(func.count(PriceItemModel.id)).where(
-        PriceItemModel.org_id == org_id
+    scan_query = (
+        select(
+            PriceItemModel.is_current,
+            PriceItemModel.classification_code,
+            PriceItemModel.vendor_id,
+            PriceItemModel.currency,
+            func.count().label("count"),
+            func.count(PriceItemModel.vat_rate).label("vat_specified"),
+            func.sum(PriceItemModel.unit_price).label("sum_price"),
+            func.min(PriceItemModel.unit_price).label("min_price"),
+            func.max(PriceItemModel.unit_price).label("max_price"),
+            func.min(PriceItemModel.last_updated).label("oldest"),
+            func.sum(_epoch_seconds(PriceItemModel.last_updated, dialect)).label(
+                "sum_epoch"
+            ),
+            _count_where(PriceItemModel.last_updated >= thirty_days_ago).label(
+                "fresh_30"
+            ),
+            _count_where(PriceItemModel.last_updated >= ninety_days_ago).label(
+                "fresh_90"
+            ),
+            _count_where(PriceItemModel.last_updated < one_year_ago).label("stale"),
+        )
+        .where(PriceItemModel.org_id == org_id)
+        .group_by(
+            PriceItemModel.is_current,
+            PriceItemModel.classification_code,
+            PriceItemModel.vendor_id,
+            PriceItemModel.currency,
+        )
     )
-    total_price_items = (await session.execute(total_query)).scalar_one()
+    groups = (await session.execute(scan_query)).all()
 
+    total_price_items = sum(g.count for g in groups)
     if total_price_items == 0:
         return _empty_metrics()
 
-    current_query = select(func.count(PriceItemModel.id)).where(
-        and_(PriceItemModel.org_id == org_id, PriceItemModel.is_current == True)
-    )
-    current_price_items = (await session.execute(current_query)).scalar_one()
+    current = [g for g in groups if g.is_current]
+    current_price_items = sum(g.count for g in current)
     historical_price_items = total_price_items - current_price_items
 
     # ========================================================================
     # 2. Currency & VAT Distribution
     # ========================================================================
 
-    currency_query = (
-        select(PriceItemModel.currency, func.count(PriceItemModel.id).label("count"))
-        .where(and_(PriceItemModel.org_id == org_id, PriceItemModel.is_current == True))
-        .group_by(PriceItemModel.currency)
-    )
-
-    currency_result = await session.execute(currency_query)
-    currencies = currency_result.all()
+    currency_counts = Counter()
+    for g in current:
+        currency_counts[g.currency] += g.count
 
     # Primary currency (most common)
-    primary_currency = currencies[0][0] if currencies else "EUR"
-    currencies_found = [c[0] for c in currencies]
-
-    # VAT distribution
-    vat_specified_query = select(func.count(PriceItemModel.id)).where(
-        and_(
-            PriceItemModel.org_id == org_id,
-            PriceItemModel.is_current == True,
-            PriceItemModel.vat_rate.isnot(None),
-        )
+    primary_currency = (
+        currency_counts.most_common(1)[0][0] if currency_counts else "EUR"
     )
-    vat_specified_count = (await session.execute(vat_specified_query)).scalar_one()
+    currencies_found = list(currency_counts)
+
+    vat_specified_count = sum(g.vat_specified for g in current)
     vat_unspecified_count = current_price_items - vat_specified_count
 
     # ========================================================================
     # 3. Price Ranges (current items only)
     # ========================================================================
 
-    stats_query = select(
-        func.min(PriceItemModel.unit_price).label("min_price"),
-        func.max(PriceItemModel.unit_price).label("max_price"),
-        func.avg(PriceItemModel.unit_price).label("avg_price"),
-    ).where(and_(PriceItemModel.org_id == org_id, PriceItemModel.is_current == True))
-    stats = (await session.execute(stats_query)).one()
-
-    min_unit_price = float(stats.min_price) if stats.min_price else None
-    max_unit_price = float(stats.max_price) if stats.max_price else None
-    avg_unit_price = float(stats.avg_price) if stats.avg_price else None
-
-    # Median (approximate using percentile)
-    median_query = text("""
-        SELECT PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY unit_price)
-        FROM price_items
-        WHERE org_id = :org_id AND is_current = true
-    """)
-    median_result = await session.execute(median_query, {"org_id": org_id})
-    median_unit_price = median_result.scalar()
+    min_price = min((g.min_price for g in current), default=None)
+    max_price = max((g.max_price for g in current), default=None)
+    sum_price = sum((g.sum_price or 0 for g in current), Decimal(0))
+
+    min_unit_price = float(min_price) if min_price else None
+    max_unit_price = float(max_price) if max_price else None
+    avg_unit_price = (
+        float(sum_price / current_price_items) if current_price_items else None
+    ) or None
+
+    median_unit_price = (
+        await _median_price(session, org_id, current_price_items, dialect)
+        if current_price_items
+        else None
+    )
 
     # ========================================================================
     # 4. Classification Coverage
     # ========================================================================
 
-    # Count distinct classifications with prices
-    class_with_prices_query = select(
-        func.count(func.distinct(PriceItemModel.classification_code))
-    ).where(
-        and_(
-            PriceItemModel.org_id == org_id,
-            PriceItemModel.is_current == True,
-            PriceItemModel.classification_code.isnot(None),
-        )
-    )
-    classifications_with_prices = (
-        await session.execute(class_with_prices_query)
-    ).scalar_one()
+    by_class: dict[str, list] = {}  # code -> [count, sum, min, max]
+    for g in current:
+        if g.classification_code is None:
+            continue
+        stats = by_class.setdefault(g.classification_code, [0, Decimal(0), None, None])
+        stats[0] += g.count
+        stats[1] += g.sum_price or 0
+        stats[2] = g.min_price if stats[2] is None else min(stats[2], g.min_price)
+        stats[3] = g.max_price if stats[3] is None else max(stats[3], g.max_price)
+    classifications_with_prices = len(by_class)
 
     # Total distinct classifications needed (from Items table)
     total_class_query = select(
@@ -231,88 +318,36 @@ async def compute_price_metrics(
     )
 
     # Top classifications by count
-    top_class_query = (
-        select(
-            PriceItemModel.classification_code,
-            func.count(PriceItemModel.id).label("count"),
-            func.avg(PriceItemModel.unit_price).label("avg_price"),
-            func.min(PriceItemModel.unit_price).label("min_price"),
-            func.max(PriceItemModel.unit_price).label("max_price"),
-        )
-        .where(
-            and_(
-                PriceItemModel.org_id == org_id,
-                PriceItemModel.is_current == True,
-                PriceItemModel.classification_code.isnot(None),
-            )
-        )
-        .group_by(PriceItemModel.classification_code)
-        .order_by(func.count(PriceItemModel.id).desc())
-        .limit(10)
-    )
-
-    top_class_result = await session.execute(top_class_query)
     top_classifications = [
         {
-            "code": row.classification_code,
-            "count": row.count,
-            "avg_price": float(row.avg_price) if row.avg_price else 0,
-            "min_price": float(row.min_price) if row.min_price else 0,
-            "max_price": float(row.max_price) if row.max_price else 0,
+            "code": code,
+            "count": count,
+            "avg_price": float(total / count) if total else 0,
+            "min_price": float(low) if low else 0,
+            "max_price": float(high) if high else 0,
         }
-        for row in top_class_result.all()
+        for code, (count, total, low, high) in sorted(
+            by_class.items(), key=lambda kv: (-kv[1][0], str(kv[0]))
+        )[:10]
     ]
 
     # ========================================================================
     # 5. Staleness Metrics
     # ========================================================================
 
-    # Age calculations
-    age_query = select(
-        func.min(PriceItemModel.last_updated).label("oldest"),
-        func.avg(
-            func.extract("epoch", now - PriceItemModel.last_updated) / 86400
-        ).label("avg_age_days"),
-    ).where(and_(PriceItemModel.org_id == org_id, PriceItemModel.is_current == True))
-    age_stats = (await session.execute(age_query)).one()
+    oldest = min((_as_utc(g.oldest) for g in current if g.oldest), default=None)
+    oldest_price_days = (now - oldest).days if oldest else None
 
-    oldest_price_days = None
-    if age_stats.oldest:
-        oldest_price_days = (now - age_stats.oldest).days
+    sum_epoch = sum(float(g.sum_epoch or 0) for g in current)
+    avg_age_days = (
+        (now.timestamp() - sum_epoch / current_price_items) / 86400
+        if current_price_items
+        else None
+    ) or None
 
-    avg_age_days = float(age_stats.avg_age_days) if age_stats.avg_age_days else None
-
-    # Recent updates
-    thirty_days_ago = now - timedelta(days=30)
-    ninety_days_ago = now - timedelta(days=90)
-    one_year_ago = now - timedelta(days=365)
-
-    recent_30_query = select(func.count(PriceItemModel.id)).where(
-        and_(
-            PriceItemModel.org_id == org_id,
-            PriceItemModel.is_current == True,
-            PriceItemModel.last_updated >= thirty_days_ago,
-        )
-    )
-    prices_updated_last_30_days = (await session.execute(recent_30_query)).scalar_one()
-
-    recent_90_query = select(func.count(PriceItemModel.id)).where(
-        and_(
-            PriceItemModel.org_id == org_id,
-            PriceItemModel.is_current == True,
-            PriceItemModel.last_updated >= ninety_days_ago,
-        )
-    )
-    prices_updated_last_90_days = (await session.execute(recent_90_query)).scalar_one()
-
-    stale_query = select(func.count(PriceItemModel.id)).where(
-        and_(
-            PriceItemModel.org_id == org_id,
-            PriceItemModel.is_current == True,
-            PriceItemModel.last_updated < one_year_ago,
-        )
-    )
-    stale_prices_count = (await session.execute(stale_query)).scalar_one()
+    prices_updated_last_30_days = sum(g.fresh_30 or 0 for g in current)
+    prices_updated_last_90_days = sum(g.fresh_90 or 0 for g in current)
+    stale_prices_count = sum(g.stale or 0 for g in current)
 
     # ========================================================================
     # 6. Top Expensive Items
@@ -349,43 +384,24 @@ async def compute_price_metrics(
     # 7. Vendor Distribution
     # ========================================================================
 
-    vendor_count_query = select(
-        func.count(func.distinct(PriceItemModel.vendor_id))
-    ).where(
-        and_(
-            PriceItemModel.org_id == org_id,
-            PriceItemModel.is_current == True,
-            PriceItemModel.vendor_id.isnot(None),
-        )
-    )
-    unique_vendors = (await session.execute(vendor_count_query)).scalar_one()
+    by_vendor: dict[str, list] = {}  # vendor -> [count, sum]
+    for g in current:
+        if g.vendor_id is None:
+            continue
+        stats = by_vendor.setdefault(g.vendor_id, [0, Decimal(0)])
+        stats[0] += g.count
+        stats[1] += g.sum_price or 0
+    unique_vendors = len(by_vendor)
 
-    top_vendors_query = (
-        select(
-            PriceItemModel.vendor_id,
-            func.count(PriceItemModel.id).label("count"),
-            func.avg(PriceItemModel.unit_price).label("avg_price"),
-        )
-        .where(
-            and_(
-                PriceItemModel.org_id == org_id,
-                PriceItemModel.is_current == True,
-                PriceItemModel.vendor_id.isnot(None),
-            )
-        )
-        .group_by(PriceItemModel.vendor_id)
-        .order_by(func.count(PriceItemModel.id).desc())
-        .limit(10)
-    )
-
-    top_vendors_result = await session.execute(top_vendors_query)
     top_vendors = [
         {
-            "vendor": row.vendor_id,
-            "count": row.count,
-            "avg_price": float(row.avg_price) if row.avg_price else 0,
+            "vendor": vendor,
+            "count": count,
+            "avg_price": float(total / count) if total else 0,
         }
-        for row in top_vendors_result.all()
+        for vendor, (count, total) in sorted(
+            by_vendor.items(), key=lambda kv: (-kv[1][0], kv[0])
+        )[:10]
     ]
 
     # ========================================================================
@@ -434,7 +450,7 @@ async def compute_price_metrics(
         min_unit_price=min_unit_price,
         max_unit_price=max_unit_price,
         avg_unit_price=avg_unit_price,
-        median_unit_price=float(median_unit_price) if median_unit_price else None,
+        median_unit_price=median_unit_price,
         classifications_with_prices=classifications_with_prices,
         total_classifications=total_classifications,
         classification_coverage_pct=classification_coverage_pct,
@@ -453,6 +469,29 @@ async def compute_price_metrics(
     )
 
 
+async def compute_price_metrics_cached(
+    session: AsyncSession, org_id: str = "default"
+) -> PriceMetrics:
+    """Compute price metrics with Redis caching.
+
+    This is the preferred entry point for price metrics. Cached per org
+    until the next price import commits (``prices:{org}`` tag).
+
+    Args:
+        session: Database session
+        org_id: Organization ID
+
+    Returns:
+        PriceMetrics (cached or freshly computed)
+    """
+    return await get_cache().get_or_compute(
+        _get_cache_key(org_id),
+        lambda: compute_price_metrics(session, org_id),
+        ttl_seconds=_CACHE_TTL_SECONDS,
+        tags=[prices_tag(org_id)],
+    )
+
+
 def _empty_metrics() -> PriceMetrics:
     """Return empty metrics for when no price data exists."""
     return PriceMetrics(
@@ -1,20 +1,47 @@
 """Review UI data models and services."""
 
-from bimcalc.review.models import ReviewFlag, ReviewItem, ReviewPrice, ReviewRecord
+from bimcalc.review.models import (
+    BulkReviewFailure,
+    BulkReviewOutcome,
+    ReviewCursor,
+    ReviewFlag,
+    ReviewItem,
+    ReviewPage,
+    ReviewPrice,
+    ReviewQueueCounts,
+    ReviewRecord,
+)
 from bimcalc.review.repository import (
     fetch_available_classifications,
     fetch_pending_reviews,
+    fetch_review_counts,
+    fetch_review_page,
     fetch_review_record,
+    fetch_review_records,
+)
+from bimcalc.review.service import (
+    approve_review_record,
+    bulk_approve_review_records,
+    bulk_reject_review_records,
 )
-from bimcalc.review.service import approve_review_record
 
 __all__ = [
+    "BulkReviewFailure",
+    "BulkReviewOutcome",
+    "ReviewCursor",
     "ReviewFlag",
     "ReviewItem",
+    "ReviewPage",
     "ReviewPrice",
+    "ReviewQueueCounts",
     "ReviewRecord",
     "fetch_available_classifications",
     "fetch_pending_reviews",
+    "fetch_review_counts",
+    "fetch_review_page",
     "fetch_review_record",
+    "fetch_review_records",
     "approve_review_record",
+    "bulk_approve_review_records",
+    "bulk_reject_review_records",
 ]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import base64
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
@@ -100,3 +101,75 @@ class ReviewRecord:
         ):
             return False
         return self.item.classification_code != self.price.classification_code
+
+
+@dataclass(frozen=True, slots=True)
+class ReviewCursor:
+    """Keyset position in the review queue, ordered by (timestamp, id)."""
+
+    timestamp: datetime
+    match_result_id: UUID
+
+    @classmethod
+    def after(cls, record: ReviewRecord) -> ReviewCursor:
+        return cls(timestamp=record.timestamp, match_result_id=record.match_result_id)
+
+    def encode(self) -> str:
+        raw = f"{self.timestamp.isoformat()}|{self.match_result_id.hex}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> ReviewCursor:
+        """Parse a token produced by ``encode``; raises ValueError if malformed."""
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode()).decode()
+            timestamp, match_result_id = raw.split("|", 1)
+            return cls(
+                timestamp=datetime.fromisoformat(timestamp),
+                match_result_id=UUID(hex=match_result_id),
+            )
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ValueError(f"Invalid review cursor: {token!r}") from exc
+
+
+@dataclass(slots=True)
+class ReviewPage:
+    records: list[ReviewRecord]
+    next_cursor: str | None = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+@dataclass(slots=True)
+class ReviewQueueCounts:
+    """Pending-review counts per filter value, from one grouped query."""
+
+    total: int = 0
+    unmapped: int = 0
+    # Reviews matching the active filters
+    filtered: int = 0
+    by_flag_type: dict[str, int] = field(default_factory=dict)
+    by_severity: dict[str, int] = field(default_factory=dict)
+    by_classification: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class BulkReviewFailure:
+    match_result_id: UUID
+    error: str
+
+
+@dataclass(slots=True)
+class BulkReviewOutcome:
+    """Per-row outcome of a bulk approve/reject operation."""
+
+    action: str
+    processed: list[UUID] = field(default_factory=list)
+    failures: list[BulkReviewFailure] = field(default_factory=list)
+
+    @property
+    def processed_count(self) -> int:
+        return len(self.processed)
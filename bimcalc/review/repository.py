@@ -6,8 +6,22 @@ from collections import defaultdict
 from collections.abc import Sequence
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import (
+    String,
+    and_,
+    cast,
+    distinct,
+    exists,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    true,
+    union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from bimcalc.db.models import (
     ItemModel,
@@ -16,7 +30,15 @@ from bimcalc.db.models import (
     PriceItemModel,
 )
 from bimcalc.models import FlagSeverity
-from bimcalc.review.models import ReviewFlag, ReviewItem, ReviewPrice, ReviewRecord
+from bimcalc.review.models import (
+    ReviewCursor,
+    ReviewFlag,
+    ReviewItem,
+    ReviewPage,
+    ReviewPrice,
+    ReviewQueueCounts,
+    ReviewRecord,
+)
 
 
 async def fetch_pending_reviews(
@@ -27,44 +49,45 @@ async def fetch_pending_reviews(
     severity_filter: FlagSeverity | None = None,
     unmapped_only: bool = False,
     classification_filter: str | None = None,
+    after: ReviewCursor | None = None,
+    limit: int | None = None,
 ) -> list[ReviewRecord]:
     """Return latest manual-review items for the project.
 
+    All filters are evaluated in SQL; results are ordered by (timestamp, id)
+    so ``after``/``limit`` give stable keyset pagination.
+
     Args:
         unmapped_only: If True, only return items with no matched price (price_item_id IS NULL)
         classification_filter: If provided, only return items with this classification code
+        after: Only return records positioned after this cursor
+        limit: Maximum number of records to return (None = all)
     """
-
-    # Find the latest match result for each item (regardless of decision)
-    latest_subquery = (
-        select(
-            MatchResultModel.item_id.label("item_id"),
-            func.max(MatchResultModel.timestamp).label("max_ts"),
-        )
+    stmt = (
+        select(MatchResultModel, ItemModel, PriceItemModel)
         .join(ItemModel, ItemModel.id == MatchResultModel.item_id)
+        .outerjoin(PriceItemModel, MatchResultModel.price_item_id == PriceItemModel.id)
         .where(
-            ItemModel.org_id == org_id,
-            ItemModel.project_id == project_id,
+            *_pending_review_conditions(org_id, project_id),
+            *_filter_conditions(
+                flag_types, severity_filter, unmapped_only, classification_filter
+            ),
         )
-        .group_by(MatchResultModel.item_id)
-        .subquery()
+        .order_by(MatchResultModel.timestamp.asc(), MatchResultModel.id.asc())
     )
 
-    # Then filter for items whose latest decision is manual-review
-    stmt = (
-        select(MatchResultModel, ItemModel, PriceItemModel)
-        .join(
-            latest_subquery,
-            and_(
-                MatchResultModel.item_id == latest_subquery.c.item_id,
-                MatchResultModel.timestamp == latest_subquery.c.max_ts,
-            ),
+    if after is not None:
+        stmt = stmt.where(
+            or_(
+                MatchResultModel.timestamp > after.timestamp,
+                and_(
+                    MatchResultModel.timestamp == after.timestamp,
+                    MatchResultModel.id > after.match_result_id,
+                ),
+            )
         )
-        .join(ItemModel, ItemModel.id == MatchResultModel.item_id)
-        .outerjoin(PriceItemModel, MatchResultModel.price_item_id == PriceItemModel.id)
-        .where(MatchResultModel.decision == "manual-review")
-        .order_by(MatchResultModel.timestamp.asc())
-    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
 
     rows = await session.execute(stmt)
     records = rows.all()
@@ -74,33 +97,142 @@ async def fetch_pending_reviews(
     match_ids = [row.MatchResultModel.id for row in records]
     flags_by_match = await _load_flags(session, match_ids)
 
-    review_records: list[ReviewRecord] = []
-    for row in records:
-        match_result = row.MatchResultModel
-        item_model = row.ItemModel
-        price_model = row.PriceItemModel
-
-        flags = flags_by_match.get(match_result.id, [])
-        record = ReviewRecord(
-            match_result_id=match_result.id,
-            item=_to_review_item(item_model),
-            price=_to_review_price(price_model) if price_model else None,
-            confidence_score=match_result.confidence_score,
-            source=match_result.source,
-            reason=match_result.reason,
-            created_by=match_result.created_by,
-            timestamp=match_result.timestamp,
-            flags=flags,
+    return [
+        ReviewRecord(
+            match_result_id=row.MatchResultModel.id,
+            item=_to_review_item(row.ItemModel),
+            price=_to_review_price(row.PriceItemModel) if row.PriceItemModel else None,
+            confidence_score=row.MatchResultModel.confidence_score,
+            source=row.MatchResultModel.source,
+            reason=row.MatchResultModel.reason,
+            created_by=row.MatchResultModel.created_by,
+            timestamp=row.MatchResultModel.timestamp,
+            flags=flags_by_match.get(row.MatchResultModel.id, []),
         )
+        for row in records
+    ]
 
-        if not _matches_filters(
-            record, flag_types, severity_filter, unmapped_only, classification_filter
-        ):
-            continue
 
-        review_records.append(record)
+async def fetch_review_page(
+    session: AsyncSession,
+    org_id: str,
+    project_id: str,
+    flag_types: Sequence[str] | None = None,
+    severity_filter: FlagSeverity | None = None,
+    unmapped_only: bool = False,
+    classification_filter: str | None = None,
+    cursor: str | None = None,
+    limit: int = 100,
+) -> ReviewPage:
+    """Return one keyset page of the review queue.
+
+    Fetches ``limit + 1`` rows to detect whether another page exists, so
+    latency depends on the page size rather than the queue size.
+
+    Raises:
+        ValueError: If ``cursor`` is not a valid token
+    """
+    after = ReviewCursor.decode(cursor) if cursor else None
+    records = await fetch_pending_reviews(
+        session,
+        org_id,
+        project_id,
+        flag_types=flag_types,
+        severity_filter=severity_filter,
+        unmapped_only=unmapped_only,
+        classification_filter=classification_filter,
+        after=after,
+        limit=limit + 1,
+    )
+
+    if len(records) <= limit:
+        return ReviewPage(records=records)
+
+    records = records[:limit]
+    return ReviewPage(
+        records=records, next_cursor=ReviewCursor.after(records[-1]).encode()
+    )
+
+
+async def fetch_review_counts(
+    session: AsyncSession,
+    org_id: str,
+    project_id: str,
+    flag_types: Sequence[str] | None = None,
+    severity_filter: FlagSeverity | None = None,
+    unmapped_only: bool = False,
+    classification_filter: str | None = None,
+) -> ReviewQueueCounts:
+    """Count pending reviews per filter value in a single round trip.
+
+    One UNION ALL statement groups the pending set by classification, flag
+    type and severity, plus total and unmapped counts. Flag counts are of
+    distinct match results, matching the semantics of the filters.
+    ``filtered`` counts the reviews matching the given filters (the total
+    when there are none).
+    """
+    filters = _filter_conditions(
+        flag_types, severity_filter, unmapped_only, classification_filter
+    )
+    pending = (
+        select(
+            MatchResultModel.id.label("match_result_id"),
+            MatchResultModel.price_item_id.label("price_item_id"),
+            ItemModel.classification_code.label("classification_code"),
+            (and_(*filters) if filters else true()).label("filtered"),
+        )
+        .join(ItemModel, ItemModel.id == MatchResultModel.item_id)
+        .where(*_pending_review_conditions(org_id, project_id))
+        .cte("pending")
+    )
+
+    distinct_matches = func.count(distinct(pending.c.match_result_id))
+    union = union_all(
+        select(
+            literal("total").label("bucket"),
+            cast(null(), String).label("key"),
+            func.count().label("count"),
+        ).select_from(pending),
+        select(literal("unmapped"), cast(null(), String), func.count())
+        .select_from(pending)
+        .where(pending.c.price_item_id.is_(None)),
+        select(literal("filtered"), cast(null(), String), func.count())
+        .select_from(pending)
+        .where(pending.c.filtered),
+        select(
+            literal("classification"),
+            cast(pending.c.classification_code, String),
+            func.count(),
+        )
+        .select_from(pending)
+        .group_by(pending.c.classification_code),
+        select(literal("flag_type"), MatchFlagModel.flag_type, distinct_matches)
+        .select_from(pending)
+        .join(MatchFlagModel, MatchFlagModel.match_result_id == pending.c.match_result_id)
+        .group_by(MatchFlagModel.flag_type),
+        select(literal("severity"), MatchFlagModel.severity, distinct_matches)
+        .select_from(pending)
+        .join(MatchFlagModel, MatchFlagModel.match_result_id == pending.c.match_result_id)
+        .group_by(MatchFlagModel.severity),
+    )
 
-    return review_records
+    counts = ReviewQueueCounts()
+    for row in (await session.execute(union)).all():
+        if row.bucket == "total":
+            counts.total = row.count
+        elif row.bucket == "unmapped":
+            counts.unmapped = row.count
+        elif row.bucket == "filtered":
+            counts.filtered = row.count
+        elif row.bucket == "classification":
+            if row.key is not None:
+                counts.by_classification[row.key] = row.count
+        elif row.bucket == "flag_type":
+            counts.by_flag_type[row.key] = row.count
+        elif row.bucket == "severity":
+            counts.by_severity[row.key] = row.count
+
+    return counts
 
 
 async def fetch_available_classifications(
@@ -148,32 +280,62 @@ async def fetch_review_record(
     session: AsyncSession,
     match_result_id: UUID,
 ) -> ReviewRecord | None:
+    records = await fetch_review_records(session, [match_result_id])
+    return records.get(match_result_id)
+
+
+async def fetch_review_records(
+    session: AsyncSession,
+    match_result_ids: Sequence[UUID],
+    org_id: str | None = None,
+    project_id: str | None = None,
+) -> dict[UUID, ReviewRecord]:
+    """Load many review records with one joined query plus one flag query.
+
+    Args:
+        org_id: If provided, only return records whose item belongs to this org
+        project_id: If provided, only return records whose item belongs to this project
+
+    Returns:
+        Mapping of match_result_id -> ReviewRecord (missing IDs are omitted)
+    """
+    if not match_result_ids:
+        return {}
+
     stmt = (
         select(MatchResultModel, ItemModel, PriceItemModel)
         .join(ItemModel, ItemModel.id == MatchResultModel.item_id)
         .outerjoin(PriceItemModel, MatchResultModel.price_item_id == PriceItemModel.id)
-        .where(MatchResultModel.id == match_result_id)
+        .where(MatchResultModel.id.in_(match_result_ids))
     )
+    if org_id is not None:
+        stmt = stmt.where(ItemModel.org_id == org_id)
+    if project_id is not None:
+        stmt = stmt.where(ItemModel.project_id == project_id)
 
-    row = (await session.execute(stmt)).one_or_none()
-    if row is None:
-        return None
+    rows = (await session.execute(stmt)).all()
+    if not rows:
+        return {}
 
-    flags_by_match = await _load_flags(session, [match_result_id])
-    flags = flags_by_match.get(match_result_id, [])
-
-    return ReviewRecord(
-        match_result_id=row.MatchResultModel.id,
-        item=_to_review_item(row.ItemModel),
-        price=_to_review_price(row.PriceItemModel) if row.PriceItemModel else None,
-        confidence_score=row.MatchResultModel.confidence_score,
-        source=row.MatchResultModel.source,
-        reason=row.MatchResultModel.reason,
-        created_by=row.MatchResultModel.created_by,
-        timestamp=row.MatchResultModel.timestamp,
-        flags=flags,
+    flags_by_match = await _load_flags(
+        session, [row.MatchResultModel.id for row in rows]
     )
 
+    return {
+        row.MatchResultModel.id: ReviewRecord(
+            match_result_id=row.MatchResultModel.id,
+            item=_to_review_item(row.ItemModel),
+            price=_to_review_price(row.PriceItemModel) if row.PriceItemModel else None,
+            confidence_score=row.MatchResultModel.confidence_score,
+            source=row.MatchResultModel.source,
+            reason=row.MatchResultModel.reason,
+            created_by=row.MatchResultModel.created_by,
+            timestamp=row.MatchResultModel.timestamp,
+            flags=flags_by_match.get(row.MatchResultModel.id, []),
+        )
+        for row in rows
+    }
+
 
 async def _load_flags(
     session: AsyncSession, match_result_ids: Sequence[UUID]
@@ -200,33 +362,59 @@ async def _load_flags(
     return flags_by_match
 
 
-def _matches_filters(
-    record: ReviewRecord,
+def _pending_review_conditions(org_id: str, project_id: str) -> list:
+    """Latest match result per item, restricted to manual-review decisions.
+
+    Uses NOT EXISTS against a newer result for the same item instead of a
+    grouped max(timestamp) subquery, so the planner can walk
+    ``idx_match_results_decision_ts`` in order and stop at the page limit.
+    """
+    newer = aliased(MatchResultModel)
+    return [
+        ItemModel.org_id == org_id,
+        ItemModel.project_id == project_id,
+        MatchResultModel.decision == "manual-review",
+        ~exists().where(
+            newer.item_id == MatchResultModel.item_id,
+            newer.timestamp > MatchResultModel.timestamp,
+        ),
+    ]
+
+
+def _filter_conditions(
     flag_types: Sequence[str] | None,
     severity_filter: FlagSeverity | None,
     unmapped_only: bool = False,
     classification_filter: str | None = None,
-) -> bool:
+) -> list:
+    conditions = []
+
     # Filter for unmapped items (no matched price)
-    if unmapped_only and record.price is not None:
-        return False
+    if unmapped_only:
+        conditions.append(MatchResultModel.price_item_id.is_(None))
 
     # Filter by classification code
-    if (
-        classification_filter
-        and record.item.classification_code != classification_filter
-    ):
-        return False
+    if classification_filter:
+        conditions.append(ItemModel.classification_code == classification_filter)
 
     if flag_types:
-        if not any(flag.type in flag_types for flag in record.flags):
-            return False
+        conditions.append(
+            exists().where(
+                MatchFlagModel.match_result_id == MatchResultModel.id,
+                MatchFlagModel.flag_type.in_(list(flag_types)),
+            )
+        )
 
+    # EXISTS over match_flags served by idx_flags_severity
     if severity_filter:
-        if not any(flag.severity == severity_filter for flag in record.flags):
-            return False
+        conditions.append(
+            exists().where(
+                MatchFlagModel.match_result_id == MatchResultModel.id,
+                MatchFlagModel.severity == FlagSeverity(severity_filter).value,
+            )
+        )
 
-    return True
+    return conditions
 
 
 def _to_review_item(model: ItemModel) -> ReviewItem:
@@ -2,12 +2,31 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from sqlalchemy import and_, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bimcalc.db.match_results import record_match_result
+from bimcalc.db.models import (
+    ItemMappingModel,
+    ItemModel,
+    MatchFlagModel,
+    MatchResultModel,
+    TrainingExampleModel,
+)
 from bimcalc.mapping.scd2 import MappingMemory
 from bimcalc.models import Flag, MatchDecision, MatchResult
-from bimcalc.review.models import ReviewRecord
+from bimcalc.review.models import BulkReviewFailure, BulkReviewOutcome, ReviewRecord
+from bimcalc.review.repository import fetch_review_records
+from bimcalc.utils.cache_tags import (
+    item_tag,
+    mappings_tag,
+    project_tag,
+    publish_invalidation,
+)
 
 
 async def approve_review_record(
@@ -16,20 +35,9 @@ async def approve_review_record(
     created_by: str,
     annotation: str | None = None,
 ) -> None:
-    if record.price is None:
-        raise ValueError("Cannot approve record without a price candidate")
-
-    if not record.item.canonical_key:
-        raise ValueError("Item is missing canonical key; run matching first")
-
-    # CRITICAL: Block approval if any Critical-Veto flags exist
-    if record.has_critical_flags:
-        critical_flags = [f for f in record.flags if f.severity == "Critical-Veto"]
-        flag_types = ", ".join(f.type for f in critical_flags)
-        raise ValueError(
-            f"Cannot approve item with Critical-Veto flags: {flag_types}. "
-            "These flags indicate fundamental mismatches that compromise auditability."
-        )
+    error = _approval_error(record)
+    if error:
+        raise ValueError(error)
 
     mapping = MappingMemory(session)
     await mapping.write(
@@ -55,33 +63,250 @@ async def approve_review_record(
     )
 
     await record_match_result(session, record.item.id, match_result)
+    publish_invalidation(
+        session, project_tag(record.item.org_id, record.item.project_id)
+    )
 
     # INTELLIGENCE: Capture training example
     # If the item has a classification, or if we are confirming a match that implies a classification
     if record.price.classification_code:
-        from bimcalc.db.models import TrainingExampleModel
-
-        # Determine if this is a correction or confirmation
-        # If item had no class, or different class, it's a correction/imputation
-        feedback_type = "confirmation"
-        if (
-            not record.item.classification_code
-            or record.item.classification_code != record.price.classification_code
-        ):
-            feedback_type = "correction"
-
-        example = TrainingExampleModel(
-            org_id=record.item.org_id,
-            item_family=record.item.family,
-            item_type=record.item.type_name,
-            item_description=f"{record.item.family} {record.item.type_name}",  # Simplified description
-            target_classification_code=record.price.classification_code,
-            source_item_id=record.item.id,
-            price_item_id=record.price.id,
-            feedback_type=feedback_type,
-            created_by=created_by,
+        session.add(TrainingExampleModel(**_training_example_values(record, created_by)))
+
+
+async def bulk_approve_review_records(
+    session: AsyncSession,
+    match_result_ids: Sequence[UUID],
+    org_id: str,
+    project_id: str,
+    created_by: str,
+    annotation: str | None = None,
+) -> BulkReviewOutcome:
+    """Approve many review records with set-based writes.
+
+    Loads all records and their flags up front (two queries), validates each
+    record with the same rules as ``approve_review_record`` and then writes
+    the SCD2 mapping close/insert, match results, flags and training examples
+    as bulk statements. Rows that fail validation are reported in
+    ``outcome.failures`` and do not block the rest of the batch.
+
+    Does not commit; the caller owns the transaction.
+    """
+    outcome = BulkReviewOutcome(action="approve")
+    records = await fetch_review_records(
+        session, match_result_ids, org_id=org_id, project_id=project_id
+    )
+
+    approved: list[ReviewRecord] = []
+    for match_result_id in dict.fromkeys(match_result_ids):
+        record = records.get(match_result_id)
+        error = (
+            _approval_error(record)
+            if record is not None
+            else "Match result not found or access denied"
+        )
+        if error:
+            outcome.failures.append(BulkReviewFailure(match_result_id, error))
+            continue
+        approved.append(record)
+
+    if not approved:
+        return outcome
+
+    now = datetime.utcnow()
+
+    # Last approval in the batch wins per canonical key, mirroring sequential writes
+    mapping_by_key: dict[tuple[str, str], ReviewRecord] = {}
+    for record in approved:
+        mapping_by_key[(record.item.org_id, record.item.canonical_key)] = record
+
+    keys_by_org: dict[str, list[str]] = {}
+    for mapping_org, canonical_key in mapping_by_key:
+        keys_by_org.setdefault(mapping_org, []).append(canonical_key)
+
+    for mapping_org, canonical_keys in keys_by_org.items():
+        await session.execute(
+            update(ItemMappingModel)
+            .where(
+                and_(
+                    ItemMappingModel.org_id == mapping_org,
+                    ItemMappingModel.canonical_key.in_(canonical_keys),
+                    ItemMappingModel.end_ts.is_(None),
+                )
+            )
+            .values(end_ts=now)
+            .execution_options(synchronize_session=False)
+        )
+
+    await session.execute(
+        insert(ItemMappingModel),
+        [
+            {
+                "id": uuid4(),
+                "org_id": mapping_org,
+                "canonical_key": canonical_key,
+                "price_item_id": record.price.id,
+                "start_ts": now,
+                "end_ts": None,
+                "created_by": created_by,
+                "reason": annotation or "review-ui approval",
+            }
+            for (mapping_org, canonical_key), record in mapping_by_key.items()
+        ],
+    )
+
+    result_rows = []
+    flag_rows = []
+    for record in approved:
+        result_id = uuid4()
+        result_rows.append(
+            {
+                "id": result_id,
+                "item_id": record.item.id,
+                "price_item_id": record.price.id,
+                "confidence_score": record.confidence_score,
+                "source": "review_ui",
+                "decision": MatchDecision.AUTO_ACCEPTED.value,
+                "reason": _build_reason(annotation, record),
+                "created_by": created_by,
+                "timestamp": now,
+            }
+        )
+        flag_rows.extend(
+            {
+                "id": uuid4(),
+                "match_result_id": result_id,
+                "item_id": record.item.id,
+                "price_item_id": record.price.id,
+                "flag_type": flag.type,
+                "severity": flag.severity.value,
+                "message": flag.message,
+            }
+            for flag in record.flags
         )
-        session.add(example)
+        outcome.processed.append(record.match_result_id)
+
+    await session.execute(insert(MatchResultModel), result_rows)
+    if flag_rows:
+        await session.execute(insert(MatchFlagModel), flag_rows)
+
+    training_rows = [
+        {"id": uuid4(), **_training_example_values(record, created_by)}
+        for record in approved
+        if record.price.classification_code
+    ]
+    if training_rows:
+        await session.execute(insert(TrainingExampleModel), training_rows)
+
+    publish_invalidation(
+        session,
+        project_tag(org_id, project_id),
+        *(mappings_tag(mapping_org) for mapping_org in keys_by_org),
+        *(item_tag(record.item.id) for record in approved),
+    )
+    return outcome
+
+
+async def bulk_reject_review_records(
+    session: AsyncSession,
+    match_result_ids: Sequence[UUID],
+    org_id: str,
+    project_id: str,
+    created_by: str,
+    annotation: str | None = None,
+) -> BulkReviewOutcome:
+    """Reject many match results with a single scoped UPDATE.
+
+    Does not commit; the caller owns the transaction.
+    """
+    outcome = BulkReviewOutcome(action="reject")
+    requested = list(dict.fromkeys(match_result_ids))
+    if not requested:
+        return outcome
+
+    item_ids_by_result = dict(
+        (
+            await session.execute(
+                select(MatchResultModel.id, MatchResultModel.item_id)
+                .join(ItemModel, ItemModel.id == MatchResultModel.item_id)
+                .where(
+                    MatchResultModel.id.in_(requested),
+                    ItemModel.org_id == org_id,
+                    ItemModel.project_id == project_id,
+                )
+            )
+        ).all()
+    )
+    scoped_ids = set(item_ids_by_result)
+
+    if scoped_ids:
+        await session.execute(
+            update(MatchResultModel)
+            .where(MatchResultModel.id.in_(scoped_ids))
+            .values(
+                decision=MatchDecision.REJECTED.value,
+                reason=annotation or "Bulk rejection via web UI",
+                created_by=created_by,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        publish_invalidation(
+            session,
+            project_tag(org_id, project_id),
+            *(item_tag(item_id) for item_id in item_ids_by_result.values()),
+        )
+
+    for match_result_id in requested:
+        if match_result_id in scoped_ids:
+            outcome.processed.append(match_result_id)
+        else:
+            outcome.failures.append(
+                BulkReviewFailure(
+                    match_result_id, "Match result not found or access denied"
+                )
+            )
+
+    return outcome
+
+
+def _approval_error(record: ReviewRecord) -> str | None:
+    if record.price is None:
+        return "Cannot approve record without a price candidate"
+
+    if not record.item.canonical_key:
+        return "Item is missing canonical key; run matching first"
+
+    # CRITICAL: Block approval if any Critical-Veto flags exist
+    if record.has_critical_flags:
+        flag_types = ", ".join(f.type for f in record.flags if f.is_critical)
+        return (
+            f"Cannot approve item with Critical-Veto flags: {flag_types}. "
+            "These flags indicate fundamental mismatches that compromise auditability."
+        )
+
+    return None
+
+
+def _training_example_values(record: ReviewRecord, created_by: str) -> dict:
+    # Determine if this is a correction or confirmation
+    # If item had no class, or different class, it's a correction/imputation
+    feedback_type = "confirmation"
+    if (
+        not record.item.classification_code
+        or record.item.classification_code != record.price.classification_code
+    ):
+        feedback_type = "correction"
+
+    return {
+        "org_id": record.item.org_id,
+        "item_family": record.item.family,
+        "item_type": record.item.type_name,
+        "item_description": f"{record.item.family} {record.item.type_name}",  # Simplified description
+        "target_classification_code": record.price.classification_code,
+        "source_item_id": record.item.id,
+        "price_item_id": record.price.id,
+        "feedback_type": feedback_type,
+        "created_by": created_by,
+    }
 
 
 def _build_reason(annotation: str | None, record: ReviewRecord) -> str:
@@ -9,6 +9,7 @@
 
 -- Enable pgvector extension for RAG agent
 CREATE EXTENSION IF NOT EXISTS vector;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;  -- list search (ILIKE '%term%')
 
 -- ============================================================================
 -- Core Tables
@@ -53,6 +54,10 @@ CREATE INDEX idx_items_org ON items(org_id);
 CREATE INDEX idx_items_project ON items(project_id);
 CREATE INDEX idx_items_class ON items(classification_code);  -- CRITICAL for blocking
 CREATE INDEX idx_items_canonical ON items(canonical_key);    -- CRITICAL for O(1) lookup
+CREATE INDEX idx_items_list_keyset ON items(org_id, project_id, created_at, id);  -- Items list paging
+CREATE INDEX idx_items_family_trgm ON items USING GIN(family gin_trgm_ops);
+CREATE INDEX idx_items_type_name_trgm ON items USING GIN(type_name gin_trgm_ops);
+CREATE INDEX idx_items_category_trgm ON items USING GIN(category gin_trgm_ops);
 
 COMMENT ON TABLE items IS 'BIM items from Revit schedules or other sources';
 COMMENT ON COLUMN items.classification_code IS 'Uniformat/Omniclass code from trust hierarchy';
@@ -91,6 +96,9 @@ CREATE INDEX idx_price_class ON price_items(classification_code);  -- CRITICAL f
 CREATE INDEX idx_price_vendor ON price_items(vendor_id);
 CREATE INDEX idx_price_sku ON price_items(sku);
 CREATE INDEX idx_price_attributes ON price_items USING GIN(attributes);  -- JSONB search
+CREATE INDEX idx_price_items_description_trgm ON price_items USING GIN(description gin_trgm_ops);
+CREATE INDEX idx_price_items_sku_trgm ON price_items USING GIN(sku gin_trgm_ops);
+CREATE INDEX idx_price_items_item_code_trgm ON price_items USING GIN(item_code gin_trgm_ops);
 
 COMMENT ON TABLE price_items IS 'Vendor price catalog items';
 COMMENT ON COLUMN price_items.classification_code IS 'Required for classification-first blocking (20× reduction)';
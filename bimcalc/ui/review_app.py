@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 from datetime import datetime
 
+from rich.text import Text
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, Vertical
@@ -21,7 +22,7 @@ from textual.widgets import (
 
 from bimcalc.config import get_config
 from bimcalc.db.connection import get_session
-from bimcalc.review import approve_review_record, fetch_pending_reviews
+from bimcalc.review import approve_review_record, fetch_review_page
 from bimcalc.review.models import ReviewRecord
 
 
@@ -48,7 +49,7 @@ class ReviewUIApp(App[None]):
 
     #detail-panel {
         width: 1fr;
-        border: solid $panel 1;
+        border: solid $panel;
         padding: 1;
     }
 
@@ -62,8 +63,11 @@ class ReviewUIApp(App[None]):
     }
     """
 
+    PAGE_SIZE = 200
+
     BINDINGS = [
         Binding("r", "refresh", "Refresh"),
+        Binding("n", "load_more", "Load more"),
         Binding("a", "accept", "Accept"),
         Binding("q", "quit", "Quit"),
     ]
@@ -74,6 +78,8 @@ class ReviewUIApp(App[None]):
         self.project_id = project_id
         self.reviewer = reviewer
         self.records: list[ReviewRecord] = []
+        # Keyset cursor of the page after the last one loaded
+        self.next_cursor: str | None = None
         self.selected_index: int | None = None
         self.flag_filter: str | None = None
         self.loading = reactive(False)
@@ -115,6 +121,12 @@ class ReviewUIApp(App[None]):
     async def action_refresh(self) -> None:
         await self.load_records()
 
+    async def action_load_more(self) -> None:
+        if self.next_cursor is None:
+            self._set_status("All pending items are loaded", error=False)
+            return
+        await self.load_records(more=True)
+
     async def action_accept(self) -> None:
         record = self._current_record
         if not record:
@@ -145,29 +157,41 @@ class ReviewUIApp(App[None]):
         self._set_status("Match approved", error=False)
         self._remove_record(str(record.match_result_id))
 
-    async def load_records(self) -> None:
+    async def load_records(self, more: bool = False) -> None:
+        """Load the oldest page of the queue, or with ``more`` the next one."""
         self.loading = True
         self._set_status("Loading review queue…", error=False)
-        records = await self._with_session(
-            fetch_pending_reviews,
+        page = await self._with_session(
+            fetch_review_page,
             self.org_id,
             self.project_id,
-            [self.flag_filter] if self.flag_filter else None,
-            None,
+            flag_types=[self.flag_filter] if self.flag_filter else None,
+            cursor=self.next_cursor if more else None,
+            limit=self.PAGE_SIZE,
         )
-        self.records = records or []
+        records = page.records if page else []
+        first_new = len(self.records) if more else 0
+        self.records = self.records + records if more else records
+        self.next_cursor = page.next_cursor if page else None
         self.loading = False
-        self._populate_table()
+        self._populate_table(select=first_new)
         if not self.records:
             self._set_status("No pending items — you're caught up!", error=False)
+        elif self.next_cursor:
+            self._set_status(
+                f"Showing oldest {len(self.records)} items; press n to load more",
+                error=False,
+            )
+        else:
+            self._set_status(f"Showing all {len(self.records)} items", error=False)
 
-    async def _with_session(self, func, *args):
+    async def _with_session(self, func, *args, **kwargs):
         async with get_session() as session:
-            return await func(session, *args)
+            return await func(session, *args, **kwargs)
 
-    def _populate_table(self) -> None:
+    def _populate_table(self, select: int = 0) -> None:
         table = self.query_one(DataTable)
-        table.clear(rows=True, columns=False)
+        table.clear()
         self.record_index = {}
         for idx, record in enumerate(self.records):
             flags = (
@@ -181,18 +205,23 @@ class ReviewUIApp(App[None]):
             row_key = str(record.match_result_id)
             self.record_index[row_key] = idx
             table.add_row(
-                f"{record.item.family} / {record.item.type_name}",
-                f"{record.confidence_score:.0f}%",
-                flags,
-                updated,
-                reason,
+                *(
+                    Text(cell, style=style)
+                    for cell in (
+                        f"{record.item.family} / {record.item.type_name}",
+                        f"{record.confidence_score:.0f}%",
+                        flags,
+                        updated,
+                        reason,
+                    )
+                ),
                 key=row_key,
-                style=style,
             )
 
         if self.records:
-            table.cursor_coordinate = (0, 0)
-            self._select_record(0)
+            select = min(select, len(self.records) - 1)
+            table.cursor_coordinate = (select, 0)
+            self._select_record(select)
             table.focus()
         else:
             self.selected_index = None
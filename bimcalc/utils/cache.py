@@ -0,0 +1,499 @@
+"""Tiered cache for BIMCalc: bounded in-process L1 in front of Redis (L2).
+
+Features:
+- L1: per-process LRU with TTL, bounded by entry count
+- L2: Redis, shared across workers (optional; L1-only if unavailable)
+- Single-flight: concurrent misses for the same key share one computation
+- Versioned namespaces: O(1) invalidation by bumping a version counter
+  instead of SCAN/KEYS + DEL
+- Tags: an entry may depend on several namespaces (``project:acme:p1``,
+  ``item:<id>``...); bumping any of them invalidates it
+- Safe serializer: tagged JSON (+ zlib for large payloads), never pickle
+- Hit/miss/latency counters via ``stats``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import logging
+import os
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, TypeVar
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Payloads above this size are zlib-compressed before hitting Redis
+_COMPRESS_THRESHOLD_BYTES = 1024
+_TAG = "__t__"
+
+
+class _LeaderCancelled(Exception):
+    """The caller computing a coalesced value was cancelled."""
+
+
+# Dataclasses allowed to round-trip through the cache (name -> class)
+_REGISTERED_TYPES: dict[str, type] = {}
+
+
+def register_cache_type(cls: type[T]) -> type[T]:
+    """Allow a dataclass to be stored in the cache.
+
+    Only registered types are reconstructed on read, so cached bytes can
+    never instantiate arbitrary classes (unlike pickle).
+
+    Example:
+        @register_cache_type
+        @dataclass
+        class RiskScore: ...
+    """
+    if not dataclasses.is_dataclass(cls):
+        raise TypeError(f"{cls.__name__} must be a dataclass to be cacheable")
+    _REGISTERED_TYPES[f"{cls.__module__}.{cls.__qualname__}"] = cls
+    return cls
+
+
+# ============================================================================
+# Serialization
+# ============================================================================
+
+
+def _encode(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        encoded = [_encode(v) for v in value]
+        return encoded if isinstance(value, list) else {_TAG: "tuple", "v": encoded}
+    if isinstance(value, dict):
+        if all(isinstance(k, str) for k in value) and _TAG not in value:
+            return {k: _encode(v) for k, v in value.items()}
+        return {_TAG: "map", "v": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, datetime):
+        return {_TAG: "datetime", "v": value.isoformat()}
+    if isinstance(value, date):
+        return {_TAG: "date", "v": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {_TAG: "decimal", "v": str(value)}
+    if isinstance(value, UUID):
+        return {_TAG: "uuid", "v": value.hex}
+    if isinstance(value, (set, frozenset)):
+        return {_TAG: "set", "v": [_encode(v) for v in value]}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        name = f"{type(value).__module__}.{type(value).__qualname__}"
+        if name not in _REGISTERED_TYPES:
+            raise TypeError(f"{name} is not registered with register_cache_type")
+        fields = {f.name: _encode(getattr(value, f.name)) for f in dataclasses.fields(value)}
+        return {_TAG: "dataclass", "type": name, "v": fields}
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+
+    tag = value.get(_TAG)
+    if tag is None:
+        return {k: _decode(v) for k, v in value.items()}
+    payload = value["v"]
+    if tag == "tuple":
+        return tuple(_decode(v) for v in payload)
+    if tag == "map":
+        return {_decode(k): _decode(v) for k, v in payload}
+    if tag == "datetime":
+        return datetime.fromisoformat(payload)
+    if tag == "date":
+        return date.fromisoformat(payload)
+    if tag == "decimal":
+        return Decimal(payload)
+    if tag == "uuid":
+        return UUID(hex=payload)
+    if tag == "set":
+        return {_decode(v) for v in payload}
+    if tag == "dataclass":
+        cls = _REGISTERED_TYPES.get(value["type"])
+        if cls is None:
+            raise ValueError(f"Unregistered cached type: {value['type']}")
+        return cls(**{k: _decode(v) for k, v in payload.items()})
+    raise ValueError(f"Unknown cache tag: {tag}")
+
+
+def serialize(value: Any) -> bytes:
+    """Encode a value as compact tagged JSON, compressing large payloads."""
+    raw = json.dumps(_encode(value), separators=(",", ":")).encode("utf-8")
+    if len(raw) > _COMPRESS_THRESHOLD_BYTES:
+        return b"z" + zlib.compress(raw, 3)
+    return b"j" + raw
+
+
+def deserialize(data: bytes) -> Any:
+    """Inverse of ``serialize``."""
+    header, body = data[:1], data[1:]
+    if header == b"z":
+        body = zlib.decompress(body)
+    elif header != b"j":
+        raise ValueError("Unrecognised cache payload")
+    return _decode(json.loads(body))
+
+
+# ============================================================================
+# L1 (in-process) tier
+# ============================================================================
+
+
+class LocalLRU:
+    """Bounded LRU with per-entry expiry. Not shared between processes."""
+
+    def __init__(self, maxsize: int = 1024, default_ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        ttl = self.default_ttl if ttl is None else min(ttl, self.default_ttl)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ============================================================================
+# Stats
+# ============================================================================
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """Counters for cache effectiveness and Redis latency."""
+
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    coalesced: int = 0
+    errors: int = 0
+    invalidations: int = 0
+    l2_calls: int = 0
+    l2_latency_seconds: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        return (self.l1_hits + self.l2_hits) / lookups if lookups else 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        data = dataclasses.asdict(self)
+        data["hit_ratio"] = round(self.hit_ratio, 4)
+        data["l2_avg_latency_ms"] = round(
+            (self.l2_latency_seconds / self.l2_calls * 1000) if self.l2_calls else 0.0, 3
+        )
+        return data
+
+
+# ============================================================================
+# Tiered cache
+# ============================================================================
+
+
+class TieredCache:
+    """L1 + Redis cache with single-flight and versioned namespaces.
+
+    Redis errors never propagate: they are logged, counted in
+    ``stats.errors`` and treated as misses. After an error Redis is skipped
+    for ``error_backoff_seconds`` so an outage does not add a connect
+    timeout to every request.
+
+    Cached values must be treated as immutable: L1 hits (and callers
+    coalesced onto one computation) receive the same object, not a copy,
+    so mutating a returned value would change it for every later reader
+    in the process.
+    """
+
+    def __init__(
+        self,
+        redis_factory: Callable[[], Any] | None = None,
+        l1_maxsize: int = 1024,
+        l1_ttl_seconds: float = 30.0,
+        version_ttl_seconds: float = 1.0,
+        error_backoff_seconds: float = 5.0,
+    ):
+        self._redis_factory = redis_factory
+        self._redis: Any | None = None
+        self.l1 = LocalLRU(maxsize=l1_maxsize, default_ttl=l1_ttl_seconds)
+        self.versions = LocalLRU(maxsize=4096, default_ttl=version_ttl_seconds)
+        self.error_backoff_seconds = error_backoff_seconds
+        self.stats = CacheStats()
+        self._redis_down_until = 0.0
+        self._inflight: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+
+    # -- Redis plumbing -----------------------------------------------------
+
+    def _client(self) -> Any | None:
+        if self._redis_factory is None or time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            self._redis = self._redis_factory()
+        return self._redis
+
+    async def _l2(self, op: str, *args: Any) -> Any:
+        client = self._client()
+        if client is None:
+            return None
+        started = time.perf_counter()
+        try:
+            return await getattr(client, op)(*args)
+        except Exception as e:
+            self.stats.errors += 1
+            self._redis_down_until = time.monotonic() + self.error_backoff_seconds
+            logger.warning("Redis %s failed: %s", op, e)
+            return None
+        finally:
+            self.stats.l2_calls += 1
+            self.stats.l2_latency_seconds += time.perf_counter() - started
+
+    # -- Namespaces ---------------------------------------------------------
+
+    @staticmethod
+    def _version_key(namespace: str) -> str:
+        return f"cachever:{namespace}"
+
+    async def _namespace_version(self, namespace: str) -> int:
+        return (await self._namespace_versions([namespace]))[0]
+
+    async def _namespace_versions(self, namespaces: list[str]) -> list[int]:
+        versions: dict[str, int] = {}
+        missing: list[str] = []
+        for namespace in namespaces:
+            found, version = self.versions.get(namespace)
+            if found:
+                versions[namespace] = version
+            else:
+                missing.append(namespace)
+
+        if missing:
+            # One round trip however many tags the entry declares
+            raw = await self._l2("mget", [self._version_key(ns) for ns in missing])
+            for namespace, value in zip(
+                missing, raw or [None] * len(missing), strict=True
+            ):
+                versions[namespace] = int(value) if value is not None else 0
+                self.versions.set(namespace, versions[namespace])
+
+        return [versions[namespace] for namespace in namespaces]
+
+    async def _physical_key(
+        self,
+        key: str,
+        namespace: str | None,
+        tags: Iterable[str] | None = None,
+    ) -> str:
+        namespaces = [namespace] if namespace is not None else []
+        namespaces.extend(sorted(set(tags or ()) - set(namespaces)))
+        if not namespaces:
+            return key
+        versions = await self._namespace_versions(namespaces)
+        prefix = ";".join(
+            f"{ns}:v{v}" for ns, v in zip(namespaces, versions, strict=True)
+        )
+        return f"{prefix}:{key}"
+
+    async def invalidate_namespace(self, namespace: str) -> None:
+        """Invalidate every key in ``namespace`` in O(1).
+
+        Bumps the namespace version so old physical keys are never read
+        again; they age out of Redis through their TTL.
+        """
+        self.stats.invalidations += 1
+        found, current = self.versions.get(namespace)
+        version = await self._l2("incr", self._version_key(namespace))
+        if version is None:
+            version = (current if found else 0) + 1
+        self.versions.set(namespace, int(version))
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        """Invalidate every entry that declared any of ``tags``."""
+        await asyncio.gather(*(self.invalidate_namespace(tag) for tag in set(tags)))
+
+    # -- Public API ---------------------------------------------------------
+
+    async def get(
+        self,
+        key: str,
+        namespace: str | None = None,
+        tags: Iterable[str] | None = None,
+    ) -> Any | None:
+        physical = await self._physical_key(key, namespace, tags)
+        found, value = self.l1.get(physical)
+        if found:
+            self.stats.l1_hits += 1
+            return value
+
+        raw = await self._l2("get", physical)
+        if raw is not None:
+            try:
+                value = deserialize(raw)
+            except Exception as e:
+                self.stats.errors += 1
+                logger.warning("Discarding undecodable cache entry %s: %s", physical, e)
+            else:
+                self.stats.l2_hits += 1
+                self.l1.set(physical, value)
+                return value
+
+        self.stats.misses += 1
+        return None
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: int = 300,
+        namespace: str | None = None,
+        tags: Iterable[str] | None = None,
+    ) -> bool:
+        physical = await self._physical_key(key, namespace, tags)
+        self.stats.sets += 1
+        self.l1.set(physical, value, ttl_seconds)
+        try:
+            payload = serialize(value)
+        except TypeError as e:
+            logger.warning("Value for %s not cacheable in Redis: %s", physical, e)
+            return False
+        return await self._l2("setex", physical, ttl_seconds, payload) is not None
+
+    async def delete(
+        self,
+        key: str,
+        namespace: str | None = None,
+        tags: Iterable[str] | None = None,
+    ) -> bool:
+        physical = await self._physical_key(key, namespace, tags)
+        self.l1.delete(physical)
+        return await self._l2("delete", physical) is not None
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[T]],
+        ttl_seconds: int = 300,
+        namespace: str | None = None,
+        tags: Iterable[str] | None = None,
+    ) -> T:
+        """Return the cached value or compute it once for all concurrent callers.
+
+        Concurrent misses for the same key in this process await a single
+        ``compute()`` call (single-flight) instead of stampeding the DB.
+        If the caller running ``compute()`` is cancelled, the waiters are not:
+        they retry, and one of them computes instead. ``tags`` lists the
+        namespaces the value depends on; invalidating any of them (see
+        ``invalidate_tags``) makes the entry unreachable.
+        """
+        tags = list(tags or ())
+        cached = await self.get(key, namespace, tags)
+        if cached is not None:
+            return cached
+
+        physical = await self._physical_key(key, namespace, tags)
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(physical)
+        if inflight is not None and inflight[0] is loop:
+            self.stats.coalesced += 1
+            try:
+                return await asyncio.shield(inflight[1])
+            except _LeaderCancelled:
+                return await self.get_or_compute(
+                    key, compute, ttl_seconds, namespace, tags
+                )
+
+        future: asyncio.Future = loop.create_future()
+        self._inflight[physical] = (loop, future)
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            # Our cancellation is not the waiters' failure: they retry once
+            # the in-flight entry is dropped below
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an un-awaited failure doesn't log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if value is not None:
+                await self.set(key, value, ttl_seconds, namespace, tags)
+            return value
+        finally:
+            if self._inflight.get(physical, (None, None))[1] is future:
+                del self._inflight[physical]
+
+    def clear_local(self) -> None:
+        """Drop all L1 entries and cached namespace versions."""
+        self.l1.clear()
+        self.versions.clear()
+
+
+# ============================================================================
+# Default instance
+# ============================================================================
+
+_default_cache: TieredCache | None = None
+
+
+def _redis_from_env() -> Any:
+    import redis.asyncio as redis
+
+    return redis.from_url(
+        os.getenv("REDIS_URL", "redis://redis:6379/0"), decode_responses=False
+    )
+
+
+def get_cache() -> TieredCache:
+    """Get the process-wide tiered cache (singleton)."""
+    global _default_cache
+
+    if _default_cache is None:
+        _default_cache = TieredCache(
+            redis_factory=_redis_from_env,
+            l1_maxsize=int(os.getenv("CACHE_L1_MAXSIZE", "2048")),
+            l1_ttl_seconds=float(os.getenv("CACHE_L1_TTL_SECONDS", "30")),
+        )
+    return _default_cache
+
+
+def set_cache(cache: TieredCache | None) -> None:
+    """Replace the process-wide cache (tests, alternate backends)."""
+    global _default_cache
+    _default_cache = cache
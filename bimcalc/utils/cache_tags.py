@@ -0,0 +1,98 @@
+"""Cache tags and commit-time invalidation for BIMCalc.
+
+Cached values declare the data they were derived from as tags (see
+``TieredCache.get_or_compute(..., tags=...)``). Write paths call
+``publish_invalidation(session, *tags)``; the tags are held on the session
+and only invalidated once the transaction commits, so a concurrent reader
+can never re-cache pre-commit data under the new tag version. Rolled-back
+transactions publish nothing.
+
+Tag vocabulary:
+- ``project:{org}:{project}`` - items, reviews and documents of a project
+- ``item:{id}``               - a single item (risk score, embeddings)
+- ``prices:{org}``            - an organisation's price catalog
+- ``mappings:{org}``          - an organisation's active item mappings
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from bimcalc.utils.cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "bimcalc_cache_invalidations"
+
+# Invalidations scheduled after commit; held so they aren't garbage collected
+_inflight: set[asyncio.Task] = set()
+
+
+def project_tag(org_id: str, project_id: str) -> str:
+    return f"project:{org_id}:{project_id}"
+
+
+def item_tag(item_id: UUID | str) -> str:
+    return f"item:{item_id}"
+
+
+def prices_tag(org_id: str) -> str:
+    return f"prices:{org_id}"
+
+
+def mappings_tag(org_id: str) -> str:
+    return f"mappings:{org_id}"
+
+
+def publish_invalidation(session: AsyncSession | Session, *tags: str) -> None:
+    """Invalidate ``tags`` when ``session`` next commits."""
+    pending: set[str] = session.info.setdefault(_PENDING_KEY, set())
+    pending.update(tags)
+
+
+async def flush_invalidations() -> None:
+    """Wait for invalidations scheduled by committed sessions to finish.
+
+    ``get_session`` calls this on exit so short-lived processes (CLI,
+    workers) don't exit before Redis has seen the version bumps.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = [task for task in _inflight if task.get_loop() is loop]
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _schedule(tags: Iterable[str]) -> None:
+    tags = tuple(tags)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Sync session outside an event loop: other processes see the bump
+        # on their next TTL expiry, this one drops its local tier now.
+        logger.debug("No running loop; dropping L1 only for %s", tags)
+        get_cache().clear_local()
+        return
+
+    task = loop.create_task(get_cache().invalidate_tags(*tags))
+    _inflight.add(task)
+    task.add_done_callback(_inflight.discard)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_on_commit(session: Session) -> None:
+    tags = session.info.pop(_PENDING_KEY, None)
+    if tags:
+        _schedule(tags)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_on_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
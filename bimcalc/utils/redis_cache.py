@@ -1,115 +1,123 @@
-"""Redis cache utilities for BIMCalc."""
+"""Redis cache utilities for BIMCalc.
 
-import os
-import pickle
+Thin function API over the tiered cache in ``bimcalc.utils.cache``; values
+go through the L1 tier and the safe serializer rather than pickle.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
 from typing import Any
 
-import redis.asyncio as redis
+from bimcalc.utils.cache import get_cache
 
+logger = logging.getLogger(__name__)
 
-# Global Redis client (lazy initialized)
-_redis_client: redis.Redis | None = None
+# SCAN batch size for clear_cache_pattern
+_SCAN_COUNT = 500
 
 
-async def get_redis() -> redis.Redis:
+async def get_redis() -> Any:
     """Get Redis client instance (singleton).
 
     Returns:
-        Async Redis client
+        Async Redis client, or None while Redis is backed off after an error
     """
-    global _redis_client
-
-    if _redis_client is None:
-        redis_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
-
-        _redis_client = redis.from_url(
-            redis_url,
-            encoding="utf-8",
-            decode_responses=False,  # We'll handle pickle serialization
-        )
-
-    return _redis_client
+    return get_cache()._client()
 
 
-async def get_cached(key: str) -> Any | None:
-    """Get value from Redis cache.
+async def get_cached(
+    key: str, namespace: str | None = None, tags: Iterable[str] | None = None
+) -> Any | None:
+    """Get value from cache (L1, then Redis).
 
     Args:
         key: Cache key
+        namespace: Optional versioned namespace (see ``invalidate_namespace``)
+        tags: Tags the entry was stored with (see ``bimcalc.utils.cache_tags``)
 
     Returns:
-        Cached value (unpickled) or None if not found/expired
+        Cached value or None if not found/expired
     """
-    client = await get_redis()
-
-    try:
-        cached_bytes = await client.get(key)
-        if cached_bytes:
-            return pickle.loads(cached_bytes)
-    except Exception as e:
-        # Log error but don't fail - cache misses are acceptable
-        print(f"Redis get error for key {key}: {e}")
-
-    return None
+    return await get_cache().get(key, namespace, tags)
 
 
-async def set_cached(key: str, value: Any, ttl_seconds: int = 300) -> bool:
-    """Set value in Redis cache.
+async def set_cached(
+    key: str,
+    value: Any,
+    ttl_seconds: int = 300,
+    namespace: str | None = None,
+    tags: Iterable[str] | None = None,
+) -> bool:
+    """Set value in cache.
 
     Args:
         key: Cache key
-        value: Value to cache (will be pickled)
+        value: JSON-compatible value or registered dataclass
         ttl_seconds: Time to live in seconds (default 5 minutes)
+        namespace: Optional versioned namespace
+        tags: Tags that invalidate the entry when bumped
 
     Returns:
-        True if successful, False otherwise
+        True if written to Redis, False otherwise (L1 is always updated)
     """
-    client = await get_redis()
-
-    try:
-        value_bytes = pickle.dumps(value)
-        await client.setex(key, ttl_seconds, value_bytes)
-        return True
-    except Exception as e:
-        print(f"Redis set error for key {key}: {e}")
-        return False
+    return await get_cache().set(key, value, ttl_seconds, namespace, tags)
 
 
-async def delete_cached(key: str) -> bool:
-    """Delete key from Redis cache.
+async def delete_cached(key: str, namespace: str | None = None) -> bool:
+    """Delete key from cache.
 
     Args:
         key: Cache key
+        namespace: Optional versioned namespace
 
     Returns:
         True if key was deleted, False otherwise
     """
-    client = await get_redis()
+    return await get_cache().delete(key, namespace)
 
-    try:
-        await client.delete(key)
-        return True
-    except Exception as e:
-        print(f"Redis delete error for key {key}: {e}")
-        return False
+
+async def invalidate_namespace(namespace: str) -> None:
+    """Invalidate every key stored under ``namespace`` in O(1)."""
+    await get_cache().invalidate_namespace(namespace)
+
+
+async def invalidate_tags(*tags: str) -> None:
+    """Invalidate every entry stored with any of ``tags``."""
+    await get_cache().invalidate_tags(*tags)
 
 
 async def clear_cache_pattern(pattern: str) -> int:
     """Clear all keys matching a pattern.
 
+    Uses incremental SCAN rather than KEYS so large keyspaces don't block
+    Redis. Prefer ``invalidate_namespace`` for hot paths.
+
     Args:
         pattern: Redis key pattern (e.g., "compliance:*")
 
     Returns:
         Number of keys deleted
     """
-    client = await get_redis()
+    cache = get_cache()
+    cache.l1.clear()
+    client = cache._client()
+    if client is None:
+        return 0
 
+    deleted = 0
     try:
-        keys = await client.keys(pattern)
-        if keys:
-            return await client.delete(*keys)
+        batch: list[bytes] = []
+        async for key in client.scan_iter(match=pattern, count=_SCAN_COUNT):
+            batch.append(key)
+            if len(batch) >= _SCAN_COUNT:
+                deleted += await client.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += await client.unlink(*batch)
     except Exception as e:
-        print(f"Redis clear pattern error for {pattern}: {e}")
+        cache.stats.errors += 1
+        logger.warning("Redis clear pattern error for %s: %s", pattern, e)
 
-    return 0
+    return deleted
@@ -0,0 +1,182 @@
+"""Per-stage timing spans for the matching pipeline.
+
+Wrap a stage in ``with span("fuzzy_ranking", count=len(candidates)):``.
+While nothing listens a span costs a couple of attribute lookups and
+returns a shared no-op. Spans are recorded when:
+
+- Prometheus export is on (``enable_span_metrics()``, called by the web
+  app): durations feed the ``bimcalc_pipeline_stage_seconds`` histogram and
+  counts the ``bimcalc_pipeline_stage_items_total`` counter, labelled by
+  stage and served by the existing ``/metrics`` endpoint;
+- a ``collect_spans()`` block is active in the current context: totals are
+  kept in a ``SpanRecorder`` (``bimcalc match`` prints them after a run).
+
+A stage that only knows its count at the end sets it on the span::
+
+    with span("candidate_sql") as s:
+        rows = ...
+        s.count = len(rows)
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+# Stage latencies run from sub-millisecond (key generation) to seconds
+STAGE_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+@dataclass
+class StageTiming:
+    """Accumulated timing of one stage."""
+
+    calls: int = 0
+    items: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.seconds * 1000 / self.calls if self.calls else 0.0
+
+
+@dataclass
+class SpanRecorder:
+    """Per-stage totals for spans recorded in a ``collect_spans()`` block."""
+
+    stages: dict[str, StageTiming] = field(default_factory=dict)
+
+    def record(self, stage: str, seconds: float, count: int) -> None:
+        timing = self.stages.get(stage)
+        if timing is None:
+            timing = self.stages[stage] = StageTiming()
+        timing.calls += 1
+        timing.items += count
+        timing.seconds += seconds
+        timing.max_seconds = max(timing.max_seconds, seconds)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(timing.seconds for timing in self.stages.values())
+
+
+class _Metrics:
+    """Prometheus collectors, created once per process."""
+
+    def __init__(self, registry: Any = None) -> None:
+        from prometheus_client import REGISTRY, Counter, Histogram
+
+        registry = registry or REGISTRY
+        self.seconds = Histogram(
+            "bimcalc_pipeline_stage_seconds",
+            "Time spent per matching pipeline stage",
+            ["stage"],
+            buckets=STAGE_BUCKETS,
+            registry=registry,
+        )
+        self.items = Counter(
+            "bimcalc_pipeline_stage_items",
+            "Items, candidates or rows handled per matching pipeline stage",
+            ["stage"],
+            registry=registry,
+        )
+
+
+_metrics: _Metrics | None = None
+_export = False
+_recorder: ContextVar[SpanRecorder | None] = ContextVar(
+    "bimcalc_span_recorder", default=None
+)
+
+
+def enable_span_metrics(registry: Any = None) -> None:
+    """Export spans as Prometheus metrics (idempotent).
+
+    Args:
+        registry: Collector registry (default: the process-wide registry
+            that ``prometheus_fastapi_instrumentator`` exposes)
+    """
+    global _metrics, _export
+    if _metrics is None:
+        _metrics = _Metrics(registry)
+    _export = True
+
+
+def disable_span_metrics() -> None:
+    """Stop exporting spans; already registered collectors stay registered."""
+    global _export
+    _export = False
+
+
+@contextmanager
+def collect_spans() -> Iterator[SpanRecorder]:
+    """Record spans of the current context (and tasks it spawns)."""
+    recorder = SpanRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+class _Span:
+    __slots__ = ("stage", "count", "_start", "_recorder")
+
+    def __init__(self, stage: str, count: int, recorder: SpanRecorder | None):
+        self.stage = stage
+        self.count = count
+        self._recorder = recorder
+
+    def __enter__(self) -> _Span:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        elapsed = time.perf_counter() - self._start
+        if _export and _metrics is not None:
+            _metrics.seconds.labels(self.stage).observe(elapsed)
+            if self.count:
+                _metrics.items.labels(self.stage).inc(self.count)
+        if self._recorder is not None:
+            self._recorder.record(self.stage, elapsed, self.count)
+
+
+class _NoopSpan:
+    __slots__ = ("count",)
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def span(stage: str, count: int = 1) -> _Span | _NoopSpan:
+    """Time the enclosed block as one call of ``stage`` handling ``count`` things."""
+    recorder = _recorder.get()
+    if recorder is None and not _export:
+        return _NOOP
+    return _Span(stage, count, recorder)
@@ -15,37 +15,11 @@ from prometheus_fastapi_instrumentator import Instrumentator
 
 from bimcalc.config import get_config
 from bimcalc.core.logging import configure_logging
-from bimcalc.intelligence.routes import router as intelligence_router
-
-# Import modular routers
-from bimcalc.ingestion import routes as ingestion_routes
-from bimcalc.reporting import routes as reporting_routes
-from bimcalc.web.routes import (
-    auth,
-    compliance,
-    dashboard,
-    matching,
-    review,
-    items,
-    mappings,
-    audit,
-    pipeline,
-    prices,
-    projects,
-    scenarios,
-    price_scout,
-    price_sources,
-    revisions,
-    integrations,
-    documents,
-    classifications,
-    analytics,
-    risk_dashboard,
-    users,
-    webhooks,
-    search,
-    revit,
-    health,
+from bimcalc.utils.spans import enable_span_metrics
+from bimcalc.web.router_registry import (
+    LazyRouterMiddleware,
+    RouterRegistry,
+    enabled_features,
 )
 
 # Initialize structured logging
@@ -112,8 +86,14 @@ if os.environ.get("BIMCALC_RATE_LIMIT_ENABLED", "false").lower() == "true":
     from bimcalc.web.rate_limit import RateLimitMiddleware
     app.add_middleware(RateLimitMiddleware)
 
-# Prometheus Metrics
+# SQL query profiling (optional - only enabled via env var, see /admin/profiling)
+if os.environ.get("BIMCALC_QUERY_PROFILING", "false").lower() == "true":
+    from bimcalc.web.query_profiling import QueryProfilingMiddleware
+    app.add_middleware(QueryProfilingMiddleware)
+
+# Prometheus Metrics (HTTP plus matching pipeline stage timings)
 Instrumentator().instrument(app).expose(app)
+enable_span_metrics()
 
 # Mount static files if directory exists
 static_dir = Path(__file__).parent / "static"
@@ -140,33 +120,25 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 
 
 # Include Routers
-app.include_router(auth.router)
-app.include_router(compliance.router)
-app.include_router(dashboard.router)
-app.include_router(ingestion_routes.router)
-app.include_router(matching.router)
-app.include_router(review.router)
-app.include_router(items.router)
-app.include_router(mappings.router)
-app.include_router(reporting_routes.router)
-app.include_router(audit.router)
-app.include_router(pipeline.router)
-app.include_router(prices.router)
-app.include_router(projects.router)
-app.include_router(scenarios.router)
-app.include_router(price_scout.router)
-app.include_router(price_sources.router)
-app.include_router(revisions.router)
-app.include_router(integrations.router)
-app.include_router(documents.router)
-app.include_router(classifications.router)
-app.include_router(analytics.router)
-app.include_router(risk_dashboard.router)
-app.include_router(users.router)
-app.include_router(webhooks.router)
-app.include_router(search.router)
-app.include_router(revit.router)
-app.include_router(health.router)
+# Feature groups come from BIMCALC_WEB_FEATURES; heavy routers (matching,
+# reporting, ingestion, Price Scout, intelligence) mount on first request.
+# Intelligence features are conditional on their config flags.
+config = get_config()
+features = enabled_features()
+if not (config.enable_rag or config.enable_risk_scoring):
+    features.discard("intelligence")
+
+router_registry = RouterRegistry(app, features=features)
+app.add_middleware(LazyRouterMiddleware, registry=router_registry)
+router_registry.mount()
+
+
+@app.on_event("shutdown")
+async def flush_webhooks_on_shutdown():
+    """Enqueue buffered webhook events before the process exits."""
+    from bimcalc.core.webhook_dispatcher import close_dispatcher
+
+    await close_dispatcher()
 
 
 # Legacy Redirects
@@ -175,8 +147,3 @@ async def redirect_crail4_config():
     """Redirect legacy Crail4 config route to new Price Scout route."""
     return RedirectResponse(url="/price-scout")
 
-
-# Intelligence Features (Conditional)
-config = get_config()
-if config.enable_rag or config.enable_risk_scoring:
-    app.include_router(intelligence_router)
@@ -0,0 +1,47 @@
+"""Query Profiling Middleware for FastAPI.
+
+Profiles the SQL each request executes (see ``bimcalc.db.profiler``) and
+reports it in ``X-Query-Count``/``X-Query-Time-Ms`` response headers, a
+``query_profile`` log line and ``/admin/profiling``.
+
+Opt-in: the app only adds it when ``BIMCALC_QUERY_PROFILING=true``.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from bimcalc.db.profiler import profile_queries
+
+
+class QueryProfilingMiddleware(BaseHTTPMiddleware):
+    """Middleware that profiles the queries of each request.
+
+    Usage:
+        app.add_middleware(QueryProfilingMiddleware)
+
+    Profiles are labelled with the matched route template
+    (``GET /items/{item_id}``) so requests for the same page aggregate.
+    Queries issued while a streaming body is sent are not included.
+    """
+
+    # Paths never profiled
+    EXEMPT_PATHS = {"/metrics", "/static", "/favicon.ico", "/admin/profiling"}
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        path = request.url.path
+        if any(path.startswith(exempt) for exempt in self.EXEMPT_PATHS):
+            return await call_next(request)
+
+        with profile_queries(f"{request.method} {path}") as profile:
+            response = await call_next(request)
+            route = request.scope.get("route")
+            if route is not None and hasattr(route, "path"):
+                profile.label = f"{request.method} {route.path}"
+
+        response.headers["X-Query-Count"] = str(profile.total_queries)
+        response.headers["X-Query-Time-Ms"] = f"{profile.query_ms:.1f}"
+        return response
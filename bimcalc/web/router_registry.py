@@ -0,0 +1,232 @@
+"""Router registry for the BIMCalc web app.
+
+Every route module is listed once in ``ROUTERS`` with the feature group it
+belongs to. ``BIMCALC_WEB_FEATURES`` (comma separated, default ``all``)
+selects the groups a worker serves, so e.g. ``BIMCALC_WEB_FEATURES=revit``
+runs a lean API worker for the Revit plugin.
+
+Modules with ``lazy_prefixes`` are heavy to import (pandas, OpenAI,
+Playwright, the matching pipeline). They are not imported at startup: the
+``LazyRouterMiddleware`` mounts one on the first request whose path starts
+with one of its prefixes. Set ``BIMCALC_WEB_LAZY_ROUTERS=false`` to import
+everything up front (e.g. to warm forked workers).
+
+Per-router import cost is logged at startup (``routers_mounted``) and on
+each lazy mount (``router_mounted``), and kept on
+``app.state.router_import_ms``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+import structlog
+
+if TYPE_CHECKING:
+    from fastapi import APIRouter, FastAPI
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = structlog.get_logger(__name__)
+
+# Group mounted whatever BIMCALC_WEB_FEATURES selects (login, health checks)
+BASE_GROUP = "base"
+
+
+@dataclass(frozen=True)
+class RouterSpec:
+    """One route module and how to mount it."""
+
+    name: str
+    module: str
+    group: str
+    # Mount on first request under these paths instead of at startup
+    lazy_prefixes: tuple[str, ...] = ()
+
+    @property
+    def lazy(self) -> bool:
+        return bool(self.lazy_prefixes)
+
+    def load(self) -> APIRouter:
+        return import_module(self.module).router
+
+    def matches(self, path: str) -> bool:
+        return any(path.startswith(prefix) for prefix in self.lazy_prefixes)
+
+
+_ROUTES = "bimcalc.web.routes"
+
+# Mount order matters where paths overlap, keep it stable
+ROUTERS: tuple[RouterSpec, ...] = (
+    RouterSpec("auth", f"{_ROUTES}.auth", BASE_GROUP),
+    RouterSpec("health", f"{_ROUTES}.health", BASE_GROUP),
+    RouterSpec("compliance", f"{_ROUTES}.compliance", "core"),
+    RouterSpec("dashboard", f"{_ROUTES}.dashboard", "core"),
+    RouterSpec(
+        "ingestion",
+        "bimcalc.ingestion.routes",
+        "ingestion",
+        ("/ingest", "/api/ingest/"),
+    ),
+    RouterSpec(
+        "matching", f"{_ROUTES}.matching", "matching", ("/match", "/api/match/")
+    ),
+    RouterSpec("review", f"{_ROUTES}.review", "matching", ("/review", "/api/matches/")),
+    RouterSpec("items", f"{_ROUTES}.items", "core"),
+    RouterSpec("mappings", f"{_ROUTES}.mappings", "core"),
+    RouterSpec(
+        "reporting",
+        "bimcalc.reporting.routes",
+        "reporting",
+        ("/reports", "/api/reports/"),
+    ),
+    RouterSpec("audit", f"{_ROUTES}.audit", "admin", ("/audit",)),
+    RouterSpec(
+        "pipeline", f"{_ROUTES}.pipeline", "core", ("/pipeline", "/api/pipeline/")
+    ),
+    RouterSpec("prices", f"{_ROUTES}.prices", "core"),
+    RouterSpec("projects", f"{_ROUTES}.projects", "core"),
+    RouterSpec("scenarios", f"{_ROUTES}.scenarios", "core"),
+    RouterSpec(
+        "price_scout", f"{_ROUTES}.price_scout", "price_scout", ("/price-scout",)
+    ),
+    RouterSpec("price_sources", f"{_ROUTES}.price_sources", "core"),
+    RouterSpec("revisions", f"{_ROUTES}.revisions", "core"),
+    RouterSpec("integrations", f"{_ROUTES}.integrations", "core"),
+    RouterSpec("documents", f"{_ROUTES}.documents", "core"),
+    RouterSpec("classifications", f"{_ROUTES}.classifications", "core"),
+    RouterSpec(
+        "analytics", f"{_ROUTES}.analytics", "core", ("/analytics", "/api/analytics/")
+    ),
+    RouterSpec("risk_dashboard", f"{_ROUTES}.risk_dashboard", "core"),
+    RouterSpec("users", f"{_ROUTES}.users", "admin"),
+    RouterSpec("webhooks", f"{_ROUTES}.webhooks", "core"),
+    RouterSpec("search", f"{_ROUTES}.search", "core"),
+    RouterSpec("revit", f"{_ROUTES}.revit", "revit"),
+    RouterSpec("profiling", f"{_ROUTES}.profiling", "admin"),
+    RouterSpec(
+        "intelligence",
+        "bimcalc.intelligence.routes",
+        "intelligence",
+        ("/api/intelligence/",),
+    ),
+)
+
+FEATURE_GROUPS = frozenset(spec.group for spec in ROUTERS)
+
+
+def enabled_features(value: str | None = None) -> set[str]:
+    """Feature groups selected by ``value`` or ``BIMCALC_WEB_FEATURES``.
+
+    Raises:
+        ValueError: If an unknown group is named
+    """
+    if value is None:
+        value = os.environ.get("BIMCALC_WEB_FEATURES", "all")
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    if not names or "all" in names:
+        return set(FEATURE_GROUPS)
+
+    unknown = names - FEATURE_GROUPS
+    if unknown:
+        raise ValueError(
+            f"Unknown BIMCALC_WEB_FEATURES group(s): {', '.join(sorted(unknown))}; "
+            f"expected 'all' or any of {', '.join(sorted(FEATURE_GROUPS))}"
+        )
+    return names | {BASE_GROUP}
+
+
+class RouterRegistry:
+    """Mounts the selected routers on ``app``, lazily where allowed.
+
+    Usage:
+        registry = RouterRegistry(app, features=enabled_features())
+        app.add_middleware(LazyRouterMiddleware, registry=registry)
+        registry.mount()
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        features: set[str] | None = None,
+        specs: tuple[RouterSpec, ...] = ROUTERS,
+        lazy: bool | None = None,
+    ):
+        if features is None:
+            features = enabled_features()
+        if lazy is None:
+            lazy = os.environ.get("BIMCALC_WEB_LAZY_ROUTERS", "true").lower() == "true"
+
+        self.app = app
+        self.specs = [spec for spec in specs if spec.group in features]
+        self.lazy = lazy
+        self.pending: list[RouterSpec] = []
+        self.import_ms: dict[str, float] = {}
+        self._lock = asyncio.Lock()
+        app.state.router_import_ms = self.import_ms
+
+    def mount(self) -> None:
+        """Mount eager routers now and queue the lazy ones."""
+        for spec in self.specs:
+            if self.lazy and spec.lazy:
+                self.pending.append(spec)
+            else:
+                self.app.include_router(self._timed_load(spec))
+
+        logger.info(
+            "routers_mounted",
+            total_import_ms=round(sum(self.import_ms.values()), 1),
+            import_ms={name: round(ms, 1) for name, ms in self.import_ms.items()},
+            lazy=[spec.name for spec in self.pending],
+        )
+
+    async def mount_for_path(self, path: str) -> None:
+        """Mount pending routers serving ``path`` (all for the OpenAPI schema)."""
+        wanted = self._wanted(path)
+        if not wanted:
+            return
+        async with self._lock:
+            # Another request may have mounted them while we waited
+            for spec in self._wanted(path):
+                router = await asyncio.to_thread(self._timed_load, spec)
+                self.app.include_router(router)
+                self.pending.remove(spec)
+                logger.info(
+                    "router_mounted",
+                    router=spec.name,
+                    group=spec.group,
+                    import_ms=round(self.import_ms[spec.name], 1),
+                )
+            self.app.openapi_schema = None
+
+    def _wanted(self, path: str) -> list[RouterSpec]:
+        if path in (self.app.openapi_url, self.app.docs_url, self.app.redoc_url):
+            return list(self.pending)
+        return [spec for spec in self.pending if spec.matches(path)]
+
+    def _timed_load(self, spec: RouterSpec) -> APIRouter:
+        start = time.perf_counter()
+        router = spec.load()
+        self.import_ms[spec.name] = (time.perf_counter() - start) * 1000
+        return router
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware mounting lazy routers before their first request.
+
+    Usage:
+        app.add_middleware(LazyRouterMiddleware, registry=registry)
+    """
+
+    def __init__(self, app: ASGIApp, registry: RouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.registry.pending and scope["type"] in ("http", "websocket"):
+            await self.registry.mount_for_path(scope["path"])
+        await self.app(scope, receive, send)
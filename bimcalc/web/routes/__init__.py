@@ -5,7 +5,7 @@ Each module handles a specific functional area using FastAPI's APIRouter.
 
 Architecture:
 - Each route module exports a `router` object (APIRouter instance)
-- Main app includes these routers in app_enhanced.py
+- Main app mounts these routers via bimcalc.web.router_registry
 - Shared dependencies provided by bimcalc.web.dependencies
 - Shared models defined in bimcalc.web.models
 
@@ -20,37 +20,13 @@ Pattern (from intelligence/routes.py):
 Usage:
     from bimcalc.web.routes import auth
     app.include_router(auth.router)
-"""
 
-# Import routers as they are created
-from bimcalc.web.routes import (
-    analytics,
-    audit,
-    auth,
-    classifications,
-    compliance,
-    price_scout,
-    price_sources,
-    dashboard,
-    documents,
-    integrations,
-    items,
-    mappings,
-    matching,
-    pipeline,
-    prices,
-    projects,
-    review,
-    revisions,
-    risk_dashboard,
-    scenarios,
-    users,
-    webhooks,
-    search,
-    revit,
-    health,
-)
+New modules must also be listed in bimcalc.web.router_registry.ROUTERS.
+"""
 
+# Submodules are not imported here: each is loaded on first
+# ``from bimcalc.web.routes import <name>`` so workers only pay for the
+# routers they mount (see bimcalc.web.router_registry).
 __all__ = [
     "auth",  # Phase 3.1 - Authentication routes
     "dashboard",  # Phase 3.2 - Dashboard and progress routes
@@ -76,4 +52,5 @@ __all__ = [
     "search",  # Phase 3.21 - User management routes
     "revit",
     "health",
+    "profiling",  # Query profiler report (/admin/profiling)
 ]
@@ -1,13 +1,16 @@
 """Analytics routes for BIMCalc web UI.
 
-Handles analytics dashboard and metrics.
+Handles analytics dashboard and metrics, plus the price history, vendor
+comparison, forecast and price inflation APIs behind advanced analytics.
 """
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Body, Depends, Query, Request
 from fastapi.responses import HTMLResponse
 
+from bimcalc.db.connection import get_session
+from bimcalc.reporting.analytics import AnalyticsEngine
 from bimcalc.web.dependencies import get_templates, get_org_project
 
 router = APIRouter(tags=["analytics"])
@@ -27,3 +30,74 @@ async def analytics_page(
         "analytics.html",
         {"request": request, "org_id": org_id, "project_id": project_id},
     )
+
+
+@router.get("/analytics/advanced", response_class=HTMLResponse)
+async def advanced_analytics_page(
+    request: Request,
+    org: str | None = None,
+    project: str | None = None,
+    templates=Depends(get_templates),
+):
+    """Render price history, vendor comparison and forecast page."""
+    org_id, project_id = get_org_project(request, org, project)
+
+    return templates.TemplateResponse(
+        "analytics_advanced.html",
+        {"request": request, "org_id": org_id, "project_id": project_id},
+    )
+
+
+@router.get("/api/analytics/history/{item_code}")
+async def item_price_history(
+    request: Request,
+    item_code: str,
+    org: str | None = None,
+):
+    """Every price version of an item, oldest first."""
+    org_id, _ = get_org_project(request, org, None)
+
+    async with get_session() as session:
+        return await AnalyticsEngine(session).get_item_price_history(item_code, org_id)
+
+
+@router.post("/api/analytics/vendor-comparison")
+async def vendor_comparison(
+    request: Request,
+    item_codes: list[str] = Body(...),
+    org: str | None = None,
+):
+    """Current basket cost and coverage per vendor."""
+    org_id, _ = get_org_project(request, org, None)
+
+    async with get_session() as session:
+        return await AnalyticsEngine(session).compare_vendors(item_codes, org_id)
+
+
+@router.get("/api/analytics/forecast")
+async def cost_forecast(
+    request: Request,
+    project: str | None = None,
+    days: int = Query(default=90, ge=1, le=730),
+):
+    """Linear forecast of cumulative project cost."""
+    _, project_id = get_org_project(request, None, project)
+
+    async with get_session() as session:
+        return await AnalyticsEngine(session).forecast_cost_trends(project_id, days)
+
+
+@router.get("/api/analytics/price-inflation")
+async def price_inflation(
+    request: Request,
+    org: str | None = None,
+    region: str | None = None,
+    limit: int = Query(default=20, ge=1, le=500),
+):
+    """Items with the steepest annualised price increase across the catalog."""
+    org_id, _ = get_org_project(request, org, None)
+
+    async with get_session() as session:
+        return await AnalyticsEngine(session).get_price_inflation(
+            org_id, limit=limit, region=region
+        )
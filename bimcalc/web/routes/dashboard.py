@@ -15,7 +15,6 @@ import os
 from datetime import datetime
 from io import BytesIO
 
-import pandas as pd
 from fastapi import APIRouter, Depends, Query, Request, Response
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy import func, select, text
@@ -227,6 +226,30 @@ async def progress_dashboard(
     )
 
 
+@router.get("/api/project-metrics")
+async def project_metrics(
+    request: Request,
+    org: str | None = None,
+    project: str | None = None,
+):
+    """Review, audit and progress metrics from one scan, with section timings."""
+    from bimcalc.reporting.project_metrics import compute_project_metrics
+
+    org_id, project_id = get_org_project(request, org, project)
+
+    async with get_session() as session:
+        metrics = await compute_project_metrics(session, org_id, project_id)
+
+    return {
+        "org_id": org_id,
+        "project_id": project_id,
+        "review": metrics.review,
+        "audit": metrics.audit,
+        "progress": metrics.progress,
+        "timings": metrics.timings,
+    }
+
+
 @router.get("/progress/export")
 async def progress_export(
     request: Request,
@@ -237,6 +260,8 @@ async def progress_export(
 
     Extracted from: app_enhanced.py:359
     """
+    import pandas as pd
+
     from bimcalc.reporting.progress import compute_progress_metrics
 
     org_id, project_id = get_org_project(request, org, project)
@@ -28,3 +28,12 @@ async def health_check(db: AsyncSession = Depends(get_db)):
             "database": "disconnected",
             "detail": str(e)
         }
+
+
+@router.get("/cache", status_code=status.HTTP_200_OK)
+async def cache_stats():
+    """Report tiered cache hit/miss/latency counters for this worker."""
+    from bimcalc.utils.cache import get_cache
+
+    cache = get_cache()
+    return {"l1_entries": len(cache.l1), **cache.stats.snapshot()}
@@ -4,7 +4,7 @@ Extracted from app_enhanced.py as part of Phase 3.6 web refactor.
 Handles item listing, detail viewing, export, and deletion.
 
 Routes:
-- GET    /items           - List and filter items with pagination
+- GET    /items           - List and filter items with keyset pagination
 - GET    /items/export    - Export filtered items to Excel
 - GET    /items/{item_id} - View item details
 - DELETE /items/{item_id} - Delete an item
@@ -18,12 +18,20 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, StreamingResponse
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font
-from sqlalchemy import func, select
+from sqlalchemy import select
 
 from bimcalc.db.connection import get_session
 from bimcalc.db.models import ItemModel
+from bimcalc.db.facets import item_facets
+from bimcalc.db.pagination import ITEMS_SORT, InvalidCursorError, KeysetPage, fetch_page
+from bimcalc.db.search import (
+    ITEMS,
+    ResultCount,
+    apply_search,
+    count_results,
+    dialect_name,
+)
+from bimcalc.utils.cache_tags import project_tag, publish_invalidation
 from bimcalc.web.dependencies import get_org_project, get_templates
 
 # Create router with items tag
@@ -41,6 +49,8 @@ async def items_list(
     org: str | None = None,
     project: str | None = None,
     page: int = Query(default=1, ge=1),
+    after: str | None = Query(default=None),
+    before: str | None = Query(default=None),
     search: str | None = Query(default=None),
     category: str | None = Query(default=None),
     templates=Depends(get_templates),
@@ -48,89 +58,76 @@ async def items_list(
     """List and manage items with search and filter.
 
     Supports pagination, search across family/type/category, and category filtering.
+    Unsearched listings page by ``after``/``before`` cursors (keyset
+    pagination), so deep pages cost the same as the first; ranked search
+    results keep page numbers. Totals and category counts come
+    from the cached facet cube.
 
     Extracted from: app_enhanced.py:732
     """
     org_id, project_id = get_org_project(request, org, project)
     per_page = 50
     offset = (page - 1) * per_page
+    searching = bool((search or "").strip())
 
     async with get_session() as session:
+        dialect = dialect_name(session)
+        facets = await item_facets(session, org_id, project_id)
+
         # Build query with filters
         stmt = select(ItemModel).where(
             ItemModel.org_id == org_id,
             ItemModel.project_id == project_id,
         )
 
-        # Apply search filter (family, type, category)
-        if search:
-            search_term = f"%{search}%"
-            stmt = stmt.where(
-                (ItemModel.family.ilike(search_term))
-                | (ItemModel.type_name.ilike(search_term))
-                | (ItemModel.category.ilike(search_term))
-            )
-
         # Apply category filter
         if category:
             stmt = stmt.where(ItemModel.category == category)
 
-        # Get total count with filters
-        count_stmt = (
-            select(func.count())
-            .select_from(ItemModel)
-            .where(
-                ItemModel.org_id == org_id,
-                ItemModel.project_id == project_id,
-            )
-        )
-        if search:
-            search_term = f"%{search}%"
-            count_stmt = count_stmt.where(
-                (ItemModel.family.ilike(search_term))
-                | (ItemModel.type_name.ilike(search_term))
-                | (ItemModel.category.ilike(search_term))
-            )
-        if category:
-            count_stmt = count_stmt.where(ItemModel.category == category)
-
-        count_result = await session.execute(count_stmt)
-        total_items = count_result.scalar_one()
-        total_pages = (total_items + per_page - 1) // per_page
+        if searching:
+            # Apply search filter (family, type, category), best matches first
+            stmt = apply_search(stmt, ITEMS, search, dialect)
 
-        # Apply pagination and ordering
-        stmt = stmt.order_by(ItemModel.created_at.desc()).limit(per_page).offset(offset)
-        result = await session.execute(stmt)
-        items = result.scalars().all()
+            # Total for the same filters (estimated for very large results)
+            count = await count_results(session, stmt, dialect)
 
-        # Get distinct categories for filter dropdown
-        categories_stmt = (
-            select(ItemModel.category)
-            .where(
-                ItemModel.org_id == org_id,
-                ItemModel.project_id == project_id,
-                ItemModel.category.isnot(None),
+            stmt = (
+                stmt.order_by(ItemModel.created_at.desc())
+                .limit(per_page)
+                .offset(offset)
             )
-            .distinct()
-            .order_by(ItemModel.category)
-        )
-        categories_result = await session.execute(categories_stmt)
-        categories = [c for c in categories_result.scalars().all() if c]
+            result = await session.execute(stmt)
+            listing = KeysetPage(rows=list(result.scalars().all()))
+        else:
+            count = ResultCount(total=facets.total(category=category or None))
+            try:
+                listing = await fetch_page(
+                    session, stmt, ITEMS_SORT, per_page, after, before, offset
+                )
+            except InvalidCursorError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+
+    total_items = count.total
+    total_pages = (total_items + per_page - 1) // per_page
 
     return templates.TemplateResponse(
         "items.html",
         {
             "request": request,
-            "items": items,
+            "items": listing.rows,
             "org_id": org_id,
             "project_id": project_id,
             "page": page,
             "total_pages": total_pages,
             "total": total_items,
+            "total_estimated": count.estimated,
             "per_page": per_page,
+            "keyset": not searching,
+            "next_cursor": listing.next_cursor,
+            "prev_cursor": listing.prev_cursor,
             "search": search or "",
             "category": category or "",
-            "categories": categories,
+            "categories": facets.counts("category"),
         },
     )
 
@@ -157,22 +154,18 @@ async def items_export(
             ItemModel.project_id == project_id,
         )
 
-        if search:
-            search_term = f"%{search}%"
-            stmt = stmt.where(
-                (ItemModel.family.ilike(search_term))
-                | (ItemModel.type_name.ilike(search_term))
-                | (ItemModel.category.ilike(search_term))
-            )
-
         if category:
             stmt = stmt.where(ItemModel.category == category)
 
+        stmt = apply_search(stmt, ITEMS, search, dialect_name(session))
         stmt = stmt.order_by(ItemModel.created_at.desc())
         result = await session.execute(stmt)
         items = result.scalars().all()
 
     # Create Excel file
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Font
+
     wb = Workbook()
     ws = wb.active
     ws.title = "Items"
@@ -310,6 +303,7 @@ async def delete_item(item_id: UUID):
             raise HTTPException(status_code=404, detail="Item not found")
 
         await session.delete(item)
+        publish_invalidation(session, project_tag(item.org_id, item.project_id))
         await session.commit()
 
     return {"success": True, "message": "Item deleted"}
@@ -17,6 +17,7 @@ from sqlalchemy import select
 from bimcalc.db.connection import get_session
 from bimcalc.db.match_results import record_match_result
 from bimcalc.db.models import ItemModel
+from bimcalc.matching.dirty import find_dirty_items, load_dirty_items
 from bimcalc.matching.orchestrator import MatchOrchestrator
 from bimcalc.models import Item
 from bimcalc.web.dependencies import get_org_project, get_templates
@@ -61,6 +62,7 @@ async def run_matching(
     org: str = Form(...),
     project: str = Form(...),
     limit: str | None = Form(default=None),
+    incremental: bool = Form(default=False),
 ):
     """Trigger matching pipeline for project.
 
@@ -71,6 +73,7 @@ async def run_matching(
         org: Organization ID
         project: Project ID
         limit: Optional limit on number of items to match
+        incremental: Only re-match items in the project's dirty set
 
     Returns:
         JSON response with success status, message, and match results
@@ -88,17 +91,29 @@ async def run_matching(
         orchestrator = MatchOrchestrator(session)
 
         # Query items
-        stmt = select(ItemModel).where(
-            ItemModel.org_id == org,
-            ItemModel.project_id == project,
-        )
-        if limit_value:
-            stmt = stmt.limit(limit_value)
-
-        result = await session.execute(stmt)
-        items = result.scalars().all()
+        skipped = 0
+        if incremental:
+            dirty = await find_dirty_items(session, org, project)
+            items = await load_dirty_items(session, dirty, limit_value)
+            skipped = dirty.clean
+        else:
+            stmt = select(ItemModel).where(
+                ItemModel.org_id == org,
+                ItemModel.project_id == project,
+            )
+            if limit_value:
+                stmt = stmt.limit(limit_value)
+            result = await session.execute(stmt)
+            items = result.scalars().all()
 
         if not items:
+            if incremental and skipped:
+                return {
+                    "success": True,
+                    "message": f"All {skipped} items are up to date",
+                    "results": [],
+                    "skipped": skipped,
+                }
             return {"success": False, "message": "No items found for project"}
 
         # Run matching
@@ -143,10 +158,14 @@ async def run_matching(
         # Commit all changes (canonical keys and match results)
         await session.commit()
 
+        message = f"Matched {len(results)} items"
+        if incremental:
+            message += f" ({skipped} clean items skipped)"
         return {
             "success": True,
-            "message": f"Matched {len(results)} items",
+            "message": message,
             "results": results,
+            "skipped": skipped,
         }
 
 
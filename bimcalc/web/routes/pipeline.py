@@ -11,6 +11,7 @@ Routes:
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, Query, Request
@@ -144,7 +145,9 @@ async def run_pipeline_manual():
             )
 
         # Run pipeline
-        orchestrator = PipelineOrchestrator(importers)
+        orchestrator = PipelineOrchestrator(
+            importers, max_parallel=int(os.environ.get("PIPELINE_MAX_PARALLEL", "1"))
+        )
         summary = await orchestrator.run()
 
         return {
@@ -18,14 +18,25 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, StreamingResponse
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font
-from sqlalchemy import func, select, text
+from sqlalchemy import select, text
 
 from bimcalc.db.connection import get_session
 from bimcalc.db.models import PriceItemModel
+from bimcalc.db.facets import price_facets
+from bimcalc.db.pagination import (
+    PRICES_SORT,
+    InvalidCursorError,
+    KeysetPage,
+    fetch_page,
+)
+from bimcalc.db.search import (
+    PRICES,
+    ResultCount,
+    apply_search,
+    count_results,
+    dialect_name,
+)
 from bimcalc.web.dependencies import get_org_project, get_templates
-from bimcalc.intelligence.predictor import predict_price_trend
 
 # Create router with prices tag
 # Trigger reload
@@ -88,6 +99,8 @@ async def prices_list(
     view: str | None = Query(default=None),
     current_only: bool = Query(default=True),
     page: int = Query(default=1, ge=1),
+    after: str | None = Query(default=None),
+    before: str | None = Query(default=None),
     search: str | None = Query(default=None),
     vendor: str | None = Query(default=None),
     classification: str | None = Query(default=None),
@@ -98,7 +111,9 @@ async def prices_list(
 
     Supports two views:
     - view=executive: Price quality metrics dashboard
-    - (default): Paginated table with search and filters
+    - (default): Paginated table with search and filters; browsing pages by
+      ``after``/``before`` keyset cursors, ranked searches by page number.
+      Totals and dropdown counts come from the cached facet cube.
 
     Extracted from: app_enhanced.py:837
     """
@@ -106,10 +121,10 @@ async def prices_list(
 
     # Executive view: Show price quality metrics
     if view == "executive":
-        from bimcalc.reporting.price_metrics import compute_price_metrics
+        from bimcalc.reporting.price_metrics import compute_price_metrics_cached
 
         async with get_session() as session:
-            metrics = await compute_price_metrics(session, org_id)
+            metrics = await compute_price_metrics_cached(session, org_id)
 
             # Get pending review count for navigation badge
             pending_query = text("""
@@ -148,23 +163,24 @@ async def prices_list(
     # Default view: Paginated table with search and filters
     per_page = 50
     offset = (page - 1) * per_page
+    searching = bool((search or "").strip())
+    facet_filters = {
+        "is_current": True if current_only else None,
+        "vendor_id": vendor or None,
+        "classification_code": classification or None,
+        "region": region or None,
+    }
 
     async with get_session() as session:
+        dialect = dialect_name(session)
+        facets = await price_facets(session, org_id)
+
         # Build query with filters
         stmt = select(PriceItemModel).where(PriceItemModel.org_id == org_id)
 
         if current_only:
             stmt = stmt.where(PriceItemModel.is_current == True)
 
-        # Apply search filter (description, SKU, item_code)
-        if search:
-            search_term = f"%{search}%"
-            stmt = stmt.where(
-                (PriceItemModel.description.ilike(search_term))
-                | (PriceItemModel.sku.ilike(search_term))
-                | (PriceItemModel.item_code.ilike(search_term))
-            )
-
         # Apply vendor filter
         if vendor:
             stmt = stmt.where(PriceItemModel.vendor_id == vendor)
@@ -177,92 +193,50 @@ async def prices_list(
         if region:
             stmt = stmt.where(PriceItemModel.region == region)
 
-        # Get total count with filters
-        count_stmt = (
-            select(func.count())
-            .select_from(PriceItemModel)
-            .where(PriceItemModel.org_id == org_id)
-        )
-        if current_only:
-            count_stmt = count_stmt.where(PriceItemModel.is_current == True)
-        if search:
-            search_term = f"%{search}%"
-            count_stmt = count_stmt.where(
-                (PriceItemModel.description.ilike(search_term))
-                | (PriceItemModel.sku.ilike(search_term))
-                | (PriceItemModel.item_code.ilike(search_term))
-            )
-        if vendor:
-            count_stmt = count_stmt.where(PriceItemModel.vendor_id == vendor)
-        if classification:
-            count_stmt = count_stmt.where(
-                PriceItemModel.classification_code == classification
-            )
-        if region:
-            count_stmt = count_stmt.where(PriceItemModel.region == region)
-
-        count_result = await session.execute(count_stmt)
-        total = count_result.scalar_one()
-        total_pages = (total + per_page - 1) // per_page
+        if searching:
+            # Apply search filter (description, SKU, item_code), best matches first
+            stmt = apply_search(stmt, PRICES, search, dialect)
 
-        # Apply pagination and ordering
-        stmt = (
-            stmt.order_by(
-                PriceItemModel.item_code,
-                PriceItemModel.valid_from.desc(),
-            )
-            .limit(per_page)
-            .offset(offset)
-        )
+            # Total for the same filters (estimated for very large results)
+            count = await count_results(session, stmt, dialect)
 
-        result = await session.execute(stmt)
-        prices = result.scalars().all()
-
-        # Get distinct vendors for filter dropdown
-        vendors_stmt = (
-            select(PriceItemModel.vendor_id)
-            .where(
-                PriceItemModel.org_id == org_id,
-                PriceItemModel.vendor_id.isnot(None),
+            # Apply pagination and ordering
+            stmt = (
+                stmt.order_by(
+                    PriceItemModel.item_code,
+                    PriceItemModel.valid_from.desc(),
+                )
+                .limit(per_page)
+                .offset(offset)
             )
-            .distinct()
-            .order_by(PriceItemModel.vendor_id)
-        )
-        vendors_result = await session.execute(vendors_stmt)
-        vendors = [v for v in vendors_result.scalars().all() if v]
+            result = await session.execute(stmt)
+            listing = KeysetPage(rows=list(result.scalars().all()))
+        else:
+            # Browsing: total from the facet cube, page by keyset cursor
+            count = ResultCount(total=facets.total(**facet_filters))
+            try:
+                listing = await fetch_page(
+                    session, stmt, PRICES_SORT, per_page, after, before, offset
+                )
+            except InvalidCursorError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
 
-        # Get distinct classifications
-        classifications_stmt = (
-            select(PriceItemModel.classification_code)
-            .where(
-                PriceItemModel.org_id == org_id,
-                PriceItemModel.classification_code.isnot(None),
-            )
-            .distinct()
-            .order_by(PriceItemModel.classification_code)
-        )
-        classifications_result = await session.execute(classifications_stmt)
-        classifications = [c for c in classifications_result.scalars().all() if c]
-
-        # Get distinct regions
-        regions_stmt = (
-            select(PriceItemModel.region)
-            .where(PriceItemModel.org_id == org_id)
-            .distinct()
-            .order_by(PriceItemModel.region)
-        )
-        regions_result = await session.execute(regions_stmt)
-        regions = [r for r in regions_result.scalars().all() if r]
+    total = count.total
+    total_pages = (total + per_page - 1) // per_page
 
     return templates.TemplateResponse(
         "prices.html",
         {
             "request": request,
-            "prices": prices,
+            "prices": listing.rows,
             "current_only": current_only,
             "page": page,
+            "keyset": not searching,
+            "next_cursor": listing.next_cursor,
+            "prev_cursor": listing.prev_cursor,
             "per_page": per_page,
             "total": total,
+            "total_estimated": count.estimated,
             "total_pages": total_pages,
             "org_id": org_id,
             "project_id": project_id,
@@ -270,9 +244,9 @@ async def prices_list(
             "vendor": vendor or "",
             "classification": classification or "",
             "region": region or "",
-            "vendors": vendors,
-            "classifications": classifications,
-            "regions": regions,
+            "vendors": facets.counts("vendor_id", **facet_filters),
+            "classifications": facets.counts("classification_code", **facet_filters),
+            "regions": facets.counts("region", **facet_filters),
             "request_url": str(request.url).replace(
                 "/prices-legacy", "/prices"
             ),  # Ensure correct URL in template
@@ -315,14 +289,6 @@ async def prices_export(
         if current_only:
             stmt = stmt.where(PriceItemModel.is_current == True)
 
-        if search:
-            search_term = f"%{search}%"
-            stmt = stmt.where(
-                (PriceItemModel.description.ilike(search_term))
-                | (PriceItemModel.sku.ilike(search_term))
-                | (PriceItemModel.item_code.ilike(search_term))
-            )
-
         if vendor:
             stmt = stmt.where(PriceItemModel.vendor_id == vendor)
 
@@ -332,6 +298,7 @@ async def prices_export(
         if region:
             stmt = stmt.where(PriceItemModel.region == region)
 
+        stmt = apply_search(stmt, PRICES, search, dialect_name(session))
         stmt = stmt.order_by(
             PriceItemModel.item_code,
             PriceItemModel.valid_from.desc(),
@@ -340,6 +307,9 @@ async def prices_export(
         prices = result.scalars().all()
 
     # Create Excel file
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Font
+
     wb = Workbook()
     ws = wb.active
     ws.title = "Prices"
@@ -483,7 +453,9 @@ async def price_detail(
         )
         price_history_list = history_result.scalars().all()
 
-        # Calculate trend
+        # Calculate trend (the predictor pulls in pandas, load it on demand)
+        from bimcalc.intelligence.predictor import predict_price_trend
+
         try:
             trend = predict_price_trend(price_history_list)
         except Exception:
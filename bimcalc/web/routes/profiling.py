@@ -0,0 +1,78 @@
+"""Query profiling routes for BIMCalc web UI.
+
+Routes:
+- GET    /admin/profiling - Recent request/command query profiles and hot queries
+- DELETE /admin/profiling - Clear collected profiles
+"""
+
+from __future__ import annotations
+
+import os
+
+from fastapi import APIRouter, Depends, Query
+
+from bimcalc.db.profiler import QueryStats, clear_profiles, recent_profiles
+from bimcalc.web.auth import require_admin
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def _enabled() -> bool:
+    return os.environ.get("BIMCALC_QUERY_PROFILING", "false").lower() == "true"
+
+
+@router.get("/profiling")
+async def profiling_report(
+    limit: int = Query(default=20, ge=1, le=100),
+    username: str = Depends(require_admin),
+):
+    """Query profiles of this worker, newest first.
+
+    ``hot_queries`` aggregates every kept profile by fingerprint, slowest
+    in total first; ``n_plus_one`` lists the profiles (by label) that
+    repeated a fingerprint often enough to look like a per-row query loop.
+    """
+    profiles = recent_profiles()
+
+    totals: dict[str, QueryStats] = {}
+    labels: dict[str, set[str]] = {}
+    n_plus_one: dict[tuple[str, str], dict] = {}
+    for profile in profiles:
+        for key, stats in profile.queries.items():
+            total = totals.setdefault(key, QueryStats())
+            total.count += stats.count
+            total.total_ms += stats.total_ms
+            total.max_ms = max(total.max_ms, stats.max_ms)
+            labels.setdefault(key, set()).add(profile.label)
+        for key, stats in profile.suspected_n_plus_one():
+            entry = n_plus_one.setdefault(
+                (profile.label, key),
+                {"label": profile.label, "fingerprint": key, "seen": 0, "max_count": 0},
+            )
+            entry["seen"] += 1
+            entry["max_count"] = max(entry["max_count"], stats.count)
+
+    hot = sorted(totals.items(), key=lambda kv: -kv[1].total_ms)[:limit]
+    return {
+        "enabled": _enabled(),
+        "profiles_kept": len(profiles),
+        "hot_queries": [
+            {
+                "fingerprint": key,
+                "count": stats.count,
+                "total_ms": round(stats.total_ms, 2),
+                "max_ms": round(stats.max_ms, 2),
+                "labels": sorted(labels[key]),
+            }
+            for key, stats in hot
+        ],
+        "n_plus_one": sorted(n_plus_one.values(), key=lambda e: -e["max_count"]),
+        "profiles": [profile.summary(top=5) for profile in profiles[:limit]],
+    }
+
+
+@router.delete("/profiling")
+async def profiling_clear(username: str = Depends(require_admin)):
+    """Forget collected profiles (e.g. before a load test)."""
+    clear_profiles()
+    return {"success": True}
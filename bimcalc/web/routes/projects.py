@@ -316,6 +316,7 @@ async def export_project_items_csv(
     project_id: str,
     org_id: str = Query(..., alias="org"),
     category: str | None = None,
+    search: str | None = None,
 ):
     """Export project items to CSV."""
     async with get_session() as session:
@@ -330,7 +331,7 @@ async def export_project_items_csv(
             raise HTTPException(status_code=404, detail="Project not found")
 
         # Use the export function
-        stream = export_items_csv(session, org_id, project_id, category)
+        stream = export_items_csv(session, org_id, project_id, category, search)
 
         filename = f"items_{org_id}_{project_id}.csv"
 
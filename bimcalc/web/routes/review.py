@@ -26,16 +26,22 @@ from bimcalc.mapping.scd2 import MappingMemory
 from bimcalc.db.match_results import record_match_result
 from bimcalc.review import (
     approve_review_record,
+    bulk_approve_review_records,
+    bulk_reject_review_records,
     fetch_available_classifications,
-    fetch_pending_reviews,
+    fetch_review_counts,
+    fetch_review_page,
     fetch_review_record,
 )
+from bimcalc.utils.cache_tags import item_tag, project_tag, publish_invalidation
 from bimcalc.web.dependencies import get_org_project, get_templates
 from bimcalc.notifications.slack import send_slack_notification
 
 # Create router with review tag
 router = APIRouter(tags=["review"])
 
+REVIEW_PAGE_SIZE = 100
+
 
 # ============================================================================
 # Helper Functions
@@ -80,6 +86,8 @@ async def review_dashboard(
     unmapped_only: str | None = Query(default=None),
     classification: str | None = Query(default=None),
     view: str | None = Query(default=None),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=REVIEW_PAGE_SIZE, ge=1, le=500),
     templates=Depends(get_templates),
 ):
     """Review items requiring manual approval.
@@ -118,22 +126,31 @@ async def review_dashboard(
             session, org_id, project_id
         )
 
-        # Fetch pending reviews with filters
-        records = await fetch_pending_reviews(
-            session,
-            org_id,
-            project_id,
-            flag_types=_parse_flag_filter(flag),
-            severity_filter=_parse_severity_filter(severity),
-            unmapped_only=unmapped_filter,
-            classification_filter=classification,
-        )
+        # Fetch one keyset page of pending reviews (filters applied in SQL)
+        filters = {
+            "flag_types": _parse_flag_filter(flag),
+            "severity_filter": _parse_severity_filter(severity),
+            "unmapped_only": unmapped_filter,
+            "classification_filter": (
+                classification if classification != "all" else None
+            ),
+        }
+        try:
+            page = await fetch_review_page(
+                session, org_id, project_id, cursor=cursor, limit=limit, **filters
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+        counts = await fetch_review_counts(session, org_id, project_id, **filters)
 
     return templates.TemplateResponse(
         "review.html",
         {
             "request": request,
-            "records": records,
+            "records": page.records,
+            "next_cursor": page.next_cursor,
+            "counts": counts,
             "classifications": classifications,
             "org_id": org_id,
             "project_id": project_id,
@@ -217,6 +234,9 @@ async def reject_review(
         match_result.reviewed_at = datetime.utcnow()
         match_result.reviewed_by = "web-ui"  # In real app, use user ID
 
+        publish_invalidation(
+            session, project_tag(org_id, project_id), item_tag(match_result.item_id)
+        )
         await session.commit()
 
     # Redirect back to dashboard with filters preserved
@@ -333,60 +353,43 @@ async def bulk_update_matches(
 ):
     """Bulk approve or reject matches.
 
+    Uses set-based writes for the whole selection; rows that cannot be
+    processed (missing, out of scope, Critical-Veto flags, no price) are
+    returned in ``failed`` instead of aborting the batch.
+
     Extracted from: app_enhanced.py:462
     """
-    from bimcalc.db.models import MatchResultModel, ItemModel
+    username = (
+        "web-ui"  # Placeholder until auth dependency is fully integrated in router
+    )
+    bulk_operation = (
+        bulk_approve_review_records
+        if request.action == "approve"
+        else bulk_reject_review_records
+    )
 
     async with get_session() as session:
-        # Verify all match results exist and belong to org/project
-        stmt = (
-            select(MatchResultModel)
-            .join(ItemModel)
-            .where(
-                MatchResultModel.id.in_(request.match_result_ids),
-                ItemModel.org_id == request.org_id,
-                ItemModel.project_id == request.project_id,
-            )
-        )
-        results = (await session.execute(stmt)).scalars().all()
-
-        if len(results) != len(request.match_result_ids):
-            found_ids = {r.id for r in results}
-            missing = set(request.match_result_ids) - found_ids
-            raise HTTPException(
-                status_code=400,
-                detail=f"Some match results not found or access denied: {missing}",
-            )
-
-        processed_count = 0
-        username = (
-            "web-ui"  # Placeholder until auth dependency is fully integrated in router
+        outcome = await bulk_operation(
+            session,
+            request.match_result_ids,
+            org_id=request.org_id,
+            project_id=request.project_id,
+            created_by=username,
+            annotation=request.annotation,
         )
-
-        for match_result in results:
-            if request.action == "approve":
-                # Re-use existing approval logic
-                record = await fetch_review_record(session, match_result.id)
-                if record:
-                    await approve_review_record(
-                        session,
-                        record,
-                        created_by=username,
-                        annotation=request.annotation,
-                    )
-                    processed_count += 1
-
-            elif request.action == "reject":
-                match_result.decision = "rejected"
-                match_result.reason = request.annotation or "Bulk rejection via web UI"
-                match_result.created_by = username
-                processed_count += 1
-
         await session.commit()
 
-        if processed_count > 0:
-            emoji = "✅" if request.action == "approve" else "❌"
-            msg = f"{emoji} *Bulk {request.action.title()}*\nUser `{username}` {request.action}d {processed_count} items in {request.org_id}/{request.project_id}."
-            background_tasks.add_task(send_slack_notification, msg)
-
-        return {"processed": processed_count, "action": request.action}
+    processed_count = outcome.processed_count
+    if processed_count > 0:
+        emoji = "✅" if request.action == "approve" else "❌"
+        msg = f"{emoji} *Bulk {request.action.title()}*\nUser `{username}` {request.action}d {processed_count} items in {request.org_id}/{request.project_id}."
+        background_tasks.add_task(send_slack_notification, msg)
+
+    return {
+        "processed": processed_count,
+        "action": request.action,
+        "failed": [
+            {"match_result_id": str(failure.match_result_id), "error": failure.error}
+            for failure in outcome.failures
+        ],
+    }
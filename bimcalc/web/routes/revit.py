@@ -1,12 +1,27 @@
-from typing import List
+"""Revit plugin integration routes.
+
+POST /api/revit/match resolves a batch of elements in three passes:
+identical elements are grouped so each distinct payload is matched once,
+mapping memory answers every group whose canonical key has an active
+mapping, and the remaining texts are embedded in batches and looked up
+together in the vector index. Results then fan back out per element.
+"""
+
+from typing import Any, Dict, List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bimcalc.core.embeddings import generate_embedding
+from bimcalc.canonical.key_generator import canonical_key
+from bimcalc.classification.trust_hierarchy import ConfigurationError, classify_item
+from bimcalc.core.embeddings import generate_embeddings
 from bimcalc.db.connection import get_db
-from bimcalc.matching.smart_matcher import find_matches_by_embedding
+from bimcalc.db.models import PriceItemModel
+from bimcalc.mapping.scd2 import MappingMemory
+from bimcalc.matching.smart_matcher import find_matches_by_embeddings
+from bimcalc.models import Item
 from bimcalc.web.models import RevitItemInput, RevitMatchResponse
 
 router = APIRouter(prefix="/api/revit", tags=["Revit Integration"])
@@ -26,53 +41,161 @@ async def match_revit_items(
     runs them through the Smart Matcher, and returns the best match
     for each item along with confidence scores.
     """
-    results = []
-
+    # Group identical payloads: each distinct element is matched once
+    groups: Dict[tuple, List[RevitItemInput]] = {}
     for item_input in items:
-        # Construct text representation for embedding
-        # Similar to how ItemModel generates its embedding text
-        text_parts = [
-            f"Family: {item_input.family}",
-            f"Type: {item_input.type_name}",
-            f"Category: {item_input.category or ''}",
-        ]
-        
-        # Add parameters to text
-        for key, value in item_input.parameters.items():
-            if value:
-                text_parts.append(f"{key}: {value}")
-                
-        text_representation = " ".join(text_parts)
-        
-        # Generate embedding
-        embedding = await generate_embedding(text_representation)
-        
-        matches = []
-        if embedding:
-            # Run matching
-            matches = await find_matches_by_embedding(db, embedding, limit=1)
-
-        response = RevitMatchResponse(
+        groups.setdefault(_payload_key(item_input), []).append(item_input)
+
+    representatives = [members[0] for members in groups.values()]
+    matches: Dict[tuple, Dict[str, Any]] = {}
+
+    # Mapping memory fast path (same canonical keys the orchestrator writes)
+    keys = {
+        key: canonical
+        for key, item_input in zip(groups, representatives, strict=False)
+        if (canonical := _canonical_key(item_input, org_id, project_id))
+    }
+    mapped = await MappingMemory(db).lookup_many(org_id, keys.values())
+    if mapped:
+        result = await db.execute(
+            select(PriceItemModel).where(
+                PriceItemModel.id.in_(set(mapped.values())),
+                PriceItemModel.is_current.is_(True),
+            )
+        )
+        prices = {row.id: row for row in result.scalars()}
+        for key, canonical in keys.items():
+            price = prices.get(mapped.get(canonical))
+            if price is not None:
+                matches[key] = {
+                    "price_item_id": price.id,
+                    "confidence_score": 1.0,
+                    "match_source": "exact",
+                    "price_data": _price_data(
+                        price.sku,
+                        price.description,
+                        price.unit_price,
+                        price.currency,
+                        price.vendor_id,
+                    ),
+                }
+
+    # Embed the rest in batches and run one vector lookup for all of them
+    pending = [
+        (key, _embedding_text(item_input))
+        for key, item_input in zip(groups, representatives, strict=False)
+        if key not in matches
+    ]
+    embeddings = await generate_embeddings([text for _, text in pending])
+    embedded = [
+        (key, embedding)
+        for (key, _), embedding in zip(pending, embeddings, strict=False)
+        if embedding
+    ]
+    if embedded:
+        nearest = await find_matches_by_embeddings(
+            db, [embedding for _, embedding in embedded], limit=1
+        )
+        for (key, _), candidates in zip(embedded, nearest, strict=False):
+            if candidates:
+                best_match = candidates[0]
+                matches[key] = {
+                    "price_item_id": UUID(best_match["id"]),
+                    "confidence_score": best_match["similarity"],
+                    "match_source": "fuzzy",
+                    "price_data": _price_data(
+                        best_match["sku"],
+                        best_match["description"],
+                        best_match["unit_price"],
+                        best_match["currency"],
+                        best_match["vendor_id"],
+                    ),
+                }
+
+    no_match = {"match_source": "none", "confidence_score": 0.0}
+    return [
+        RevitMatchResponse(
             element_id=item_input.element_id,
-            match_source="none",
-            confidence_score=0.0
+            **matches.get(_payload_key(item_input), no_match),
         )
+        for item_input in items
+    ]
+
+
+def _payload_key(item_input: RevitItemInput) -> tuple:
+    """Identity of an element for matching purposes (element_id excluded)."""
+    return (
+        item_input.family,
+        item_input.type_name,
+        item_input.category,
+        tuple(sorted((k, str(v)) for k, v in item_input.parameters.items())),
+    )
+
+
+def _embedding_text(item_input: RevitItemInput) -> str:
+    """Text representation for embedding.
+
+    Similar to how ItemModel generates its embedding text.
+    """
+    text_parts = [
+        f"Family: {item_input.family}",
+        f"Type: {item_input.type_name}",
+        f"Category: {item_input.category or ''}",
+    ]
+    for key, value in item_input.parameters.items():
+        if value:
+            text_parts.append(f"{key}: {value}")
+    return " ".join(text_parts)
+
+
+def _param(parameters: Dict[str, Any], names: List[str], numeric: bool = False) -> Any:
+    """First parameter present under any of ``names`` (schedule column aliases)."""
+    for name in names:
+        value = parameters.get(name)
+        if value is None or value == "":
+            continue
+        if not numeric:
+            return str(value).strip()
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _canonical_key(
+    item_input: RevitItemInput, org_id: str, project_id: str
+) -> str | None:
+    """Canonical key for an element, or None if it cannot be classified."""
+    params = item_input.parameters
+    item = Item(
+        org_id=org_id,
+        project_id=project_id,
+        family=item_input.family,
+        type_name=item_input.type_name,
+        category=item_input.category,
+        element_id=item_input.element_id,
+        system_type=_param(params, ["System Type"]),
+        unit=_param(params, ["Unit"]),
+        width_mm=_param(params, ["Width", "Width (mm)", "W"], numeric=True),
+        height_mm=_param(params, ["Height", "Height (mm)", "H"], numeric=True),
+        dn_mm=_param(params, ["DN", "Diameter", "D"], numeric=True),
+        angle_deg=_param(params, ["Angle", "Angle (deg)", "Degrees"], numeric=True),
+        material=_param(params, ["Material"]),
+    )
+    try:
+        item.classification_code = classify_item(item)
+        return canonical_key(item)
+    except (ConfigurationError, ValueError):
+        return None
+
 
-        if matches:
-            best_match = matches[0]
-            response.price_item_id = UUID(best_match["id"])
-            response.confidence_score = best_match["similarity"]
-            response.match_source = "fuzzy"
-            
-            # Include price data for the plugin to display
-            response.price_data = {
-                "sku": best_match["sku"],
-                "description": best_match["description"],
-                "unit_price": float(best_match["unit_price"]) if best_match["unit_price"] else 0.0,
-                "currency": best_match["currency"],
-                "vendor": best_match["vendor_id"]
-            }
-
-        results.append(response)
-
-    return results
+def _price_data(sku, description, unit_price, currency, vendor) -> Dict[str, Any]:
+    """Price fields for the plugin to display."""
+    return {
+        "sku": sku,
+        "description": description,
+        "unit_price": float(unit_price) if unit_price else 0.0,
+        "currency": currency,
+        "vendor": vendor,
+    }
@@ -8,7 +8,7 @@ from bimcalc.db.connection import get_session
 from bimcalc.db.models import WebhookModel
 from bimcalc.web.auth import require_admin
 from bimcalc.web.dependencies import get_templates
-from bimcalc.core.webhook_dispatcher import trigger_webhook
+from bimcalc.core.webhook_dispatcher import invalidate_subscriptions, trigger_webhook
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
@@ -32,6 +32,7 @@ async def create_webhook(
     request: Request,
     url: str = Form(...),
     events: str = Form(...),  # Comma separated
+    batch_max_events: int = Form(1),
     username: str = Depends(require_admin),
 ):
     event_list = [e.strip() for e in events.split(",") if e.strip()]
@@ -42,11 +43,13 @@ async def create_webhook(
             url=url,
             secret=secret,
             events=event_list,
-            is_active=True
+            is_active=True,
+            batch_max_events=max(1, batch_max_events),
         )
         session.add(webhook)
         await session.commit()
-        
+
+    invalidate_subscriptions()
     return RedirectResponse(url="/webhooks", status_code=302)
 
 @router.post("/{webhook_id}/delete")
@@ -60,7 +63,8 @@ async def delete_webhook(
         if webhook:
             await session.delete(webhook)
             await session.commit()
-            
+
+    invalidate_subscriptions()
     return RedirectResponse(url="/webhooks", status_code=302)
 
 @router.post("/test")
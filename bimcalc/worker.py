@@ -1,12 +1,20 @@
 import logging
 import os
 from typing import Any
+from uuid import UUID
 
 from arq.connections import RedisSettings
+from arq.worker import func
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+from bimcalc.core.webhook_dispatcher import (
+    deliver_webhook_batch,
+    get_http_client,
+    send_webhook_request,
+)
 from bimcalc.db.connection import get_session
+from bimcalc.ingestion.uploads import STALE_JOB_AFTER, SpooledUpload
 from bimcalc.integration.price_scout_sync import sync_price_scout_prices
 
 logger = logging.getLogger(__name__)
@@ -23,12 +31,14 @@ async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False
 async def startup(ctx: dict[str, Any]) -> None:
     """Initialize resources when worker starts."""
     ctx["session_maker"] = async_session
+    ctx["http_client"] = get_http_client()
     logger.info("Worker started. Database connection initialized.")
 
 
 async def shutdown(ctx: dict[str, Any]) -> None:
     """Cleanup resources when worker stops."""
     await engine.dispose()
+    await ctx["http_client"].aclose()
     logger.info("Worker stopped. Database connection closed.")
 
 
@@ -188,6 +198,13 @@ async def batch_generate_checklists_job(
             session, item_ids, progress_callback=report_progress
         )
 
+    logger.info(
+        f"Batch checklist generation finished: {results['successful']} created, "
+        f"{results['skipped']} skipped, {results['failed']} failed "
+        f"({results['unique_contexts']} LLM contexts)"
+    )
+    return results
+
 
 async def process_document_job(ctx: dict[str, Any], document_id: str) -> dict[str, Any]:
     """ARQ worker task for processing a document.
@@ -284,6 +301,39 @@ async def send_scheduled_report_job(
         return {"status": "failed", "error": str(e)}
 
 
+async def ingest_schedule_job(
+    ctx: dict[str, Any],
+    job_id: UUID,
+    upload: SpooledUpload,
+    org: str,
+    project: str,
+    reingest: bool = False,
+) -> None:
+    """Parse a schedule spooled by ``POST /ingest/schedules``.
+
+    The spool file lives under ``BIMCALC_SPOOL_DIR``, which must be shared
+    with the web workers. Outcome is recorded on the job's ingest log row.
+    """
+    from bimcalc.ingestion.jobs import run_schedule_job
+
+    logger.info(f"Starting schedule ingest job {job_id} for {org}/{project}")
+    await run_schedule_job(job_id, upload, org, project, reingest)
+
+
+async def ingest_pricebook_job(
+    ctx: dict[str, Any],
+    job_id: UUID,
+    upload: SpooledUpload,
+    vendor: str,
+    use_cmm: bool = True,
+) -> None:
+    """Parse a price book spooled by ``POST /ingest/prices``."""
+    from bimcalc.ingestion.jobs import run_pricebook_job
+
+    logger.info(f"Starting price book ingest job {job_id} for vendor {vendor}")
+    await run_pricebook_job(job_id, upload, vendor, use_cmm)
+
+
 class WorkerSettings:
     functions = [
         run_price_scout_sync,
@@ -291,6 +341,12 @@ class WorkerSettings:
         batch_generate_checklists_job,
         process_document_job,
         send_scheduled_report_job,
+        deliver_webhook_batch,
+        send_webhook_request,
+        # Imports are not idempotent, so never retried; an interrupted job is
+        # failed by the ingest log's stale-job check after the same timeout
+        func(ingest_schedule_job, timeout=STALE_JOB_AFTER, max_tries=1),
+        func(ingest_pricebook_job, timeout=STALE_JOB_AFTER, max_tries=1),
     ]
     on_startup = startup
     on_shutdown = shutdown
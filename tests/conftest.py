@@ -5,13 +5,31 @@ Provides common fixtures for testing.
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
 from decimal import Decimal
 
 import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
 
+from bimcalc.db.models import Base
 from bimcalc.models import Item, PriceItem
 
 
+@pytest_asyncio.fixture()
+async def session() -> AsyncIterator[AsyncSession]:
+    """Session on a fresh in-memory SQLite database with all tables created."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    SessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with SessionLocal() as session:
+        yield session
+    await engine.dispose()
+
+
 @pytest.fixture
 def test_org_id() -> str:
     """Test organization ID."""
@@ -0,0 +1,123 @@
+"""Tests for concurrent, ordered pagination in APIImporter."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bimcalc.pipeline.importers.api_importer import APIImporter
+from bimcalc.pipeline.pagination import PageFetchError
+
+TOTAL_ITEMS = 250
+
+
+class StubPriceAPI:
+    """Local offset-paginated price API with injectable failures."""
+
+    def __init__(
+        self, fail_once: set[int] = frozenset(), fail_always: set[int] = frozenset()
+    ):
+        self.fail_once = set(fail_once)
+        self.fail_always = set(fail_always)
+        self.requested: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def prices(self, request: web.Request) -> web.Response:
+        offset = int(request.query["offset"])
+        limit = int(request.query["limit"])
+        self.requested.append(offset)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Later pages answer faster, so completion order != offset order
+            await asyncio.sleep(0.02 if offset == 0 else 0.005)
+            if offset in self.fail_always or offset in self.fail_once:
+                self.fail_once.discard(offset)
+                return web.Response(status=503)
+            items = [
+                {
+                    "item_code": f"SKU-{i:04d}",
+                    "classification_code": 66,
+                    "description": f"Item {i}",
+                    "unit": "ea",
+                    "price": 1.5,
+                }
+                for i in range(offset, min(offset + limit, TOTAL_ITEMS))
+            ]
+            return web.json_response({"items": items})
+        finally:
+            self.in_flight -= 1
+
+
+async def _serve(api: StubPriceAPI) -> TestServer:
+    app = web.Application()
+    app.router.add_get("/prices", api.prices)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+def _importer(server: TestServer, **config) -> APIImporter:
+    return APIImporter(
+        "stub_api",
+        {
+            "api_base_url": str(server.make_url("")).rstrip("/"),
+            "api_key": "test",
+            "region": "UK",
+            "batch_size": 50,
+            "rate_limit_delay": 0,
+            "max_in_flight": 3,
+            "retry_base_delay": 0,
+            **config,
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_fetch_data_is_concurrent_ordered_and_retries_pages():
+    api = StubPriceAPI(fail_once={100})
+    server = await _serve(api)
+    try:
+        importer = _importer(server)
+        codes = [record.item_code async for record in importer.fetch_data()]
+    finally:
+        await server.close()
+
+    assert codes == [f"SKU-{i:04d}" for i in range(TOTAL_ITEMS)]
+    assert api.requested.count(100) == 2
+    assert 1 < api.max_in_flight <= 3
+    assert importer.consumed_offset == TOTAL_ITEMS
+
+
+@pytest.mark.asyncio
+async def test_failed_page_raises_and_resume_starts_at_checkpoint():
+    api = StubPriceAPI(fail_always={150})
+    server = await _serve(api)
+    try:
+        importer = _importer(server, max_retries=1)
+        seen = []
+        with pytest.raises(PageFetchError) as exc_info:
+            async for record in importer.fetch_data():
+                seen.append(record.item_code)
+        # What the orchestrator stores with the last committed batch
+        position = importer.checkpoint_position()
+
+        assert exc_info.value.offset == 150
+        assert len(seen) == 150
+        assert position == 150
+
+        api.fail_always.clear()
+        api.requested.clear()
+        # A fresh importer starts from scratch unless told to resume
+        resumed = _importer(server)
+        assert resumed.resume_from(position)
+        rest = [record.item_code async for record in resumed.fetch_data()]
+    finally:
+        await server.close()
+
+    assert rest == [f"SKU-{i:04d}" for i in range(150, TOTAL_ITEMS)]
+    assert min(api.requested) == 150
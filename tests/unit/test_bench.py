@@ -0,0 +1,89 @@
+"""Tests for the ``bimcalc bench`` suite."""
+
+from __future__ import annotations
+
+import pytest
+
+from bimcalc.bench import (
+    STAGES,
+    BenchConfig,
+    compare_results,
+    parse_scale,
+    run_benchmarks,
+)
+from bimcalc.bench.data import iter_price_rows, schedule_frame
+
+
+def _results(**stages):
+    return {"scale": "10k", "seed": 0, "stages": stages}
+
+
+def _stage(p50=10.0, p95=20.0, p99=30.0, throughput=100.0, error=None):
+    return {
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+        "throughput_per_s": throughput,
+        "error": error,
+    }
+
+
+def test_synthetic_data_is_deterministic():
+    first = next(iter_price_rows(50, "org", seed=7))
+    assert first == next(iter_price_rows(50, "org", seed=7))
+    assert first != next(iter_price_rows(50, "org", seed=8))
+    assert len({row["id"] for row in first}) == 50
+
+    schedule = schedule_frame(30, seed=7)
+    assert schedule.equals(schedule_frame(30, seed=7))
+    assert not schedule.duplicated(["Family", "Type"]).any()
+
+    assert parse_scale("100K") == 100_000
+    assert parse_scale("2500") == 2_500
+    with pytest.raises(ValueError):
+        parse_scale("huge")
+
+
+def test_compare_flags_slowdowns_and_new_failures():
+    baseline = _results(
+        candidates=_stage(),
+        report=_stage(),
+        flags=_stage(p50=0.001, p95=0.002, p99=0.003),
+        dashboard=_stage(error="OperationalError: boom"),
+    )
+    current = _results(
+        candidates=_stage(p95=23.0, throughput=85.0),  # within 20%
+        report=_stage(p99=40.0, throughput=70.0),
+        flags=_stage(p50=0.004, p95=0.004, p99=0.004),  # below timer noise
+        dashboard=_stage(error="OperationalError: boom"),
+    )
+    assert [(r.stage, r.metric) for r in compare_results(current, baseline)] == [
+        ("report", "p99_ms"),
+        ("report", "throughput_per_s"),
+    ]
+    assert compare_results(current, baseline, threshold=0.5) == []
+
+    broken = _results(candidates=_stage(error="ValueError: no classification"))
+    [regression] = compare_results(broken, baseline)
+    assert (regression.stage, regression.metric) == ("candidates", "error")
+
+    with pytest.raises(ValueError, match="scale"):
+        compare_results({**current, "scale": "1m"}, baseline)
+
+
+@pytest.mark.asyncio
+async def test_small_run_times_every_stage(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+    config = BenchConfig(prices=300, items=40, queries=10, repeat=2, workdir=tmp_path)
+
+    results = await run_benchmarks(config)
+
+    assert list(results["stages"]) == list(STAGES)
+    for name, stage in results["stages"].items():
+        assert stage["error"] is None, name
+        assert stage["calls"] > 0, name
+        assert stage["p50_ms"] <= stage["p95_ms"] <= stage["p99_ms"]
+    assert results["stages"]["ingest_prices"]["ops"] == 300
+    assert results["stages"]["ingest_schedule"]["ops"] == 40
+    assert results["stages"]["scd2_merge"]["ops"] == 300
+    assert compare_results(results, results) == []
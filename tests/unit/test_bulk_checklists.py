@@ -0,0 +1,172 @@
+"""Tests for bulk QA checklist generation."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from bimcalc.db.models import DocumentModel, ItemModel, QAChecklistModel
+from bimcalc.intelligence import bulk_operations
+from bimcalc.intelligence.bulk_operations import batch_generate_checklists
+from bimcalc.intelligence.checklist_generator import QAChecklistGenerator
+from bimcalc.utils.cache import TieredCache, set_cache
+
+
+@pytest.fixture(autouse=True)
+def cache():
+    cache = TieredCache()
+    set_cache(cache)
+    yield cache
+    set_cache(None)
+
+
+class StubLLM:
+    """Chat completions client recording calls and peak concurrency."""
+
+    def __init__(self, fail_on: str | None = None):
+        self.contexts: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.fail_on = fail_on
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        self.contexts.append(prompt)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail_on and self.fail_on in prompt:
+                raise RuntimeError("rate limited")
+        finally:
+            self.in_flight -= 1
+        content = json.dumps(
+            {"items": [{"requirement": f"Check {len(self.contexts)}"}, {"id": 9}]}
+        )
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+        )
+
+
+async def _seed(session, families):
+    doc = DocumentModel(
+        id=uuid4(),
+        title="Fire stopping spec",
+        content="Seal all",
+        embedding=[0.0] * 1536,
+    )
+    items = [
+        ItemModel(
+            id=uuid4(),
+            org_id="acme",
+            project_id="p1",
+            family=family,
+            type_name="Standard",
+            classification_code="2215",
+        )
+        for family in families
+    ]
+    session.add_all([doc, *items])
+    await session.commit()
+    return doc, items
+
+
+@pytest.fixture()
+def recommendations(monkeypatch):
+    calls = []
+
+    def stub(docs):
+        async def recommend(session, item, limit=5, min_score=0.0):
+            calls.append(item.family)
+            return [{"id": str(doc.id), "score": 0.9} for doc in docs]
+
+        monkeypatch.setattr(bulk_operations, "get_document_recommendations", recommend)
+        return calls
+
+    return stub
+
+
+@pytest.mark.asyncio
+async def test_batch_shares_llm_calls_between_identical_contexts(
+    session, recommendations
+):
+    doc, items = await _seed(session, ["Damper"] * 3 + ["Valve"] * 2 + ["Pump"])
+    recommended_for = recommendations([doc])
+    _, [done] = await _seed(session, ["Fan"])
+    session.add(
+        QAChecklistModel(
+            item_id=done.id,
+            org_id="acme",
+            project_id="p1",
+            checklist_items={"items": []},
+        )
+    )
+    await session.commit()
+
+    llm = StubLLM()
+    progress = []
+    results = await batch_generate_checklists(
+        session,
+        [str(item.id) for item in items] + [str(done.id), str(uuid4()), "not-a-uuid"],
+        progress_callback=lambda done, total: progress.append((done, total)),
+        generator=QAChecklistGenerator(client=llm, max_concurrency=2),
+    )
+
+    assert results["total"] == 9
+    assert (results["successful"], results["skipped"], results["failed"]) == (6, 1, 2)
+    assert results["unique_contexts"] == 3
+    assert len(llm.contexts) == 3
+    assert llm.peak == 2
+    # One recommendation lookup per distinct item description
+    assert sorted(recommended_for) == ["Damper", "Pump", "Valve"]
+    assert progress[-1] == (9, 9)
+
+    rows = (await session.execute(select(QAChecklistModel))).scalars().all()
+    created = [row for row in rows if row.created_by == "batch_system"]
+    assert len(created) == 6
+    for row in created:
+        [entry] = row.checklist_items["items"]
+        assert entry["completed"] is False
+        assert row.source_documents == {
+            "docs": [{"id": str(doc.id), "title": doc.title, "type": "unknown"}]
+        }
+
+    # A second run finds the checklists and makes no LLM calls
+    again = await batch_generate_checklists(
+        session,
+        [str(item.id) for item in items],
+        generator=QAChecklistGenerator(client=llm),
+    )
+    assert again["skipped"] == 6
+    assert len(llm.contexts) == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_reuses_cached_responses_and_isolates_failures(
+    session, recommendations
+):
+    doc, items = await _seed(session, ["Damper", "Valve"])
+    recommendations([doc])
+
+    generator = QAChecklistGenerator(client=StubLLM(fail_on="Valve"))
+    results = await batch_generate_checklists(
+        session, [str(item.id) for item in items], generator=generator
+    )
+    assert (results["successful"], results["failed"]) == (1, 1)
+    [created] = results["checklists"]
+    assert created["item_id"] == str(items[0].id)
+
+    # Same context for another item: served from the response cache
+    _, [twin] = await _seed(session, ["Damper"])
+    llm = StubLLM()
+    results = await batch_generate_checklists(
+        session, [str(twin.id)], generator=QAChecklistGenerator(client=llm)
+    )
+    assert results["successful"] == 1
+    assert llm.contexts == []
@@ -0,0 +1,215 @@
+"""Tests for the tiered L1/Redis cache."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from bimcalc.utils.cache import (
+    LocalLRU,
+    TieredCache,
+    deserialize,
+    register_cache_type,
+    serialize,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@register_cache_type
+@dataclass
+class _Metrics:
+    total: int
+    computed_at: datetime
+    breakdown: dict
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+def _cache(server, **kwargs) -> TieredCache:
+    return TieredCache(
+        redis_factory=lambda: fakeredis.FakeAsyncRedis(server=server), **kwargs
+    )
+
+
+def test_serializer_round_trips_tagged_types():
+    value = {
+        "id": uuid4(),
+        "price": Decimal("12.50"),
+        "pair": (1, "a"),
+        "by_code": {66: [1.0, 2.5]},
+        "metrics": _Metrics(total=3, computed_at=datetime(2025, 1, 1), breakdown={}),
+    }
+    assert deserialize(serialize(value)) == value
+
+
+def test_serializer_compresses_large_payloads_and_rejects_unregistered():
+    assert serialize([0.125] * 1536)[:1] == b"z"
+
+    @dataclass
+    class NotRegistered:
+        x: int
+
+    with pytest.raises(TypeError):
+        serialize(NotRegistered(1))
+
+
+def test_local_lru_evicts_oldest_entry():
+    lru = LocalLRU(maxsize=2, default_ttl=60)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+    assert lru.get("b") == (False, None)
+    assert lru.get("a") == (True, 1)
+
+
+@pytest.mark.asyncio
+async def test_l2_hit_populates_l1_across_instances(redis_server):
+    writer = _cache(redis_server)
+    reader = _cache(redis_server)
+
+    await writer.set("k", {"v": 1}, ttl_seconds=60)
+    assert await reader.get("k") == {"v": 1}
+    assert await reader.get("k") == {"v": 1}
+
+    assert reader.stats.l2_hits == 1
+    assert reader.stats.l1_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_coalesces_concurrent_misses(redis_server):
+    cache = _cache(redis_server)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    results = await asyncio.gather(
+        *(cache.get_or_compute("metrics", compute, ttl_seconds=60) for _ in range(10))
+    )
+
+    assert calls == 1
+    assert all(r == {"value": 42} for r in results)
+    assert cache.stats.coalesced == 9
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_waiters(redis_server):
+    cache = _cache(redis_server)
+    started = asyncio.Event()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(0.05)
+        return {"value": calls}
+
+    leader = asyncio.create_task(cache.get_or_compute("metrics", compute))
+    await started.wait()
+    waiters = [
+        asyncio.create_task(cache.get_or_compute("metrics", compute)) for _ in range(3)
+    ]
+    while cache.stats.coalesced < 3:
+        await asyncio.sleep(0.001)
+    leader.cancel()
+
+    results = await asyncio.gather(*waiters)
+    assert leader.cancelled()
+    # One waiter took over the computation and the others joined it
+    assert calls == 2
+    assert results == [{"value": 2}] * 3
+
+
+@pytest.mark.asyncio
+async def test_namespace_invalidation_is_visible_to_other_workers(redis_server):
+    worker_a = _cache(redis_server, version_ttl_seconds=0)
+    worker_b = _cache(redis_server, version_ttl_seconds=0, l1_ttl_seconds=0)
+
+    await worker_a.set("summary", 1, namespace="project:acme:p1")
+    assert await worker_b.get("summary", namespace="project:acme:p1") == 1
+
+    await worker_a.invalidate_namespace("project:acme:p1")
+
+    assert await worker_a.get("summary", namespace="project:acme:p1") is None
+    assert await worker_b.get("summary", namespace="project:acme:p1") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_degrade_to_l1():
+    class BrokenRedis:
+        async def get(self, *args):
+            raise ConnectionError("down")
+
+        async def setex(self, *args):
+            raise ConnectionError("down")
+
+    cache = TieredCache(redis_factory=BrokenRedis)
+    assert await cache.set("k", 1) is False
+    assert await cache.get("k") == 1
+    assert cache.stats.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_tagged_entry_invalidated_by_any_of_its_tags(redis_server):
+    cache = _cache(redis_server, version_ttl_seconds=0)
+    tags = ["project:acme:p1", "item:1"]
+
+    await cache.set("risk:1", 10, tags=tags)
+    await cache.set("risk:2", 20, tags=["project:acme:p1", "item:2"])
+    assert await cache.get("risk:1", tags=reversed(tags)) == 10
+
+    await cache.invalidate_tags("item:1")
+
+    assert await cache.get("risk:1", tags=tags) is None
+    assert await cache.get("risk:2", tags=["project:acme:p1", "item:2"]) == 20
+
+
+@pytest.mark.asyncio
+async def test_session_publishes_invalidations_only_on_commit(redis_server):
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from bimcalc.utils.cache import set_cache
+    from bimcalc.utils.cache_tags import (
+        flush_invalidations,
+        project_tag,
+        publish_invalidation,
+    )
+
+    cache = _cache(redis_server, version_ttl_seconds=0)
+    set_cache(cache)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    tags = [project_tag("acme", "p1")]
+    try:
+        await cache.set("compliance", 1, tags=tags)
+
+        async with AsyncSession(engine) as session:
+            await session.execute(text("SELECT 1"))
+            publish_invalidation(session, *tags)
+            await session.rollback()
+            await session.commit()
+        await flush_invalidations()
+        assert await cache.get("compliance", tags=tags) == 1
+
+        async with AsyncSession(engine) as session:
+            publish_invalidation(session, *tags)
+            await session.commit()
+        await flush_invalidations()
+        assert await cache.get("compliance", tags=tags) is None
+    finally:
+        set_cache(None)
+        await engine.dispose()
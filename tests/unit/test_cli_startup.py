@@ -0,0 +1,78 @@
+"""Import-time budget for the ``bimcalc`` CLI.
+
+Cron jobs and health checks start the CLI many times an hour, so help and
+light commands must not pay for the database, pipeline or web stacks.
+Measured with ``python -X importtime`` in a fresh interpreter.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time allowed for bimcalc.cli (about 150 ms today)
+CLI_IMPORT_BUDGET_MS = 600
+
+# Heavy modules only the commands that need them may import
+HEAVY_MODULES = (
+    "pandas",
+    "numpy",
+    "sqlalchemy",
+    "fastapi",
+    "openai",
+    "playwright",
+    "bimcalc.config",
+    "bimcalc.db.models",
+    "bimcalc.matching.orchestrator",
+    "bimcalc.reporting.builder",
+)
+
+
+def _import_times(code: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module imported by ``code``."""
+    env = {k: v for k, v in os.environ.items() if k != "DATABASE_URL"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [["--help"], ["pipeline-status", "--help"], ["project", "list", "--help"]],
+)
+def test_cli_help_skips_heavy_imports(argv):
+    times = _import_times(
+        "import sys\n"
+        "from bimcalc.cli import app\n"
+        f"try:\n    app({argv!r})\n"
+        "except SystemExit as e:\n    sys.exit(e.code)\n"
+    )
+    assert "bimcalc.cli" in times
+    assert [m for m in HEAVY_MODULES if m in times] == []
+
+
+def test_cli_import_within_budget():
+    # Best of three runs to keep scheduler noise out of the measurement
+    best_ms = min(
+        _import_times("import bimcalc.cli")["bimcalc.cli"] / 1000 for _ in range(3)
+    )
+    assert best_ms < CLI_IMPORT_BUDGET_MS, (
+        f"import bimcalc.cli took {best_ms:.0f} ms "
+        f"(budget {CLI_IMPORT_BUDGET_MS} ms); import heavy modules lazily"
+    )
@@ -0,0 +1,188 @@
+"""Tests for dirty-set tracking used by incremental matching."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+from bimcalc.db.models import (
+    ItemMappingModel,
+    ItemModel,
+    ItemRevisionModel,
+    MatchResultModel,
+    PriceItemModel,
+)
+from bimcalc.matching import dirty as dirty_module
+from bimcalc.matching.dirty import find_dirty_items, load_dirty_items
+
+MATCHED_AT = datetime(2025, 1, 1)
+LATER = MATCHED_AT + timedelta(days=1)
+
+
+def _item(name, classification="2650", project="proj", key=None):
+    return ItemModel(
+        id=uuid4(),
+        org_id="org",
+        project_id=project,
+        family=name,
+        type_name="Type",
+        classification_code=classification,
+        canonical_key=key,
+    )
+
+
+def _price(code, classification="2650", valid_from=datetime(2024, 1, 1), **kwargs):
+    return PriceItemModel(
+        id=uuid4(),
+        org_id="org",
+        item_code=code,
+        region="UK",
+        sku=code,
+        classification_code=classification,
+        description=code,
+        unit="ea",
+        unit_price=Decimal("10"),
+        currency="EUR",
+        source_name="test",
+        source_currency="EUR",
+        valid_from=valid_from,
+        **kwargs,
+    )
+
+
+def _match(item, price=None, at=MATCHED_AT):
+    return MatchResultModel(
+        item_id=item.id,
+        price_item_id=price.id if price else None,
+        confidence_score=90.0,
+        source="fuzzy_match",
+        decision="auto-accepted" if price else "rejected",
+        reason="test",
+        created_by="test",
+        timestamp=at,
+    )
+
+
+def _mapping(key, price, start_ts):
+    return ItemMappingModel(
+        org_id="org",
+        canonical_key=key,
+        price_item_id=price.id,
+        start_ts=start_ts,
+        created_by="test",
+        reason="test",
+    )
+
+
+@pytest_asyncio.fixture()
+async def project(session):
+    """Items matched at MATCHED_AT, then one change of each kind."""
+    old_x = _price("X", valid_to=LATER, is_current=False)
+    new_x = _price("X", valid_from=LATER, is_current=True)
+    y = _price("Y", is_current=True)
+    z = _price("Z", classification="2302", valid_from=LATER, is_current=True)
+
+    items = {
+        "repriced": _item("repriced"),
+        "clean": _item("clean"),
+        "new candidate": _item("new candidate", classification="2302"),
+        "remapped": _item("remapped", key="k-remapped"),
+        "reingested": _item("reingested"),
+        "unmatched": _item("unmatched"),
+        "self mapped": _item("self mapped", key="k-self"),
+        "other project": _item("other project", project="other"),
+    }
+    session.add_all([old_x, new_x, y, z, *items.values()])
+    session.add_all(
+        [
+            _match(items["repriced"], old_x),
+            _match(items["clean"], y),
+            _match(items["new candidate"]),
+            _match(items["remapped"]),
+            _match(items["reingested"], y),
+            _match(items["self mapped"], y),
+            _match(items["other project"]),
+            # Mapping written to another price after the match
+            _mapping("k-remapped", y, LATER),
+            # Mapping the matcher wrote for its own auto-accept
+            _mapping("k-self", y, MATCHED_AT + timedelta(seconds=1)),
+            ItemRevisionModel(
+                item_id=items["reingested"].id,
+                org_id="org",
+                project_id="proj",
+                ingest_timestamp=LATER,
+                field_name="width_mm",
+                old_value="200",
+                new_value="250",
+                change_type="modified",
+            ),
+        ]
+    )
+    await session.commit()
+    return items
+
+
+@pytest.mark.asyncio
+async def test_dirty_set_reasons(session, project):
+    dirty = await find_dirty_items(session, "org", "proj")
+
+    assert dirty.item_ids == {
+        project[name].id
+        for name in (
+            "repriced",
+            "new candidate",
+            "remapped",
+            "reingested",
+            "unmatched",
+        )
+    }
+    assert dirty.reasons == {
+        "price_changed": 1,
+        "candidates_changed": 1,
+        "mapping_changed": 1,
+        "reingested": 1,
+        "unmatched": 1,
+    }
+    assert (dirty.total_items, dirty.clean) == (7, 2)
+
+
+@pytest.mark.asyncio
+async def test_rematched_items_become_clean(session, project):
+    session.add(_match(project["repriced"], at=LATER + timedelta(hours=1)))
+    await session.commit()
+
+    dirty = await find_dirty_items(session, "org", "proj")
+    items = await load_dirty_items(session, dirty)
+    assert sorted(item.family for item in items) == [
+        "new candidate",
+        "reingested",
+        "remapped",
+        "unmatched",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_dirty_items_load_by_id_in_batches(session, project, monkeypatch):
+    monkeypatch.setattr(dirty_module, "ITEM_ID_BATCH", 2)
+    dirty = await find_dirty_items(session, "org", "proj")
+
+    items = await load_dirty_items(session, dirty)
+    assert {item.id for item in items} == dirty.item_ids
+
+    limited = await load_dirty_items(session, dirty, limit=3)
+    assert [item.id for item in limited] == sorted(dirty.item_ids)[:3]
+
+
+@pytest.mark.asyncio
+async def test_price_leaving_block_dirties_block(session):
+    gone = _price("G", valid_to=LATER, is_current=False)
+    item = _item("block")
+    session.add_all([gone, item, _match(item)])
+    await session.commit()
+
+    dirty = await find_dirty_items(session, "org", "proj")
+    assert dirty.reasons == {"candidates_changed": 1}
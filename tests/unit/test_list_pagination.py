@@ -0,0 +1,206 @@
+"""Tests for keyset pagination and facet counts of the list views."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, update
+
+from bimcalc.db.facets import item_facets, price_facets
+from bimcalc.db.models import ItemModel, PriceItemModel
+from bimcalc.db.pagination import (
+    ITEMS_SORT,
+    PRICES_SORT,
+    InvalidCursorError,
+    fetch_page,
+)
+from bimcalc.utils.cache import TieredCache, set_cache
+from bimcalc.utils.cache_tags import (
+    flush_invalidations,
+    prices_tag,
+    project_tag,
+    publish_invalidation,
+)
+
+T0 = datetime(2025, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture()
+def cache():
+    cache = TieredCache(version_ttl_seconds=60)
+    set_cache(cache)
+    yield cache
+    set_cache(None)
+
+
+def _item(n, created_at, category=None):
+    return ItemModel(
+        id=uuid4(),
+        org_id="org",
+        project_id="proj",
+        family=f"Family {n}",
+        type_name="Standard",
+        category=category,
+        created_at=created_at,
+    )
+
+
+def _price(code, valid_from, vendor="V1", region="UK", current=True):
+    return PriceItemModel(
+        id=uuid4(),
+        org_id="org",
+        item_code=code,
+        region=region,
+        vendor_id=vendor,
+        sku=code,
+        classification_code="66",
+        description=f"{code} tray",
+        unit="ea",
+        unit_price=Decimal("10"),
+        currency="EUR",
+        source_name="test",
+        source_currency="EUR",
+        valid_from=valid_from,
+        valid_to=None if current else valid_from + timedelta(days=1),
+        is_current=current,
+    )
+
+
+async def _walk(session, stmt, key, per_page):
+    """Every page forwards, then every page backwards from the last."""
+    forward = [await fetch_page(session, stmt, key, per_page)]
+    while forward[-1].next_cursor:
+        forward.append(
+            await fetch_page(
+                session, stmt, key, per_page, after=forward[-1].next_cursor
+            )
+        )
+    backward = [forward[-1]]
+    while backward[-1].prev_cursor:
+        backward.append(
+            await fetch_page(
+                session, stmt, key, per_page, before=backward[-1].prev_cursor
+            )
+        )
+    return forward, backward[::-1]
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_items_once_in_both_directions(session):
+    # Bulk imports share timestamps: the id tie-breaker keeps pages disjoint
+    items = [_item(n, T0 + timedelta(minutes=n // 3)) for n in range(8)]
+    session.add_all(items)
+    await session.commit()
+
+    stmt = select(ItemModel).where(ItemModel.org_id == "org")
+    expected = (
+        (await session.execute(stmt.order_by(*ITEMS_SORT.order_by()))).scalars().all()
+    )
+
+    forward, backward = await _walk(session, stmt, ITEMS_SORT, per_page=3)
+    assert [[i.id for i in p.rows] for p in forward] == [
+        [i.id for i in expected[n : n + 3]] for n in range(0, 8, 3)
+    ]
+    assert [p.rows for p in backward] == [p.rows for p in forward]
+    assert forward[0].prev_cursor is None
+    assert forward[-1].next_cursor is None
+
+    # Legacy page numbers still land on the same rows
+    page = await fetch_page(session, stmt, ITEMS_SORT, 3, offset=3)
+    assert page.rows == forward[1].rows
+    assert page.prev_cursor is not None
+
+    for bad in ("not-a-cursor", PRICES_SORT.encode(_price("X", T0))):
+        with pytest.raises(InvalidCursorError):
+            await fetch_page(session, stmt, ITEMS_SORT, 3, after=bad)
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_follow_mixed_price_order(session):
+    prices = [
+        _price(code, T0 + timedelta(days=day), current=day == 2)
+        for code in ("A", "B", "C")
+        for day in range(3)
+    ]
+    session.add_all(prices)
+    await session.commit()
+
+    stmt = select(PriceItemModel).where(PriceItemModel.org_id == "org")
+    forward, backward = await _walk(session, stmt, PRICES_SORT, per_page=4)
+
+    rows = [p for page in forward for p in page.rows]
+    assert [(p.item_code, p.valid_from.day) for p in rows] == [
+        (code, day) for code in ("A", "B", "C") for day in (3, 2, 1)
+    ]
+    assert [p.rows for p in backward] == [p.rows for p in forward]
+
+
+def test_mixed_direction_seek_bounds_the_leading_column():
+    values = ["B", T0, uuid4()]
+
+    def sql(reverse):
+        return str(PRICES_SORT.seek(values, reverse=reverse))
+
+    # The range bound sits outside the OR so an index on item_code is usable
+    assert sql(False).startswith("price_items.item_code >= :item_code_1 AND (")
+    assert sql(True).startswith("price_items.item_code <= :item_code_1 AND (")
+
+
+@pytest.mark.asyncio
+async def test_facets_cached_until_ingestion_invalidates(session, cache):
+    session.add_all(
+        [_item(n, T0, category=("Pipes", "Ducts", None)[n % 3]) for n in range(7)]
+        + [
+            _price("A", T0, vendor="V1", region="UK"),
+            _price("B", T0, vendor="V2", region="UK"),
+            _price("C", T0, vendor="V1", region="IE"),
+            _price(
+                "C", T0 - timedelta(days=2), vendor="V1", region="IE", current=False
+            ),
+        ]
+    )
+    await session.commit()
+
+    items = await item_facets(session, "org", "proj")
+    assert items.total() == 7
+    assert items.total(category="Pipes") == 3
+    assert items.counts("category") == [("Ducts", 2), ("Pipes", 3)]
+
+    prices = await price_facets(session, "org")
+    assert prices.total() == 4
+    assert prices.total(is_current=True, vendor_id="V1") == 2
+    # Counts honour the other filters; emptied values stay selectable
+    assert prices.counts("vendor_id", is_current=True, region="IE") == [
+        ("V1", 1),
+        ("V2", 0),
+    ]
+    assert prices.counts("region", is_current=None, vendor_id="V1") == [
+        ("IE", 2),
+        ("UK", 1),
+    ]
+
+    # Served from cache until a write publishes the matching tag
+    await session.execute(
+        update(ItemModel).where(ItemModel.category.is_(None)).values(category="Pipes")
+    )
+    await session.execute(
+        update(PriceItemModel)
+        .where(PriceItemModel.item_code == "B")
+        .values(vendor_id="V1")
+    )
+    await session.commit()
+    assert (await item_facets(session, "org", "proj")).total(category="Pipes") == 3
+
+    publish_invalidation(session, project_tag("org", "proj"))
+    await session.commit()
+    await flush_invalidations()
+    assert (await item_facets(session, "org", "proj")).total(category="Pipes") == 5
+    assert (await price_facets(session, "org")).total(vendor_id="V2") == 1
+
+    publish_invalidation(session, prices_tag("org"))
+    await session.commit()
+    await flush_invalidations()
+    assert (await price_facets(session, "org")).total(vendor_id="V2") == 0
@@ -0,0 +1,285 @@
+"""Tests for concurrent pipeline orchestration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from bimcalc.db.models import (
+    Base,
+    DataSyncLogModel,
+    PipelineCheckpointModel,
+    PriceItemModel,
+)
+from bimcalc.pipeline import orchestrator as orchestrator_module
+from bimcalc.pipeline.base_importer import BaseImporter
+from bimcalc.pipeline.importers.csv_importer import CSVFileImporter
+from bimcalc.pipeline.orchestrator import PipelineOrchestrator
+from bimcalc.pipeline.types import PriceRecord
+
+
+class StaticImporter(BaseImporter):
+    """Yields fixed (item_code, price) pairs with a small delay per record."""
+
+    def __init__(
+        self, source_name: str, rows: list[tuple[str, str]], fail=False, fail_at=None
+    ):
+        super().__init__(source_name, {})
+        self.rows = rows
+        self.fail = fail
+        self.fail_at = fail_at
+        self.position = 0
+        self.started_at = 0
+
+    def checkpoint_position(self) -> int | None:
+        return self.position
+
+    def resume_from(self, position: int) -> bool:
+        self.started_at = position
+        return True
+
+    async def fetch_data(self) -> AsyncIterator[PriceRecord]:
+        for index in range(self.started_at, len(self.rows)):
+            if index == self.fail_at:
+                raise RuntimeError("connection reset")
+            item_code, price = self.rows[index]
+            self.position = index + 1
+            await asyncio.sleep(0.001)
+            yield PriceRecord(
+                item_code=item_code,
+                region="UK",
+                classification_code=66,
+                description=f"{item_code} from {self.source_name}",
+                unit="ea",
+                unit_price=Decimal(price),
+                currency="GBP",
+            )
+        if self.fail:
+            raise RuntimeError("feed dropped")
+
+
+@pytest_asyncio.fixture()
+async def session_factory(tmp_path, monkeypatch):
+    # File-backed so each source really gets its own connection/transaction
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pipeline.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    SessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def _get_session():
+        async with SessionLocal() as session:
+            yield session
+            await session.commit()
+
+    monkeypatch.setattr(orchestrator_module, "get_session", _get_session)
+    try:
+        yield SessionLocal
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_parallel_run_serializes_overlapping_keys(session_factory):
+    importers = [
+        StaticImporter("vendor_a", [("A-1", "10"), ("SHARED", "20")]),
+        StaticImporter("vendor_b", [("SHARED", "25"), ("B-1", "30")]),
+    ]
+
+    summary = await PipelineOrchestrator(importers, max_parallel=2).run()
+
+    assert summary["overall_success"]
+    async with session_factory() as session:
+        current = (
+            await session.execute(
+                select(PriceItemModel.item_code, func.count())
+                .where(PriceItemModel.is_current.is_(True))
+                .group_by(PriceItemModel.item_code)
+            )
+        ).all()
+        logs = (await session.execute(select(DataSyncLogModel))).scalars().all()
+
+    assert dict(current) == {"A-1": 1, "B-1": 1, "SHARED": 1}
+    assert {log.source_name for log in logs} == {"vendor_a", "vendor_b"}
+    assert all(log.duration_seconds is not None for log in logs)
+    assert any("serialized" in r.message for r in summary["results"])
+
+
+@pytest.mark.asyncio
+async def test_failed_source_is_rolled_back_without_affecting_others(session_factory):
+    importers = [
+        StaticImporter("broken", [("X-1", "1")], fail=True),
+        StaticImporter("healthy", [("H-1", "2")]),
+    ]
+
+    summary = await PipelineOrchestrator(importers, max_parallel=2).run()
+
+    assert summary["failed_sources"] == 1
+    async with session_factory() as session:
+        codes = (await session.execute(select(PriceItemModel.item_code))).scalars()
+        assert set(codes) == {"H-1"}
+
+
+@pytest.mark.asyncio
+async def test_resume_continues_from_checkpoint_without_duplicate_versions(
+    session_factory,
+):
+    rows = [(f"R-{i}", str(10 + i)) for i in range(7)]
+
+    first = await PipelineOrchestrator(
+        [StaticImporter("nightly", rows, fail_at=5)], commit_every=2
+    ).run()
+    assert first["failed_sources"] == 1
+
+    async with session_factory() as session:
+        checkpoint = await session.get(PipelineCheckpointModel, "nightly")
+        assert checkpoint.position == 4
+        assert checkpoint.records_committed == 4
+
+    resumed_importer = StaticImporter("nightly", rows)
+    summary = await PipelineOrchestrator(
+        [resumed_importer], resume=True, commit_every=2
+    ).run()
+
+    assert summary["overall_success"]
+    assert resumed_importer.started_at == 4
+    async with session_factory() as session:
+        versions = (
+            await session.execute(
+                select(PriceItemModel.item_code, func.count()).group_by(
+                    PriceItemModel.item_code
+                )
+            )
+        ).all()
+        assert await session.get(PipelineCheckpointModel, "nightly") is None
+
+    assert dict(versions) == {code: 1 for code, _ in rows}
+
+
+class DigestImporter(StaticImporter):
+    """StaticImporter delivered as a file with the given digest."""
+
+    def __init__(self, source_name, rows, digest, **kwargs):
+        super().__init__(source_name, rows, **kwargs)
+        self.digest = digest
+
+    def source_digest(self) -> str | None:
+        return self.digest
+
+
+@pytest.mark.asyncio
+async def test_resume_discards_checkpoint_of_a_different_file(session_factory):
+    rows = [(f"F-{i}", str(10 + i)) for i in range(7)]
+    await PipelineOrchestrator(
+        [DigestImporter("drop", rows, "v1", fail_at=5)], commit_every=2
+    ).run()
+
+    async with session_factory() as session:
+        checkpoint = await session.get(PipelineCheckpointModel, "drop")
+        assert (checkpoint.position, checkpoint.source_digest) == (4, "v1")
+
+    # A new file arrived before the rerun: position 4 means nothing in it
+    replaced = DigestImporter("drop", [("G-1", "1"), *rows], "v2")
+    summary = await PipelineOrchestrator([replaced], resume=True).run()
+
+    assert summary["overall_success"]
+    assert replaced.started_at == 0
+    result = summary["results"][0]
+    assert (result.records_inserted, result.records_skipped) == (4, 4)
+
+
+@pytest.mark.asyncio
+async def test_back_dated_prices_are_counted_not_applied(session_factory):
+    class DatedImporter(StaticImporter):
+        def __init__(self, price, effective):
+            super().__init__("dated", [("D-1", price)])
+            self.effective = effective
+
+        async def fetch_data(self):
+            async for record in super().fetch_data():
+                record.original_effective_date = self.effective
+                yield record
+
+    await PipelineOrchestrator([DatedImporter("10", datetime(2026, 6, 1))]).run()
+    summary = await PipelineOrchestrator(
+        [DatedImporter("9", datetime(2026, 3, 1))]
+    ).run()
+
+    result = summary["results"][0]
+    assert (result.records_updated, result.records_stale) == (0, 1)
+    assert "1 back-dated corrections ignored" in result.message
+
+
+@pytest.mark.asyncio
+async def test_replaying_a_source_creates_no_new_versions(session_factory):
+    rows = [("P-1", "5"), ("P-2", "6")]
+    await PipelineOrchestrator([StaticImporter("vendor", rows)]).run()
+    summary = await PipelineOrchestrator([StaticImporter("vendor", rows)]).run()
+
+    assert summary["results"][0].records_inserted == 0
+    async with session_factory() as session:
+        total = await session.scalar(select(func.count()).select_from(PriceItemModel))
+    assert total == 2
+
+
+def _csv_importer(path) -> CSVFileImporter:
+    return CSVFileImporter(
+        "obo_drop",
+        {
+            "file_path": str(path),
+            "region": "DE",
+            "column_mapping": {
+                "Item Code": "item_code",
+                "Description": "description",
+                "Class": "classification_code",
+                "Price": "unit_price",
+            },
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_file_drop_skips_unchanged_file_and_unchanged_rows(
+    session_factory, tmp_path
+):
+    drop = tmp_path / "obo.csv"
+    rows = [f"OBO-{i},Tray {i},66,{10 + i}" for i in range(50)]
+    drop.write_text("Item Code,Description,Class,Price\n" + "\n".join(rows) + "\n")
+
+    first = await PipelineOrchestrator([_csv_importer(drop)]).run()
+    assert first["results"][0].records_inserted == 50
+
+    # Byte-identical drop: nothing is parsed
+    importer = _csv_importer(drop)
+    same = (await PipelineOrchestrator([importer]).run())["results"][0]
+    assert same.records_skipped == 50
+    assert "unchanged" in same.message
+    assert importer.rows_consumed == 0
+
+    # One price changed, one row added: only the delta reaches SCD2
+    rows[3] = "OBO-3,Tray 3,66,99"
+    rows.append("OBO-NEW,New tray,66,5")
+    drop.write_text("Item Code,Description,Class,Price\n" + "\n".join(rows) + "\n")
+    delta = (await PipelineOrchestrator([_csv_importer(drop)]).run())["results"][0]
+
+    assert (delta.records_inserted, delta.records_updated) == (1, 1)
+    assert delta.records_skipped == 49
+    assert "49 skipped by hash" in delta.message
+    async with session_factory() as session:
+        current = await session.scalar(
+            select(PriceItemModel.unit_price).where(
+                PriceItemModel.item_code == "OBO-3",
+                PriceItemModel.is_current.is_(True),
+            )
+        )
+    assert current == Decimal("99")
@@ -0,0 +1,181 @@
+"""Tests for the columnar price history service."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from statistics import linear_regression
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from bimcalc.config import get_config
+from bimcalc.db.models import PriceItemModel
+from bimcalc.intelligence.predictor import predict_price_trend
+from bimcalc.pipeline.scd2_updater import SCD2PriceUpdater
+from bimcalc.pipeline.types import PriceRecord
+from bimcalc.reporting import price_history
+from bimcalc.reporting.analytics import AnalyticsEngine
+from bimcalc.reporting.price_history import fit_linear_trends, get_price_history
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture(autouse=True)
+def price_history_cache():
+    price_history.clear_price_history_cache()
+    yield
+    price_history.clear_price_history_cache()
+
+
+def _versions(org_id, item_code, prices, region="UK", vendor="acme"):
+    """SCD2 rows for ``prices`` at 90-day intervals, last one current."""
+    rows = []
+    for i, price in enumerate(prices):
+        valid_from = START + timedelta(days=90 * i)
+        last = i == len(prices) - 1
+        rows.append(
+            PriceItemModel(
+                org_id=org_id,
+                item_code=item_code,
+                region=region,
+                vendor_id=vendor,
+                sku=item_code,
+                classification_code="66",
+                description=item_code,
+                unit="ea",
+                unit_price=Decimal(price),
+                currency="GBP",
+                source_name="test",
+                source_currency="GBP",
+                valid_from=valid_from,
+                valid_to=None if last else valid_from + timedelta(days=90),
+                is_current=last,
+            )
+        )
+    return rows
+
+
+def test_grouped_fit_matches_per_group_regression():
+    rng = np.random.default_rng(7)
+    group = rng.integers(0, 5, size=200)
+    x = 1.7e9 + rng.uniform(0, 3e7, size=200)
+    y = 100 + (group + 1) * (x - 1.7e9) * 1e-6 + rng.normal(0, 0.5, size=200)
+
+    slope, intercept, counts = fit_linear_trends(group, x, y, 5)
+
+    for g in range(5):
+        expected_slope, expected_intercept = linear_regression(
+            x[group == g].tolist(), y[group == g].tolist()
+        )
+        assert slope[g] == pytest.approx(expected_slope, rel=1e-6)
+        assert intercept[g] == pytest.approx(expected_intercept, rel=1e-6)
+    assert counts.sum() == 200
+
+
+@pytest.mark.asyncio
+async def test_history_views_and_steepest_inflation(session):
+    session.add_all(
+        _versions("org", "FLAT", ["10", "10", "10"])
+        + _versions("org", "STEEP", ["10", "15", "20"])
+        + _versions("org", "MILD", ["10", "10.5", "11"])
+        + _versions("org", "MILD", ["12"], region="IE", vendor="other")
+        + _versions("other-org", "STEEP", ["1", "100"])
+    )
+    await session.commit()
+    engine = AnalyticsEngine(session)
+
+    inflation = (await engine.get_price_inflation("org"))["items"]
+    assert [(i["item_code"], i["region"]) for i in inflation] == [
+        ("STEEP", "UK"),
+        ("MILD", "UK"),
+        ("FLAT", "UK"),
+    ]
+    assert inflation[0]["current_price"] == 20.0
+    assert inflation[2]["annual_change_percent"] == pytest.approx(0.0)
+
+    history = (await engine.get_item_price_history("MILD", "org"))["history"]
+    assert [h["price"] for h in history] == [10.0, 12.0, 10.5, 11.0]
+    assert history[0]["date"] == "2024-01-01"
+
+    comparison = (await engine.compare_vendors(["MILD", "STEEP"], "org"))["comparison"]
+    totals = {c["vendor"]: (c["total_cost"], c["item_count"]) for c in comparison}
+    assert totals == {"acme": (31.0, 2), "other": (12.0, 1)}
+
+
+@pytest.mark.asyncio
+async def test_committed_scd2_versions_extend_cached_history(session, monkeypatch):
+    org_id = get_config().org_id
+    session.add_all(_versions(org_id, "PIPE-1", ["10", "12"]))
+    await session.commit()
+
+    cached = await get_price_history(session, org_id)
+
+    async def no_reload(*args, **kwargs):
+        raise AssertionError("history should be extended, not reloaded")
+
+    monkeypatch.setattr(price_history.PriceHistory, "sync", no_reload)
+
+    updater = SCD2PriceUpdater(session)
+    record = PriceRecord(
+        item_code="PIPE-1",
+        region="UK",
+        classification_code=66,
+        description="PIPE-1",
+        unit="ea",
+        unit_price=Decimal("15"),
+        currency="GBP",
+        vendor_id="acme",
+    )
+    await updater.process_price(record)
+    await updater.rollback()
+    assert len(cached.item_history("PIPE-1")) == 2
+
+    await updater.process_price(record)
+    await updater.commit()
+
+    assert await get_price_history(session, org_id) is cached
+    assert [h["price"] for h in cached.item_history("PIPE-1")] == [10.0, 12.0, 15.0]
+
+
+@pytest.mark.asyncio
+async def test_delta_sync_finds_back_dated_and_late_committed_versions(session):
+    session.add_all(_versions("org", "DUCT", ["10", "12"]))
+    await session.commit()
+    history = await price_history.PriceHistory.load(session, "org")
+    assert len(history.item_history("DUCT")) == 2
+
+    # Valid from before every cached version, inserted after the watermark
+    [back_dated] = _versions("org", "DUCT", ["9"])
+    back_dated.valid_from = START - timedelta(days=30)
+    back_dated.is_current = False
+    # Inserted (transaction started) before the watermark, committed after it
+    [late] = _versions("org", "VALVE", ["5"])
+    late.created_at = history.high_water - timedelta(seconds=60)
+    session.add_all([back_dated, late])
+    await session.commit()
+
+    await history.sync(session)
+    assert [h["price"] for h in history.item_history("DUCT")] == [9.0, 10.0, 12.0]
+    assert [h["price"] for h in history.item_history("VALVE")] == [5.0]
+
+    # Overlapping re-reads replace cached rows instead of duplicating them
+    await history.sync(session)
+    assert len(history.item_history("DUCT")) == 3
+
+
+def test_predict_price_trend_handles_mixed_timestamps():
+    history = [
+        SimpleNamespace(valid_from="2024-07-01 00:00:00", unit_price=Decimal("11")),
+        SimpleNamespace(valid_from=datetime(2024, 1, 1), unit_price=Decimal("10")),
+        SimpleNamespace(valid_from=datetime(2025, 1, 1), unit_price=Decimal("12")),
+    ]
+
+    trend = predict_price_trend(history)
+
+    assert trend.points[0].date == datetime(2024, 1, 1)
+    assert len(trend.forecast) == 12
+    assert trend.forecast[0].price > trend.points[-1].price
+    assert trend.annual_change_percent == pytest.approx(16.6, abs=0.5)
+    assert trend.trend_description.startswith("Increasing")
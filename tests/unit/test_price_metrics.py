@@ -0,0 +1,158 @@
+"""Tests for price catalog quality metrics."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+
+from bimcalc.db.models import ItemModel, PriceItemModel
+from bimcalc.reporting.price_metrics import (
+    compute_price_metrics,
+    compute_price_metrics_cached,
+)
+from bimcalc.utils.cache import TieredCache, set_cache
+from bimcalc.utils.cache_tags import (
+    flush_invalidations,
+    prices_tag,
+    publish_invalidation,
+)
+
+
+def _price(
+    item_code,
+    price,
+    age_days,
+    org_id="org",
+    vendor="acme",
+    classification="66",
+    currency="EUR",
+    current=True,
+    vat_rate=None,
+):
+    updated = datetime.utcnow() - timedelta(days=age_days)
+    return PriceItemModel(
+        org_id=org_id,
+        item_code=item_code,
+        region="UK",
+        vendor_id=vendor,
+        sku=item_code,
+        classification_code=classification,
+        description=f"{item_code} tray",
+        unit="ea",
+        unit_price=Decimal(price),
+        currency=currency,
+        vat_rate=vat_rate,
+        source_name="test",
+        source_currency=currency,
+        valid_from=updated - timedelta(days=1),
+        valid_to=None if current else updated,
+        is_current=current,
+        last_updated=updated,
+    )
+
+
+def _item(classification):
+    return ItemModel(
+        org_id="org",
+        project_id="p1",
+        family="Cable Tray",
+        type_name="Elbow",
+        classification_code=classification,
+    )
+
+
+@pytest_asyncio.fixture()
+async def catalog(session):
+    session.add_all(
+        [
+            _price("A", "10", 5, vat_rate=Decimal("0.23")),
+            _price("B", "20", 60, vendor="rexel"),
+            _price("C", "40", 400, classification="64", currency="GBP"),
+            _price("D", "30", 10, vendor=None, classification="68"),
+            _price("A", "8", 500, current=False),
+            _price("A", "999", 1, org_id="elsewhere"),
+            _item("62"),
+            _item("64"),
+            _item("66"),
+        ]
+    )
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_metrics_from_grouped_scan_on_sqlite(session, catalog):
+    metrics = await compute_price_metrics(session, "org")
+
+    assert (metrics.total_price_items, metrics.current_price_items) == (5, 4)
+    assert metrics.historical_price_items == 1
+    assert metrics.currency == "EUR"
+    assert sorted(metrics.currencies_found) == ["EUR", "GBP"]
+    assert (metrics.vat_specified_count, metrics.vat_unspecified_count) == (1, 3)
+
+    assert (metrics.min_unit_price, metrics.max_unit_price) == (10.0, 40.0)
+    assert metrics.avg_unit_price == pytest.approx(25.0)
+    assert metrics.median_unit_price == pytest.approx(25.0)
+
+    assert metrics.classifications_with_prices == 3
+    assert metrics.total_classifications == 3
+    assert metrics.top_classifications[0] == {
+        "code": "66",
+        "count": 2,
+        "avg_price": 15.0,
+        "min_price": 10.0,
+        "max_price": 20.0,
+    }
+
+    assert metrics.oldest_price_days == 400
+    assert metrics.avg_age_days == pytest.approx((5 + 60 + 400 + 10) / 4, abs=0.01)
+    assert metrics.prices_updated_last_30_days == 2
+    assert metrics.prices_updated_last_90_days == 3
+    assert metrics.stale_prices_count == 1
+
+    assert metrics.top_10_expensive[0]["code"] == "C"
+    assert metrics.unique_vendors == 2
+    assert metrics.top_vendors[0] == {"vendor": "acme", "count": 2, "avg_price": 25.0}
+
+
+@pytest.mark.asyncio
+async def test_odd_count_median_and_empty_org(session, catalog):
+    session.add(_price("E", "35", 1))
+    await session.commit()
+
+    assert (await compute_price_metrics(session, "org")).median_unit_price == 30.0
+    assert (await compute_price_metrics(session, "nobody")).quality_status == "No Data"
+
+
+@pytest.mark.asyncio
+async def test_cached_metrics_invalidated_by_price_import(session, catalog):
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    set_cache(
+        TieredCache(
+            redis_factory=lambda: fakeredis.FakeAsyncRedis(server=server),
+            version_ttl_seconds=0,
+        )
+    )
+    try:
+        first = await compute_price_metrics_cached(session, "org")
+
+        await session.execute(
+            update(PriceItemModel)
+            .where(PriceItemModel.item_code == "C")
+            .values(unit_price=Decimal("50"))
+        )
+        await session.commit()
+        assert (await compute_price_metrics_cached(session, "org")) == first
+
+        publish_invalidation(session, prices_tag("org"))
+        await session.commit()
+        await flush_invalidations()
+
+        refreshed = await compute_price_metrics_cached(session, "org")
+        assert refreshed.max_unit_price == 50.0
+    finally:
+        set_cache(None)
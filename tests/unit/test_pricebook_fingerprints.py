@@ -0,0 +1,102 @@
+"""Tests for skip-unchanged price book ingestion."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from bimcalc.db.models import PriceItemModel
+from bimcalc.ingestion.pricebooks import ingest_pricebook
+from bimcalc.pipeline.fingerprints import row_hash
+
+HEADER = "SKU,Description,Unit,Unit Price,Classification Code\n"
+
+
+def _write(path, prices: dict[str, str]) -> None:
+    path.write_text(
+        HEADER
+        + "".join(f"{sku},Item {sku},ea,{price},2215\n" for sku, price in prices.items())
+    )
+
+
+def test_row_hash_ignores_price_formatting():
+    assert row_hash("A", "IE", "10.50", "eur") == row_hash("A", "IE", 10.5, "EUR")
+    assert row_hash("A", "IE", "10.50", "EUR") != row_hash("A", "IE", "10.51", "EUR")
+
+
+@pytest.mark.asyncio
+async def test_reingest_skips_unchanged_file_and_rows(session, tmp_path):
+    prices = {f"SKU-{i}": str(10 + i) for i in range(20)}
+    q1 = tmp_path / "vendor_q1.csv"
+    _write(q1, prices)
+
+    assert (await ingest_pricebook(session, q1, "acme", use_cmm=False))[0] == 20
+
+    success, messages = await ingest_pricebook(session, q1, "acme", use_cmm=False)
+    assert success == 0
+    assert "20 rows skipped by hash" in messages[0]
+
+    # Next quarter's file: new name, one price changed
+    prices["SKU-7"] = "70"
+    q2 = tmp_path / "vendor_q2.csv"
+    _write(q2, prices)
+    success, messages = await ingest_pricebook(session, q2, "acme", use_cmm=False)
+
+    assert success == 1
+    assert any("19 unchanged rows skipped" in m for m in messages)
+    current = (
+        await session.execute(
+            select(PriceItemModel.unit_price).where(
+                PriceItemModel.item_code == "SKU-7",
+                PriceItemModel.is_current.is_(True),
+            )
+        )
+    ).scalars().all()
+    assert current == [Decimal("70")]
+
+
+@pytest.mark.asyncio
+async def test_file_with_failed_rows_is_parsed_again(session, tmp_path):
+    book = tmp_path / "vendor.csv"
+    book.write_text(HEADER + "A,Item A,ea,10,2215\nB,Item B,ea,-5,2215\n")
+
+    success, messages = await ingest_pricebook(session, book, "acme", use_cmm=False)
+    assert success == 1
+    assert any("Negative unit price" in m for m in messages)
+
+    # No file digest was stored: the rerun parses it, skipping only row A
+    success, messages = await ingest_pricebook(session, book, "acme", use_cmm=False)
+    assert success == 0
+    assert any("Negative unit price" in m for m in messages)
+    assert any("1 unchanged rows skipped" in m for m in messages)
+
+    # Only the row skipped by hash is confirmed as current
+    session.add(
+        PriceItemModel(
+            org_id="acme",
+            item_code="OLD",
+            region="IE",
+            vendor_id="default",
+            sku="OLD",
+            description="Dropped from the book",
+            classification_code="2215",
+            unit="ea",
+            unit_price=Decimal("1"),
+            currency="EUR",
+            source_name="default_old",
+            source_currency="EUR",
+        )
+    )
+    await session.commit()
+    old = await session.scalar(
+        select(PriceItemModel.last_updated).where(PriceItemModel.item_code == "OLD")
+    )
+    await ingest_pricebook(session, book, "acme", use_cmm=False)
+    assert (
+        await session.scalar(
+            select(PriceItemModel.last_updated).where(PriceItemModel.item_code == "OLD")
+        )
+        == old
+    )
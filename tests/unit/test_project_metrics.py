@@ -0,0 +1,146 @@
+"""Tests for the single-scan project metrics engine."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+from bimcalc.db.models import ItemModel, MatchFlagModel, MatchResultModel
+from bimcalc.reporting.audit_metrics import compute_audit_metrics
+from bimcalc.reporting.progress import compute_progress_metrics
+from bimcalc.reporting.project_metrics import compute_project_metrics
+from bimcalc.reporting.review_metrics import compute_review_metrics
+
+
+def _item(code, project="p1"):
+    return ItemModel(
+        id=uuid4(),
+        org_id="org",
+        project_id=project,
+        family="Cable Tray",
+        type_name="Elbow",
+        classification_code=code,
+    )
+
+
+def _result(
+    item, decision, confidence, age_days, created_by="system", source="fuzzy_match"
+):
+    return MatchResultModel(
+        id=uuid4(),
+        item_id=item.id,
+        confidence_score=confidence,
+        source=source,
+        decision=decision,
+        reason="test",
+        created_by=created_by,
+        timestamp=datetime.utcnow() - timedelta(days=age_days),
+    )
+
+
+def _flag(result, severity, flag_type="UnitConflict"):
+    return MatchFlagModel(
+        match_result_id=result.id,
+        item_id=result.item_id,
+        price_item_id=uuid4(),
+        flag_type=flag_type,
+        severity=severity,
+        message="test",
+    )
+
+
+@pytest_asyncio.fixture()
+async def project(session):
+    tray, light, unclassified = _item("66"), _item("64"), _item(None)
+    pending = _item("66")
+
+    stale = _result(tray, "manual-review", 60, age_days=20, created_by="alice")
+    accepted = _result(tray, "auto-accepted", 92, age_days=1)
+    light_review = _result(
+        light, "manual-review", 75, age_days=9, created_by="bob", source="review_ui"
+    )
+    pending_review = _result(pending, "manual-review", 50, age_days=40)
+    session.add_all(
+        [
+            tray,
+            light,
+            unclassified,
+            pending,
+            _item("66", project="other"),
+            stale,
+            accepted,
+            light_review,
+            pending_review,
+            # Superseded result: counted by progress, not by the review queue
+            _flag(stale, "Critical-Veto"),
+            _flag(light_review, "Advisory", "StalePrice"),
+            _flag(pending_review, "Critical-Veto", "SizeMismatch"),
+        ]
+    )
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_engine_builds_all_three_metric_sets(session, project):
+    metrics = await compute_project_metrics(session, "org", "p1")
+
+    review = metrics.review
+    assert review.total_pending == 2
+    assert (review.high_urgency, review.medium_urgency) == (1, 2)
+    assert review.critical_flag_types == {"SizeMismatch": 1}
+    assert review.advisory_flag_types == {"StalePrice": 1}
+    assert review.items_over_30_days == 1
+    assert review.oldest_review_days == pytest.approx(40, abs=0.01)
+    assert review.avg_age_days == pytest.approx(24.5, abs=0.01)
+    assert [c["code"] for c in review.classification_breakdown] == ["64", "66"]
+    assert review.classification_breakdown[1]["critical"] == 1
+
+    audit = metrics.audit
+    assert (audit.total_decisions, audit.total_items_audited) == (4, 3)
+    assert (audit.auto_approved_count, audit.manual_review_count) == (1, 3)
+    assert (audit.decisions_last_7_days, audit.decisions_last_30_days) == (1, 3)
+    assert audit.review_ui_count == 1
+    assert audit.top_reviewers[0] == {
+        "created_by": "alice",
+        "count": 1,
+        "avg_confidence": 60.0,
+    }
+    assert [d["count"] for d in audit.daily_timeline] == [1, 1]
+
+    progress = metrics.progress
+    assert (progress.total_items, progress.classified_items) == (4, 3)
+    assert (progress.matched_items, progress.auto_approved) == (3, 1)
+    assert (progress.flagged_critical, progress.flagged_advisory) == (2, 1)
+    assert progress.classification_coverage[0] == {
+        "code": "66",
+        "total": 2,
+        "matched": 2,
+        "percent": 100.0,
+    }
+
+    assert set(metrics.timings) == {"latest", "flags", "audit", "format"}
+
+
+@pytest.mark.asyncio
+async def test_section_wrappers_match_engine(session, project):
+    metrics = await compute_project_metrics(session, "org", "p1")
+
+    review = await compute_review_metrics(session, "org", "p1")
+    audit = await compute_audit_metrics(session, "org", "p1")
+    progress = await compute_progress_metrics(session, "org", "p1")
+
+    assert review.classification_breakdown == metrics.review.classification_breakdown
+    assert audit.daily_timeline == metrics.audit.daily_timeline
+    assert audit.compliance_score == metrics.audit.compliance_score
+    assert progress.overall_completion == metrics.progress.overall_completion
+
+    only_audit = await compute_project_metrics(session, "org", "p1", sections=["audit"])
+    assert only_audit.review is None and only_audit.progress is None
+    assert "latest" not in only_audit.timings
+
+    empty = await compute_project_metrics(session, "org", "missing")
+    assert empty.progress.overall_status == "not_started"
+    assert empty.review.total_pending == 0
@@ -0,0 +1,99 @@
+"""Tests for the SQL query profiler and its web surface."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from bimcalc.db.profiler import (
+    N_PLUS_ONE_THRESHOLD,
+    clear_profiles,
+    fingerprint,
+    profile_queries,
+    recent_profiles,
+)
+from bimcalc.web.query_profiling import QueryProfilingMiddleware
+from bimcalc.web.routes import profiling
+
+
+@pytest.fixture(autouse=True)
+def fresh_profiles():
+    clear_profiles()
+    yield
+    clear_profiles()
+
+
+def test_fingerprint_collapses_values():
+    assert fingerprint(
+        "SELECT x::text FROM t1\n  WHERE id IN ($1, $2, $3) AND a = %(a)s "
+        "AND b = :b_1 AND c = 'it''s' AND d > 42"
+    ) == (
+        "SELECT x::text FROM t1 WHERE id IN (?, ...) AND a = ? AND b = ? AND c = ? AND d > ?"
+    )
+    assert fingerprint("SELECT * FROM t WHERE id = ?") == fingerprint(
+        "SELECT * FROM t WHERE id = 7"
+    )
+
+
+@pytest.mark.asyncio
+async def test_profile_flags_repeated_queries():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    with profile_queries("cli match", log=False) as profile:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT count(*) FROM sqlite_master"))
+            for n in range(N_PLUS_ONE_THRESHOLD):
+                await conn.execute(text("SELECT :n + 1"), {"n": n})
+    await engine.dispose()
+
+    # Outside the block nothing is recorded
+    async with create_async_engine("sqlite+aiosqlite:///:memory:").connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert profile.total_queries == N_PLUS_ONE_THRESHOLD + 1
+    [(key, stats)] = profile.suspected_n_plus_one()
+    assert (key, stats.count) == ("SELECT ? + ?", N_PLUS_ONE_THRESHOLD)
+    assert recent_profiles() == [profile]
+
+    summary = profile.summary()
+    assert summary["queries"] == N_PLUS_ONE_THRESHOLD + 1
+    assert summary["distinct"] == 2
+    assert summary["n_plus_one"][0]["count"] == N_PLUS_ONE_THRESHOLD
+
+
+def test_middleware_profiles_requests_for_admin_report(monkeypatch):
+    monkeypatch.setenv("BIMCALC_AUTH_DISABLED", "true")
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+
+    app = FastAPI()
+    app.add_middleware(QueryProfilingMiddleware)
+    app.include_router(profiling.router)
+
+    @app.get("/things/{thing_id}")
+    async def thing(thing_id: int):
+        async with engine.connect() as conn:
+            for n in range(12):
+                await conn.execute(text("SELECT :n"), {"n": n})
+        return {"id": thing_id}
+
+    client = TestClient(app)
+    for thing_id in (1, 2):
+        response = client.get(f"/things/{thing_id}")
+        assert response.headers["X-Query-Count"] == "12"
+
+    report = client.get("/admin/profiling").json()
+    assert report["profiles_kept"] == 2
+    assert [p["label"] for p in report["profiles"]] == ["GET /things/{thing_id}"] * 2
+    [hot] = report["hot_queries"]
+    assert (hot["fingerprint"], hot["count"]) == ("SELECT ?", 24)
+    [loop] = report["n_plus_one"]
+    assert (loop["label"], loop["seen"], loop["max_count"]) == (
+        "GET /things/{thing_id}",
+        2,
+        12,
+    )
+
+    assert client.delete("/admin/profiling").json() == {"success": True}
+    assert client.get("/admin/profiling").json()["profiles_kept"] == 0
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from decimal import Decimal
 from uuid import uuid4
@@ -22,8 +23,16 @@ from bimcalc.db.models import (
 )
 from bimcalc.models import FlagSeverity
 from bimcalc.review.models import ReviewFlag, ReviewItem, ReviewPrice, ReviewRecord
-from bimcalc.review.repository import fetch_pending_reviews
-from bimcalc.review.service import approve_review_record
+from bimcalc.review.repository import (
+    fetch_pending_reviews,
+    fetch_review_counts,
+    fetch_review_page,
+)
+from bimcalc.review.service import (
+    approve_review_record,
+    bulk_approve_review_records,
+    bulk_reject_review_records,
+)
 
 
 @pytest_asyncio.fixture()
@@ -318,3 +327,247 @@ async def test_approve_review_record_blocks_critical_veto_flags(
         select(MatchResultModel).where(MatchResultModel.item_id == item.id)
     )
     assert result_rows.scalar_one_or_none() is None
+
+
+async def _seed_review_rows(
+    session: AsyncSession, count: int, critical_index: int | None = None
+) -> list[MatchResultModel]:
+    price = PriceItemModel(
+        org_id="acme",
+        item_code="CT-90-ELBOW",
+        region="IE",
+        vendor_id="vendor",
+        sku="CT-90",
+        description="Cable tray elbow 90",
+        classification_code=66,
+        unit="ea",
+        unit_price=Decimal("25.0"),
+        currency="EUR",
+        source_name="test_catalog",
+        source_currency="EUR",
+    )
+    session.add(price)
+    await session.flush()
+
+    results = []
+    for index in range(count):
+        item = ItemModel(
+            org_id="acme",
+            project_id="proj-a",
+            family="Cable Tray",
+            type_name=f"Elbow {index}",
+            classification_code=66,
+            canonical_key=f"bulk-key-{index}",
+        )
+        session.add(item)
+        await session.flush()
+        result = MatchResultModel(
+            item_id=item.id,
+            price_item_id=price.id,
+            confidence_score=70.0,
+            source="fuzzy_match",
+            decision="manual-review",
+            reason="Needs review",
+            created_by="matcher",
+            timestamp=datetime.utcnow() - timedelta(hours=1),
+        )
+        session.add(result)
+        await session.flush()
+        severity = "Critical-Veto" if index == critical_index else "Advisory"
+        session.add(
+            MatchFlagModel(
+                match_result_id=result.id,
+                item_id=item.id,
+                price_item_id=price.id,
+                flag_type="Unit Conflict" if index == critical_index else "StalePrice",
+                severity=severity,
+                message="flag",
+            )
+        )
+        results.append(result)
+
+    # Existing active mapping that the bulk approval must close
+    session.add(
+        ItemMappingModel(
+            org_id="acme",
+            canonical_key="bulk-key-0",
+            price_item_id=price.id,
+            start_ts=datetime.utcnow() - timedelta(days=1),
+            created_by="seed",
+            reason="seed",
+        )
+    )
+    await session.commit()
+    return results
+
+
+@pytest.mark.asyncio
+async def test_bulk_approve_writes_set_based_and_reports_failures(
+    db_session: AsyncSession,
+):
+    results = await _seed_review_rows(db_session, 4, critical_index=2)
+    missing_id = uuid4()
+
+    outcome = await bulk_approve_review_records(
+        db_session,
+        [r.id for r in results] + [missing_id],
+        org_id="acme",
+        project_id="proj-a",
+        created_by="reviewer@acme",
+        annotation="batch",
+    )
+    await db_session.commit()
+
+    assert outcome.processed_count == 3
+    failed = {f.match_result_id: f.error for f in outcome.failures}
+    assert set(failed) == {results[2].id, missing_id}
+    assert "Critical-Veto" in failed[results[2].id]
+
+    active = (
+        await db_session.execute(
+            select(ItemMappingModel).where(ItemMappingModel.end_ts.is_(None))
+        )
+    ).scalars().all()
+    assert sorted(m.canonical_key for m in active) == [
+        "bulk-key-0",
+        "bulk-key-1",
+        "bulk-key-3",
+    ]
+    closed = (
+        await db_session.execute(
+            select(ItemMappingModel).where(ItemMappingModel.end_ts.is_not(None))
+        )
+    ).scalars().all()
+    assert [m.created_by for m in closed] == ["seed"]
+
+    accepted = (
+        await db_session.execute(
+            select(MatchResultModel).where(MatchResultModel.source == "review_ui")
+        )
+    ).scalars().all()
+    assert len(accepted) == 3
+    assert all(r.decision == "auto-accepted" for r in accepted)
+
+    copied_flags = (
+        await db_session.execute(
+            select(MatchFlagModel).where(
+                MatchFlagModel.match_result_id.in_([r.id for r in accepted])
+            )
+        )
+    ).scalars().all()
+    assert len(copied_flags) == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_reject_is_scoped_to_project(db_session: AsyncSession):
+    results = await _seed_review_rows(db_session, 2)
+
+    outcome = await bulk_reject_review_records(
+        db_session,
+        [r.id for r in results],
+        org_id="acme",
+        project_id="other-project",
+        created_by="reviewer@acme",
+    )
+    assert outcome.processed_count == 0
+    assert len(outcome.failures) == 2
+
+    outcome = await bulk_reject_review_records(
+        db_session,
+        [r.id for r in results],
+        org_id="acme",
+        project_id="proj-a",
+        created_by="reviewer@acme",
+    )
+    await db_session.commit()
+    assert outcome.processed_count == 2
+
+    decisions = (
+        await db_session.execute(select(MatchResultModel.decision))
+    ).scalars().all()
+    assert decisions == ["rejected", "rejected"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_review_page_filters_in_sql_and_paginates(
+    db_session: AsyncSession,
+):
+    results = await _seed_review_rows(db_session, 5, critical_index=3)
+
+    first = await fetch_review_page(db_session, "acme", "proj-a", limit=2)
+    assert len(first.records) == 2
+    assert first.has_more
+
+    second = await fetch_review_page(
+        db_session, "acme", "proj-a", cursor=first.next_cursor, limit=2
+    )
+    third = await fetch_review_page(
+        db_session, "acme", "proj-a", cursor=second.next_cursor, limit=2
+    )
+    assert not third.has_more
+    paged_ids = [
+        r.match_result_id for page in (first, second, third) for r in page.records
+    ]
+    assert sorted(paged_ids) == sorted(r.id for r in results)
+    assert len(set(paged_ids)) == 5
+
+    critical = await fetch_review_page(
+        db_session,
+        "acme",
+        "proj-a",
+        severity_filter=FlagSeverity.CRITICAL_VETO,
+    )
+    assert [r.match_result_id for r in critical.records] == [results[3].id]
+
+    by_type = await fetch_pending_reviews(
+        db_session, "acme", "proj-a", flag_types=["StalePrice"]
+    )
+    assert len(by_type) == 4
+
+    with pytest.raises(ValueError):
+        await fetch_review_page(db_session, "acme", "proj-a", cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_fetch_review_counts_groups_by_filter(db_session: AsyncSession):
+    await _seed_review_rows(db_session, 3, critical_index=0)
+
+    counts = await fetch_review_counts(db_session, "acme", "proj-a")
+    assert counts.total == 3
+    assert counts.unmapped == 0
+    assert counts.by_severity == {"Critical-Veto": 1, "Advisory": 2}
+    assert counts.by_flag_type == {"Unit Conflict": 1, "StalePrice": 2}
+    assert counts.by_classification == {"66": 3}
+    assert counts.filtered == 3
+
+    critical = await fetch_review_counts(
+        db_session, "acme", "proj-a", severity_filter=FlagSeverity.CRITICAL_VETO
+    )
+    assert (critical.filtered, critical.total) == (1, 3)
+    assert critical.by_severity == counts.by_severity
+
+
+@pytest.mark.asyncio
+async def test_review_ui_loads_following_pages(db_session: AsyncSession, monkeypatch):
+    from bimcalc.ui import review_app
+
+    results = await _seed_review_rows(db_session, 5)
+    await db_session.commit()
+
+    @asynccontextmanager
+    async def session_scope():
+        yield db_session
+
+    monkeypatch.setattr(review_app, "get_session", session_scope)
+    monkeypatch.setattr(review_app.ReviewUIApp, "PAGE_SIZE", 2)
+
+    app = review_app.ReviewUIApp("acme", "proj-a", "tester")
+    async with app.run_test() as pilot:
+        assert len(app.records) == 2
+        await pilot.press("n")
+        await pilot.press("n")
+        await pilot.pause()
+        assert app.next_cursor is None
+        assert sorted(r.match_result_id for r in app.records) == sorted(
+            r.id for r in results
+        )
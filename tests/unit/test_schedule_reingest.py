@@ -0,0 +1,225 @@
+"""Tests for schedule re-ingestion (field-level diff into item_revisions)."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from bimcalc.core.vector_index import clear_vector_indexes, get_vector_index
+from bimcalc.db.models import ItemModel, ItemRevisionModel
+from bimcalc.ingestion import schedules
+from bimcalc.ingestion.schedules import ingest_schedule, reingest_schedule
+
+
+@pytest.fixture(autouse=True)
+def vector_indexes():
+    clear_vector_indexes()
+    yield
+    clear_vector_indexes()
+
+
+def _csv(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+async def _items(session):
+    result = await session.execute(select(ItemModel).order_by(ItemModel.element_id))
+    return {item.element_id: item for item in result.scalars()}
+
+
+async def _revisions(session):
+    result = await session.execute(select(ItemRevisionModel))
+    return list(result.scalars())
+
+
+FIRST = """Element Id,Family,Type,Width,Count,Material
+101,Cable Tray,Elbow 90,200,4,Steel
+102,Cable Tray,Tee,300,2,Steel
+103,Cable Tray,Straight,300,10,Steel
+"""
+
+
+@pytest.mark.asyncio
+async def test_reingest_records_field_level_changes(session, tmp_path):
+    await ingest_schedule(
+        session, _csv(tmp_path, "a.csv", FIRST), "org", "proj", source_name="model.csv"
+    )
+    items = await _items(session)
+    await session.execute(
+        ItemModel.__table__.update().values(
+            classification_code="2650", canonical_key="key"
+        )
+    )
+    await session.commit()
+
+    second = """Element Id,Family,Type,Width,Count,Material
+101,Cable Tray,Elbow 90,200.0,4,Steel
+102,Cable Tray,Tee,350,3,Steel
+104,Cable Tray,Cross,300,1,Steel
+"""
+    diff = await reingest_schedule(
+        session, _csv(tmp_path, "b.csv", second), "org", "proj", source_name="model.csv"
+    )
+
+    assert (diff.added, diff.modified, diff.unchanged, diff.deleted) == (1, 1, 1, 1)
+    assert diff.errors == []
+
+    session.expire_all()
+    after = await _items(session)
+    assert set(after) == {"101", "102", "103", "104"}
+    assert set(diff.changed_item_ids) == {after["102"].id, after["104"].id}
+
+    # Numeric changes clear the canonical key but keep the classification
+    tee = after["102"]
+    assert (tee.width_mm, tee.quantity) == (350.0, Decimal("3"))
+    assert tee.canonical_key is None and tee.classification_code == "2650"
+    assert after["101"].canonical_key == "key"
+    assert after["104"].source_file == "model.csv"
+
+    changes = {
+        (r.item_id, r.field_name): (r.old_value, r.new_value, r.change_type)
+        for r in await _revisions(session)
+    }
+    assert changes == {
+        (items["102"].id, "quantity"): ("2", "3", "modified"),
+        (items["102"].id, "width_mm"): ("300", "350", "modified"),
+        (after["104"].id, "item"): (None, "Cable Tray / Cross", "added"),
+        (items["103"].id, "item"): ("Cable Tray / Straight", None, "deleted"),
+    }
+    assert diff.revisions == len(changes)
+
+
+@pytest.mark.asyncio
+async def test_reingest_falls_back_to_family_and_type(session, tmp_path):
+    await ingest_schedule(
+        session,
+        _csv(tmp_path, "a.csv", "Family,Type,Category\nDuct,Bend,Ducts\n"),
+        "org",
+        "proj",
+        source_name="ducts.csv",
+    )
+    await session.execute(
+        ItemModel.__table__.update().values(classification_code="2302")
+    )
+    await session.commit()
+
+    # Same element gains an id and a new system type; blanks stay missing
+    diff = await reingest_schedule(
+        session,
+        _csv(
+            tmp_path,
+            "b.csv",
+            "Element Id,Family,Type,Category,System Type,Material\n"
+            "77,Duct,Bend,Ducts,Supply Air, \n"
+            "78,Duct,,Ducts,,\n",
+        ),
+        "org",
+        "proj",
+        source_name="ducts.csv",
+    )
+
+    assert (diff.added, diff.modified, diff.deleted) == (0, 1, 0)
+    assert diff.errors == ["Row 1: Missing family or type"]
+
+    session.expire_all()
+    (item,) = (await _items(session)).values()
+    assert (item.element_id, item.system_type, item.material) == (
+        "77",
+        "Supply Air",
+        None,
+    )
+    # Classifying field changed: classification is re-derived on next match
+    assert item.classification_code is None
+    assert {r.field_name for r in await _revisions(session)} == {
+        "element_id",
+        "system_type",
+    }
+
+
+@pytest.mark.asyncio
+async def test_reingest_scopes_deletions_and_skips_duplicates(session, tmp_path):
+    await ingest_schedule(
+        session,
+        _csv(tmp_path, "a.csv", "Element Id,Family,Type\n1,Pipe,Elbow\n"),
+        "org",
+        "proj",
+        source_name="plumbing.csv",
+    )
+
+    diff = await reingest_schedule(
+        session,
+        _csv(
+            tmp_path,
+            "b.csv",
+            "Element Id,Family,Type\n2,Tray,Tee\n2,Tray,Tee\n",
+        ),
+        "org",
+        "proj",
+        source_name="electrical.csv",
+    )
+
+    # Items imported from another file are not treated as deleted
+    assert (diff.added, diff.deleted) == (1, 0)
+    assert len(diff.errors) == 1 and "Duplicate item" in diff.errors[0]
+
+    # Re-running the same file is a no-op
+    again = await reingest_schedule(
+        session,
+        _csv(tmp_path, "c.csv", "Element Id,Family,Type\n2,Tray,Tee\n"),
+        "org",
+        "proj",
+        source_name="electrical.csv",
+    )
+    assert (again.added, again.modified, again.unchanged, again.revisions) == (
+        0,
+        0,
+        1,
+        0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_reingest_clears_derived_state_of_changed_items(
+    session, tmp_path, monkeypatch
+):
+    await ingest_schedule(
+        session, _csv(tmp_path, "a.csv", FIRST), "org", "proj", source_name="model.csv"
+    )
+    items = await _items(session)
+    await session.execute(ItemModel.__table__.update().values(embedding=[0.5] * 1536))
+    await session.commit()
+    index = get_vector_index(session, "items")
+    await index.sync(session, force=True)
+    assert len(index) == 3
+
+    published = []
+    monkeypatch.setattr(
+        schedules,
+        "publish_invalidation",
+        lambda session, *tags: published.extend(tags),
+    )
+    second = """Element Id,Family,Type,Width,Count,Material
+101,Cable Tray,Elbow 45,200,4,Steel
+102,Cable Tray,Tee,350,2,Steel
+103,Cable Tray,Straight,300,10,Steel
+"""
+    await reingest_schedule(
+        session, _csv(tmp_path, "b.csv", second), "org", "proj", source_name="model.csv"
+    )
+
+    session.expire_all()
+    after = await _items(session)
+    # Type feeds the embedding text; width does not
+    assert after["101"].embedding is None
+    assert after["102"].embedding is not None
+    assert after["103"].embedding is not None
+    assert len(index) == 2
+    assert set(published) == {
+        "project:org:proj",
+        f"item:{items['101'].id}",
+        f"item:{items['102'].id}",
+    }
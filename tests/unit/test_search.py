@@ -0,0 +1,105 @@
+"""Tests for the shared items/prices list search."""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.dialects import postgresql
+
+from bimcalc.db.models import ItemModel
+from bimcalc.db.search import (
+    ITEMS,
+    apply_search,
+    count_results,
+    dialect_name,
+    search_sql,
+)
+
+
+def _item(family, type_name="Standard", category=None):
+    return ItemModel(
+        id=uuid4(),
+        org_id="org",
+        project_id="proj",
+        family=family,
+        type_name=type_name,
+        category=category,
+    )
+
+
+async def _search(session, term):
+    stmt = apply_search(
+        select(ItemModel.family), ITEMS, term, dialect_name(session)
+    ).order_by(ItemModel.family)
+    return list((await session.execute(stmt)).scalars())
+
+
+@pytest.mark.asyncio
+async def test_fts_search_matches_substrings_and_stays_in_sync(session):
+    tray, ladder, duct = (
+        _item("Cable Tray", "Elbow 90"),
+        _item("Cable Ladder", category="Cable Trays"),
+        _item("Rectangular Duct", "100% recycled"),
+    )
+    session.add_all([tray, ladder, duct])
+    await session.commit()
+
+    assert dialect_name(session) == "sqlite"
+    # Case-insensitive substring across family, type and category
+    assert await _search(session, "TRAY") == ["Cable Tray", "Cable Ladder"]
+    assert await _search(session, "bow 9") == ["Cable Tray"]
+    # Short terms fall back to LIKE; wildcards are literal
+    assert await _search(session, "0%") == ["Rectangular Duct"]
+    assert await _search(session, "%") == ["Rectangular Duct"]
+    assert await _search(session, "  ") == [
+        "Cable Ladder",
+        "Cable Tray",
+        "Rectangular Duct",
+    ]
+
+    # Triggers keep the FTS table in step with updates and deletes
+    await session.execute(
+        update(ItemModel).where(ItemModel.id == tray.id).values(family="Cable Basket")
+    )
+    await session.execute(delete(ItemModel).where(ItemModel.id == ladder.id))
+    await session.commit()
+    assert await _search(session, "tray") == []
+    assert await _search(session, "basket") == ["Cable Basket"]
+    remaining = await session.execute(text("SELECT count(*) FROM items_fts"))
+    assert remaining.scalar_one() == 2
+    # The rowid-keyed index matches the table (raises on any drift)
+    await session.execute(
+        text("INSERT INTO items_fts(items_fts, rank) VALUES ('integrity-check', 1)")
+    )
+
+
+@pytest.mark.asyncio
+async def test_count_and_sql_text_share_the_predicate(session):
+    session.add_all([_item(f"Tray {i}") for i in range(3)] + [_item("Duct")])
+    await session.commit()
+
+    stmt = apply_search(select(ItemModel), ITEMS, "tray", "sqlite")
+    count = await count_results(session, stmt, "sqlite")
+    assert (count.total, count.estimated) == (3, False)
+
+    for term in ("tray", "tr"):
+        condition, params = search_sql(ITEMS, term, "sqlite", "i")
+        result = await session.execute(
+            text(f"SELECT count(*) FROM items i WHERE {condition}"), params
+        )
+        assert result.scalar_one() == 3
+    assert search_sql(ITEMS, None, "sqlite", "i") == ("", {})
+
+
+def test_postgres_search_uses_trigram_ilike_and_similarity():
+    stmt = apply_search(select(ItemModel.id), ITEMS, "tray", "postgresql")
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert sql.count("ILIKE") == 3
+    assert "word_similarity" in sql and "ORDER BY greatest(" in sql
+    assert "items_fts" not in sql
+    condition, params = search_sql(ITEMS, "50%", "postgresql", "i")
+    assert "i.family ILIKE :search_pattern" in condition
+    assert params == {"search_pattern": "%50\\%%"}
@@ -0,0 +1,112 @@
+"""Tests for matching pipeline timing spans."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from prometheus_client import CollectorRegistry
+
+from bimcalc.config import get_config
+from bimcalc.db.models import PriceItemModel
+from bimcalc.matching.orchestrator import MatchOrchestrator
+from bimcalc.models import Item
+from bimcalc.utils import spans
+from bimcalc.utils.spans import collect_spans, enable_span_metrics, span
+
+
+@pytest.fixture()
+def registry(monkeypatch):
+    monkeypatch.setattr(spans, "_metrics", None)
+    monkeypatch.setattr(spans, "_export", False)
+    registry = CollectorRegistry()
+    enable_span_metrics(registry)
+    return registry
+
+
+def test_spans_are_free_until_someone_listens():
+    first = span("flags")
+    with first as s:
+        s.count = 3
+    assert span("routing") is first
+
+    with collect_spans() as recorder:
+        with span("candidate_sql", count=0) as s:
+            s.count = 12
+        with span("candidate_sql", count=0) as s:
+            s.count = 4
+        with collect_spans() as inner:
+            with span("flags"):
+                pass
+
+    assert set(recorder.stages) == {"candidate_sql"}
+    assert recorder.stages["candidate_sql"].calls == 2
+    assert recorder.stages["candidate_sql"].items == 16
+    assert set(inner.stages) == {"flags"}
+    assert span("flags") is first
+
+
+def test_spans_export_prometheus_histograms(registry):
+    with span("fuzzy_ranking", count=5):
+        pass
+    with span("fuzzy_ranking", count=7):
+        pass
+
+    labels = {"stage": "fuzzy_ranking"}
+    assert (
+        registry.get_sample_value("bimcalc_pipeline_stage_seconds_count", labels) == 2
+    )
+    assert registry.get_sample_value("bimcalc_pipeline_stage_items_total", labels) == 12
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_records_each_stage(session):
+    org_id = get_config().org_id
+    session.add(
+        PriceItemModel(
+            org_id=org_id,
+            item_code="TRAY-200",
+            region="EU",
+            vendor_id="vendor",
+            sku="TRAY-200",
+            description="Ladder cable tray 200x50 galvanised",
+            classification_code="66",
+            unit="m",
+            unit_price=Decimal("25.00"),
+            currency="EUR",
+            source_name="test",
+            source_currency="EUR",
+            width_mm=200.0,
+            height_mm=50.0,
+        )
+    )
+    await session.commit()
+
+    item = Item(
+        org_id=org_id,
+        project_id="proj",
+        family="Cable Tray - Ladder",
+        type_name="200x50",
+        category="Cable Tray",
+        classification_code=66,
+        width_mm=200.0,
+        height_mm=50.0,
+        material="Galvanised",
+        unit="m",
+    )
+    with collect_spans() as recorder:
+        await MatchOrchestrator(session).match(item)
+
+    stages = recorder.stages
+    for stage in (
+        "canonical_key",
+        "mapping_lookup",
+        "region_fetch",
+        "candidate_sql",
+        "candidate_convert",
+        "fuzzy_ranking",
+    ):
+        assert stages[stage].calls == 1, stage
+    assert "classification" not in stages  # code was already set
+    assert stages["candidate_sql"].items == 1
+    assert stages["fuzzy_ranking"].items == 1
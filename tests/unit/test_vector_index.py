@@ -0,0 +1,214 @@
+"""Tests for the local vector similarity index."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy import update
+
+from bimcalc.config import get_config
+from bimcalc.core import vector_index
+from bimcalc.core.vector_index import (
+    LocalVectorIndex,
+    clear_vector_indexes,
+    get_vector_index,
+    index_embedding,
+)
+from bimcalc.db.models import PriceItemModel
+
+DIM = 1536
+
+
+@pytest.fixture(autouse=True)
+def vector_indexes():
+    clear_vector_indexes()
+    yield
+    clear_vector_indexes()
+
+
+@pytest.fixture()
+def rng():
+    return np.random.default_rng(7)
+
+
+def _price(code, embedding, current=True):
+    return PriceItemModel(
+        id=uuid4(),
+        org_id="org",
+        item_code=code,
+        region="UK",
+        sku=code,
+        classification_code="66",
+        description=f"{code} tray",
+        unit="ea",
+        unit_price=Decimal("10"),
+        currency="EUR",
+        source_name="test",
+        source_currency="EUR",
+        valid_from=datetime(2024, 1, 1),
+        is_current=current,
+        embedding=embedding.tolist(),
+    )
+
+
+def test_top_k_matches_brute_force(rng):
+    vectors = rng.normal(size=(200, 32)).astype(np.float32)
+    ids = [uuid4() for _ in vectors]
+    index = LocalVectorIndex("price_items")
+    index.add(ids, vectors)
+
+    query = rng.normal(size=32)
+    hits = index.top_k(query, 10)
+
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(unit @ (query / np.linalg.norm(query))))[:10]
+    assert [id_ for id_, _ in hits] == [ids[i] for i in expected]
+    assert hits[0][1] >= hits[-1][1]
+
+
+def test_batched_top_k_matches_single_queries(rng):
+    vectors = rng.normal(size=(300, 16)).astype(np.float32)
+    ids = [uuid4() for _ in vectors]
+    index = LocalVectorIndex("price_items")
+    index.add(ids, vectors)
+    index.top_k(vectors[0], 1)
+    index.remove(ids[:10])
+
+    queries = list(rng.normal(size=(5, 16))) + [np.ones(3)]
+    batched = index.top_k_many(queries, 4)
+    for hits, query in zip(batched, queries[:5], strict=False):
+        single = index.top_k(query, 4)
+        assert [id_ for id_, _ in hits] == [id_ for id_, _ in single]
+        assert [s for _, s in hits] == pytest.approx([s for _, s in single])
+    assert batched[5] == []
+
+
+def test_incremental_add_remove_and_replace(rng):
+    vectors = rng.normal(size=(20, 8)).astype(np.float32)
+    ids = [uuid4() for _ in vectors]
+    index = LocalVectorIndex("price_items")
+    index.add(ids, vectors)
+    assert index.top_k(vectors[3], 1)[0][0] == ids[3]
+
+    index.remove([ids[3]])
+    assert ids[3] not in [id_ for id_, _ in index.top_k(vectors[3], 20)]
+    assert len(index) == 19
+
+    # Replacing an embedding moves the id to its new position
+    index.add([ids[5]], [vectors[3]])
+    top_id, score = index.top_k(vectors[3], 1)[0]
+    assert top_id == ids[5]
+    assert score == pytest.approx(1.0, abs=1e-5)
+
+    # Mismatched dimensions are skipped rather than corrupting the matrix
+    index.add([uuid4()], [np.ones(4)])
+    assert len(index) == 19
+
+
+@pytest.mark.asyncio
+async def test_search_skips_expired_prices(session, rng):
+    target = rng.normal(size=DIM)
+    current = _price("CUR", target + rng.normal(scale=0.1, size=DIM))
+    expired = _price("OLD", target, current=False)
+    session.add_all([current, expired])
+    await session.commit()
+
+    index = get_vector_index(session, "price_items")
+    assert isinstance(index, LocalVectorIndex)
+    hits = await index.search(session, target.tolist(), limit=1)
+    assert [row.item_code for row, _ in hits] == ["CUR"]
+
+    # Closed after indexing: dropped on the next search, not returned
+    newest = _price("NEW", target)
+    session.add(newest)
+    await session.commit()
+    index_embedding(session, "price_items", newest.id, newest.embedding)
+    assert (await index.search(session, target.tolist(), limit=1))[0][0].id == newest.id
+
+    await session.execute(
+        update(PriceItemModel)
+        .where(PriceItemModel.id == newest.id)
+        .values(is_current=False)
+    )
+    await session.commit()
+    hits = await index.search(session, target.tolist(), limit=1)
+    assert [row.item_code for row, _ in hits] == ["CUR"]
+    assert len(index) == 1
+
+
+@pytest.mark.asyncio
+async def test_index_persists_matrix_and_ids_together(
+    session, rng, tmp_path, monkeypatch
+):
+    config = get_config()
+    monkeypatch.setattr(
+        config, "vector", replace(config.vector, local_index_dir=str(tmp_path))
+    )
+    vectors = rng.normal(size=(5, DIM))
+    session.add_all([_price(f"P{i}", v) for i, v in enumerate(vectors)])
+    await session.commit()
+
+    index = get_vector_index(session, "price_items")
+    await index.sync(session)
+    # One file, published by rename: no temporary files left behind
+    assert [p.name for p in tmp_path.iterdir()] == [index.path.name + ".npz"]
+
+    reloaded = LocalVectorIndex("price_items", index.path)
+    reloaded._load()
+    assert reloaded._ids == index._ids
+    ((reloaded_id, reloaded_score),) = reloaded.top_k(vectors[2], 1)
+    ((original_id, original_score),) = index.top_k(vectors[2], 1)
+    assert reloaded_id == original_id
+    assert reloaded_score == pytest.approx(original_score)
+
+    # A file whose ids don't match its matrix is ignored, not trusted
+    np.savez(
+        index.path.with_suffix(".npz"),
+        matrix=np.zeros((3, DIM), dtype=np.float32),
+        ids=np.frombuffer(uuid4().bytes * 2, dtype=np.uint8).reshape(2, 16),
+    )
+    broken = LocalVectorIndex("price_items", index.path)
+    broken._load()
+    assert len(broken) == 0
+
+
+@pytest.mark.asyncio
+async def test_pending_rows_are_scored_without_rewriting_the_matrix(
+    rng, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(vector_index, "_FOLD_PENDING_ROWS", 4)
+    vectors = rng.normal(size=(50, 16)).astype(np.float32)
+    ids = [uuid4() for _ in vectors]
+    index = LocalVectorIndex("price_items", tmp_path / "prices")
+    index.add(ids[:40], vectors[:40])
+    await index._consolidate(force=True)
+    matrix = index._matrix
+    saved_at = (tmp_path / "prices.npz").stat().st_mtime_ns
+
+    # Two adds stay in the pending block: searchable, but no rewrite
+    index.add(ids[40:42], vectors[40:42])
+    await index.fold()
+    assert index.top_k(vectors[41], 1)[0][0] == ids[41]
+    assert index._matrix is matrix
+    assert (tmp_path / "prices.npz").stat().st_mtime_ns == saved_at
+    assert len(index) == 42
+
+    # Replacing a matrix row hides the old row until the next fold
+    index.add([ids[0]], [vectors[45]])
+    assert index.top_k(vectors[45], 1)[0][0] == ids[0]
+    assert index._matrix is matrix
+
+    # Searching never folds; the fourth pending row folds on the next sync
+    index.add([ids[42]], [vectors[42]])
+    assert index.top_k(vectors[42], 1)[0][0] == ids[42]
+    assert index._matrix is matrix
+    await index.fold()
+    assert index.top_k(vectors[42], 1)[0][0] == ids[42]
+    assert index._matrix is not matrix
+    assert index._matrix.shape[0] == 43
+    assert not index._pending
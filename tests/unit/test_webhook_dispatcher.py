@@ -0,0 +1,173 @@
+"""Tests for pooled, batched webhook dispatch."""
+
+from __future__ import annotations
+
+import json
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from bimcalc.core import webhook_dispatcher
+from bimcalc.core.webhook_dispatcher import (
+    SubscriptionIndex,
+    WebhookDispatcher,
+    WebhookTarget,
+    deliver_webhook_batch,
+)
+from bimcalc.db.models import Base, WebhookModel
+
+
+@pytest_asyncio.fixture()
+async def session_maker(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    SessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def _get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    monkeypatch.setattr(webhook_dispatcher, "get_session", _get_session)
+    try:
+        yield SessionLocal
+    finally:
+        await engine.dispose()
+
+
+class FakePool:
+    def __init__(self):
+        self.jobs: list[tuple[str, dict]] = []
+        self.closed = False
+
+    async def enqueue_job(self, name, **kwargs):
+        self.jobs.append((name, kwargs))
+
+    async def close(self):
+        self.closed = True
+
+
+async def _add_webhooks(session_maker, *webhooks: WebhookModel) -> None:
+    async with session_maker() as session:
+        session.add_all(webhooks)
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_subscription_index_matches_event_and_wildcard(session_maker):
+    await _add_webhooks(
+        session_maker,
+        WebhookModel(url="https://a", secret="s", events=["item.matched"]),
+        WebhookModel(url="https://b", secret="s", events=["*"]),
+        WebhookModel(url="https://c", secret="s", events=["price.updated"]),
+        WebhookModel(url="https://d", secret="s", events=["*"], is_active=False),
+    )
+    index = SubscriptionIndex()
+
+    matched = await index.targets_for("item.matched")
+
+    assert sorted(t.url for t in matched) == ["https://a", "https://b"]
+    assert [t.url for t in await index.targets_for("ping")] == ["https://b"]
+
+
+@pytest.mark.asyncio
+async def test_publish_coalesces_events_into_one_job_per_webhook(session_maker):
+    await _add_webhooks(
+        session_maker,
+        WebhookModel(url="https://a", secret="s", events=["item.matched"]),
+        WebhookModel(url="https://b", secret="s", events=["*"]),
+    )
+    pool = FakePool()
+
+    async def pool_factory():
+        return pool
+
+    dispatcher = WebhookDispatcher(pool_factory=pool_factory, linger_seconds=60)
+    for i in range(5):
+        await dispatcher.publish("item.matched", {"item_id": i})
+    await dispatcher.close()
+
+    assert len(pool.jobs) == 2
+    assert {name for name, _ in pool.jobs} == {"deliver_webhook_batch"}
+    assert all(len(job["events"]) == 5 for _, job in pool.jobs)
+    assert pool.closed
+
+
+@pytest.mark.asyncio
+async def test_delivery_batches_for_opted_in_webhook_and_retries(
+    session_maker, monkeypatch
+):
+    monkeypatch.setattr(webhook_dispatcher, "RETRY_BASE_DELAY_SECONDS", 0)
+    webhook = WebhookModel(
+        url="https://hooks.example/batch",
+        secret="top-secret",
+        events=["*"],
+        batch_max_events=3,
+    )
+    await _add_webhooks(session_maker, webhook)
+
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        # First attempt fails transiently
+        return httpx.Response(503 if len(requests) == 1 else 200)
+
+    events = [
+        {"event": "item.matched", "timestamp": "t", "data": {"i": i}} for i in range(5)
+    ]
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        result = await deliver_webhook_batch(
+            {"session_maker": session_maker, "http_client": client},
+            str(webhook.id),
+            events,
+        )
+
+    assert result == {"delivered": 2, "failed": 0, "skipped": 0}
+    assert len(requests) == 3
+    bodies = [json.loads(r.content) for r in requests[1:]]
+    assert [b["count"] for b in bodies] == [3, 2]
+    assert requests[-1].headers["X-BIMCalc-Event"] == "batch"
+
+
+@pytest.mark.asyncio
+async def test_unreachable_webhook_drops_rest_of_job(session_maker, monkeypatch):
+    monkeypatch.setattr(webhook_dispatcher, "RETRY_BASE_DELAY_SECONDS", 0)
+    webhook = WebhookModel(url="https://hooks.example/dead", secret="s", events=["*"])
+    await _add_webhooks(session_maker, webhook)
+
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        raise httpx.ConnectError("connection refused")
+
+    events = [{"event": "item.matched", "timestamp": "t", "data": {}}] * 5
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        result = await deliver_webhook_batch(
+            {"session_maker": session_maker, "http_client": client},
+            str(webhook.id),
+            events,
+        )
+
+    assert result == {"delivered": 0, "failed": 1, "skipped": 4}
+    assert len(requests) == webhook_dispatcher.MAX_DELIVERY_ATTEMPTS
+
+
+def test_unbatched_target_gets_one_signed_request_per_event():
+    target = WebhookTarget(uuid4(), "https://a", "secret")
+    events = [{"event": "ping", "timestamp": "t", "data": {}}] * 2
+
+    built = webhook_dispatcher._requests_for(target, events)
+
+    assert len(built) == 2
+    body, headers = built[0]
+    assert headers["X-BIMCalc-Event"] == "ping"
+    assert headers["X-BIMCalc-Signature"] == webhook_dispatcher._sign("secret", body)
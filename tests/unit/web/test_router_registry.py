@@ -0,0 +1,145 @@
+"""Tests for the web router registry and the app's import-time budget."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from bimcalc.web.router_registry import (
+    BASE_GROUP,
+    FEATURE_GROUPS,
+    ROUTERS,
+    LazyRouterMiddleware,
+    RouterRegistry,
+    RouterSpec,
+    enabled_features,
+)
+
+# Cumulative import time allowed for bimcalc.web.app_enhanced (about 1.5 s
+# today, 3.7 s when every router was imported at startup)
+APP_IMPORT_BUDGET_MS = 3000
+
+# Heavy modules only lazily mounted routers may import
+HEAVY_MODULES = (
+    "pandas",
+    "openai",
+    "playwright",
+    "bimcalc.matching.orchestrator",
+    "bimcalc.reporting.builder",
+    "bimcalc.intelligence.price_scout",
+)
+
+
+def test_enabled_features():
+    assert enabled_features("all") == set(FEATURE_GROUPS)
+    assert enabled_features("") == set(FEATURE_GROUPS)
+    assert enabled_features(" revit ") == {"revit", BASE_GROUP}
+    assert enabled_features("core,reporting") == {"core", "reporting", BASE_GROUP}
+    with pytest.raises(ValueError, match="reviit"):
+        enabled_features("reviit")
+
+    # Every route module is registered exactly once
+    assert len({spec.module for spec in ROUTERS}) == len(ROUTERS)
+
+
+def test_lazy_router_mounts_on_first_request(monkeypatch):
+    monkeypatch.setenv("BIMCALC_AUTH_DISABLED", "true")
+    specs = (
+        RouterSpec("health", "bimcalc.web.routes.health", BASE_GROUP),
+        RouterSpec(
+            "profiling", "bimcalc.web.routes.profiling", "admin", ("/admin/profiling",)
+        ),
+        RouterSpec("revit", "bimcalc.web.routes.revit", "revit", ("/api/revit/",)),
+    )
+    app = FastAPI()
+    registry = RouterRegistry(
+        app, features={BASE_GROUP, "admin"}, specs=specs, lazy=True
+    )
+    app.add_middleware(LazyRouterMiddleware, registry=registry)
+    registry.mount()
+
+    assert list(app.state.router_import_ms) == ["health"]
+    assert [spec.name for spec in registry.pending] == ["profiling"]
+    paths = {route.path for route in app.routes}
+    assert "/admin/profiling" not in paths
+
+    client = TestClient(app)
+    # Revit's group is not enabled, so it is never mounted
+    assert client.post("/api/revit/match", json=[]).status_code == 404
+
+    response = client.get("/admin/profiling")
+    assert response.status_code == 200
+    assert response.json()["profiles_kept"] >= 0
+    assert registry.pending == []
+    assert set(app.state.router_import_ms) == {"health", "profiling"}
+
+
+def test_openapi_schema_mounts_pending_routers():
+    app = FastAPI()
+    specs = (
+        RouterSpec(
+            "profiling", "bimcalc.web.routes.profiling", "admin", ("/admin/profiling",)
+        ),
+    )
+    registry = RouterRegistry(app, features={"admin"}, specs=specs, lazy=True)
+    app.add_middleware(LazyRouterMiddleware, registry=registry)
+    registry.mount()
+
+    paths = TestClient(app).get("/openapi.json").json()["paths"]
+    assert "/admin/profiling" in paths
+    assert registry.pending == []
+
+
+def _import_times(code: str, cwd, **env_overrides: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module imported by ``code``."""
+    env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{cwd}/app.db")
+    env.update(env_overrides)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=cwd,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("features", ["all", "revit"])
+def test_app_startup_skips_heavy_routers(features, tmp_path):
+    times = _import_times(
+        "import bimcalc.web.app_enhanced",
+        tmp_path,
+        BIMCALC_WEB_FEATURES=features,
+        ENABLE_RAG="true",
+    )
+    assert "bimcalc.web.app_enhanced" in times
+    assert [m for m in HEAVY_MODULES if m in times] == []
+
+
+def test_app_import_within_budget(tmp_path):
+    # Best of three runs to keep scheduler noise out of the measurement
+    best_ms = min(
+        _import_times("import bimcalc.web.app_enhanced", tmp_path)[
+            "bimcalc.web.app_enhanced"
+        ]
+        / 1000
+        for _ in range(3)
+    )
+    assert best_ms < APP_IMPORT_BUDGET_MS, (
+        f"import bimcalc.web.app_enhanced took {best_ms:.0f} ms "
+        f"(budget {APP_IMPORT_BUDGET_MS} ms); mount heavy routers lazily"
+    )
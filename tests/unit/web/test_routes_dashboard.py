@@ -440,9 +440,10 @@ def test_router_has_correct_routes():
     assert "/" in routes
     assert "/progress" in routes
     assert "/progress/export" in routes
+    assert "/api/project-metrics" in routes
 
-    # Should have 3 routes total
-    assert len(dashboard.router.routes) == 3
+    # Should have 4 routes total
+    assert len(dashboard.router.routes) == 4
 
 
 def test_router_has_dashboard_tag():
@@ -3,13 +3,26 @@
 Tests the ingestion router module extracted in Phase 3.3.
 """
 
+import hashlib
+from contextlib import asynccontextmanager
+from datetime import datetime
+from io import BytesIO
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
 import pytest
+import pytest_asyncio
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock, AsyncMock, mock_open
-from io import BytesIO
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
+from bimcalc.db.models import Base, IngestLogModel
+from bimcalc.ingestion import jobs
 from bimcalc.ingestion import routes as ingestion
+from bimcalc.ingestion import uploads
 
 
 @pytest.fixture
@@ -78,116 +91,163 @@ class TestIngestPage:
         assert response.status_code == 200
 
 
+@pytest_asyncio.fixture()
+async def jobs_db(monkeypatch, tmp_path):
+    """Real ingest_logs table behind get_session, spool files under tmp_path."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    SessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def session_scope():
+        async with SessionLocal() as session:
+            yield session
+
+    monkeypatch.setattr(ingestion, "get_session", session_scope)
+    monkeypatch.setattr(jobs, "get_session", session_scope)
+    monkeypatch.setattr(uploads, "get_session", session_scope)
+    monkeypatch.setenv("BIMCALC_SPOOL_DIR", str(tmp_path))
+    yield tmp_path
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture()
+async def async_client(app):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+async def _job(async_client, accepted):
+    """Background tasks finish before ASGITransport returns, so poll once."""
+    response = await async_client.get(accepted["status_url"])
+    assert response.status_code == 200
+    return response.json()
+
+
 class TestIngestSchedules:
     """Tests for POST /ingest/schedules route."""
 
-    @patch("bimcalc.ingestion.routes.ingest_schedule")
-    @patch("bimcalc.ingestion.routes.get_session")
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("bimcalc.ingestion.routes.Path")
-    def test_ingest_schedules_success(
-        self,
-        mock_path_class,
-        mock_file_open,
-        mock_get_session,
-        mock_ingest_schedule,
-        client,
+    @pytest.mark.asyncio
+    async def test_ingest_schedules_streams_and_imports_in_background(
+        self, jobs_db, async_client
     ):
-        """Test successful schedule ingestion."""
-        # Mock file operations
-        mock_path = MagicMock()
-        mock_path.exists.return_value = True
-        mock_path.unlink = MagicMock()
-        mock_path_class.return_value = mock_path
-
-        # Mock database session
-        mock_session = AsyncMock()
-        async_cm = AsyncMock()
-        async_cm.__aenter__.return_value = mock_session
-        async_cm.__aexit__.return_value = None
-        mock_get_session.return_value = async_cm
-
-        # Mock ingestion result
-        mock_ingest_schedule.return_value = (100, [])
-
-        # Create test file
-        file_content = b"test,schedule,data"
-        files = {"file": ("schedule.csv", BytesIO(file_content), "text/csv")}
-        data = {"org": "test-org", "project": "test-project"}
-
-        response = client.post("/ingest/schedules", files=files, data=data)
-
-        assert response.status_code == 200
-        json_response = response.json()
-        assert json_response["success"] is True
-        assert "100" in json_response["message"]
-        assert json_response["errors"] == []
-
-        # Verify file operations
-        mock_file_open.assert_called_once()
-        mock_path.unlink.assert_called_once()
-
-    @patch("bimcalc.ingestion.routes.ingest_schedule")
-    @patch("bimcalc.ingestion.routes.get_session")
-    @patch("bimcalc.ingestion.routes.get_email_notifier")
-    @patch("bimcalc.ingestion.routes.get_slack_notifier")
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("bimcalc.ingestion.routes.Path")
-    def test_ingest_schedules_failure_sends_alerts(
-        self,
-        mock_path_class,
-        mock_file_open,
-        mock_get_slack,
-        mock_get_email,
-        mock_get_session,
-        mock_ingest_schedule,
-        client,
+        """Upload is spooled, hashed and imported as a tracked job."""
+        file_content = b"Family,Type\nTray,Elbow\n"
+        seen = {}
+
+        async def fake_ingest(
+            session, path, org, project, progress=None, source_name=None
+        ):
+            seen["path"] = path
+            seen["content"] = path.read_bytes()
+            seen["source_name"] = source_name
+            await progress(1, 2)
+            return 100, []
+
+        with patch.object(jobs, "ingest_schedule", side_effect=fake_ingest):
+            response = await async_client.post(
+                "/ingest/schedules",
+                files={"file": ("schedule.csv", BytesIO(file_content), "text/csv")},
+                data={"org": "test-org", "project": "test-project"},
+            )
+
+        assert response.status_code == 202
+        accepted = response.json()
+        assert accepted["success"] is True
+        assert accepted["status"] == "running"
+        assert accepted["file_hash"] == hashlib.sha256(file_content).hexdigest()
+
+        # Spooled under a unique name keeping the extension, then cleaned up
+        assert seen["content"] == file_content
+        assert seen["path"].parent == jobs_db
+        assert seen["path"].name != "schedule.csv"
+        assert seen["path"].suffix == ".csv"
+        assert not seen["path"].exists()
+        assert seen["source_name"] == "schedule.csv"
+
+        job = await _job(async_client, accepted)
+        assert job["status"] == "completed"
+        assert job["success"] is True
+        assert "100" in job["message"]
+        assert job["progress"] == {"processed": 1, "total": 2, "percent": 50.0}
+        assert job["errors"] == []
+
+    @pytest.mark.asyncio
+    @patch("bimcalc.ingestion.jobs.get_email_notifier")
+    @patch("bimcalc.ingestion.jobs.get_slack_notifier")
+    async def test_ingest_schedules_failure_sends_alerts(
+        self, mock_get_slack, mock_get_email, jobs_db, async_client
     ):
-        """Test failed schedule ingestion sends alerts."""
-        # Mock file operations
-        mock_path = MagicMock()
-        mock_path.exists.return_value = True
-        mock_path.unlink = MagicMock()
-        mock_path_class.return_value = mock_path
-
-        # Mock database session
-        mock_session = AsyncMock()
-        async_cm = AsyncMock()
-        async_cm.__aenter__.return_value = mock_session
-        async_cm.__aexit__.return_value = None
-        mock_get_session.return_value = async_cm
-
-        # Mock ingestion failure
-        mock_ingest_schedule.side_effect = Exception("Ingestion failed")
-
-        # Mock notifiers
+        """Failed background import marks the job failed and sends alerts."""
         mock_email_notifier = AsyncMock()
         mock_slack_notifier = AsyncMock()
         mock_get_email.return_value = mock_email_notifier
         mock_get_slack.return_value = mock_slack_notifier
 
-        # Create test file
-        file_content = b"test,schedule,data"
-        files = {"file": ("schedule.csv", BytesIO(file_content), "text/csv")}
-        data = {"org": "test-org", "project": "test-project"}
-
-        response = client.post("/ingest/schedules", files=files, data=data)
+        with patch.object(
+            jobs, "ingest_schedule", side_effect=Exception("Ingestion failed")
+        ):
+            response = await async_client.post(
+                "/ingest/schedules",
+                files={"file": ("schedule.csv", BytesIO(b"x"), "text/csv")},
+                data={"org": "test-org", "project": "test-project"},
+            )
 
-        assert response.status_code == 500
-        assert "Ingestion failed" in response.json()["detail"]
+        job = await _job(async_client, response.json())
+        assert job["status"] == "failed"
+        assert "Ingestion failed" in job["message"]
 
-        # Verify alerts were sent
         mock_email_notifier.send_ingestion_failure_alert.assert_called_once()
         mock_slack_notifier.post_ingestion_failure_alert.assert_called_once()
+        assert list(jobs_db.iterdir()) == []
 
-        # Verify cleanup
-        mock_path.unlink.assert_called_once()
-
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("bimcalc.ingestion.routes.Path")
-    def test_ingest_schedules_requires_file(
-        self, mock_path_class, mock_file_open, client
+    @pytest.mark.asyncio
+    async def test_ingest_schedules_rejects_oversized_upload(
+        self, jobs_db, async_client, monkeypatch
     ):
+        """Uploads over the limit are refused mid-stream and not kept."""
+        monkeypatch.setattr(uploads, "CHUNK_SIZE", 4)
+        monkeypatch.setattr(uploads, "MAX_UPLOAD_BYTES", 10)
+
+        response = await async_client.post(
+            "/ingest/schedules",
+            files={"file": ("big.csv", BytesIO(b"x" * 64), "text/csv")},
+            data={"org": "test-org", "project": "test-project"},
+        )
+
+        assert response.status_code == 413
+        assert response.json()["success"] is False
+        assert list(jobs_db.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_ingest_schedules_reingest_reports_diff(self, jobs_db, async_client):
+        """Re-ingest mode diffs against existing items and records the counts."""
+
+        async def upload(content, **data):
+            response = await async_client.post(
+                "/ingest/schedules",
+                files={"file": ("model.csv", BytesIO(content), "text/csv")},
+                data={"org": "test-org", "project": "test-project", **data},
+            )
+            return await _job(async_client, response.json())
+
+        first = b"Element Id,Family,Type,Width\n1,Tray,Elbow,200\n2,Tray,Tee,300\n"
+        assert (await upload(first))["imported"] == 2
+
+        second = b"Element Id,Family,Type,Width\n1,Tray,Elbow,250\n3,Tray,Cross,100\n"
+        job = await upload(second, reingest="true")
+        assert job["status"] == "completed"
+        assert (job["imported"], job["modified"], job["deleted"]) == (1, 1, 1)
+        assert job["message"].startswith("Added 1, modified 1, deleted 1")
+
+    def test_ingest_schedules_requires_file(self, client):
         """Test that file upload is required."""
         data = {"org": "test-org", "project": "test-project"}
 
@@ -198,194 +258,171 @@ class TestIngestSchedules:
 class TestIngestPrices:
     """Tests for POST /ingest/prices route."""
 
-    @patch("bimcalc.ingestion.routes.ingest_pricebook")
-    @patch("bimcalc.ingestion.routes.get_session")
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("bimcalc.ingestion.routes.Path")
-    def test_ingest_prices_success_with_cmm(
-        self,
-        mock_path_class,
-        mock_file_open,
-        mock_get_session,
-        mock_ingest_pricebook,
-        client,
-    ):
-        """Test successful price ingestion with CMM enabled."""
-        # Mock file operations
-        mock_path = MagicMock()
-        mock_path.exists.return_value = True
-        mock_path.unlink = MagicMock()
-        mock_path_class.return_value = mock_path
-
-        # Mock database session
-        mock_session = AsyncMock()
-        async_cm = AsyncMock()
-        async_cm.__aenter__.return_value = mock_session
-        async_cm.__aexit__.return_value = None
-        mock_get_session.return_value = async_cm
-
-        # Mock ingestion result
-        mock_ingest_pricebook.return_value = (500, [])
-
-        # Create test file
-        file_content = b"code,description,price"
-        files = {"file": ("prices.csv", BytesIO(file_content), "text/csv")}
-        data = {"vendor": "acme", "use_cmm": "true"}
-
-        response = client.post("/ingest/prices", files=files, data=data)
-
-        assert response.status_code == 200
-        json_response = response.json()
-        assert json_response["success"] is True
-        assert "500" in json_response["message"]
-        assert "with CMM enabled" in json_response["message"]
-        assert json_response["errors"] == []
-
-        # Verify file cleanup
-        mock_path.unlink.assert_called_once()
-
-    @patch("bimcalc.ingestion.routes.ingest_pricebook")
-    @patch("bimcalc.ingestion.routes.get_session")
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("bimcalc.ingestion.routes.Path")
-    def test_ingest_prices_success_without_cmm(
-        self,
-        mock_path_class,
-        mock_file_open,
-        mock_get_session,
-        mock_ingest_pricebook,
-        client,
-    ):
-        """Test successful price ingestion without CMM."""
-        # Mock file operations
-        mock_path = MagicMock()
-        mock_path.exists.return_value = True
-        mock_path.unlink = MagicMock()
-        mock_path_class.return_value = mock_path
-
-        # Mock database session
-        mock_session = AsyncMock()
-        async_cm = AsyncMock()
-        async_cm.__aenter__.return_value = mock_session
-        async_cm.__aexit__.return_value = None
-        mock_get_session.return_value = async_cm
-
-        # Mock ingestion result
-        mock_ingest_pricebook.return_value = (250, ["Warning: Missing classifications"])
-
-        # Create test file
+    @pytest.mark.asyncio
+    async def test_ingest_prices_passes_stream_digest(self, jobs_db, async_client):
+        """The digest computed while streaming reaches the skip-unchanged check."""
+        mock_ingest = AsyncMock(
+            return_value=(500, ["Warning: Missing classifications"])
+        )
         file_content = b"code,description,price"
-        files = {"file": ("prices.csv", BytesIO(file_content), "text/csv")}
-        data = {"vendor": "default", "use_cmm": "false"}
-
-        response = client.post("/ingest/prices", files=files, data=data)
 
-        assert response.status_code == 200
-        json_response = response.json()
-        assert json_response["success"] is True
-        assert "250" in json_response["message"]
-        assert "without CMM" in json_response["message"]
-        assert len(json_response["errors"]) == 1
-
-    @patch("bimcalc.ingestion.routes.ingest_pricebook")
-    @patch("bimcalc.ingestion.routes.get_session")
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("bimcalc.ingestion.routes.Path")
-    def test_ingest_prices_validation_error(
-        self,
-        mock_path_class,
-        mock_file_open,
-        mock_get_session,
-        mock_ingest_pricebook,
-        client,
-    ):
-        """Test price ingestion with validation error returns 400."""
-        # Mock file operations
-        mock_path = MagicMock()
-        mock_path.exists.return_value = True
-        mock_path.unlink = MagicMock()
-        mock_path_class.return_value = mock_path
-
-        # Mock database session
-        mock_session = AsyncMock()
-        async_cm = AsyncMock()
-        async_cm.__aenter__.return_value = mock_session
-        async_cm.__aexit__.return_value = None
-        mock_get_session.return_value = async_cm
-
-        # Mock validation error
-        mock_ingest_pricebook.side_effect = ValueError("Invalid file format")
-
-        # Create test file
-        file_content = b"invalid data"
-        files = {"file": ("prices.txt", BytesIO(file_content), "text/plain")}
-        data = {"vendor": "default"}
-
-        response = client.post("/ingest/prices", files=files, data=data)
+        with patch.object(jobs, "ingest_pricebook", mock_ingest):
+            response = await async_client.post(
+                "/ingest/prices",
+                files={"file": ("prices.csv", BytesIO(file_content), "text/csv")},
+                data={"vendor": "acme", "use_cmm": "false"},
+            )
+
+        assert response.status_code == 202
+        kwargs = mock_ingest.await_args.kwargs
+        assert kwargs["digest"] == hashlib.sha256(file_content).hexdigest()
+        assert kwargs["use_cmm"] is False
+        assert mock_ingest.await_args.args[2] == "acme"
+
+        job = await _job(async_client, response.json())
+        assert job["status"] == "completed"
+        assert "500" in job["message"]
+        assert len(job["errors"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_ingest_prices_unsupported_format(self, jobs_db, async_client):
+        """Unsupported extensions are rejected before anything is spooled."""
+        response = await async_client.post(
+            "/ingest/prices",
+            files={"file": ("prices.txt", BytesIO(b"invalid data"), "text/plain")},
+            data={"vendor": "default"},
+        )
 
         assert response.status_code == 400
-        json_response = response.json()
-        assert json_response["success"] is False
-        assert "Invalid file format" in json_response["message"]
-
-        # Verify cleanup
-        mock_path.unlink.assert_called_once()
-
-    @patch("bimcalc.ingestion.routes.ingest_pricebook")
-    @patch("bimcalc.ingestion.routes.get_session")
-    @patch("bimcalc.ingestion.routes.get_email_notifier")
-    @patch("bimcalc.ingestion.routes.get_slack_notifier")
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("bimcalc.ingestion.routes.Path")
-    def test_ingest_prices_server_error_sends_alerts(
-        self,
-        mock_path_class,
-        mock_file_open,
-        mock_get_slack,
-        mock_get_email,
-        mock_get_session,
-        mock_ingest_pricebook,
-        client,
+        assert response.json()["success"] is False
+        assert "Unsupported file format" in response.json()["message"]
+        assert list(jobs_db.iterdir()) == []
+
+    @pytest.mark.asyncio
+    @patch("bimcalc.ingestion.jobs.get_email_notifier")
+    @patch("bimcalc.ingestion.jobs.get_slack_notifier")
+    async def test_ingest_prices_validation_error_fails_job_without_alerts(
+        self, mock_get_slack, mock_get_email, jobs_db, async_client
+    ):
+        """A file the ingester rejects fails the job but sends no alerts."""
+        with patch.object(
+            jobs,
+            "ingest_pricebook",
+            AsyncMock(side_effect=ValueError("Missing required columns")),
+        ):
+            response = await async_client.post(
+                "/ingest/prices",
+                files={"file": ("prices.csv", BytesIO(b"a,b"), "text/csv")},
+                data={"vendor": "default"},
+            )
+
+        job = await _job(async_client, response.json())
+        assert job["status"] == "failed"
+        assert "Missing required columns" in job["message"]
+        mock_get_email.assert_not_called()
+        mock_get_slack.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("bimcalc.ingestion.jobs.get_email_notifier")
+    @patch("bimcalc.ingestion.jobs.get_slack_notifier")
+    async def test_ingest_prices_server_error_sends_alerts(
+        self, mock_get_slack, mock_get_email, jobs_db, async_client
     ):
         """Test price ingestion server error sends alerts."""
-        # Mock file operations
-        mock_path = MagicMock()
-        mock_path.exists.return_value = True
-        mock_path.unlink = MagicMock()
-        mock_path_class.return_value = mock_path
-
-        # Mock database session
-        mock_session = AsyncMock()
-        async_cm = AsyncMock()
-        async_cm.__aenter__.return_value = mock_session
-        async_cm.__aexit__.return_value = None
-        mock_get_session.return_value = async_cm
-
-        # Mock server error
-        mock_ingest_pricebook.side_effect = Exception("Database connection failed")
-
-        # Mock notifiers
         mock_email_notifier = AsyncMock()
         mock_slack_notifier = AsyncMock()
         mock_get_email.return_value = mock_email_notifier
         mock_get_slack.return_value = mock_slack_notifier
 
-        # Create test file
-        file_content = b"code,description,price"
-        files = {"file": ("prices.csv", BytesIO(file_content), "text/csv")}
-        data = {"vendor": "acme"}
+        with patch.object(
+            jobs,
+            "ingest_pricebook",
+            AsyncMock(side_effect=Exception("Database connection failed")),
+        ):
+            response = await async_client.post(
+                "/ingest/prices",
+                files={"file": ("prices.csv", BytesIO(b"a,b"), "text/csv")},
+                data={"vendor": "acme"},
+            )
+
+        job = await _job(async_client, response.json())
+        assert job["status"] == "failed"
+        assert "Database connection failed" in job["message"]
+        mock_email_notifier.send_ingestion_failure_alert.assert_called_once()
+        mock_slack_notifier.post_ingestion_failure_alert.assert_called_once()
 
-        response = client.post("/ingest/prices", files=files, data=data)
 
-        assert response.status_code == 500
-        assert "Database connection failed" in response.json()["detail"]
+@pytest.mark.asyncio
+async def test_unknown_ingest_job_returns_404(jobs_db, async_client):
+    response = await async_client.get(f"/api/ingest/jobs/{uuid4()}")
+    assert response.status_code == 404
 
-        # Verify alerts were sent
-        mock_email_notifier.send_ingestion_failure_alert.assert_called_once()
-        mock_slack_notifier.post_ingestion_failure_alert.assert_called_once()
 
-        # Verify cleanup
-        mock_path.unlink.assert_called_once()
+class FakeQueue:
+    def __init__(self):
+        self.enqueued = []
+
+    async def enqueue_job(self, function, **kwargs):
+        self.enqueued.append((function, kwargs))
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_ingest_on_worker_enqueues_spooled_upload(
+    jobs_db, async_client, monkeypatch
+):
+    """With worker ingestion the web worker only spools and enqueues."""
+    queue = FakeQueue()
+
+    async def get_queue():
+        return queue
+
+    monkeypatch.setenv("BIMCALC_INGEST_ON_WORKER", "true")
+    monkeypatch.setattr(jobs, "get_queue", get_queue)
+    mock_ingest = AsyncMock(return_value=(3, []))
+
+    with patch.object(jobs, "ingest_pricebook", mock_ingest):
+        response = await async_client.post(
+            "/ingest/prices",
+            files={"file": ("prices.csv", BytesIO(b"a,b"), "text/csv")},
+            data={"vendor": "acme"},
+        )
+        accepted = response.json()
+        assert (await _job(async_client, accepted))["status"] == "running"
+        mock_ingest.assert_not_awaited()
+
+        [(function, kwargs)] = queue.enqueued
+        assert function == "ingest_pricebook_job"
+        assert str(kwargs["job_id"]) == accepted["job_id"]
+        assert kwargs["upload"].path.read_bytes() == b"a,b"
+
+        # What the arq worker runs
+        await jobs.run_pricebook_job(**kwargs)
+
+    job = await _job(async_client, accepted)
+    assert job["status"] == "completed"
+    assert job["imported"] == 3
+    assert list(jobs_db.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_polling_fails_jobs_whose_worker_died(jobs_db, async_client):
+    """A job left running past the cutoff is reported failed, not running."""
+    upload = uploads.SpooledUpload(jobs_db / "gone.csv", "gone.csv", 1, "abc")
+    stale = await uploads.start_ingest_job("test-org", "test-project", upload)
+    fresh = await uploads.start_ingest_job("test-org", "test-project", upload)
+    async with ingestion.get_session() as session:
+        log = await session.get(IngestLogModel, stale)
+        log.started_at = datetime.utcnow() - uploads.STALE_JOB_AFTER * 2
+        await session.commit()
+
+    job = await async_client.get(f"/api/ingest/jobs/{stale}")
+    assert job.json()["status"] == "failed"
+    assert job.json()["message"].startswith("Import interrupted")
+    job = await async_client.get(f"/api/ingest/jobs/{fresh}")
+    assert job.json()["status"] == "running"
 
 
 # Integration test
@@ -398,9 +435,10 @@ def test_router_has_correct_routes():
     assert "/ingest/schedules" in routes
     assert "/ingest/prices" in routes
     assert "/api/ingest/history" in routes
+    assert "/api/ingest/jobs/{job_id}" in routes
 
-    # Should have 5 routes total
-    assert len(ingestion.router.routes) == 5
+    # Should have 6 routes total
+    assert len(ingestion.router.routes) == 6
 
 
 def test_router_has_ingestion_tag():
@@ -10,9 +10,21 @@ from unittest.mock import patch, MagicMock, AsyncMock
 from uuid import uuid4
 from datetime import datetime
 
+from bimcalc.db.facets import FacetCube
+from bimcalc.db.pagination import ITEMS_SORT
 from bimcalc.web.routes import items
 
 
+@pytest.fixture(autouse=True)
+def item_facets():
+    """Facet cube for the list view, bypassing the cache."""
+    cube = FacetCube(("category",), [("Pipes", 60), ("Ducts", 40), (None, 2)])
+    with patch(
+        "bimcalc.web.routes.items.item_facets", AsyncMock(return_value=cube)
+    ) as loader:
+        yield loader
+
+
 @pytest.fixture
 def app():
     """Create test FastAPI app with items router."""
@@ -42,6 +54,7 @@ def mock_db_session():
     session.execute = AsyncMock()
     session.commit = AsyncMock()
     session.delete = AsyncMock()
+    session.info = {}
 
     # Create async context manager
     async_cm = AsyncMock()
@@ -143,10 +156,7 @@ class TestItemsList:
         mock_count.scalar_one.return_value = 0
         mock_items = MagicMock()
         mock_items.scalars.return_value.all.return_value = []
-        mock_categories = MagicMock()
-        mock_categories.scalars.return_value.all.return_value = []
-
-        session.execute.side_effect = [mock_count, mock_items, mock_categories]
+        session.execute.side_effect = [mock_count, mock_items]
 
         response = client.get("/items?search=pipe")
 
@@ -168,18 +178,16 @@ class TestItemsList:
         mock_get_session.return_value = mock_db_session
         session = mock_db_session.__aenter__.return_value
 
-        # Setup mock responses
-        mock_count = MagicMock()
-        mock_count.scalar_one.return_value = 0
+        # Setup mock responses: the total comes from the facet cube
         mock_items = MagicMock()
         mock_items.scalars.return_value.all.return_value = []
-        mock_categories = MagicMock()
-        mock_categories.scalars.return_value.all.return_value = []
 
-        session.execute.side_effect = [mock_count, mock_items, mock_categories]
+        session.execute.side_effect = [mock_items]
 
         response = client.get("/items?category=Pipes")
         assert response.status_code == 200
+        assert "Browsing 60 items" in response.text
+        assert "Ducts (40)" in response.text
 
     @patch("bimcalc.web.routes.items.get_session")
     @patch("bimcalc.web.dependencies.get_config")
@@ -190,24 +198,47 @@ class TestItemsList:
         client,
         mock_config,
         mock_db_session,
+        mock_item,
     ):
-        """Test items list with pagination."""
+        """Test items list pages forward by keyset cursor."""
         mock_get_config.return_value = mock_config
         mock_get_session.return_value = mock_db_session
         session = mock_db_session.__aenter__.return_value
 
-        # Setup mock responses
-        mock_count = MagicMock()
-        mock_count.scalar_one.return_value = 100
+        # One row more than a page: there is a next page
         mock_items = MagicMock()
-        mock_items.scalars.return_value.all.return_value = []
-        mock_categories = MagicMock()
-        mock_categories.scalars.return_value.all.return_value = []
+        mock_items.scalars.return_value.all.return_value = [mock_item] * 51
+        session.execute.side_effect = [mock_items]
 
-        session.execute.side_effect = [mock_count, mock_items, mock_categories]
+        response = client.get("/items?category=Pipes")
+        assert response.status_code == 200
+        cursor = ITEMS_SORT.encode(mock_item)
+        assert f"&after={cursor}&page=2" in response.text
 
-        response = client.get("/items?page=2")
+        session.execute.side_effect = [mock_items]
+        response = client.get(f"/items?after={cursor}&page=2")
         assert response.status_code == 200
+        stmt = session.execute.call_args.args[0]
+        assert stmt._offset_clause is None
+        assert "before=" in response.text
+
+    @patch("bimcalc.web.routes.items.get_session")
+    @patch("bimcalc.web.dependencies.get_config")
+    def test_items_list_invalid_cursor(
+        self,
+        mock_get_config,
+        mock_get_session,
+        client,
+        mock_config,
+        mock_db_session,
+    ):
+        """Test a malformed cursor is a 400, not a server error."""
+        mock_get_config.return_value = mock_config
+        mock_get_session.return_value = mock_db_session
+
+        response = client.get("/items?after=garbage")
+        assert response.status_code == 400
+        assert "cursor" in response.json()["detail"]
 
 
 class TestItemsExport:
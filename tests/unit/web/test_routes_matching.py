@@ -235,6 +235,36 @@ class TestRunMatching:
         # Verify limit was applied in query (can't easily verify in mock, but at least check it doesn't error)
         session.execute.assert_called_once()
 
+    @patch("bimcalc.web.routes.matching.find_dirty_items")
+    @patch("bimcalc.web.routes.matching.MatchOrchestrator")
+    @patch("bimcalc.web.routes.matching.get_session")
+    def test_run_matching_incremental_all_clean(
+        self,
+        mock_get_session,
+        mock_orchestrator_class,
+        mock_find_dirty,
+        client,
+        mock_db_session,
+    ):
+        """Incremental run with an empty dirty set reports skipped items."""
+        mock_get_session.return_value = mock_db_session
+        session = mock_db_session.__aenter__.return_value
+
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        session.execute.return_value = mock_result
+        mock_find_dirty.return_value = SimpleNamespace(clean=12, item_ids=set())
+
+        data = {"org": "test-org", "project": "test-project", "incremental": "true"}
+        response = client.post("/match/run", data=data)
+
+        assert response.status_code == 200
+        json_response = response.json()
+        assert json_response["success"] is True
+        assert json_response["skipped"] == 12
+        assert json_response["results"] == []
+        mock_find_dirty.assert_awaited_once_with(session, "test-org", "test-project")
+
     def test_run_matching_invalid_limit(self, client):
         """Test matching with invalid limit parameter."""
         data = {
@@ -11,9 +11,27 @@ from datetime import datetime
 from uuid import uuid4
 from decimal import Decimal
 
+from bimcalc.db.facets import PRICE_DIMENSIONS, FacetCube
 from bimcalc.web.routes import prices
 
 
+@pytest.fixture(autouse=True)
+def price_facets():
+    """Facet cube for the list view, bypassing the cache."""
+    cube = FacetCube(
+        PRICE_DIMENSIONS,
+        [
+            (True, "TEST-VENDOR", "TEST", "UK", 30),
+            (True, "OTHER-VENDOR", "TEST", "IE", 12),
+            (False, "TEST-VENDOR", "TEST", "UK", 5),
+        ],
+    )
+    with patch(
+        "bimcalc.web.routes.prices.price_facets", AsyncMock(return_value=cube)
+    ) as loader:
+        yield loader
+
+
 @pytest.fixture
 def app():
     """Create test FastAPI app with prices router."""
@@ -231,6 +249,34 @@ class TestPricesList:
         )
         assert response.status_code == 200
 
+    @patch("bimcalc.web.routes.prices.get_session")
+    @patch("bimcalc.web.routes.prices.get_org_project")
+    def test_prices_list_browse_uses_facets(
+        self,
+        mock_get_org_project,
+        mock_get_session,
+        client,
+        mock_db_session,
+        mock_price_item,
+    ):
+        """Test browsing counts from the facet cube and pages by cursor."""
+        mock_get_org_project.return_value = ("test-org", "test-project")
+        mock_get_session.return_value = mock_db_session
+        session = mock_db_session.__aenter__.return_value
+
+        # Only the page itself is queried
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [mock_price_item] * 51
+        session.execute.side_effect = [mock_result]
+
+        response = client.get("/prices?region=UK")
+        assert response.status_code == 200
+        assert "Price Book (30 items)" in response.text
+        assert "OTHER-VENDOR (0)" in response.text
+        assert "IE (12)" in response.text
+        assert "&after=" in response.text
+        assert session.execute.call_count == 1
+
 
 class TestPricesExport:
     """Tests for GET /prices/export route."""
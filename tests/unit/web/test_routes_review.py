@@ -12,6 +12,7 @@ from uuid import uuid4
 
 from bimcalc.web.routes import review
 from bimcalc.models import FlagSeverity
+from bimcalc.review.models import ReviewPage, ReviewQueueCounts
 
 
 @pytest.fixture
@@ -42,6 +43,7 @@ def mock_db_session():
     session = AsyncMock()
     session.execute = AsyncMock()
     session.commit = AsyncMock()
+    session.info = {}
 
     # Create async context manager
     async_cm = AsyncMock()
@@ -101,7 +103,7 @@ class TestReviewDashboard:
     @pytest.mark.skip(
         reason="Template requires complex records object with many attributes - better tested in integration"
     )
-    @patch("bimcalc.web.routes.review.fetch_pending_reviews")
+    @patch("bimcalc.web.routes.review.fetch_review_page")
     @patch("bimcalc.web.routes.review.fetch_available_classifications")
     @patch("bimcalc.web.routes.review.get_session")
     @patch("bimcalc.web.dependencies.get_config")
@@ -132,7 +134,7 @@ class TestReviewDashboard:
                 classification="ABC123",
             )
         ]
-        mock_fetch_reviews.return_value = mock_records
+        mock_fetch_reviews.return_value = ReviewPage(records=mock_records)
         mock_fetch_classifications.return_value = ["ABC123", "XYZ789"]
 
         response = client.get("/review")
@@ -181,7 +183,8 @@ class TestReviewDashboard:
         # Verify metrics were computed
         mock_compute_metrics.assert_called_once()
 
-    @patch("bimcalc.web.routes.review.fetch_pending_reviews")
+    @patch("bimcalc.web.routes.review.fetch_review_counts")
+    @patch("bimcalc.web.routes.review.fetch_review_page")
     @patch("bimcalc.web.routes.review.fetch_available_classifications")
     @patch("bimcalc.web.routes.review.get_session")
     @patch("bimcalc.web.dependencies.get_config")
@@ -191,6 +194,7 @@ class TestReviewDashboard:
         mock_get_session,
         mock_fetch_classifications,
         mock_fetch_reviews,
+        mock_fetch_counts,
         client,
         mock_config,
         mock_db_session,
@@ -199,7 +203,8 @@ class TestReviewDashboard:
         mock_get_config.return_value = mock_config
         mock_get_session.return_value = mock_db_session
 
-        mock_fetch_reviews.return_value = []
+        mock_fetch_reviews.return_value = ReviewPage(records=[])
+        mock_fetch_counts.return_value = ReviewQueueCounts()
         mock_fetch_classifications.return_value = []
 
         response = client.get(
@@ -213,8 +218,19 @@ class TestReviewDashboard:
         assert call_args.kwargs["severity_filter"] == FlagSeverity.ADVISORY
         assert call_args.kwargs["unmapped_only"] is True
         assert call_args.kwargs["classification_filter"] == "ABC123"
+        # Header count uses the same filters
+        assert mock_fetch_counts.call_args.kwargs == {
+            key: call_args.kwargs[key]
+            for key in (
+                "flag_types",
+                "severity_filter",
+                "unmapped_only",
+                "classification_filter",
+            )
+        }
 
-    @patch("bimcalc.web.routes.review.fetch_pending_reviews")
+    @patch("bimcalc.web.routes.review.fetch_review_counts")
+    @patch("bimcalc.web.routes.review.fetch_review_page")
     @patch("bimcalc.web.routes.review.fetch_available_classifications")
     @patch("bimcalc.web.routes.review.get_session")
     @patch("bimcalc.web.dependencies.get_config")
@@ -224,6 +240,7 @@ class TestReviewDashboard:
         mock_get_session,
         mock_fetch_classifications,
         mock_fetch_reviews,
+        mock_fetch_counts,
         client,
         mock_config,
         mock_db_session,
@@ -232,7 +249,8 @@ class TestReviewDashboard:
         mock_get_config.return_value = mock_config
         mock_get_session.return_value = mock_db_session
 
-        mock_fetch_reviews.return_value = []
+        mock_fetch_reviews.return_value = ReviewPage(records=[])
+        mock_fetch_counts.return_value = ReviewQueueCounts()
         mock_fetch_classifications.return_value = []
 
         response = client.get("/review?org=custom-org&project=custom-proj")
@@ -0,0 +1,141 @@
+"""Tests for bimcalc.web.routes.revit - Revit plugin matching."""
+
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from bimcalc.canonical.key_generator import canonical_key
+from bimcalc.classification.trust_hierarchy import classify_item
+from bimcalc.core.vector_index import clear_vector_indexes
+from bimcalc.db.connection import get_db
+from bimcalc.db.models import ItemMappingModel, PriceItemModel
+from bimcalc.models import Item
+from bimcalc.web.routes import revit
+
+DIM = 1536
+
+
+def _vector(seed):
+    return np.random.default_rng(seed).normal(size=DIM).tolist()
+
+
+def _price(sku, seed):
+    return PriceItemModel(
+        id=uuid4(),
+        org_id="default",
+        item_code=sku,
+        region="UK",
+        sku=sku,
+        classification_code="2650",
+        description=f"{sku} tray",
+        unit="ea",
+        unit_price=Decimal("12.50"),
+        currency="EUR",
+        source_name="test",
+        source_currency="EUR",
+        valid_from=datetime(2024, 1, 1),
+        is_current=True,
+        embedding=_vector(seed),
+    )
+
+
+@pytest.fixture(autouse=True)
+def vector_indexes():
+    clear_vector_indexes()
+    yield
+    clear_vector_indexes()
+
+
+@pytest_asyncio.fixture()
+async def client(session):
+    app = FastAPI()
+    app.include_router(revit.router)
+
+    async def override_db():
+        yield session
+
+    app.dependency_overrides[get_db] = override_db
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+def _element(element_id, family="Cable Tray", type_name="Elbow 90", **params):
+    return {
+        "element_id": element_id,
+        "family": family,
+        "type_name": type_name,
+        "category": "Cable Trays",
+        "parameters": params,
+    }
+
+
+@pytest.mark.asyncio
+async def test_match_uses_mapping_memory_then_batched_embeddings(session, client):
+    mapped_price, near_price = _price("MAPPED", 1), _price("NEAR", 2)
+    item = Item(
+        org_id="default",
+        project_id="default",
+        family="Cable Tray",
+        type_name="Elbow 90",
+        category="Cable Trays",
+        width_mm=200,
+    )
+    item.classification_code = classify_item(item)
+    session.add_all(
+        [
+            mapped_price,
+            near_price,
+            ItemMappingModel(
+                org_id="default",
+                canonical_key=canonical_key(item),
+                price_item_id=mapped_price.id,
+                start_ts=datetime.utcnow(),
+                created_by="test",
+                reason="manual match",
+            ),
+        ]
+    )
+    await session.commit()
+
+    payload = [
+        _element("1", Width=200),
+        _element("2", Width=200),
+        _element("3", family="Ladder", Width=300),
+        _element("4", family="Ladder", Width=300),
+        _element("5", family="Trunking"),
+    ]
+    embed = AsyncMock(return_value=[_vector(2), None])
+    with patch.object(revit, "generate_embeddings", embed):
+        response = await client.post("/api/revit/match", json=payload)
+
+    assert response.status_code == 200
+    results = {r["element_id"]: r for r in response.json()}
+
+    # Mapped elements never reach the embedding API
+    assert results["1"]["match_source"] == results["2"]["match_source"] == "exact"
+    assert results["1"]["price_item_id"] == str(mapped_price.id)
+    assert results["1"]["price_data"]["unit_price"] == 12.5
+
+    # Duplicates are embedded once and share the vector lookup
+    (texts,) = embed.await_args.args
+    assert len(texts) == 2 and "Family: Ladder" in texts[0]
+    assert results["3"]["match_source"] == results["4"]["match_source"] == "fuzzy"
+    assert results["3"]["price_item_id"] == str(near_price.id)
+    assert results["3"]["confidence_score"] == pytest.approx(1.0, abs=1e-5)
+
+    assert results["5"] == {
+        "element_id": "5",
+        "price_item_id": None,
+        "confidence_score": 0.0,
+        "match_source": "none",
+        "price_data": None,
+    }